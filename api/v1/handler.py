@@ -43,10 +43,15 @@ async def get_user_transactions(
             ge=1,
             le=100,
             description="Количество записей, которое необходимо получить."
+        ),
+        before_id: int | None = Query(
+            default=None,
+            ge=1,
+            description="Вернуть переводы старше перевода с этим id (id последней записи прошлой страницы)."
         )
 ) -> list[Transaction | None]:
 
-    return ApiService().get_user_transactions(user_id, type, offset, limit)
+    return ApiService().get_user_transactions(user_id, type, offset, limit, before_id)
 
 
 @api_v1_router.get("/user_verification", response_model=bool, include_in_schema=False)
@@ -2,7 +2,7 @@ from fastapi import HTTPException, Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from databases.redis import get_redis_cursor
-from databases.postgresql import get_postgresql_connection
+from databases.postgresql import get_postgresql_pool
 
 from schemas.redis import RedisKeys
 from services.access_tokens import ApiAccessTokensService
@@ -22,7 +22,8 @@ class ApiSecurity:
         """Возвращает user_id если пользователь смог авторизоваться"""
 
         redis_cursor = get_redis_cursor()
-        psql_connect, psql_cursor = get_postgresql_connection()
+        psql_pool = get_postgresql_pool()
+        psql_connect, psql_cursor = psql_pool.acquire()
 
         try:
             if ApiAccessTokensService.validate_access_token(access_token) is False:
@@ -50,8 +51,7 @@ class ApiSecurity:
 
         finally:
             redis_cursor.close()
-            psql_cursor.close()
-            psql_connect.close()
+            psql_pool.release(psql_connect, psql_cursor)
 
 
     @staticmethod
@@ -61,7 +61,8 @@ class ApiSecurity:
         """Возвращает данные для авторизации на сайте в меню api"""
 
         redis_cursor = get_redis_cursor()
-        psql_connect, psql_cursor = get_postgresql_connection()
+        psql_pool = get_postgresql_pool()
+        psql_connect, psql_cursor = psql_pool.acquire()
 
         try:
             access_token = form_data.password
@@ -94,5 +95,4 @@ class ApiSecurity:
 
         finally:
             redis_cursor.close()
-            psql_cursor.close()
-            psql_connect.close()
+            psql_pool.release(psql_connect, psql_cursor)
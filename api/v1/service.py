@@ -1,7 +1,7 @@
 from fastapi import HTTPException
 
 from databases.redis import get_redis_cursor
-from databases.postgresql import get_postgresql_connection
+from databases.postgresql import get_postgresql_pool
 
 from schemas.users import UserStatus
 from schemas.transfer_coins import TransferCoinsType
@@ -18,13 +18,13 @@ class ApiService:
 
     def __init__(self) -> None:
         self.redis_cursor = get_redis_cursor()
-        self.psql_connect, self.psql_cursor = get_postgresql_connection()
+        self.psql_pool = get_postgresql_pool()
+        self.psql_connect, self.psql_cursor = self.psql_pool.acquire()
 
 
     def __del__(self) -> None:
         self.redis_cursor.close()
-        self.psql_cursor.close()
-        self.psql_connect.close()
+        self.psql_pool.release(self.psql_connect, self.psql_cursor)
 
 
     def get_user_banalce(
@@ -42,13 +42,14 @@ class ApiService:
             user_id: int,
             type: TransactionType,
             offset: int,
-            limit: int
+            limit: int,
+            before_id: int | None = None
     ) -> list[Transaction | None]:
         """Возвращает переводы пользователя"""
 
         transactions = TransferCoinsService.get_user_transfers(
             user_id, TransferCoinsType(type.value), offset, limit, self.psql_cursor,
-            convert_type=False
+            before_id=before_id, convert_type=False
         )
         transactions = [Transaction(**x) for x in transactions]
 
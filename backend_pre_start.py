@@ -22,8 +22,10 @@ from games.under_7_over import Under7OverGameModel
 from games.dream_catcher import DreamCatcherGameModel
 # Не трогать, читай BaseGameModel.GAMES_MODEL
 
+from games.deadlines import GameDeadlines
 from databases.redis import get_redis_cursor
-from databases.postgresql import get_postgresql_connection
+from databases.postgresql import get_postgresql_connection, close_postgresql_pool
+from modules.telegram.bot import get_bot_stats
 
 
 def init_old_games() -> None:
@@ -32,28 +34,21 @@ def init_old_games() -> None:
     redis_cursor = get_redis_cursor()
     psql_connect, psql_cursor = get_postgresql_connection()
 
-    psql_cursor.execute("""
-        SELECT games.game_id, games.game_mode
-        FROM games JOIN rates ON games.game_id = rates.game_id
-        WHERE games.is_active = TRUE AND
-              games.end_datetime IS NULL
-        GROUP BY games.game_id
-        HAVING COUNT(rates.*) > 0
-    """)
-    waiting_game = psql_cursor.fetchall()
+    # Сроки собираются заново, если redis очистили или срок раунда не записался (см. games/deadlines.py)
+    if not GameDeadlines.is_ready(redis_cursor):
+        GameDeadlines.rebuild(psql_cursor, redis_cursor)
 
+    # Запущенные раунды и раунды, в которых бот упал между первой ставкой и запуском таймера
+    # (частичный индекс games_active_end_datetime_idx), берутся из postgresql, а не из сроков в redis
     psql_cursor.execute("""
         SELECT game_id, game_mode
         FROM games
-        WHERE is_active = TRUE AND
-              end_datetime IS NOT NULL
+        WHERE is_active = TRUE AND (
+            end_datetime IS NOT NULL OR
+            EXISTS (SELECT 1 FROM rates WHERE rates.game_id = games.game_id)
+        )
     """)
-    running_games = psql_cursor.fetchall()
-
-    games = {}
-    for game in (waiting_game + running_games):
-        games[game["game_id"]] = game
-    games = list(games.values())
+    games = psql_cursor.fetchall()
 
     for game in games:
         game_mode = Games(game["game_mode"])
@@ -75,7 +70,15 @@ def when_ready(_):
         os.mkdir(Config.BACKUPS_FOLDER)
 
     init_old_games()
+    # Все фоновые задачи в одном event loop, выполняет их только ведущий процесс (modules/task_runner.py)
     threading.Thread(target=asyncio.run, args=[BackgroundWorkers.run_workers()], daemon=True).start()
 
     if Config.DEVELOPMENT_MODE is True and Config.ON_SERVER is False:
         threading.Thread(target=asyncio.run, args=[telegram_polling()], daemon=True).start()
+
+
+def worker_exit(_, __):
+    """Закрывает пул соединений postgresql воркера gunicorn"""
+
+    print(f"[BOT API] worker stats: {get_bot_stats()}", flush=True)
+    close_postgresql_pool()
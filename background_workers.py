@@ -1,7 +1,6 @@
 import os
 import time
 import asyncio
-import threading
 import traceback
 import subprocess
 from subprocess import STDOUT, DEVNULL
@@ -11,10 +10,14 @@ from redis.client import Redis
 from datetime import datetime, timedelta
 from psycopg2.extras import DictCursor
 
-from settings import TopSettings, Config, DatabasePsqlSettings
-from databases.redis import get_redis_cursor
-from databases.postgresql import get_postgresql_connection
+from settings import TopSettings, Config, DatabasePsqlSettings, RoundSchedulerSettings
+from databases.redis import get_shared_redis_cursor
+from databases.postgresql import async_postgresql_connection
+from databases.executor import run_sync
+from games.deadlines import GameDeadlines
+from games.round_state import RoundState
 
+from tops.base import reward_tops
 from tops.day_top import DayTopService
 from tops.week_top import WeekTopService
 from tops.chats_top import ChatsTopService
@@ -24,17 +27,22 @@ from tops.rubles_top import RublesTopService
 from tops.week_rubles_top import WeekRublesTopService
 
 from schemas.bot_statistics import StatisticsSchema
+from schemas.users import UserSchema
+from schemas.redis import RedisKeys
+from schemas.periods import Period
 
 from services.incomes import IncomesService
+from services.periods import PeriodsService
 from services.promocode import PromoCodeService
 from services.bonus_repost import BonusRepostService
 from services.bonus_subscription import BonusSubscriptionService
 from services.notification import NotificationsService, NotifyChats
-from services.reset_user_data import ResetUserServices
+from services.reset_user_data import ResetUserServices, ResetUserData
 
 from modules.additional import format_number, get_word_case
-from modules.databases.users import get_user_data, update_users_last_activity, give_coins
-from modules.telegram.bot import send_message, send_keyboard, is_user_subscribed
+from modules.task_runner import TaskRunner, BackgroundTask, IntervalTrigger, DailyTrigger
+from modules.databases.users import get_user_data, update_users_last_activity
+from modules.telegram.bot import send_message, send_keyboard, get_channel_subscription
 from settings import TelegramBotSettings
 
 from vk_bot.template_messages import REPEAT_CHAT_SUBSCRIPTION
@@ -48,93 +56,97 @@ class BackgroundWorkers:
     async def reset_subscribe_chats() -> None:
         """Обнуляет подписку на чаты"""
 
-        while True:
-            try:
-                psql_connect, psql_cursor = get_postgresql_connection()
+        async with async_postgresql_connection() as (_, psql_cursor):
+            psql_cursor.execute("""
+                SELECT chats.chat_id as chat_id
+                FROM chats JOIN users ON chats.owner_id = users.user_id
+                WHERE users.status != 'admin' AND
+                      chats.is_activated = TRUE AND
+                      chats.life_datetime <= NOW()
+            """)
+            chat_ids = [x["chat_id"] for x in psql_cursor.fetchall()]
+
+            for chat_id in chat_ids:
 
                 psql_cursor.execute("""
-                    SELECT chats.chat_id as chat_id
-                    FROM chats JOIN users ON chats.owner_id = users.user_id
-                    WHERE users.status != 'admin' AND
-                          chats.is_activated = TRUE AND
-                          chats.life_datetime <= NOW()
-                """)
-                chat_ids = [x["chat_id"] for x in psql_cursor.fetchall()]
-
-                for chat_id in chat_ids:
-
-                    psql_cursor.execute("""
-                        UPDATE chats SET is_activated = FALSE
-                        WHERE chat_id = %(user_id)s
-                    """, {
-                        "user_id": chat_id
-                    })
-
-                    await send_message(chat_id, REPEAT_CHAT_SUBSCRIPTION, repeat_chat_subscription_keyboard)
-                    await send_keyboard(chat_id, empty_keyboard)
-
-                psql_cursor.close()
-                psql_connect.close()
-                await asyncio.sleep(30)
+                    UPDATE chats SET is_activated = FALSE
+                    WHERE chat_id = %(user_id)s
+                """, {
+                    "user_id": chat_id
+                })
 
-            except:
-                await asyncio.sleep(10)
+                await send_message(chat_id, REPEAT_CHAT_SUBSCRIPTION, repeat_chat_subscription_keyboard)
+                await send_keyboard(chat_id, empty_keyboard)
+
+
+    @staticmethod
+    def _get_inactive_user_ids(psql_cursor: DictCursor) -> list[int]:
+        """Возвращает пользователей, которые не пользовались ботом 2 месяца"""
+
+        psql_cursor.execute("""
+            SELECT user_id
+            FROM users
+            WHERE NOW() > (last_activity + INTERVAL '2 MONTH') AND
+                  user_id != 0
+        """)
+
+        return [x["user_id"] for x in psql_cursor.fetchall()]
+
+
+    @staticmethod
+    def _reset_inactive_user(
+            user_id: int,
+            redis_cursor: Redis,
+            psql_cursor: DictCursor
+    ) -> tuple[ResetUserData, UserSchema]:
+        """Обнуляет данные пользователя, возвращает результат обнуления и данные пользователя"""
+
+        reset_data = ResetUserServices.reset_data(user_id, psql_cursor)
+        IncomesService.records_additional_incomes(reset_data.total_amount, redis_cursor)
+        update_users_last_activity(user_id, psql_cursor)
+
+        return reset_data, get_user_data(user_id, psql_cursor)
+
+
+    @staticmethod
+    def _get_next_reset_delay(psql_cursor: DictCursor) -> float:
+        """Возвращает секунды до следующего обнуления данных"""
+
+        psql_cursor.execute("""
+            SELECT EXTRACT(EPOCH FROM (
+                COALESCE(
+                    (SELECT MIN(last_activity) FROM users WHERE user_id != 0) + INTERVAL '2 MONTH',
+                    NOW() + INTERVAL '60 SECOND'
+                ) - NOW()
+            )) AS expectation_seconds
+        """)
+
+        return max(float(psql_cursor.fetchone()["expectation_seconds"]), 0)
 
 
     @classmethod
-    async def reser_user_data(cls) -> None:
-        """Обнуляет данные пользователя если не пользовался ботом 2 месяца"""
+    async def reser_user_data(cls) -> float:
+        """Обнуляет данные пользователя если не пользовался ботом 2 месяца, возвращает секунды до следующего"""
+        # Запросы выполняются в пуле потоков, чтобы не останавливать остальные задачи
 
-        while True:
-            redis_cursor = get_redis_cursor()
-            psql_connect, psql_cursor = get_postgresql_connection()
+        redis_cursor = get_shared_redis_cursor()
 
-            try:
-                psql_cursor.execute("""
-                    SELECT EXTRACT(EPOCH FROM (
-                        COALESCE(
-                            (SELECT MIN(last_activity) FROM users) + INTERVAL '2 MONTH',
-                            NOW() + INTERVAL '60 SECOND'
-                        ) - NOW()
-                    )) AS expectation_seconds
-                """)
-                expectation_seconds = psql_cursor.fetchone()["expectation_seconds"]
-                expectation_seconds = expectation_seconds if expectation_seconds > 0 else 0
-                expectation_seconds = min(expectation_seconds, 60)
-
-                await asyncio.sleep(expectation_seconds)
+        async with async_postgresql_connection() as (_, psql_cursor):
+            user_ids = await run_sync(cls._get_inactive_user_ids, psql_cursor)
 
-                psql_cursor.execute("""
-                    SELECT user_id
-                    FROM users
-                    WHERE NOW() > (last_activity + INTERVAL '2 MONTH') AND
-                          user_id != 0
-                """)
-                user_ids = [x["user_id"] for x in psql_cursor.fetchall()]
-
-                for user_id in user_ids:
-                    reset_data = ResetUserServices.reset_data(user_id, psql_cursor)
-                    IncomesService.records_additional_incomes(reset_data.total_amount, redis_cursor)
-                    update_users_last_activity(user_id, psql_cursor)
-
-                    prefix = "⚠" if reset_data.total_amount > 0 else ""
-                    user_data = get_user_data(user_id, psql_cursor)
-                    await NotificationsService.send_notification(
-                        chat=NotifyChats.RESET_USER_ACCOINT,
-                        message=f"""
-                            {prefix} {user_data.vk_name} не пользовался ботом более 2-х месяцев\
-                            {reset_data.reset_message}
-                        """
-                    )
+            for user_id in user_ids:
+                reset_data, user_data = await run_sync(cls._reset_inactive_user, user_id, redis_cursor, psql_cursor)
 
-            except:
-                traceback.print_exc()
-                await asyncio.sleep(10)
+                prefix = "⚠" if reset_data.total_amount > 0 else ""
+                await NotificationsService.send_notification(
+                    chat=NotifyChats.RESET_USER_ACCOINT,
+                    message=f"""
+                        {prefix} {user_data.vk_name} не пользовался ботом более 2-х месяцев\
+                        {reset_data.reset_message}
+                    """
+                )
 
-            finally:
-                psql_cursor.close()
-                psql_connect.close()
-                redis_cursor.close()
+            return await run_sync(cls._get_next_reset_delay, psql_cursor)
 
 
     @staticmethod
@@ -198,9 +210,9 @@ class BackgroundWorkers:
             )
 
 
-    @classmethod
-    async def inform_owners_week_incomes(cls, psql_cursor: DictCursor) -> None:
-        """Информирует владельцев о доходе за неделю"""
+    @staticmethod
+    def get_week_statistics(psql_cursor: DictCursor) -> StatisticsSchema:
+        """Возвращает статистику за неделю"""
 
         psql_cursor.execute("""
             SELECT COALESCE(SUM(active), 0) as active,
@@ -211,8 +223,14 @@ class BackgroundWorkers:
             FROM bot_statistics
             WHERE datetime >= DATE(NOW() - INTERVAL '7 days')
         """)
-        stats = StatisticsSchema(**psql_cursor.fetchone())
+        return StatisticsSchema(**psql_cursor.fetchone())
+
+
+    @classmethod
+    async def inform_owners_week_incomes(cls, psql_cursor: DictCursor) -> None:
+        """Информирует владельцев о доходе за неделю"""
 
+        stats = await run_sync(cls.get_week_statistics, psql_cursor)
         await cls.inform_owners_incomes(stats, period="неделю")
 
 
@@ -245,7 +263,7 @@ class BackgroundWorkers:
     def reset_day_statistics(redis_cursor: Redis, psql_cursor: DictCursor) -> None:
         """Очищает статистику за день"""
 
-        psql_cursor.execute("UPDATE users SET day_win = 0, day_lost = 0, day_rates = 0")
+        PeriodsService.start_new_period(Period.DAY_STATISTICS, psql_cursor)
 
         IncomesService.reset_additional_incomes(redis_cursor)
         IncomesService.reset_additional_expenses(redis_cursor)
@@ -255,12 +273,12 @@ class BackgroundWorkers:
     def reset_week_statistics(psql_cursor: DictCursor) -> None:
         """Очищает статистику за неделю"""
 
-        psql_cursor.execute("UPDATE users SET week_win = 0, week_lost = 0, week_rates = 0")
+        PeriodsService.start_new_period(Period.WEEK_STATISTICS, psql_cursor)
 
 
     @staticmethod
-    async def send_notif_about_end_chat_sub(psql_cursor: DictCursor) -> None:
-        """Отправляет уведомления об окончании подписки на чат"""
+    def get_ending_chat_subscriptions(psql_cursor: DictCursor) -> list[dict]:
+        """Возвращает чаты, подписка которых закончится через 1 или 7 дней"""
 
         psql_cursor.execute("""
             SELECT chats.chat_id,
@@ -272,7 +290,14 @@ class BackgroundWorkers:
                   ROUND(EXTRACT(EPOCH FROM (chats.life_datetime - NOW())) / 86400) IN (1, 7) AND
                   users.status != 'admin'
         """)
-        chats = psql_cursor.fetchall()
+        return psql_cursor.fetchall()
+
+
+    @classmethod
+    async def send_notif_about_end_chat_sub(cls, psql_cursor: DictCursor) -> None:
+        """Отправляет уведомления об окончании подписки на чат"""
+
+        chats = await run_sync(cls.get_ending_chat_subscriptions, psql_cursor)
 
         for chat in chats:
 
@@ -291,240 +316,247 @@ class BackgroundWorkers:
     async def every_day(cls) -> None:
         """Ежедневный запуск задачь"""
 
-        while True:
-            await asyncio.sleep(86400 - ((time.time() + 10800) % 86400) + 10)
+        # pg_dump выполняется в отдельном потоке, чтобы не останавливать остальные задачи
+        await asyncio.to_thread(cls.create_database_backup)
+        cls.remove_old_database_backup()
 
-            redis_cursor = get_redis_cursor()
-            psql_connect, psql_cursor = get_postgresql_connection()
+        redis_cursor = get_shared_redis_cursor()
 
-            try:
-                cls.create_database_backup()
-                cls.remove_old_database_backup()
+        async with async_postgresql_connection() as (_, psql_cursor):
+            # Синхронные запросы выполняются в пуле потоков, чтобы не останавливать остальные задачи
+            bot_statistics = await run_sync(IncomesService.get_day_statistics, redis_cursor, psql_cursor)
+            await run_sync(cls.reset_day_statistics, redis_cursor, psql_cursor)
+            await run_sync(cls.write_day_statistics, bot_statistics, psql_cursor)
+            await cls.inform_owners_incomes(bot_statistics, period="день")
 
-                bot_statistics = IncomesService.get_day_statistics(redis_cursor, psql_cursor)
-                cls.reset_day_statistics(redis_cursor, psql_cursor)
-                cls.write_day_statistics(bot_statistics, psql_cursor)
-                await cls.inform_owners_incomes(bot_statistics, period="день")
+            current_date = datetime.today()
+            current_day = current_date.day
+            current_week_day = current_date.weekday()
 
-                current_date = datetime.today()
-                current_day = current_date.day
-                current_week_day = current_date.weekday()
+            # Награды всех топов дня выдаются одной транзакцией (см. tops/base.py)
+            tops = [DayTopService]
 
-                await DayTopService.reward_winners(redis_cursor, psql_cursor)
+            if current_day == 1:
+                tops.append(RublesTopService)
 
-                if current_day == 1:
-                    await RublesTopService.reward_winners(redis_cursor, psql_cursor)
+            if current_week_day == 0:
+                await run_sync(cls.reset_week_statistics, psql_cursor)
+                tops.extend((WeekTopService, ClansTopService, WeekRublesTopService))
 
-                if current_week_day == 0:
-                    cls.reset_week_statistics(psql_cursor)
-                    await WeekTopService.reward_winners(redis_cursor, psql_cursor)
-                    await ClansTopService.reward_winners(redis_cursor, psql_cursor)
-                    await WeekRublesTopService.reward_winners(redis_cursor, psql_cursor)
-                    await cls.inform_owners_week_incomes(psql_cursor)
+            if current_week_day == 5:
+                tops.append(ChatsTopService)
 
-                if current_week_day == 5:
-                    await ChatsTopService.reward_winners(redis_cursor, psql_cursor)
+            if TopSettings.SWITCH_COINS_TOP and TopSettings.DATETIME_COINS_TOP is not None:
 
-                if TopSettings.SWITCH_COINS_TOP and TopSettings.DATETIME_COINS_TOP is not None:
+                if TopSettings.DATETIME_COINS_TOP == current_date:
+                    tops.append(CoinsTopService)
 
-                    if TopSettings.DATETIME_COINS_TOP == current_date:
-                        await CoinsTopService.reward_winners(redis_cursor, psql_cursor)
+                if TopSettings.DATETIME_COINS_TOP == current_date + timedelta(days=4):
+                    await run_sync(CoinsTopService.reset_points, psql_cursor)
 
-                    if TopSettings.DATETIME_COINS_TOP == current_date + timedelta(days=4):
-                        CoinsTopService.reset_points(psql_cursor)
+            await reward_tops(tops, redis_cursor, psql_cursor)
 
-                await cls.send_notif_about_end_chat_sub(psql_cursor)
+            if current_week_day == 0:
+                await cls.inform_owners_week_incomes(psql_cursor)
 
-            except:
-                traceback.print_exc()
+            await cls.send_notif_about_end_chat_sub(psql_cursor)
+
+
+    @staticmethod
+    async def distribute_subscription_bonuses() -> float | None:
+        """Проверяет неизвестные подписки на канал и выдает бонусы за подписку"""
+        # Подписки приходят событиями chat_member (telegram_bot/handlers/channel_member.py),
+        # getChatMember запрашивается у пользователей, подписка которых еще неизвестна,
+        # и повторно у неподписанных раз в SUBSCRIPTION_RECHECK_AFTER секунд
+        # (события могли потеряться, пока бот не работал)
+
+        redis_cursor = get_shared_redis_cursor()
+        cursor_key = RedisKeys.SUBSCRIPTION_CHECK_CURSOR.value
+        channel_id = TelegramBotSettings.SUBSCRIPTION_CHANNEL_ID
+        semaphore = asyncio.Semaphore(TelegramBotSettings.SUBSCRIPTION_CHECK_CONCURRENCY)
+
+        async def check_subscription(user_id: int) -> bool | None:
+            async with semaphore:
+                return await get_channel_subscription(user_id, channel_id)
+
+        async with async_postgresql_connection() as (_, psql_cursor):
+            after_user_id = int(redis_cursor.get(cursor_key) or 0)
+            user_ids = BonusSubscriptionService.get_unchecked_users(
+                after_user_id, TelegramBotSettings.SUBSCRIPTION_CHECK_BATCH, psql_cursor
+            )
+
+            checked = []
+            if user_ids:
+                statuses = await asyncio.gather(*[check_subscription(user_id) for user_id in user_ids])
+                checked = [(user_id, status) for user_id, status in zip(user_ids, statuses) if status is not None]
+
+                BonusSubscriptionService.set_subscriptions(checked, psql_cursor)
+                redis_cursor.set(cursor_key, user_ids[-1])
+            else:
+                # Проход закончен, пользователи которых не удалось проверить проверятся в следующем проходе
+                redis_cursor.delete(cursor_key)
+
+            stale_user_ids = BonusSubscriptionService.get_stale_unsubscribed_users(
+                TelegramBotSettings.SUBSCRIPTION_RECHECK_AFTER,
+                TelegramBotSettings.SUBSCRIPTION_CHECK_BATCH, psql_cursor
+            )
 
-            finally:
-                psql_cursor.close()
-                psql_connect.close()
-                redis_cursor.close()
+            if stale_user_ids:
+                statuses = await asyncio.gather(*[check_subscription(user_id) for user_id in stale_user_ids])
+                # Не удалось проверить - остаются неподписанными до следующей повторной проверки
+                rechecked = [(user_id, status is True) for user_id, status in zip(stale_user_ids, statuses)]
+                BonusSubscriptionService.set_subscriptions(rechecked, psql_cursor)
+                checked.extend(rechecked)
+
+            # Подписчики без бонуса ищутся одним запросом, пачками по SUBSCRIPTION_BONUS_BATCH
+            rewards = []
+            while True:
+                batch = BonusSubscriptionService.give_bonuses(TelegramBotSettings.SUBSCRIPTION_BONUS_BATCH, psql_cursor)
+                if not batch:
+                    break
+                rewards.extend(batch)
+
+        await BonusSubscriptionService.send_bonus_messages(rewards)
+
+        # Пока есть непроверенные пользователи, следующая пачка проверяется сразу
+        return 1 if checked else None
 
 
     @staticmethod
-    async def distribute_subscription_bonuses() -> None:
-        """Проверяет подписки и выдает бонусы за подписку"""
+    def _get_stuck_games(game_ids: list[int], psql_cursor: DictCursor) -> dict[int, dict]:
+        """Возвращает зависшие игры по game_id"""
+
+        psql_cursor.execute("""
+            SELECT game_id, game_mode, is_active, income,
+                   EXTRACT(EPOCH FROM (NOW() - end_datetime)) as seconds_past
+            FROM games
+            WHERE game_id = ANY(%(game_ids)s)
+        """, {"game_ids": game_ids})
+
+        return {game["game_id"]: game for game in psql_cursor.fetchall()}
 
-        while True:
-            try:
-                psql_connect, psql_cursor = get_postgresql_connection()
-
-                # Получаем активные бонусы
-                active_bonuses = BonusSubscriptionService.get_active_bonuses(psql_cursor)
-
-                if active_bonuses:
-                    # Получаем всех пользователей из базы данных
-                    psql_cursor.execute("SELECT user_id FROM users WHERE user_id > 0")
-                    user_ids = [row["user_id"] for row in psql_cursor.fetchall()]
-
-                    channel_id = TelegramBotSettings.SUBSCRIPTION_CHANNEL_ID
-
-                    for bonus in active_bonuses:
-                        for user_id in user_ids:
-                            try:
-                                # Проверяем, не получал ли пользователь уже этот бонус
-                                if BonusSubscriptionService.user_received_bonus(user_id, bonus.id, psql_cursor):
-                                    continue
-
-                                # Проверяем подписку на канал
-                                if await is_user_subscribed(user_id, channel_id):
-                                    # Выдаем бонус
-                                    give_coins(user_id, bonus.reward, psql_cursor)
-                                    BonusSubscriptionService.mark_bonus_received(
-                                        user_id, bonus.id, bonus.reward, psql_cursor
-                                    )
-
-                                    # Отправляем сообщение пользователю
-                                    message = f"Получен бонус за подписку в размере {format_number(bonus.reward)} White Coin"
-                                    await send_message(user_id, message)
-
-                                    # Небольшая задержка, чтобы не перегружать API
-                                    await asyncio.sleep(0.05)
-
-                            except Exception as e:
-                                # Пропускаем ошибки для отдельных пользователей
-                                print(f"Error processing user {user_id} for bonus {bonus.id}: {e}")
-                                continue
-
-                psql_cursor.close()
-                psql_connect.close()
-                # Проверяем каждые 5 минут
-                await asyncio.sleep(300)
-
-            except Exception as e:
-                print(f"Error in distribute_subscription_bonuses: {e}")
-                traceback.print_exc()
-                await asyncio.sleep(60)
 
     @staticmethod
-    async def check_and_finish_games() -> None:
-        """Проверяет и завершает зависшие игры"""
+    def _deactivate_games(game_ids: list[int], psql_cursor: DictCursor) -> None:
+        """Помечает игры неактивными"""
+
+        psql_cursor.execute("""
+            UPDATE games SET is_active = FALSE
+            WHERE game_id = ANY(%(game_ids)s)
+        """, {"game_ids": game_ids})
+
+
+    @classmethod
+    async def check_and_finish_games(cls) -> float:
+        """Завершает зависшие игры, возвращает секунды до ближайшего срока окончания раунда (см. games/deadlines.py)"""
         from games.base import BaseGameModel
         from schemas.games import Games
-        
-        while True:
-            try:
-                psql_connect, psql_cursor = get_postgresql_connection()
-                
-                # Находим игры которые должны были завершиться
-                # Добавляем задержку в 10 секунд после end_datetime, чтобы не конфликтовать с обычным завершением
-                # Также обрабатываем игры с is_active=FALSE и income=0 или income IS NULL (не обработанные)
-                psql_cursor.execute("""
-                    SELECT game_id, chat_id, game_mode,
-                           EXTRACT(EPOCH FROM (NOW() - end_datetime)) as seconds_past,
-                           is_active, income
-                    FROM games 
-                    WHERE (
-                        (is_active = TRUE AND 
-                         end_datetime IS NOT NULL AND
-                         end_datetime < NOW() - INTERVAL '10 seconds')
-                        OR
-                        (is_active = FALSE AND 
-                         (income IS NULL OR income = 0 OR income = -1) AND
-                          end_datetime IS NOT NULL AND
-                         end_datetime < NOW() - INTERVAL '10 seconds')
-                    )
-                    ORDER BY end_datetime ASC
-                    LIMIT 10
-                """)
-                stuck_games = psql_cursor.fetchall()
-                
-                if stuck_games:
-                    print(f"[WORKER] Найдено {len(stuck_games)} зависших игр", flush=True)
-                
-                for game in stuck_games:
-                    try:
-                        game_id = game["game_id"]
-                        game_mode_str = game["game_mode"]
-                        seconds_past = game["seconds_past"]
-                        
-                        # Проверяем что игра не обрабатывается
-                        with BaseGameModel._processing_games_lock:
-                            if game_id in BaseGameModel._processing_games:
-                                print(f"[WORKER] Игра {game_id} уже обрабатывается, пропускаем", flush=True)
-                                continue
-                        
-                        # Проверяем что игра существует в GAMES_MODEL
-                        try:
-                            game_mode = Games(game_mode_str)
-                            if game_mode not in BaseGameModel.GAMES_MODEL:
-                                print(f"[WORKER ERROR] Игра {game_mode_str} не найдена в GAMES_MODEL для игры {game_id}", flush=True)
-                                # Помечаем игру как неактивную если режим игры не поддерживается
-                                psql_cursor.execute("""
-                                    UPDATE games SET is_active = FALSE
-                                    WHERE game_id = %(game_id)s
-                                """, {"game_id": game_id})
-                                psql_connect.commit()
-                                continue
-                            
-                        game_model = BaseGameModel.GAMES_MODEL[game_mode]
-                            is_active = game.get("is_active", True)
-                            income = game.get("income")
-                            if is_active:
-                                print(f"[WORKER] Завершаем зависшую игру {game_id} (прошло {seconds_past:.1f} сек после end_datetime)", flush=True)
-                            else:
-                                print(f"[WORKER] Обрабатываем необработанную игру {game_id} (is_active={is_active}, income={income}, прошло {seconds_past:.1f} сек после end_datetime)", flush=True)
-                            
-                            # Завершаем игру с time_left=0 (немедленно)
-                            await game_model.submit_results(game_id, 0)
-                            
-                        except KeyError as e:
-                            print(f"[WORKER ERROR] Игра {game_id}: режим игры {game_mode_str} не найден: {e}", flush=True)
-                            # Помечаем игру как неактивную
-                            psql_cursor.execute("""
-                                UPDATE games SET is_active = FALSE
-                                WHERE game_id = %(game_id)s
-                            """, {"game_id": game_id})
-                            psql_connect.commit()
-                        except Exception as e:
-                            print(f"[WORKER ERROR] Ошибка при завершении игры {game_id}: {e}", flush=True)
-                            import traceback
-                            traceback.print_exc()
-                            
-                            # Если ошибка критическая, помечаем игру как неактивную
-                            if "not found" in str(e).lower() or "не найдена" in str(e).lower():
-                                try:
-                                    psql_cursor.execute("""
-                                        UPDATE games SET is_active = FALSE
-                                        WHERE game_id = %(game_id)s
-                                    """, {"game_id": game_id})
-                                    psql_connect.commit()
-                                except:
-                                    pass
-                    
-                    except Exception as e:
-                        print(f"[WORKER ERROR] Ошибка при обработке игры: {e}", flush=True)
-                        import traceback
-                        traceback.print_exc()
-                
-                psql_cursor.close()
-                psql_connect.close()
-                
-                # Проверяем каждые 5 секунд
-                await asyncio.sleep(5)
-                
-            except Exception as e:
-                print(f"[WORKER ERROR] Ошибка в check_and_finish_games: {e}", flush=True)
-                import traceback
-                traceback.print_exc()
-                await asyncio.sleep(10)
+
+        redis_cursor = get_shared_redis_cursor()
+
+        if not GameDeadlines.is_ready(redis_cursor):
+            async with async_postgresql_connection() as (_, psql_cursor):
+                await run_sync(GameDeadlines.rebuild, psql_cursor, redis_cursor)
+
+        # Задержка после окончания раунда, чтобы не конфликтовать с обычным завершением
+        stuck_before = time.time() - RoundSchedulerSettings.STUCK_GAME_DELAY
+        stuck_game_ids = GameDeadlines.get_due(redis_cursor, stuck_before, RoundSchedulerSettings.STUCK_GAMES_BATCH)
+
+        if stuck_game_ids:
+            print(f"[WORKER] Найдено {len(stuck_game_ids)} зависших игр", flush=True)
+
+            # Соединение возвращается в пул до подсчета, submit_results берет свое
+            async with async_postgresql_connection() as (_, psql_cursor):
+                stuck_games = await run_sync(cls._get_stuck_games, stuck_game_ids, psql_cursor)
+
+            games_to_finish = []  # (game_id, модель игры, секунд после end_datetime)
+            unsupported_game_ids = []
+
+            for game_id in stuck_game_ids:
+                game = stuck_games.get(game_id)
+
+                # Игра удалена или уже подсчитана, а срок не удалился
+                if game is None or not game["is_active"]:
+                    GameDeadlines.remove(game_id, redis_cursor)
+                    continue
+
+                try:
+                    game_model = BaseGameModel.GAMES_MODEL[Games(game["game_mode"])]
+                except (KeyError, ValueError):
+                    print(f"[WORKER ERROR] Игра {game['game_mode']} не найдена в GAMES_MODEL для игры {game_id}", flush=True)
+                    # Помечаем игру как неактивную если режим игры не поддерживается
+                    unsupported_game_ids.append(game_id)
+                    continue
+
+                games_to_finish.append((game_id, game_model, game["seconds_past"] or 0))
+
+            if unsupported_game_ids:
+                async with async_postgresql_connection() as (_, psql_cursor):
+                    await run_sync(cls._deactivate_games, unsupported_game_ids, psql_cursor)
+
+                for game_id in unsupported_game_ids:
+                    GameDeadlines.remove(game_id, redis_cursor)
+                    RoundState.finish(game_id)
+
+            for game_id, game_model, seconds_past in games_to_finish:
+                with BaseGameModel._processing_games_lock:
+                    if game_id in BaseGameModel._processing_games:
+                        print(f"[WORKER] Игра {game_id} уже обрабатывается, пропускаем", flush=True)
+                        GameDeadlines.postpone(game_id, time.time(), redis_cursor)
+                        continue
+
+                print(f"[WORKER] Завершаем зависшую игру {game_id} (прошло {seconds_past:.1f} сек после end_datetime)", flush=True)
+
+                try:
+                    # Завершаем игру с time_left=0 (немедленно), подсчет удалит срок
+                    await game_model.submit_results(game_id, 0)
+                except Exception as e:
+                    print(f"[WORKER ERROR] Ошибка при завершении игры {game_id}: {e}", flush=True)
+                    traceback.print_exc()
+
+                # Если игра не подсчиталась, повторяем через STUCK_GAME_DELAY
+                GameDeadlines.postpone(game_id, time.time(), redis_cursor)
+
+            return 0
+
+        # Спим до ближайшего срока, раунды из других процессов проверяются раз в STUCK_GAMES_MAX_SLEEP
+        next_deadline = GameDeadlines.get_next(redis_cursor)
+        if next_deadline is None:
+            return RoundSchedulerSettings.STUCK_GAMES_MAX_SLEEP
+
+        return next_deadline + RoundSchedulerSettings.STUCK_GAME_DELAY - time.time()
+
 
     @classmethod
-    async def run_workers(cls) -> None:
-        """Запускает задачи"""
-
-        workers = [
-            cls.every_day,
-            cls.reser_user_data,
-            cls.reset_subscribe_chats,
-            cls.distribute_subscription_bonuses,
-            cls.check_and_finish_games,  # Добавляем проверку зависших игр
-            BonusRepostService.publish_post_end_bonus,
-            PromoCodeService.run_collector_expired_promocodes
+    def get_tasks(cls) -> list[BackgroundTask]:
+        """Возвращает фоновые задачи и их расписание"""
+
+        return [
+            # Каждый день в 00:00:10 по МСК
+            BackgroundTask("every_day", cls.every_day, DailyTrigger(second=10, utc_offset=3 * 3600)),
+            BackgroundTask("reset_user_data", cls.reser_user_data, IntervalTrigger(60), timeout=600),
+            BackgroundTask("reset_subscribe_chats", cls.reset_subscribe_chats, IntervalTrigger(30), timeout=300),
+            BackgroundTask(
+                "distribute_subscription_bonuses", cls.distribute_subscription_bonuses,
+                IntervalTrigger(300), timeout=1800
+            ),
+            BackgroundTask(
+                "check_and_finish_games", cls.check_and_finish_games,
+                IntervalTrigger(RoundSchedulerSettings.STUCK_GAMES_MAX_SLEEP), timeout=300
+            ),
+            BackgroundTask(
+                "publish_post_end_bonus", BonusRepostService.publish_post_end_bonus,
+                IntervalTrigger(60), timeout=600
+            ),
+            BackgroundTask(
+                "collect_expired_promocodes", PromoCodeService.collect_expired_promocodes,
+                IntervalTrigger(30), timeout=300
+            )
         ]
 
-        for worker in workers:
-            threading.Thread(target=asyncio.run, args=[worker()], daemon=True).start()
+
+    @classmethod
+    async def run_workers(cls) -> None:
+        """Запускает задачи (см. modules/task_runner.py)"""
+
+        await TaskRunner(cls.get_tasks(), get_shared_redis_cursor()).run()
@@ -40,15 +40,13 @@ def apply_sql_file(sql_file_path: str):
                 i += 2
                 continue
             else:
-                # Проверяем конец $$ блока
-                if i + 1 < len(sql_content) and sql_content[i+1] == ';':
-                    current_command += '$$'
-                    commands.append(current_command.strip())
-                    current_command = ""
-                    in_dollar_block = False
-                    dollar_tag = None
-                    i += 2  # Пропускаем $$ и ;
-                    continue
+                # Конец $$ блока, команда заканчивается на следующей ; вне блока
+                # (после $$ обычно идет LANGUAGE plpgsql)
+                current_command += '$$'
+                in_dollar_block = False
+                dollar_tag = None
+                i += 2
+                continue
         
         current_command += char
         
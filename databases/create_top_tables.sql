@@ -68,54 +68,69 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- Функция для добавления выигрышей пользователю
-CREATE OR REPLACE FUNCTION add_user_winnings(
-    p_user_id BIGINT,
-    p_amount BIGINT
+-- Функция для добавления выигрышей сразу нескольким пользователям (один вызов на игру)
+-- p_user_ids[i] выиграл p_amounts[i], повторяющиеся user_id суммируются
+-- Сброс прошедшего периода выполняется в том же upsert: если last_reset устарел,
+-- выигрыш записывается вместо старого значения и last_reset обновляется
+CREATE OR REPLACE FUNCTION add_users_winnings(
+    p_user_ids BIGINT[],
+    p_amounts BIGINT[]
 )
 RETURNS void AS $$
 BEGIN
-    -- Обновляем или создаем запись для дня
-    INSERT INTO user_day_winnings (user_id, winnings, last_reset)
-    VALUES (p_user_id, p_amount, NOW())
+    INSERT INTO user_day_winnings AS saved (user_id, winnings, last_reset)
+    SELECT user_id, SUM(amount), NOW()
+    FROM unnest(p_user_ids, p_amounts) AS game_winnings (user_id, amount)
+    GROUP BY user_id
     ON CONFLICT (user_id) DO UPDATE
-    SET winnings = user_day_winnings.winnings + p_amount
-    WHERE user_day_winnings.last_reset >= NOW() - INTERVAL '24 hours';
-    
-    -- Если прошло больше 24 часов, сбрасываем
-    UPDATE user_day_winnings
-    SET winnings = p_amount, last_reset = NOW()
-    WHERE user_id = p_user_id AND last_reset < NOW() - INTERVAL '24 hours';
-    
-    -- Обновляем или создаем запись для недели
-    INSERT INTO user_week_winnings (user_id, winnings, last_reset)
-    VALUES (p_user_id, p_amount, NOW())
+    SET winnings = CASE WHEN saved.last_reset >= NOW() - INTERVAL '24 hours'
+                        THEN saved.winnings + EXCLUDED.winnings
+                        ELSE EXCLUDED.winnings END,
+        last_reset = CASE WHEN saved.last_reset >= NOW() - INTERVAL '24 hours'
+                          THEN saved.last_reset
+                          ELSE NOW() END;
+
+    INSERT INTO user_week_winnings AS saved (user_id, winnings, last_reset)
+    SELECT user_id, SUM(amount), NOW()
+    FROM unnest(p_user_ids, p_amounts) AS game_winnings (user_id, amount)
+    GROUP BY user_id
     ON CONFLICT (user_id) DO UPDATE
-    SET winnings = user_week_winnings.winnings + p_amount
-    WHERE user_week_winnings.last_reset >= NOW() - INTERVAL '7 days';
-    
-    -- Если прошло больше 7 дней, сбрасываем
-    UPDATE user_week_winnings
-    SET winnings = p_amount, last_reset = NOW()
-    WHERE user_id = p_user_id AND last_reset < NOW() - INTERVAL '7 days';
-    
-    -- Обновляем или создаем запись для месяца
-    INSERT INTO user_month_winnings (user_id, winnings, last_reset)
-    VALUES (p_user_id, p_amount, NOW())
+    SET winnings = CASE WHEN saved.last_reset >= NOW() - INTERVAL '7 days'
+                        THEN saved.winnings + EXCLUDED.winnings
+                        ELSE EXCLUDED.winnings END,
+        last_reset = CASE WHEN saved.last_reset >= NOW() - INTERVAL '7 days'
+                          THEN saved.last_reset
+                          ELSE NOW() END;
+
+    INSERT INTO user_month_winnings AS saved (user_id, winnings, last_reset)
+    SELECT user_id, SUM(amount), NOW()
+    FROM unnest(p_user_ids, p_amounts) AS game_winnings (user_id, amount)
+    GROUP BY user_id
     ON CONFLICT (user_id) DO UPDATE
-    SET winnings = user_month_winnings.winnings + p_amount
-    WHERE user_month_winnings.last_reset >= NOW() - INTERVAL '30 days';
-    
-    -- Если прошло больше 30 дней, сбрасываем
-    UPDATE user_month_winnings
-    SET winnings = p_amount, last_reset = NOW()
-    WHERE user_id = p_user_id AND last_reset < NOW() - INTERVAL '30 days';
-    
-    -- Обновляем или создаем запись для всех времен
-    INSERT INTO user_all_time_winnings (user_id, winnings)
-    VALUES (p_user_id, p_amount)
+    SET winnings = CASE WHEN saved.last_reset >= NOW() - INTERVAL '30 days'
+                        THEN saved.winnings + EXCLUDED.winnings
+                        ELSE EXCLUDED.winnings END,
+        last_reset = CASE WHEN saved.last_reset >= NOW() - INTERVAL '30 days'
+                          THEN saved.last_reset
+                          ELSE NOW() END;
+
+    INSERT INTO user_all_time_winnings AS saved (user_id, winnings)
+    SELECT user_id, SUM(amount)
+    FROM unnest(p_user_ids, p_amounts) AS game_winnings (user_id, amount)
+    GROUP BY user_id
     ON CONFLICT (user_id) DO UPDATE
-    SET winnings = user_all_time_winnings.winnings + p_amount;
+    SET winnings = saved.winnings + EXCLUDED.winnings;
 END;
 $$ LANGUAGE plpgsql;
 
+-- Функция для добавления выигрышей пользователю
+-- Оставлена для совместимости, выполняет те же запросы что и add_users_winnings
+CREATE OR REPLACE FUNCTION add_user_winnings(
+    p_user_id BIGINT,
+    p_amount BIGINT
+)
+RETURNS void AS $$
+BEGIN
+    PERFORM add_users_winnings(ARRAY[p_user_id], ARRAY[p_amount]);
+END;
+$$ LANGUAGE plpgsql;
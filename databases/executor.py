@@ -0,0 +1,71 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar, ParamSpec, Awaitable
+
+from settings import DatabasePsqlSettings
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+"""
+    Асинхронный доступ к базе данных
+
+    psycopg2 блокирующий, поэтому запросы из async обработчиков выполняются
+    в отдельном пуле потоков, а event loop в это время обрабатывает другие чаты.
+    Одно соединение (курсор) нельзя использовать из двух корутин одновременно,
+    каждый update получает свое соединение из пула в handler_messages
+
+    Пример:
+        user_data = await run_sync(get_user_data, user_id, psql_cursor)
+        clans = await run_sync(ClanService.get_clans, offset, limit, psql_cursor)
+"""
+
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_psql_executor() -> ThreadPoolExecutor:
+    """Возвращает пул потоков для запросов к postgresql"""
+
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DatabasePsqlSettings.EXECUTOR_WORKERS,
+            thread_name_prefix="psql"
+        )
+
+    return _executor
+
+
+async def run_sync(function: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    """Выполняет синхронную функцию работы с базой данных не блокируя event loop"""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_psql_executor(),
+        functools.partial(function, *args, **kwargs)
+    )
+
+
+def to_async(function: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """Делает из синхронной функции работы с базой данных асинхронную"""
+
+    @functools.wraps(function)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        return await run_sync(function, *args, **kwargs)
+
+    return wrapper
+
+
+def shutdown_psql_executor() -> None:
+    """Останавливает пул потоков"""
+
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
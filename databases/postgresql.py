@@ -1,8 +1,15 @@
+import os
+import time
+import asyncio
+import threading
 from decimal import Decimal
-from typing import Optional, Callable
+from contextlib import contextmanager, asynccontextmanager
+from typing import Optional, Callable, Iterator, AsyncIterator
 
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 from psycopg2.extras import DictCursor
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
 from psycopg2._psycopg import connection as Connection
 
 from settings import DatabasePsqlSettings
@@ -45,20 +52,328 @@ def _fetch_all_wrapper(method) -> Callable:
     return wrapper
 
 
-def get_postgresql_connection() -> tuple[Connection, DictCursor]:
-    """Подключение к postgresql"""
+def _get_connection_params() -> dict:
+    """Возвращает параметры подключения к postgresql"""
+
+    return {
+        "user": DatabasePsqlSettings.DB_USER,
+        "password": DatabasePsqlSettings.DB_PASSWORD,
+        "host": DatabasePsqlSettings.DB_HOST,
+        "port": DatabasePsqlSettings.DB_PORT,
+        "database": DatabasePsqlSettings.DB_NAME
+    }
 
-    connection = psycopg2.connect(
-        user=DatabasePsqlSettings.DB_USER,
-        password=DatabasePsqlSettings.DB_PASSWORD,
-        host=DatabasePsqlSettings.DB_HOST,
-        port=DatabasePsqlSettings.DB_PORT,
-        database=DatabasePsqlSettings.DB_NAME
-    )
-    connection.autocommit = True
+
+def _get_dict_cursor(connection: Connection) -> DictCursor:
+    """Возвращает DictCursor с форматированием fetchone/fetchall"""
 
     cursor = connection.cursor(cursor_factory=DictCursor)
     cursor.fetchone = _fetch_one_wrapper(cursor.fetchone)
     cursor.fetchall = _fetch_all_wrapper(cursor.fetchall)
 
+    return cursor
+
+
+def get_postgresql_connection() -> tuple[Connection, DictCursor]:
+    """Подключение к postgresql"""
+    # Открывает новое соединение, для горячих участков используй postgresql_connection()
+
+    connection = psycopg2.connect(**_get_connection_params())
+    connection.autocommit = True
+
+    cursor = _get_dict_cursor(connection)
+
     return connection, cursor
+
+
+class PostgresqlPoolTimeout(Exception):
+    """Не удалось получить соединение из пула за отведенное время"""
+    pass
+
+
+class PostgresqlPool:
+    """
+        Пул соединений postgresql
+
+        Потокобезопасный, создается отдельно в каждом процессе (воркеры gunicorn
+        получают свой пул после fork). Если свободных соединений нет,
+        поток ждет освобождения не дольше POOL_TIMEOUT секунд
+    """
+
+    def __init__(
+            self,
+            min_size: int = DatabasePsqlSettings.POOL_MIN_SIZE,
+            max_size: int = DatabasePsqlSettings.POOL_MAX_SIZE,
+            timeout: float = DatabasePsqlSettings.POOL_TIMEOUT,
+            health_check_interval: float = DatabasePsqlSettings.POOL_HEALTH_CHECK_INTERVAL
+    ) -> None:
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._pool = ThreadedConnectionPool(min_size, max_size, **_get_connection_params())
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+
+        self._last_used: dict[int, float] = {}  # id соединения -> время возврата в пул
+
+        self._in_use = 0  # Выданные соединения
+        self._checkouts = 0  # Количество выдач
+        self._waits = 0  # Сколько раз пришлось ждать свободное соединение
+        self._timeouts = 0  # Сколько раз не дождались соединения
+        self._broken = 0  # Сколько соединений не прошли проверку
+        self._checkout_time_total = 0.0  # Суммарное время получения соединения
+        self._checkout_time_max = 0.0  # Максимальное время получения соединения
+
+
+    def _is_healthy(self, connection: Connection) -> bool:
+        """Проверяет что соединение живое"""
+
+        if connection.closed:
+            return False
+
+        if connection.get_transaction_status() == TRANSACTION_STATUS_UNKNOWN:
+            return False
+
+        last_used = self._last_used.get(id(connection), 0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+
+    def _take_connection(self) -> Connection:
+        """Берет соединение из пула, пересоздавая сломанные"""
+
+        while True:
+            connection = self._pool.getconn()
+
+            if self._is_healthy(connection):
+                return connection
+
+            with self._lock:
+                self._broken += 1
+                self._last_used.pop(id(connection), None)
+            self._pool.putconn(connection, close=True)
+
+
+    def acquire(self) -> tuple[Connection, DictCursor]:
+        """Выдает соединение из пула"""
+
+        started_at = time.monotonic()
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._waits += 1
+
+            if not self._slots.acquire(timeout=self.timeout):
+                with self._lock:
+                    self._timeouts += 1
+                raise PostgresqlPoolTimeout(f"no free connection in {self.timeout}s (max_size={self.max_size})")
+
+        try:
+            connection = self._take_connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+        connection.autocommit = True
+        checkout_time = time.monotonic() - started_at
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._checkout_time_total += checkout_time
+            self._checkout_time_max = max(self._checkout_time_max, checkout_time)
+
+        return connection, _get_dict_cursor(connection)
+
+
+    def release(self, connection: Connection, cursor: DictCursor | None = None) -> None:
+        """Возвращает соединение в пул"""
+
+        try:
+            if cursor is not None and not cursor.closed:
+                cursor.close()
+
+            close = bool(connection.closed)
+
+            if not close:
+                try:
+                    if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                        connection.rollback()
+                    connection.autocommit = True
+                except psycopg2.Error:
+                    close = True
+
+            with self._lock:
+                if close:
+                    self._last_used.pop(id(connection), None)
+                else:
+                    self._last_used[id(connection)] = time.monotonic()
+
+            self._pool.putconn(connection, close=close)
+
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+
+    @contextmanager
+    def connection(self) -> Iterator[tuple[Connection, DictCursor]]:
+        """Выдает соединение на время блока with"""
+
+        connection, cursor = self.acquire()
+
+        try:
+            yield connection, cursor
+        finally:
+            self.release(connection, cursor)
+
+
+    async def acquire_async(self) -> tuple[Connection, DictCursor]:
+        """Выдает соединение не блокируя event loop в ожидании свободного"""
+
+        future = asyncio.ensure_future(asyncio.to_thread(self.acquire))
+
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(self._release_cancelled)
+            raise
+
+
+    def _release_cancelled(self, future: asyncio.Future) -> None:
+        """Возвращает в пул соединение, выданное уже отмененному ожиданию"""
+
+        if not future.cancelled() and future.exception() is None:
+            self.release(*future.result())
+
+
+    @asynccontextmanager
+    async def async_connection(self) -> AsyncIterator[tuple[Connection, DictCursor]]:
+        """Выдает соединение на время блока async with"""
+
+        connection, cursor = await self.acquire_async()
+
+        try:
+            yield connection, cursor
+        finally:
+            self.release(connection, cursor)
+
+
+    def get_stats(self) -> dict:
+        """Возвращает статистику пула"""
+
+        with self._lock:
+            checkouts = self._checkouts
+
+            return {
+                "pid": os.getpid(),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._pool._pool),
+                "checkouts": checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "broken": self._broken,
+                "checkout_avg_ms": round(self._checkout_time_total / checkouts * 1000, 3) if checkouts else 0,
+                "checkout_max_ms": round(self._checkout_time_max * 1000, 3)
+            }
+
+
+    def close(self) -> None:
+        """Закрывает все соединения пула"""
+
+        self._pool.closeall()
+
+
+_pool: PostgresqlPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_postgresql_pool() -> PostgresqlPool:
+    """Возвращает пул соединений текущего процесса"""
+
+    global _pool, _pool_pid
+
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            # После fork соединения родителя нельзя использовать
+            _pool = PostgresqlPool()
+            _pool_pid = os.getpid()
+
+    return _pool
+
+
+def postgresql_connection() -> Iterator[tuple[Connection, DictCursor]]:
+    """Контекстный менеджер соединения из пула: with postgresql_connection() as (connection, cursor)"""
+
+    return get_postgresql_pool().connection()
+
+
+def async_postgresql_connection() -> AsyncIterator[tuple[Connection, DictCursor]]:
+    """Асинхронный контекстный менеджер соединения из пула"""
+
+    return get_postgresql_pool().async_connection()
+
+
+@contextmanager
+def transaction(connection: Connection, cursor: DictCursor, savepoint: str = "nested_transaction") -> Iterator[None]:
+    """Выполняет блок одной транзакцией, внутри уже открытой транзакции - через SAVEPOINT"""
+    # Если autocommit выключен, транзакцией управляет вызывающий код: менять autocommit
+    # внутри нее нельзя, поэтому при ошибке откатывается только блок, а коммит остается вызывающему
+
+    if not connection.autocommit:
+        cursor.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield
+        except BaseException:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+            raise
+        cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+        return
+
+    connection.autocommit = False
+
+    try:
+        yield
+        connection.commit()
+    except BaseException:
+        connection.rollback()
+        raise
+    finally:
+        connection.autocommit = True
+
+
+def get_postgresql_pool_stats() -> dict:
+    """Возвращает статистику пула соединений текущего процесса"""
+
+    return get_postgresql_pool().get_stats()
+
+
+def close_postgresql_pool() -> None:
+    """Закрывает пул соединений текущего процесса"""
+
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            print(f"[PSQL POOL] closing, stats: {_pool.get_stats()}", flush=True)
+            _pool.close()
+        _pool = None
+        _pool_pid = None
@@ -1,3 +1,5 @@
+import os
+
 from redis.client import Redis
 from settings import DatabaseRedisSettings, DatabaseRedisRatesSettings
 
@@ -22,3 +24,19 @@ def get_redis_rates_cursor() -> Redis:
         db=DatabaseRedisRatesSettings.DB_NUMBER,
         decode_responses=True,  # Переводит данные из байт-кода
     )
+
+
+_shared_redis_cursor: Redis | None = None
+_shared_redis_pid: int | None = None
+
+
+def get_shared_redis_cursor() -> Redis:
+    """Общее подключение к redis текущего процесса (пул соединений redis-py)"""
+
+    global _shared_redis_cursor, _shared_redis_pid
+
+    if _shared_redis_cursor is None or _shared_redis_pid != os.getpid():
+        _shared_redis_cursor = get_redis_cursor()
+        _shared_redis_pid = os.getpid()
+
+    return _shared_redis_cursor
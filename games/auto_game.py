@@ -1,8 +1,10 @@
 from typing import Optional
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
 
 from schemas.games import Games
+from schemas.users import UserSchema, UserStatus
 from schemas.auto_game import AutoGameSchema
+from games.round_state import RoundState
 
 
 class AutoGameService:
@@ -29,6 +31,44 @@ class AutoGameService:
         return auto_games
 
 
+    @staticmethod
+    def get_auto_games_with_users(
+            chat_id: int,
+            game_mode: Games,
+            psql_cursor: DictCursor
+    ) -> list[tuple[AutoGameSchema, UserSchema]]:
+        """Возвращает авто игры в чате вместе с данными их пользователей одним запросом"""
+        # Имя пользователя собирается как в get_user_data (префикс статуса и тег клана)
+
+        psql_cursor.execute("""
+            SELECT auto_games.*,
+                   users.full_name as user_full_name,
+                   users.status as user_status,
+                   users.coins as user_coins,
+                   clans.tag as clan_tag
+            FROM auto_games
+                JOIN users ON auto_games.user_id = users.user_id
+                LEFT JOIN clans ON users.show_clan_tag AND clans.clan_id = users.clan_id
+            WHERE auto_games.chat_id = %(chat_id)s AND
+                  auto_games.game_mode = %(game_mode)s
+        """, {
+            "chat_id": chat_id,
+            "game_mode": game_mode.value
+        })
+        psql_response = psql_cursor.fetchall()
+
+        auto_games = []
+        for row in psql_response:
+            status = UserStatus(row["user_status"]) if row["user_status"] else UserStatus.USER
+            user_data = UserSchema(
+                user_id=row["user_id"], status=status, coins=row["user_coins"],
+                full_name=RoundState.get_user_name(row["user_full_name"], status, row["clan_tag"])
+            )
+            auto_games.append((AutoGameSchema(**row), user_data))
+
+        return auto_games
+
+
     @staticmethod
     def insert_auto_game(
             user_id: int,
@@ -104,6 +144,38 @@ class AutoGameService:
             """, auto_game.dict())
 
 
+    @staticmethod
+    def decrement_many_auto_games(
+            auto_games: list[AutoGameSchema],
+            psql_cursor: DictCursor
+    ) -> None:
+        """Уменьшает количество игр у авто игр, закончившиеся удаляет (decrement_auto_games для списка)"""
+
+        if not auto_games:
+            return None
+
+        execute_values(psql_cursor, """
+            UPDATE auto_games
+            SET number_games = auto_games.number_games - 1
+            FROM (VALUES %s) AS auto_game(user_id, chat_id, rate_type, game_mode)
+            WHERE auto_games.user_id = auto_game.user_id AND
+                  auto_games.chat_id = auto_game.chat_id AND
+                  auto_games.rate_type = auto_game.rate_type AND
+                  auto_games.game_mode = auto_game.game_mode
+        """, [
+            (auto_game.user_id, auto_game.chat_id, auto_game.rate_type, auto_game.game_mode.value)
+            for auto_game in auto_games
+        ])
+
+        execute_values(psql_cursor, """
+            DELETE FROM auto_games
+            USING (VALUES %s) AS auto_game(chat_id, game_mode)
+            WHERE auto_games.chat_id = auto_game.chat_id AND
+                  auto_games.game_mode = auto_game.game_mode AND
+                  auto_games.number_games <= 0
+        """, list({(auto_game.chat_id, auto_game.game_mode.value) for auto_game in auto_games}))
+
+
     @staticmethod
     def get_count_auto_games(
             user_id: int,
@@ -1,8 +1,8 @@
 import os
 import re
 import json
-import random
 import hashlib
+from functools import cache
 from pathlib import Path
 from pydantic import BaseModel
 from psycopg2.extras import DictCursor
@@ -12,6 +12,7 @@ from telegram import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMa
 from settings import Config
 
 from games.base import BaseGameModel
+from games.sampler import WeightedSampler
 from painter import Painter
 
 from schemas.users import UserSchema
@@ -23,12 +24,19 @@ from schemas.user_in_chat import UserChatSchema
 # upload_photo будет реализован в modules.telegram.bot при необходимости
 
 
-AVIATOR_NUMBERS = [x for x in range(1_00, 1_000_01)]
-AVIATOR_NUMBERS_CHANCES = [1 / (x ** 2.20) for x in AVIATOR_NUMBERS]
-AVIATOR_STRING_COEFFICIENTS = [str(round(x / 100, 2)) for x in AVIATOR_NUMBERS][5:]
+AVIATOR_NUMBERS = range(1_00, 1_000_01)  # Коэффициент * 100
+AVIATOR_SAMPLER = WeightedSampler(lambda: (AVIATOR_NUMBERS, [1 / (x ** 2.20) for x in AVIATOR_NUMBERS]))
+# Таблица весов (~100к чисел) строится при первом раунде
 
-MIN_AVIATOR_RATE_TYPE = float(AVIATOR_STRING_COEFFICIENTS[0])
-MAX_AVIATOR_RATE_TYPE = float(AVIATOR_STRING_COEFFICIENTS[-1])
+MIN_AVIATOR_RATE_TYPE = round(AVIATOR_NUMBERS[5] / 100, 2)
+MAX_AVIATOR_RATE_TYPE = round(AVIATOR_NUMBERS[-1] / 100, 2)
+
+
+@cache
+def get_aviator_string_coefficients() -> list[str]:
+    """Возвращает все коэффициенты на которые можно ставить"""
+
+    return [str(round(x / 100, 2)) for x in AVIATOR_NUMBERS][5:]
 
 
 class AviatorResult(BaseModel):
@@ -42,7 +50,7 @@ class AviatorGameModel(BaseGameModel):
     def _generate_coefficient() -> int | float:
         """Генерирует коэффициент для игры"""
 
-        coefficient = random.choices(AVIATOR_NUMBERS, AVIATOR_NUMBERS_CHANCES)[0]
+        coefficient = AVIATOR_SAMPLER.sample()
 
         if coefficient == 1.0:
             return 0
@@ -272,7 +280,7 @@ class AviatorGameModel(BaseGameModel):
     @classmethod
     def get_all_rates_type(cls) -> list:
 
-        return AVIATOR_STRING_COEFFICIENTS
+        return get_aviator_string_coefficients()
 
 
     @classmethod
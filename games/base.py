@@ -1,35 +1,43 @@
 import json
+import time
 import random
 import asyncio
 import threading
 from collections import defaultdict
 
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar, Optional, Sized
+from typing import Type, TypeVar, Optional, Sized, NamedTuple, Iterable
 from string import ascii_letters
 from datetime import datetime
 from redis.client import Redis
+from redis.exceptions import RedisError
 import json
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
-from psycopg2.extras import DictCursor
+import psycopg2
+from psycopg2.extras import DictCursor, execute_values
 from psycopg2._psycopg import connection as Connection
 
 from settings import TopSettings, Temp
 from games.rates import RatesService
+from games.scheduler import get_round_scheduler
+from games.deadlines import GameDeadlines
+from games.round_state import RoundState
 
 from schemas.users import UserSchema, UserStatus
 from schemas.chats import ChatSchema
 from schemas.games import GameSchema, Games
 from schemas.rates import RatesSchema, GameRateSchema, CalculateRateSchema
 from schemas.user_in_chat import UserChatSchema
+from tops.base import BaseUserTopService
+from services.periods import PeriodsService
 
 from modules.additional import format_number, get_word_case
 from modules.databases.users import get_user_data
 from modules.databases.chats import get_chat_data, get_game_data
-from modules.telegram.bot import send_message
+from modules.telegram.bot import send_message, MessagePriority
 
 from databases.redis import get_redis_cursor
-from databases.postgresql import get_postgresql_connection
+from databases.postgresql import get_postgresql_pool
 
 from vk_bot.template_messages import DATA_OUTDATED_LOWER
 from vk_bot.keyboards.other import empty_keyboard
@@ -39,6 +47,12 @@ from vk_bot.keyboards.active_chat import keyboard_game_bank
 GAME_RESULT = TypeVar("GAME_RESULT")
 
 
+class RateTypesIndex(NamedTuple):
+    """Индекс событий игры, строится один раз на игровую модель"""
+
+    rate_types: frozenset[str]  # Все события на которые можно ставить
+
+
 # VK статьи удалены - больше не используются
 
 
@@ -54,10 +68,31 @@ class BaseGameModel(ABC):
     
     # Блокировки для предотвращения одновременного завершения одной игры
     _game_locks: dict[int, asyncio.Lock] = defaultdict(lambda: asyncio.Lock())
+    # Temp.GAMES меняют потоки пула запросов и планировщика раундов
+    _temp_games_lock = threading.Lock()
     _game_locks_lock = threading.Lock()  # Защита словаря блокировок
     _processing_games: set[int] = set()  # Игры которые уже обрабатываются
     _processing_games_lock = threading.Lock()  # Защита множества обрабатываемых игр
 
+    _rate_types_indexes: dict[type, RateTypesIndex] = {}  # Игровая модель -> индекс событий
+
+    SETTLEMENT_PERIOD_COUNTERS: str = PeriodsService.increment({
+        "clan_points": "result.clan_points",
+        "all_top_points": "result.top_points",
+        "day_top_points": "result.period_top_points",
+        "week_top_points": "result.period_top_points",
+        "month_top_points": "result.period_top_points",
+        "coins_top_points": "result.coins_top_points",
+        "rubles_top_points": "result.top_points",
+        "week_rubles_top_points": "result.top_points",
+        "day_win": "result.winning_sum",
+        "day_lost": "result.losing",
+        "day_rates": "result.rates",
+        "week_win": "result.winning_sum",
+        "week_lost": "result.losing",
+        "week_rates": "result.rates"
+    })  # SET часть пакетного обновления пользователей для счетчиков с периодами (write_game_result)
+
 
     @classmethod
     @abstractmethod
@@ -107,6 +142,27 @@ class BaseGameModel(ABC):
         ...
 
 
+    @classmethod
+    def get_rate_types_index(cls) -> RateTypesIndex:
+        """Возвращает индекс событий игры"""
+        # get_all_rates_type у авиатора ~100к строк, проверка в списке занимает O(n)
+
+        index = cls._rate_types_indexes.get(cls)
+
+        if index is None:
+            index = RateTypesIndex(rate_types=frozenset(cls.get_all_rates_type()))
+            cls._rate_types_indexes[cls] = index
+
+        return index
+
+
+    @classmethod
+    def is_rate_type(cls, rate_type: str) -> bool:
+        """Проверяет что на событие можно поставить"""
+
+        return rate_type in cls.get_rate_types_index().rate_types
+
+
     @classmethod
     def logic_opposite_rates(
             cls,
@@ -118,6 +174,8 @@ class BaseGameModel(ABC):
         # кортеж(допустимое количество, типы событий)
         # если найденное количество >= допустимое количество возвращается True
 
+        user_rates_type = set(user_rates_type)
+
         for rate in opposite_rates:
             counter, events = rate
 
@@ -163,7 +221,7 @@ class BaseGameModel(ABC):
     def _check_coverage_bets(cls, rates: Sized) -> bool:
         """Проверяет насколько событий поставлено"""
 
-        return len(rates) / len(cls.get_all_rates_type()) <= 0.8
+        return len(rates) / len(cls.get_rate_types_index().rate_types) <= 0.8
         # Если закрыли равно или больше (0.8) 80% -> False
 
 
@@ -317,8 +375,7 @@ class BaseGameModel(ABC):
         user_name = user_data.telegram_name
         user_coins = user_data.coins
 
-        valid_rate_types = cls.get_all_rates_type()
-        if not all([x in valid_rate_types for x in rate_type.split(" ")]):
+        if not all(cls.is_rate_type(x) for x in rate_type.split(" ")):
             return f"{user_name}, {DATA_OUTDATED_LOWER}", None
 
         if user_coins != 0:
@@ -373,9 +430,10 @@ class BaseGameModel(ABC):
         # Получаем соединение для коммита
         psql_connection = psql_cursor.connection
 
-        if game_id in Temp.GAMES:
-            return
-        Temp.GAMES.append(game_id)
+        with cls._temp_games_lock:
+            if game_id in Temp.GAMES:
+                return
+            Temp.GAMES.append(game_id)
 
         game_data = get_game_data(game_id, psql_cursor)
         chat_data = get_chat_data(game_data.chat_id, psql_cursor)
@@ -392,14 +450,18 @@ class BaseGameModel(ABC):
                 UPDATE games
                 SET end_datetime = NOW() + INTERVAL '%(seconds)s second'
                 WHERE game_id = %(game_id)s
+                RETURNING end_datetime
             """, {
                 "seconds": time_left,
                 "game_id": game_id
             })
+            end_datetime = psql_cursor.fetchone()["end_datetime"]
             # Коммитим установку end_datetime сразу
             psql_connection.commit()
             print(f"[GAME] Game {game_id}: end_datetime установлен на {time_left} секунд вперед", flush=True)
         else:
+            end_datetime = game_data.end_datetime
+
             # Если end_datetime уже установлен, используем его для расчета time_left
             if game_data.time_left is None:
                 # Вычисляем time_left из end_datetime
@@ -416,19 +478,33 @@ class BaseGameModel(ABC):
             else:
                 time_left = max(game_data.time_left, 0)
 
-        print(f"[GAME] Starting submit_results thread for game {game_id}, time_left={time_left:.1f}s", flush=True)
-        
-        def run_submit():
+        RoundState.set_end(game_id, time.time() + time_left, end_datetime)
+        get_round_scheduler().schedule(game_id, cls, time_left)
+        print(f"[GAME] Game {game_id} scheduled, time_left={time_left:.1f}s", flush=True)
+
+        try:
+            GameDeadlines.add(game_id, time.time() + time_left, redis_cursor)
+        except RedisError as error:
+            # Раунд подсчитает планировщик, сроки пересоберет воркер зависших игр или следующий рестарт
+            print(f"[GAME WARNING] Game {game_id}: не удалось записать срок окончания: {error}", flush=True)
+
             try:
-                asyncio.run(cls.submit_results(game_id, time_left))
-            except Exception as e:
-                print(f"[GAME ERROR] submit_results failed for game {game_id}: {e}", flush=True)
-                import traceback
-                traceback.print_exc()
-        
-        thread = threading.Thread(target=run_submit, daemon=True)
-        thread.start()
-        print(f"[GAME] Thread started for game {game_id}", flush=True)
+                GameDeadlines.invalidate(redis_cursor)
+            except RedisError as error:
+                print(f"[GAME WARNING] Game {game_id}: не удалось сбросить готовность сроков: {error}", flush=True)
+
+
+    @staticmethod
+    def _remove_deadline(game_id: int, redis_cursor: Redis) -> None:
+        """Удаляет срок окончания и состояние подсчитанного раунда (см. games/deadlines.py, games/round_state.py)"""
+
+        RoundState.finish(game_id)
+
+        try:
+            GameDeadlines.remove(game_id, redis_cursor)
+        except RedisError as error:
+            # Воркер зависших игр увидит что игра подсчитана и удалит срок сам
+            print(f"[GAME WARNING] Game {game_id}: не удалось удалить срок окончания: {error}", flush=True)
 
 
     @classmethod
@@ -465,6 +541,25 @@ class BaseGameModel(ABC):
         return rates
 
 
+    @classmethod
+    def get_payout_table(
+            cls,
+            game_result: GAME_RESULT,
+            rates_type: Iterable[str]
+    ) -> dict[str, int | float | None]:
+        """Возвращает выигрышный коэффициент каждого события раунда (None - ставка проиграла)"""
+        # Исход одинаков для всех ставок на событие, поэтому is_winning и get_coefficient
+        # вызываются один раз на событие, а не на каждую ставку
+
+        return {
+            rate_type: cls.get_coefficient(
+                rate_type, game_result,
+                calculate_winnings=True
+            ) if cls.is_winning(game_result, rate_type) else None
+            for rate_type in rates_type
+        }
+
+
     @classmethod
     def calculate_winnings(
             cls,
@@ -473,21 +568,17 @@ class BaseGameModel(ABC):
     ) -> list[Optional[CalculateRateSchema]]:
         """Вычисляет победителей"""
 
+        payouts = cls.get_payout_table(game_result, {rate.rate_type for rate in rates})
         new_rates = []
 
         for rate in rates:
-            is_winning = cls.is_winning(game_result, rate.rate_type)
-            winning_amount = round(
-                rate.amount * cls.get_coefficient(
-                    rate.rate_type, game_result,
-                    calculate_winnings=True
-                )
-            ) if is_winning else 0
-
-            new_rates.append(CalculateRateSchema(
+            coefficient = payouts[rate.rate_type]
+
+            # Ставки уже проверены при загрузке из базы, схема собирается без повторной валидации
+            new_rates.append(CalculateRateSchema.construct(
                 **rate.dict(),
-                is_winning=is_winning,
-                winning_amount=winning_amount
+                is_winning=coefficient is not None,
+                winning_amount=round(rate.amount * coefficient) if coefficient is not None else 0
             ))
 
         return sorted(new_rates, key=lambda rate: rate.is_winning, reverse=True)
@@ -526,6 +617,42 @@ class BaseGameModel(ABC):
         return grouped_rates
 
 
+    @classmethod
+    def _get_settlement_rows(
+            cls,
+            rates: list[Optional[CalculateRateSchema]]
+    ) -> tuple[list[tuple], int]:
+        """Возвращает строки для пакетного обновления пользователей и прибыль бота"""
+
+        bot_income = 0
+        settlement_rows = []
+
+        accrual_top_points = cls.check_accrual_top_points(rates)
+        accrual_coins_top = bool(
+            TopSettings.DATETIME_COINS_TOP and
+            datetime.now().date() < TopSettings.DATETIME_COINS_TOP
+        )
+
+        for user_id, rate in cls._grouped_rates_by_user_id(rates).items():
+            winning_sum = max(rate["winning_sum"], 0)
+
+            # В топ добавляется сумма выигрышей (winning_sum), а не разница выигрышей и проигрышей
+            # all/rubles топы учитывают accrual_top_points, day/week/month и кланы - нет
+            top_points = winning_sum * accrual_top_points
+            clan_points = winning_sum if rate["clan_id"] is not None else 0
+            coins_top_points = winning_sum if accrual_coins_top else 0
+
+            settlement_rows.append((
+                user_id, rate["winning_sum"], rate["clean_losing"], rate["rates_sum"],
+                top_points, winning_sum, clan_points, coins_top_points
+            ))
+
+            if rate["user_status"] != UserStatus.ADMIN:
+                bot_income += rate["clean_losing"] - rate["clean_winning"]
+
+        return settlement_rows, bot_income
+
+
     @classmethod
     def write_game_result(
             cls,
@@ -535,278 +662,99 @@ class BaseGameModel(ABC):
             psql_connection: Connection
     ) -> bool:
         """Записывает в базу данных результаты игры и возвращает что все записалось"""
+        # Одна транзакция: игра помечается рассчитанной, выигрыши и статистика
+        # всех игроков обновляются одним запросом, либо не меняется ничего
 
-        bot_income = 0
-        accrual_top_points = cls.check_accrual_top_points(rates)
-
-        # ВАЖНО: Используем ОТДЕЛЬНОЕ соединение для записи результатов
-        # чтобы избежать проблем с откатом транзакции при закрытии основного соединения
-        from databases.postgresql import get_postgresql_connection
-        
-        # Создаем отдельное соединение для записи результатов
-        result_connection, result_cursor = get_postgresql_connection()
-        
-        # Сначала начисляем выигрыши в отдельной транзакции
-        for user_id, rate in cls._grouped_rates_by_user_id(rates).items():
-            winning_sum = rate["winning_sum"]
-            
-            if winning_sum > 0:
-                # Начисляем выигрыш в отдельной транзакции с немедленным коммитом
-                print(f"[GAME] User {user_id}: начисляем выигрыш {winning_sum} в отдельной транзакции", flush=True)
-                try:
-                    win_connection, win_cursor = get_postgresql_connection()
-                    win_connection.autocommit = False
-                    
-                    try:
-                        win_cursor.execute("""
-                            UPDATE users
-                            SET coins = coins + %(winning_sum)s
-                            WHERE user_id = %(user_id)s
-                        """, {
-                            "winning_sum": winning_sum,
-                            "user_id": user_id
-                        })
-                        
-                        if win_cursor.rowcount == 0:
-                            print(f"[GAME ERROR] Failed to add coins for user {user_id} (rowcount=0)", flush=True)
-                            raise ValueError(f"Failed to add coins for user {user_id}")
-                        
-                        win_connection.commit()
-                        print(f"[GAME] User {user_id}: выигрыш {winning_sum} начислен и закоммичен", flush=True)
-                        
-                        # Проверяем баланс после коммита
-                        win_cursor.execute("""
-                            SELECT coins FROM users WHERE user_id = %(user_id)s
-                        """, {"user_id": user_id})
-                        check_result = win_cursor.fetchone()
-                        if check_result:
-                            print(f"[GAME] User {user_id}: баланс после начисления выигрыша = {check_result['coins']}", flush=True)
-                        
-                    except Exception as e:
-                        win_connection.rollback()
-                        print(f"[GAME ERROR] Failed to add coins for user {user_id}: {e}", flush=True)
-                        raise
-                    finally:
-                        win_cursor.close()
-                        win_connection.close()
-                        
-                except Exception as e:
-                    print(f"[GAME ERROR] Error in separate transaction for user {user_id}: {e}", flush=True)
-                    import traceback
-                    traceback.print_exc()
-                    # Продолжаем обработку других пользователей
-
-        # Теперь обновляем статистику в ОТДЕЛЬНОМ соединении
-        # Убеждаемся что autocommit выключен для транзакции
-        if result_connection.autocommit:
-            print(f"[GAME WARNING] Result connection autocommit was True, setting to False", flush=True)
-        result_connection.autocommit = False
-        
-        print(f"[GAME] Starting statistics update transaction for game {game_id}", flush=True)
+        settlement_rows, bot_income = cls._get_settlement_rows(rates)
 
+        # Расчет идет на соединении submit_results (autocommit выключен), второе соединение из пула не берется
         try:
-            for user_id, rate in cls._grouped_rates_by_user_id(rates).items():
-
-                rates_sum = rate["rates_sum"]
-                winning_sum = rate["winning_sum"]
-                clean_winning = rate["clean_winning"]
-                clean_losing = rate["clean_losing"]
-
-                # В топ добавляется сумма выигрышей (winning_sum), а не разница выигрышей и проигрышей
-                # Если игрок проиграл 5млн и выиграл 1млн, к топу прибавляем 1млн
-                # top_points используется для all_top_points (с учетом accrual_top_points)
-                top_points = max(winning_sum, 0) * accrual_top_points
-                # Для day/week/month_top_points используем winning_sum напрямую (без умножения на accrual_top_points)
-                day_top_points_value = max(winning_sum, 0)
-                week_top_points_value = max(winning_sum, 0)
-                month_top_points_value = max(winning_sum, 0)
-                # clan_points также используем winning_sum напрямую
-                clan_points = day_top_points_value if rate["clan_id"] is not None else 0
-                coins_top_points = day_top_points_value if (
-                    TopSettings.DATETIME_COINS_TOP and
-                    datetime.now().date() < TopSettings.DATETIME_COINS_TOP
-                ) else 0
-
-                accrue_bot_income: bool = rate["user_status"] != UserStatus.ADMIN
-                # Условие, которое показывает начислять ли прибыль за игру у игрока
-                
-                # Логируем информацию
-                print(f"[GAME] User {user_id}: rates_sum={rates_sum}, winning_sum={winning_sum}, clean_winning={clean_winning}, clean_losing={clean_losing}", flush=True)
-                
-                # Обновляем статистику и топ-поинты (НЕ трогаем coins!)
-                print(f"[GAME] User {user_id}: обновляем статистику (winning={clean_winning}, losing={clean_losing}, top_points={top_points})", flush=True)
-                result_cursor.execute("""
-                    UPDATE users
-                    SET clan_points = clan_points + %(clan_points)s,
-                        all_top_points = all_top_points + %(top_points)s,
-                        day_top_points = day_top_points + %(day_top_points_value)s,
-                        week_top_points = week_top_points + %(week_top_points_value)s,
-                        month_top_points = month_top_points + %(month_top_points_value)s,
-                        coins_top_points = coins_top_points + %(coins_top_points)s,
-                        rubles_top_points = rubles_top_points + %(top_points)s,
-                        week_rubles_top_points = week_rubles_top_points + %(top_points)s,
-                        day_win = day_win + %(winning_sum)s,
-                        day_lost = day_lost + %(losing)s,
-                        day_rates = day_rates + %(rates)s,
-                        week_win = week_win + %(winning_sum)s,
-                        week_lost = week_lost + %(losing)s,
-                        week_rates = week_rates + %(rates)s,
-                        all_win = all_win + %(winning_sum)s,
-                        all_lost = all_lost + %(losing)s,
-                        all_rates = all_rates + %(rates)s
-                    WHERE user_id = %(user_id)s
-                """, {
-                    "clan_points": clan_points,
-                    "top_points": top_points,
-                    "day_top_points_value": day_top_points_value,
-                    "week_top_points_value": week_top_points_value,
-                    "month_top_points_value": month_top_points_value,
-                    "coins_top_points": coins_top_points,
-                    "winning_sum": winning_sum,
-                    "losing": clean_losing,
-                    "rates": rates_sum,
-                    "user_id": user_id
-                })
-                
-                if result_cursor.rowcount == 0:
-                    print(f"[GAME ERROR] User {user_id}: UPDATE не выполнен (rowcount=0)!", flush=True)
-                else:
-                    print(f"[GAME] User {user_id}: статистика обновлена (rowcount={result_cursor.rowcount})", flush=True)
-                    
-                    # Обновляем таблицы топов (day/week/month/all_time)
-                    if winning_sum > 0:
-                        try:
-                            result_cursor.execute("""
-                                SELECT add_user_winnings(%(user_id)s, %(winning_sum)s)
-                            """, {
-                                "user_id": user_id,
-                                "winning_sum": winning_sum
-                            })
-                            print(f"[GAME] User {user_id}: обновлены таблицы топов (winning_sum={winning_sum})", flush=True)
-                        except Exception as e:
-                            # Если таблицы еще не созданы, просто логируем
-                            print(f"[GAME WARNING] User {user_id}: не удалось обновить таблицы топов: {e}", flush=True)
-                    
-                    # Проверяем значения после UPDATE (до коммита)
-                    result_cursor.execute("""
-                        SELECT all_win, day_win, week_win, all_top_points, day_top_points, week_top_points, month_top_points
-                        FROM users WHERE user_id = %(user_id)s
-                    """, {"user_id": user_id})
-                    check_result = result_cursor.fetchone()
-                    if check_result:
-                        print(f"[GAME] User {user_id}: значения после UPDATE (до коммита): all_win={check_result['all_win']}, day_win={check_result['day_win']}, week_win={check_result['week_win']}, all_top_points={check_result['all_top_points']}", flush=True)
-
-                if accrue_bot_income:
-                    bot_income -= clean_winning if accrue_bot_income else 0
-                    bot_income += clean_losing if accrue_bot_income else 0
-
-            # ВАЖНО: Обновляем income ДО коммита, чтобы пометить игру как обработанную
-            result_cursor.execute("""
+            # Условие is_active = TRUE не дает рассчитать игру второй раз
+            psql_cursor.execute("""
                 UPDATE games
                 SET income = %(bot_income)s,
                     is_active = FALSE
-                WHERE game_id = %(game_id)s
+                WHERE game_id = %(game_id)s AND
+                      is_active = TRUE
             """, {
                 "bot_income": bot_income,
                 "game_id": game_id
             })
-            
-            if result_cursor.rowcount == 0:
-                print(f"[GAME ERROR] Failed to update game {game_id} income (rowcount=0)!", flush=True)
-            else:
-                print(f"[GAME] Game {game_id} income updated to {bot_income}, is_active set to FALSE", flush=True)
 
-            # Вставляем в completed_games если таблица существует
+            if psql_cursor.rowcount == 0:
+                psql_connection.rollback()
+                print(f"[GAME] Game {game_id} уже рассчитана, пропускаем", flush=True)
+                return False
+
+            if settlement_rows:
+                # Счетчики дня, недели и топов прошлого периода начинаются с 0 (см. services/periods.py)
+                execute_values(psql_cursor, f"""
+                    UPDATE users
+                    SET coins = users.coins + result.winning_sum,
+                        {cls.SETTLEMENT_PERIOD_COUNTERS},
+                        all_win = users.all_win + result.winning_sum,
+                        all_lost = users.all_lost + result.losing,
+                        all_rates = users.all_rates + result.rates
+                    FROM (VALUES %s) AS result (
+                        user_id, winning_sum, losing, rates,
+                        top_points, period_top_points, clan_points, coins_top_points
+                    )
+                    WHERE users.user_id = result.user_id
+                """, settlement_rows, page_size=len(settlement_rows))
+
+                if psql_cursor.rowcount != len(settlement_rows):
+                    print(f"[GAME ERROR] Game {game_id}: обновлено {psql_cursor.rowcount} из {len(settlement_rows)} игроков", flush=True)
+
+                winnings_rows = [(row[0], row[1]) for row in settlement_rows if row[1] > 0]
+
+                if winnings_rows:
+                    # Таблицы топов могут быть еще не созданы, это не должно откатывать расчет
+                    psql_cursor.execute("SAVEPOINT top_winnings")
+                    try:
+                        # Один вызов на игру: 4 upsert-а на всех победителей (databases/create_top_tables.sql)
+                        psql_cursor.execute("""
+                            SELECT add_users_winnings(%(user_ids)s::BIGINT[], %(amounts)s::BIGINT[])
+                        """, {
+                            "user_ids": [user_id for user_id, _ in winnings_rows],
+                            "amounts": [amount for _, amount in winnings_rows]
+                        })
+                        psql_cursor.execute("RELEASE SAVEPOINT top_winnings")
+                    except psycopg2.Error as error:
+                        psql_cursor.execute("ROLLBACK TO SAVEPOINT top_winnings")
+                        print(f"[GAME WARNING] Game {game_id}: не удалось обновить таблицы топов: {error}", flush=True)
+
+            psql_cursor.execute("SAVEPOINT completed_games")
             try:
-                result_cursor.execute("""
+                psql_cursor.execute("""
                     INSERT INTO completed_games (game_id)
                     VALUES (%(game_id)s)
                 """, {"game_id": game_id})
-            except Exception:
+                psql_cursor.execute("RELEASE SAVEPOINT completed_games")
+            except psycopg2.Error:
                 # Таблица может не существовать, это не критично
-                pass
+                psql_cursor.execute("ROLLBACK TO SAVEPOINT completed_games")
+
+            psql_connection.commit()
+            print(f"[GAME] Game {game_id}: рассчитано игроков {len(settlement_rows)}, income={bot_income}", flush=True)
+
+            statuses = {rate.user_id: rate.user_status for rate in rates}
+            BaseUserTopService.record_game_points([
+                {
+                    "user_id": row[0], "status": statuses[row[0]],
+                    "top_points": row[4], "period_top_points": row[5], "coins_top_points": row[7]
+                }
+                for row in settlement_rows
+            ])
 
-            # Коммитим транзакцию со статистикой (выигрыши уже начислены в отдельных транзакциях)
-            print(f"[GAME] Коммитим транзакцию для игры {game_id}...", flush=True)
-            result_connection.commit()
-            print(f"[GAME] Транзакция закоммичена для игры {game_id}", flush=True)
-            
-            # КРИТИЧНО: Проверяем что income действительно сохранился после коммита
-            # Используем новое соединение для проверки
-            check_conn, check_cur = get_postgresql_connection()
-            check_cur.execute("""
-                SELECT income, is_active FROM games WHERE game_id = %(game_id)s
-            """, {"game_id": game_id})
-            income_check = check_cur.fetchone()
-            if income_check:
-                if income_check["income"] != bot_income:
-                    print(f"[GAME ERROR] Game {game_id} income не совпадает после коммита! Ожидалось {bot_income}, получено {income_check['income']}", flush=True)
-                    # Исправляем income в отдельной транзакции
-                    check_cur.execute("""
-                        UPDATE games SET income = %(bot_income)s WHERE game_id = %(game_id)s
-                    """, {"bot_income": bot_income, "game_id": game_id})
-                    check_conn.commit()
-                    print(f"[GAME] Game {game_id} income исправлен до {bot_income}", flush=True)
-                else:
-                    print(f"[GAME] Game {game_id} income подтвержден после коммита: {income_check['income']}", flush=True)
-            
-            # КРИТИЧНО: Проверяем что статистика действительно сохранилась после коммита
-            for user_id, rate in cls._grouped_rates_by_user_id(rates).items():
-                winning_sum = rate["winning_sum"]
-                if winning_sum > 0:  # Проверяем только если был выигрыш
-                    check_cur.execute("""
-                        SELECT day_top_points, week_top_points, month_top_points, all_top_points, day_win, week_win, all_win
-                        FROM users WHERE user_id = %(user_id)s
-                    """, {"user_id": user_id})
-                    stats_check = check_cur.fetchone()
-                    if stats_check:
-                        # Проверяем что статистика обновилась (должна быть больше 0 если был выигрыш)
-                        expected_day_top = stats_check["day_top_points"]
-                        expected_week_top = stats_check["week_top_points"]
-                        print(f"[GAME] User {user_id}: статистика после коммита - day_top={expected_day_top}, week_top={expected_week_top}, day_win={stats_check['day_win']}, week_win={stats_check['week_win']}", flush=True)
-            
-            check_cur.close()
-            check_conn.close()
-            
-            # Закрываем соединение после проверки
-            result_cursor.close()
-            result_connection.close()
-            
-            print(f"[GAME] write_game_result: успешно записаны результаты для игры {game_id}", flush=True)
-            
-            # Проверяем что балансы действительно обновились (выигрыши уже начислены в отдельных транзакциях)
-            try:
-                import time
-                time.sleep(0.1)
-                
-                check_connection, check_cursor = get_postgresql_connection()
-                for user_id, rate in cls._grouped_rates_by_user_id(rates).items():
-                    winning_sum = rate["winning_sum"]
-                    if winning_sum > 0:
-                        check_cursor.execute("""
-                            SELECT coins FROM users WHERE user_id = %(user_id)s
-                        """, {"user_id": user_id})
-                        check_result = check_cursor.fetchone()
-                        if check_result:
-                            print(f"[GAME] User {user_id}: финальный баланс после всех коммитов = {check_result['coins']}", flush=True)
-                check_cursor.close()
-                check_connection.close()
-            except Exception as e:
-                print(f"[GAME WARNING] Не удалось проверить баланс после коммита: {e}", flush=True)
-            
             return True
 
         except Exception as e:
-            result_connection.rollback()
+            psql_connection.rollback()
             print(f"[GAME ERROR] write_game_result failed for game {game_id}: {e}", flush=True)
             import traceback
             traceback.print_exc()
             return False
 
-        finally:
-            # Соединение уже закрыто выше, после коммита
-            pass
-
 
     @classmethod
     def get_game_message(
@@ -895,7 +843,8 @@ class BaseGameModel(ABC):
             # Используем блокировку для предотвращения одновременного завершения
             async with game_lock:
                 redis_cursor = get_redis_cursor()
-                psql_connection, psql_cursor = get_postgresql_connection()
+                psql_pool = get_postgresql_pool()
+                psql_connection, psql_cursor = psql_pool.acquire()
                 
                 # ВАЖНО: Убеждаемся что autocommit выключен для основного соединения
                 # чтобы избежать проблем с откатом транзакций
@@ -1035,7 +984,7 @@ class BaseGameModel(ABC):
                                     return
                                 # Отправляем сообщение сразу без задержки и сразу обрабатываем результаты
                                 await cls.additional_game_logic_after(game_data)
-                                await send_message(chat_id=chat_id, message="Итак, результаты раунда...")
+                                await send_message(chat_id=chat_id, message="Итак, результаты раунда...", priority=MessagePriority.GAME_RESULT)
                                 # КРИТИЧНО: Устанавливаем income=0 сразу после отправки сообщения, чтобы предотвратить повторные отправки
                                 psql_cursor.execute("""
                                     UPDATE games SET income = 0 WHERE game_id = %(game_id)s AND (income IS NULL OR income = -1)
@@ -1055,7 +1004,7 @@ class BaseGameModel(ABC):
                                     return
                                 print(f"[GAME] Game {game_id}: sleep completed, processing results...", flush=True)
                                 await cls.additional_game_logic_after(game_data)
-                                await send_message(chat_id=chat_id, message="Итак, результаты раунда...")
+                                await send_message(chat_id=chat_id, message="Итак, результаты раунда...", priority=MessagePriority.GAME_RESULT)
                                 # КРИТИЧНО: Устанавливаем income=0 сразу после отправки сообщения, чтобы предотвратить повторные отправки
                                 psql_cursor.execute("""
                                     UPDATE games SET income = 0 WHERE game_id = %(game_id)s AND (income IS NULL OR income = -1)
@@ -1075,7 +1024,7 @@ class BaseGameModel(ABC):
                             # Если не удалось проверить время, отправляем как обычно
                             print(f"[GAME] Game {game_id}: sleep completed, processing results...", flush=True)
                             await cls.additional_game_logic_after(game_data)
-                            await send_message(chat_id=chat_id, message="Итак, результаты раунда...")
+                            await send_message(chat_id=chat_id, message="Итак, результаты раунда...", priority=MessagePriority.GAME_RESULT)
                             # КРИТИЧНО: Устанавливаем income=0 сразу после отправки сообщения, чтобы предотвратить повторные отправки
                             psql_cursor.execute("""
                                 UPDATE games SET income = 0 WHERE game_id = %(game_id)s AND (income IS NULL OR income = -1)
@@ -1095,7 +1044,7 @@ class BaseGameModel(ABC):
                         # Если нет end_datetime, отправляем как обычно
                         print(f"[GAME] Game {game_id}: sleep completed, processing results...", flush=True)
                         await cls.additional_game_logic_after(game_data)
-                        await send_message(chat_id=chat_id, message="Итак, результаты раунда...")
+                        await send_message(chat_id=chat_id, message="Итак, результаты раунда...", priority=MessagePriority.GAME_RESULT)
                         # КРИТИЧНО: Устанавливаем income=0 сразу после отправки сообщения, чтобы предотвратить повторные отправки
                         psql_cursor.execute("""
                             UPDATE games SET income = 0 WHERE game_id = %(game_id)s AND (income IS NULL OR income = -1)
@@ -1150,10 +1099,8 @@ class BaseGameModel(ABC):
                             WHERE game_id = %(game_id)s
                         """, {"game_id": game_id})
                         psql_connection.commit()
+                        cls._remove_deadline(game_id, redis_cursor)
                         print(f"[GAME] Game {game_id}: marked as inactive (no rates)", flush=True)
-                        # Закрываем соединения
-                        psql_cursor.close()
-                        psql_connection.close()
                         return
                     
                     rates = cls.calculate_winnings(rates, game_result)
@@ -1166,19 +1113,9 @@ class BaseGameModel(ABC):
                         return
                     
                     print(f"[GAME] Game {game_id}: results written successfully", flush=True)
+                    cls._remove_deadline(game_id, redis_cursor)
 
-                    # Помечаем игру как неактивную перед созданием новой
-                    psql_cursor.execute("""
-                        UPDATE games SET is_active = FALSE
-                        WHERE game_id = %(game_id)s AND is_active = TRUE
-                    """, {
-                        "game_id": game_id
-                    })
-                    
-                    # Проверяем что обновление прошло успешно
-                    if psql_cursor.rowcount == 0:
-                        print(f"[GAME] Game {game_id} уже была помечена как неактивная", flush=True)
-                        return
+                    # Игра уже помечена неактивной в write_game_result
 
                     if chat_data.new_game_mode:
                         new_game_mode = chat_data.new_game_mode
@@ -1199,8 +1136,13 @@ class BaseGameModel(ABC):
                     new_game_result = cls.create_new_game(chat_id, new_game_mode, psql_cursor)
                     
                     # Удаляем из Temp.GAMES только если игра была в списке
-                    if game_id in Temp.GAMES:
-                        Temp.GAMES.remove(game_id)
+                    with cls._temp_games_lock:
+                        if game_id in Temp.GAMES:
+                            Temp.GAMES.remove(game_id)
+
+                    # Новая игра фиксируется до отправки результатов: в очереди чата они могут ждать
+                    # секунды, а до коммита строка чата заблокирована и get_chat_data видит старую игру
+                    psql_connection.commit()
 
                     message = cls.get_game_message(rates, game_data, game_result)
                     print(f"[GAME] Game {game_id}: message length={len(message)}, rates count={len(rates)}", flush=True)
@@ -1239,7 +1181,7 @@ class BaseGameModel(ABC):
                     
                     # Сначала пытаемся отправить текстовое сообщение с результатами
                     try:
-                        result = await send_message(chat_id=chat_id, message=message, keyboard=keyboard, photo=None)
+                        result = await send_message(chat_id=chat_id, message=message, keyboard=keyboard, photo=None, priority=MessagePriority.GAME_RESULT)
                         if result:
                             print(f"[GAME] Game {game_id}: results message sent successfully (text)", flush=True)
                             message_sent = True
@@ -1254,7 +1196,7 @@ class BaseGameModel(ABC):
                     if not message_sent:
                         try:
                             print(f"[GAME] Game {game_id}: retrying without keyboard", flush=True)
-                            result = await send_message(chat_id=chat_id, message=message, keyboard=None, photo=None)
+                            result = await send_message(chat_id=chat_id, message=message, keyboard=None, photo=None, priority=MessagePriority.GAME_RESULT)
                             if result:
                                 print(f"[GAME] Game {game_id}: results message sent without keyboard", flush=True)
                                 message_sent = True
@@ -1265,7 +1207,7 @@ class BaseGameModel(ABC):
                     if attachment and message_sent:
                         try:
                             print(f"[GAME] Game {game_id}: sending photo separately", flush=True)
-                            await send_message(chat_id=chat_id, message=None, keyboard=None, photo=attachment)
+                            await send_message(chat_id=chat_id, message=None, keyboard=None, photo=attachment, priority=MessagePriority.GAME_RESULT)
                             print(f"[GAME] Game {game_id}: photo sent successfully", flush=True)
                         except Exception as e:
                             print(f"[GAME WARNING] Game {game_id}: failed to send photo (non-critical): {e}", flush=True)
@@ -1273,20 +1215,18 @@ class BaseGameModel(ABC):
                     
                     await cls.send_article_message(chat_data)
                     await cls.additional_game_logic_before(game_data)
-                    await RatesService.accept_auto_games(chat_id, cls.GAMES_MODEL, psql_cursor, psql_connection, redis_cursor)
-                    
-                    # КРИТИЧНО: Коммитим все изменения в основном соединении
-                    # (is_active=FALSE, новая игра, и т.д.)
-                    print(f"[GAME] Game {game_id}: committing main transaction", flush=True)
+
+                    # Расчет и новая игра уже закоммичены, авто игры пишут ставки своими транзакциями
                     psql_connection.commit()
-                    print(f"[GAME] Game {game_id}: main transaction committed successfully", flush=True)
+                    psql_connection.autocommit = True
+                    await RatesService.accept_auto_games(chat_id, cls.GAMES_MODEL, psql_cursor, psql_connection, redis_cursor)
 
                 finally:
-                    # Закрываем соединения после коммита
+                    # Возвращаем соединение в пул после коммита
                     try:
-                        psql_cursor.close()
-                        psql_connection.close()
-                        print(f"[GAME] Game {game_id}: connections closed", flush=True)
+                        psql_pool.release(psql_connection, psql_cursor)
+                        redis_cursor.close()
+                        print(f"[GAME] Game {game_id}: connections released", flush=True)
                     except Exception as e:
                         print(f"[GAME WARNING] Game {game_id}: error closing connections: {e}", flush=True)
         
@@ -1308,26 +1248,26 @@ class BaseGameModel(ABC):
     ) -> tuple[str, str]:
         """Возвращает сообщения о поставленных ставках и клавиатуру"""
 
-        rates = cls.get_rates_in_game(game_data.game_id, psql_cursor)
-        rates.sort(key=lambda rate: rate.rate_type)
+        # Повторные нажатия в одну секунду получают уже собранный текст
+        message = RoundState.get_bank_message(game_data.game_id)
+        if message is not None:
+            return message, keyboard_game_bank
 
-        if len(rates) > 0:
+        totals, rates = RoundState.get_bank(game_data.game_id, psql_cursor)
 
-            rates_amount = format_number(sum([x.amount for x in rates]))
-            message = f"Всего поставлено: {rates_amount} WC"
+        if len(totals) > 0:
 
-            current_rate_type = None
-            for rate in rates:
-                rate_type = rate.rate_type
+            rates_amount = format_number(sum(totals.values()))
+            message = f"Всего поставлено: {rates_amount} WC"
 
-                if current_rate_type != rate_type:
-                    rate_type_ru = cls.get_rate_type_ru(rate_type)
-                    message += f"\n\nСтавки на {rate_type_ru}:"
-                    current_rate_type = rate_type
+            for rate_type in sorted(rates):
+                rate_type_ru = cls.get_rate_type_ru(rate_type)
+                message += f"\n\nСтавки на {rate_type_ru}:"
 
-                # Используем telegram_name вместо vk_name
-                user_name = rate.user_full_name if rate.user_full_name else f"User {rate.user_id}"
-                message += f"\n{user_name} - {format_number(rate.amount)} WC"
+                for rate in rates[rate_type]:
+                    # Используем telegram_name вместо vk_name
+                    user_name = rate.user_full_name if rate.user_full_name else f"User {rate.user_id}"
+                    message += f"\n{user_name} - {format_number(rate.amount)} WC"
 
             if game_data.time_left is not None:
 
@@ -1348,6 +1288,8 @@ class BaseGameModel(ABC):
                 Хеш игры: {game_data.enc_hash}
             """
 
+        RoundState.save_bank_message(game_data.game_id, message)
+
         return message, keyboard_game_bank
 
 
@@ -0,0 +1,114 @@
+import time
+
+from redis.client import Redis
+from psycopg2.extras import DictCursor
+
+from schemas.redis import RedisKeys
+from schemas.games import GameSchema
+
+
+"""
+    Сроки окончания запущенных раундов
+
+    Раньше воркер зависших игр каждые 5 секунд открывал соединение и искал игры
+    по всей таблице games, а при рестарте бота игры искались через games JOIN rates GROUP BY.
+    Теперь срок окончания раунда (unix time) лежит в sorted set: он записывается в init_game
+    и удаляется после подсчета игры. Воркер спит до ближайшего срока (ZRANGE 0 0),
+    а рестарт ищет запущенные раунды по частичному индексу games_active_end_datetime_idx
+
+    Ключ :ready означает что сроки собраны, если redis очистили или срок раунда не записался
+    (ключ удаляется) - сроки собираются из postgresql по тому же индексу
+
+    Пример:
+        GameDeadlines.add(game_id, time.time() + time_left, redis_cursor)
+        GameDeadlines.remove(game_id, redis_cursor)
+"""
+
+
+class GameDeadlines:
+    """Сроки окончания запущенных раундов в sorted set (score - unix time)"""
+
+    @staticmethod
+    def _get_key() -> str:
+        return RedisKeys.GAME_DEADLINES.value
+
+
+    @classmethod
+    def _get_ready_key(cls) -> str:
+        return f"{cls._get_key()}:ready"
+
+
+    @classmethod
+    def add(cls, game_id: int, end_timestamp: float, redis_cursor: Redis) -> None:
+        """Записывает срок окончания раунда"""
+
+        redis_cursor.zadd(cls._get_key(), {str(game_id): end_timestamp})
+
+
+    @classmethod
+    def postpone(cls, game_id: int, end_timestamp: float, redis_cursor: Redis) -> None:
+        """Переносит срок раунда, если он еще не подсчитан"""
+
+        redis_cursor.zadd(cls._get_key(), {str(game_id): end_timestamp}, xx=True)
+
+
+    @classmethod
+    def remove(cls, game_id: int, redis_cursor: Redis) -> None:
+        """Удаляет срок подсчитанного раунда"""
+
+        redis_cursor.zrem(cls._get_key(), str(game_id))
+
+
+    @classmethod
+    def get_next(cls, redis_cursor: Redis) -> float | None:
+        """Возвращает ближайший срок"""
+
+        deadline = redis_cursor.zrange(cls._get_key(), 0, 0, withscores=True)
+        return deadline[0][1] if deadline else None
+
+
+    @classmethod
+    def get_due(cls, redis_cursor: Redis, before: float, limit: int) -> list[int]:
+        """Возвращает раунды, срок которых раньше before"""
+
+        game_ids = redis_cursor.zrangebyscore(cls._get_key(), "-inf", before, start=0, num=limit)
+        return [int(game_id) for game_id in game_ids]
+
+
+    @classmethod
+    def is_ready(cls, redis_cursor: Redis) -> bool:
+        """Проверяет что сроки собраны"""
+
+        return bool(redis_cursor.exists(cls._get_ready_key()))
+
+
+    @classmethod
+    def invalidate(cls, redis_cursor: Redis) -> None:
+        """Помечает что сроки нужно собрать заново (срок раунда не записался)"""
+
+        redis_cursor.delete(cls._get_ready_key())
+
+
+    @classmethod
+    def rebuild(cls, psql_cursor: DictCursor, redis_cursor: Redis) -> None:
+        """Собирает сроки запущенных раундов из postgresql"""
+
+        # end_datetime хранится без часового пояса, сроки считаются от NOW() базы
+        psql_cursor.execute(f"""
+            SELECT game_id,
+                   EXTRACT(EPOCH FROM (end_datetime - NOW())) as time_left
+            FROM {GameSchema.__tablename__}
+            WHERE is_active = TRUE AND
+                  end_datetime IS NOT NULL
+        """)
+        games = psql_cursor.fetchall()
+
+        now = time.time()
+        pipeline = redis_cursor.pipeline(transaction=True)
+        pipeline.delete(cls._get_key())
+        if games:
+            pipeline.zadd(cls._get_key(), {str(game["game_id"]): now + float(game["time_left"]) for game in games})
+        pipeline.set(cls._get_ready_key(), 1)
+        pipeline.execute()
+
+        print(f"[GAME DEADLINES] собраны из postgresql, раундов {len(games)}", flush=True)
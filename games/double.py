@@ -7,6 +7,7 @@ import json
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
 
 from games.base import BaseGameModel
+from games.sampler import WeightedSampler
 
 from schemas.users import UserSchema
 from schemas.chats import ChatSchema
@@ -18,6 +19,7 @@ from schemas.user_in_chat import UserChatSchema
 DOUBLE_COEFFICIENT = [2, 3, 5, 50]
 DOUBLE_COEFFICIENT_CHANCES = [50, 33, 20, 2]  # Шансы появления коэффициента
 DOUBLE_STRING_COEFFICIENT = [str(x) for x in DOUBLE_COEFFICIENT]
+DOUBLE_SAMPLER = WeightedSampler(lambda: (DOUBLE_COEFFICIENT, DOUBLE_COEFFICIENT_CHANCES))
 
 
 class DoubleResult(BaseModel):
@@ -29,7 +31,7 @@ class DoubleGameModel(BaseGameModel):
     @classmethod
     def create_game(cls, chat_id: int, psql_cursor: DictCursor) -> dict:
 
-        coefficient = random.choices(DOUBLE_COEFFICIENT, DOUBLE_COEFFICIENT_CHANCES)[0]
+        coefficient = DOUBLE_SAMPLER.sample()
         game_result = DoubleResult(coefficient=coefficient)
 
         str_hash = f"x{coefficient}|{cls.get_secret_game_key(20)}"
@@ -8,6 +8,7 @@ import json
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
 
 from games.base import BaseGameModel
+from games.sampler import WeightedSampler
 
 from schemas.users import UserSchema
 from schemas.chats import ChatSchema
@@ -23,6 +24,21 @@ DREAM_CATCHER_OUTCOMES_CHANCES = [46, 30, 14, 8, 4, 2, 2, 1]
 DREAM_CATCHER_STRING_OUTCOMES = [x[1:] for x in DREAM_CATCHER_OUTCOMES if x.startswith("x")]
 
 
+def _get_dream_catcher_sampler(*excluded: str) -> WeightedSampler:
+    """Возвращает выбор исхода без указанных множителей"""
+
+    return WeightedSampler(lambda: tuple(zip(*[
+        (outcome, chance)
+        for outcome, chance in zip(DREAM_CATCHER_OUTCOMES, DREAM_CATCHER_OUTCOMES_CHANCES)
+        if outcome not in excluded
+    ])))
+
+
+DREAM_CATCHER_SAMPLER = _get_dream_catcher_sampler()
+DREAM_CATCHER_SAMPLER_WITHOUT_M7 = _get_dream_catcher_sampler("m7")
+DREAM_CATCHER_SAMPLER_WITHOUT_MULTIPLIERS = _get_dream_catcher_sampler("m7", "m2")
+
+
 class DreamCatcherResult(BaseModel):
     outcomes: list[str]
     coefficient: str
@@ -37,17 +53,17 @@ class DreamCatcherGameModel(BaseGameModel):
 
         current = ""
         game_result = []
-        outcomes = dict(zip(DREAM_CATCHER_OUTCOMES, DREAM_CATCHER_OUTCOMES_CHANCES))
 
         while not current.startswith("x"):
 
-            if "m7" in game_result or len(game_result) >= 2:
-                del outcomes["m7"]
-
             if len(game_result) >= 2:
-                del outcomes["m2"]
+                sampler = DREAM_CATCHER_SAMPLER_WITHOUT_MULTIPLIERS
+            elif "m7" in game_result:
+                sampler = DREAM_CATCHER_SAMPLER_WITHOUT_M7
+            else:
+                sampler = DREAM_CATCHER_SAMPLER
 
-            current = random.choices(list(outcomes.keys()), list(outcomes.values()))[0]
+            current = sampler.sample()
             game_result.append(current)
 
         return game_result
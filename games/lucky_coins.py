@@ -7,6 +7,7 @@ import json
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
 
 from games.base import BaseGameModel
+from games.sampler import WeightedSampler
 
 from schemas.users import UserSchema
 from schemas.chats import ChatSchema
@@ -19,6 +20,7 @@ LUCKY_COINS_CUPS = [1, 2, 3, 4, 5]
 LUCKY_COINS_STRING_CUPS = [str(x) for x in LUCKY_COINS_CUPS]
 LUCKY_COINS_COEFFICIENT = [2, 3, 5, 7, 15]
 LUCKY_COINS_COEFFICIENT_CHANCES = [15, 25, 45, 10, 5]
+LUCKY_COINS_SAMPLER = WeightedSampler(lambda: (LUCKY_COINS_COEFFICIENT, LUCKY_COINS_COEFFICIENT_CHANCES))
 
 
 class LuckyCoinsResult(BaseModel):
@@ -32,7 +34,7 @@ class LuckyCoinsGameModel(BaseGameModel):
     def create_game(cls, chat_id: int, psql_cursor: DictCursor) -> dict:
 
         cup_number = random.choice(LUCKY_COINS_CUPS)
-        coefficient = random.choices(LUCKY_COINS_COEFFICIENT, LUCKY_COINS_COEFFICIENT_CHANCES)[0]
+        coefficient = LUCKY_COINS_SAMPLER.sample()
         game_result = LuckyCoinsResult(cup_number=cup_number, coefficient=coefficient)
 
         str_hash = f"{cup_number}|x{coefficient}|{cls.get_secret_game_key(20)}"
@@ -2,23 +2,27 @@ from typing import TypeVar, Optional
 from redis.client import Redis
 import json
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
 from psycopg2._psycopg import connection as Connection
 
-from settings import VkBotSettings, NotifyChats, Config, Temp
+from settings import VkBotSettings, NotifyChats, Config, Temp, RoundStateSettings
+from databases.executor import run_sync
+from databases.postgresql import transaction
 from games.auto_game import AutoGameService
+from games.round_state import RoundState
 
 from schemas.users import UserSchema, UserStatus
 from schemas.chats import ChatSchema, INCOME_CHAT_TYPE
-from schemas.games import Games
+from schemas.games import Games, GameSchema
 from schemas.rates import RatesSchema
+from schemas.auto_game import AutoGameSchema
 from schemas.redis import RedisKeys
 
 from services.notification import NotificationsService
 
 from modules.additional import strtobool, format_number, convert_number, get_word_case
 from modules.databases.users import get_user_data, give_coins
-from modules.databases.chats import get_chat_data, get_game_data
+from modules.databases.chats import get_chat_data
 from modules.telegram.bot import send_message
 
 
@@ -73,78 +77,91 @@ class RatesService:
 
 
     @classmethod
-    def _get_user_rates_type_in_game(
+    def _get_profit_chat_owner(
             cls,
-            user_id: int,
-            game_id: int,
-            psql_cursor: DictCursor
-    ) -> list[Optional[str]]:
-        """Возвращает события на которые ставил пользователь в конкретной игре"""
+            user_data: UserSchema,
+            chat_data: ChatSchema,
+            rate_amount: int
+    ) -> int:
+        """Возвращает сумму которую получит владелец чата за принятую ставку"""
 
-        rates = cls.get_user_rates(user_id, game_id, psql_cursor)
-        return [x.rate_type for x in rates]
+        income = int(INCOME_CHAT_TYPE[chat_data.type] / 100 * rate_amount)
+        return income * (user_data.status != UserStatus.ADMIN)
 
 
     @classmethod
-    def _get_bet_amunt_in_game(
+    async def _accept_bet(
             cls,
             user_id: int,
+            chat_id: int,
             game_id: int,
+            amount: str | int,
             rate_type: str,
-            psql_cursor: DictCursor
-    ) -> int:
-        """Возвращает сумму ставки на события в конкретной игре"""
+            game_model: GAME_MODEL,
+            psql_cursor: DictCursor,
+            psql_connection: Connection,
+            number_games: int = 1,
+            from_auto_game: bool = False,
+            number_auto_games: int = 0
+    ) -> tuple[str, bool, str | None]:
+        """Возвращает сообщение пользователю, статус принятия ставки, лог о принятии ставки"""
 
-        psql_cursor.execute("""
-            SELECT amount FROM rates
-            WHERE user_id = %(user_id)s AND
-                  game_id = %(game_id)s AND
-                  rate_type = %(rate_type)s
-        """, {
-            "user_id": user_id,
-            "game_id": game_id,
-            "rate_type": rate_type
-        })
-        psql_response = psql_cursor.fetchone()
+        bets_result = await cls._accept_bets(
+            user_id=user_id, chat_id=chat_id, game_id=game_id,
+            bets=[(amount, rate_type)], game_model=game_model,
+            psql_cursor=psql_cursor, psql_connection=psql_connection,
+            number_games=number_games, from_auto_game=from_auto_game,
+            number_auto_games=number_auto_games
+        )
 
-        return psql_response["amount"] if psql_response else 0
+        return bets_result[0]
 
 
     @classmethod
-    def _calculate_profit_chat_owner(
+    async def _accept_bets(
             cls,
-            user_data: UserSchema,
-            chat_data: ChatSchema,
-            rate_amount: int,
-            psql_cursor: DictCursor
-    ) -> int:
-        """Возвращает сумму сколько начислено владельцу чата за принятую ставку"""
-
-        income = int(INCOME_CHAT_TYPE[chat_data.type] / 100 * rate_amount)
-        income = income * (user_data.status != UserStatus.ADMIN)
-
-        if income > 0:
-            give_coins(chat_data.owner_id, income, psql_cursor)
+            user_id: int,
+            chat_id: int,
+            game_id: int,
+            bets: list[tuple[str | int, str]],
+            game_model: GAME_MODEL,
+            psql_cursor: DictCursor,
+            psql_connection: Connection,
+            number_games: int = 1,
+            from_auto_game: bool = False,
+            number_auto_games: int = 0
+    ) -> list[tuple[str, bool, str | None]]:
+        """Возвращает для каждой ставки (сумма, событие) сообщение, статус принятия и лог о принятии"""
+        # Запросы выполняются в пуле потоков, event loop продолжает обрабатывать другие чаты
 
-        return income
+        return await run_sync(
+            cls._place_bets,
+            user_id=user_id, chat_id=chat_id, game_id=game_id,
+            bets=bets, game_model=game_model,
+            psql_cursor=psql_cursor, psql_connection=psql_connection,
+            number_games=number_games, from_auto_game=from_auto_game,
+            number_auto_games=number_auto_games
+        )
 
 
     @classmethod
-    async def _accept_bet(
+    def _place_bets(
             cls,
             user_id: int,
             chat_id: int,
             game_id: int,
-            amount: str | int,
-            rate_type: str,
+            bets: list[tuple[str | int, str]],
             game_model: GAME_MODEL,
             psql_cursor: DictCursor,
             psql_connection: Connection,
             number_games: int = 1,
             from_auto_game: bool = False,
-            number_auto_games: int = 0
-    ) -> tuple[str, bool, str | None]:
-        """Возвращает сообщение пользователю, статус принятия ставки, лог о принятии ставки"""
+            number_auto_games: int = 0,
+            attempt: int = 1
+    ) -> list[tuple[str, bool, str | None]]:
+        """Принимает ставки пользователя в раунде (синхронная часть _accept_bets)"""
+        # Данные раунда загружаются один раз, ставки проверяются по очереди в памяти
+        # (каждая следующая с учетом предыдущих) и записываются одной транзакцией
 
         user_data = get_user_data(user_id, psql_cursor)
         user_name = user_data.vk_name
@@ -154,178 +171,364 @@ class RatesService:
         game_mode = chat_data.game_mode
         current_game_id = chat_data.game_id
 
-        game_data = get_game_data(current_game_id, psql_cursor)
+        game_data = RoundState.get_game(current_game_id, psql_cursor)
         game_result = game_model.format_game_result(game_data.game_result)
-        game_all_rates = game_model.get_all_rates_type()
 
-        if (
-            current_game_id != game_id or
-            rate_type not in game_all_rates
-        ):
-            return f"{user_name} данные устарели, ставка отклонена", False, None
+        user_rates, rates_version = RoundState.get_user_rates(game_id, user_id, psql_cursor)  # Событие -> сумма ставок
+        existing_rates_type = set(user_rates)
 
-        rate_limit = cls.get_rate_limit(rate_type, game_model, game_result)
-        old_rate_amount = cls._get_bet_amunt_in_game(user_id, game_id, rate_type, psql_cursor)
-        split_amount = amount.split(" ") if isinstance(amount, str) else []
+        bets_result = []
+        accepted_bets = []  # (индекс в bets_result, ставка, баланс до ставки, событие на русском)
+        reserved_rates = []  # (событие, сумма, лимит) для RoundState.reserve_rates
 
-        if isinstance(amount, int):
-            amount = amount
+        for amount, rate_type in bets:
+            if (
+                current_game_id != game_id or
+                not game_model.is_rate_type(rate_type)
+            ):
+                bets_result.append((f"{user_name} данные устарели, ставка отклонена", False, None))
+                continue
 
-        elif VkBotSettings.APPEAL_TO_BOT in amount and len(split_amount) == 2:
-            amount = convert_number(split_amount[-1])
+            rate_limit = cls.get_rate_limit(rate_type, game_model, game_result)
+            old_rate_amount = user_rates.get(rate_type, 0)
+            split_amount = amount.split(" ") if isinstance(amount, str) else []
 
-        elif amount in VABANK_TRIGGER:
-            amount = rate_limit if user_coins > rate_limit else user_coins
+            if isinstance(amount, int):
+                amount = amount
 
-            if amount + old_rate_amount > rate_limit:
-                amount -= old_rate_amount
+            elif VkBotSettings.APPEAL_TO_BOT in amount and len(split_amount) == 2:
+                amount = convert_number(split_amount[-1])
 
-            if amount <= 0:
-                return f"{user_name}, у вас уже стоит максимальная ставка на событие", False, None
+            elif amount in VABANK_TRIGGER:
+                amount = rate_limit if user_coins > rate_limit else user_coins
 
-        else:
-            amount = convert_number(amount)
+                if amount + old_rate_amount > rate_limit:
+                    amount -= old_rate_amount
 
-        if amount is None:
-            return f"{user_name}, не получилось распознать сумму ставки", False, None
+                if amount <= 0:
+                    bets_result.append((f"{user_name}, у вас уже стоит максимальная ставка на событие", False, None))
+                    continue
 
-        if amount < 1:
-            return f"{user_name}, минимальная ставка - 1 коин", False, None
+            else:
+                amount = convert_number(amount)
 
-        if not from_auto_game and user_coins < amount * number_games:
-            return f"{user_name}, на вашем балансе недостаточно средств", False, None
+            if amount is None:
+                bets_result.append((f"{user_name}, не получилось распознать сумму ставки", False, None))
+                continue
 
-        user_rates_type = cls._get_user_rates_type_in_game(user_id, game_id, psql_cursor)
-        opposite_rates = game_model.check_opposite_rates(rate_type, user_rates_type)
+            error_message = cls._check_bet(
+                user_name=user_name, amount=amount, rate_type=rate_type, rate_limit=rate_limit,
+                user_rates=user_rates, user_coins=None if from_auto_game else user_coins,
+                number_games=number_games, game_model=game_model, game_data=game_data
+            )
+            if error_message is not None:
+                bets_result.append((error_message, False, None))
+                continue
 
-        if opposite_rates:
-            return f"{user_name}, вы уже поставили на противоположное событие!", False, None
+            rate_type_ru = cls._get_rate_type_ru(rate_type, game_model)
+            owner_income = cls._get_profit_chat_owner(user_data, chat_data, amount)
+            rate_data = RatesSchema(
+                user_id=user_id, chat_id=chat_id, game_id=game_id,
+                amount=amount, rate_type=rate_type, game_mode=game_mode,
+                owner_income=owner_income
+            )
+            accepted_bets.append((len(bets_result), rate_data, user_coins, rate_type_ru))
+            reserved_rates.append((rate_type, amount, rate_limit))
+            bets_result.append(None)
 
-        rate_type_ru = game_model.get_rate_type_ru(rate_type)
-        rate_type_ru = f"на {rate_type_ru}" if rate_type_ru else ""
+            user_rates[rate_type] = old_rate_amount + amount
+            if not from_auto_game:
+                user_coins -= amount * number_games
+            if chat_data.owner_id == user_id:
+                user_coins += owner_income
 
-        if amount + old_rate_amount > rate_limit:
-            return f"{user_name}, максимальный размер ставки {rate_type_ru} -- {format_number(rate_limit)}", False, None
+        if not accepted_bets:
+            return bets_result
 
-        if game_data.time_left is not None and game_data.time_left < 3:
-            return f"{user_name}, до конца раунда осталось менее 3 секунд, ставки не принимаются", False, None
+        # Лимиты проверяются еще раз атомарно в redis: параллельная ставка того же пользователя
+        # не пройдет по устаревшим суммам (см. games/round_state.py)
+        reserved = RoundState.reserve_rates(game_id, user_id, rates_version, reserved_rates)
 
-        owner_income = cls._calculate_profit_chat_owner(user_data, chat_data, amount, psql_cursor)
-        rate_data = RatesSchema(
-            user_id=user_id, chat_id=chat_id, game_id=game_id,
-            amount=amount, rate_type=rate_type, game_mode=game_mode,
-            owner_income=owner_income
-        )
-        _rate_data: dict = rate_data.dict()
+        if reserved is False:
+            if attempt < RoundStateSettings.RESERVE_ATTEMPTS:
+                return cls._place_bets(
+                    user_id=user_id, chat_id=chat_id, game_id=game_id,
+                    bets=bets, game_model=game_model,
+                    psql_cursor=psql_cursor, psql_connection=psql_connection,
+                    number_games=number_games, from_auto_game=from_auto_game,
+                    number_auto_games=number_auto_games, attempt=attempt + 1
+                )
+
+            for index, _, _, _ in accepted_bets:
+                bets_result[index] = (f"{user_name} данные устарели, ставка отклонена", False, None)
 
-        psql_connection.autocommit = False
+            return bets_result
 
         try:
-            if old_rate_amount == 0:
-                psql_cursor.execute("""
-                    INSERT INTO rates (
-                        user_id, chat_id, game_id, amount,
-                        rate_type, game_mode, owner_income
-                    ) VALUES (
-                        %(user_id)s, %(chat_id)s, %(game_id)s, %(amount)s,
-                        %(rate_type)s, %(game_mode)s, %(owner_income)s
-                    )
-                """, _rate_data)
-            else:
-                psql_cursor.execute("""
-                    UPDATE rates
-                    SET amount = amount + %(amount)s,
-                        owner_income = owner_income + %(owner_income)s
-                    WHERE user_id = %(user_id)s AND
-                        game_id = %(game_id)s AND
-                        rate_type = %(rate_type)s
-                """, _rate_data)
+            cls._write_bets(
+                [rate_data for _, rate_data, _, _ in accepted_bets], existing_rates_type, user_data, chat_data,
+                psql_cursor, psql_connection, number_games, from_auto_game
+            )
 
-            if not from_auto_game:
-                total_amount = rate_data.amount * number_games
-                
-                # Проверяем баланс перед списанием
-                if user_coins < total_amount:
-                    raise ValueError(f"Insufficient balance: {user_coins} < {total_amount}")
+        except Exception:
+            if reserved:
+                RoundState.release_rates(game_id, user_id, [(rate_type, amount) for rate_type, amount, _ in reserved_rates])
+
+            if len(bets) > 1:
+                # Все ставки отменены, по отдельности часть из них может пройти
+                return [
+                    cls._place_bets(
+                        user_id=user_id, chat_id=chat_id, game_id=game_id,
+                        bets=[bet], game_model=game_model,
+                        psql_cursor=psql_cursor, psql_connection=psql_connection,
+                        number_games=number_games, from_auto_game=from_auto_game,
+                        number_auto_games=number_auto_games
+                    )[0]
+                    for bet in bets
+                ]
+
+            no_coins_message = f"{user_name}, вы не можете поставить ставку, так как на вашем балансе нет коинов"
+            for index, _, _, _ in accepted_bets:
+                bets_result[index] = (no_coins_message, False, None)
+
+            return bets_result
+
+        RoundState.add_rates(game_id, user_data, [
+            (rate_data.rate_type, rate_data.amount) for _, rate_data, _, _ in accepted_bets
+        ], reserved=reserved is True)
+
+        end_round = cls._get_end_round(game_data, chat_data)
+
+        for index, rate_data, balance, rate_type_ru in accepted_bets:
+            bets_result[index] = cls._get_accepted_bet_result(
+                user_name=user_name, rate_data=rate_data, balance=balance, rate_type_ru=rate_type_ru,
+                game_model=game_model, game_result=game_result, end_round=end_round,
+                number_auto_games=number_auto_games if from_auto_game else None
+            )
 
-                psql_cursor.execute("""
-                    UPDATE users
-                    SET coins = coins - %(amount)s,
-                        rates_count = rates_count + %(number_games)s
-                    WHERE user_id = %(user_id)s AND coins >= %(amount)s
-                """, {
-                    "amount": total_amount,
-                    "number_games": number_games,
-                    "user_id": user_id
-                })
-                
-                # Проверяем что обновление прошло успешно
-                if psql_cursor.rowcount == 0:
-                    raise ValueError(f"Failed to deduct coins: insufficient balance or user not found")
+        return bets_result
 
-                psql_cursor.execute("""
-                    SELECT coins
-                    FROM users
-                    WHERE user_id = %(user_id)s
-                """, {
-                    "user_id": user_id
-                })
 
-                result = psql_cursor.fetchone()
-                if result is None:
-                    raise ValueError(f"User {user_id} not found after update")
-                
-                new_balance = result["coins"]
-                if new_balance < 0:
-                    raise ValueError(f"Balance became negative after bet: {new_balance}")
+    @staticmethod
+    def _get_rate_type_ru(rate_type: str, game_model: GAME_MODEL) -> str:
+        """Возвращает событие для сообщения о ставке ("на ...")"""
 
-                psql_cursor.execute("""
-                    UPDATE user_in_chat
-                    SET last_rate_amount = %(amount)s
-                    WHERE user_id = %(user_id)s AND
-                        chat_id = %(chat_id)s
-                """, _rate_data)
+        rate_type_ru = game_model.get_rate_type_ru(rate_type)
+        return f"на {rate_type_ru}" if rate_type_ru else ""
 
-                if number_games > 1:
-                    AutoGameService.insert_auto_game(
-                        user_id=user_id, chat_id=chat_id, amount=amount, rate_type=rate_type,
-                        game_mode=game_mode, number_games=number_games-1, psql_cursor=psql_cursor
-                    )
 
-            psql_connection.commit()
+    @classmethod
+    def _check_bet(
+            cls,
+            user_name: str,
+            amount: int,
+            rate_type: str,
+            rate_limit: int,
+            user_rates: dict[str, int],
+            user_coins: int | None,
+            number_games: int,
+            game_model: GAME_MODEL,
+            game_data: GameSchema
+    ) -> str | None:
+        """Возвращает причину отказа в ставке или None если ставку можно принять"""
+        # user_rates - суммы ставок пользователя в раунде по событиям
+        # user_coins - баланс пользователя, None для авто игр (они оплачены при создании)
+
+        if amount < 1:
+            return f"{user_name}, минимальная ставка - 1 коин"
+
+        if user_coins is not None and user_coins < amount * number_games:
+            return f"{user_name}, на вашем балансе недостаточно средств"
+
+        if game_model.check_opposite_rates(rate_type, list(user_rates)):
+            return f"{user_name}, вы уже поставили на противоположное событие!"
 
-        except:
-            psql_connection.rollback()
-            return f"{user_name}, вы не можете поставить ставку, так как на вашем балансе нет коинов", False, None
+        if amount + user_rates.get(rate_type, 0) > rate_limit:
+            rate_type_ru = cls._get_rate_type_ru(rate_type, game_model)
+            return f"{user_name}, максимальный размер ставки {rate_type_ru} -- {format_number(rate_limit)}"
+
+        if game_data.time_left is not None and game_data.time_left < 3:
+            return f"{user_name}, до конца раунда осталось менее 3 секунд, ставки не принимаются"
+
+        return None
+
+
+    @staticmethod
+    def _get_end_round(game_data: GameSchema, chat_data: ChatSchema) -> str:
+        """Возвращает время до конца раунда для лога о ставке"""
+
+        if game_data.time_left is not None:
+            return f"{game_data.time_left} (Запущено)"
 
-        finally:
-            psql_connection.autocommit = True
+        return f"{chat_data.game_timer} (Будет запущено)"
+
+
+    @classmethod
+    def _get_accepted_bet_result(
+            cls,
+            user_name: str,
+            rate_data: RatesSchema,
+            balance: int,
+            rate_type_ru: str,
+            game_model: GAME_MODEL,
+            game_result: GAME_RESULT,
+            end_round: str,
+            number_auto_games: int | None
+    ) -> tuple[str, bool, str | None]:
+        """Возвращает сообщение, статус и лог о принятой ставке"""
+        # balance - баланс пользователя до ставки, number_auto_games - None если ставка не из авто игры
+
+        amount = rate_data.amount
+        rate_type = rate_data.rate_type
 
         format_amount = format_number(amount)
         winning_amount = int(amount * game_model.get_coefficient(
             rate_type, game_result, calculate_winnings=True
         )) if game_model.is_winning(game_result, rate_type) else 0
 
-        if game_data.time_left is not None:
-            end_round = f"{game_data.time_left} (Запущено)"
-        else:
-            end_round = f"{chat_data.game_timer} (Будет запущено)"
-
         admin_message = None
         if amount >= Config.NOTIFICATION_RATE or winning_amount >= Config.NOTIFICATION_WIN:
             admin_message = f"""
-                {f"📍 Авто игры 📍 осталось {format_number(number_auto_games)}" if from_auto_game else ""}
+                {f"📍 Авто игры 📍 осталось {format_number(number_auto_games)}" if number_auto_games is not None else ""}
                 {user_name} поставил {format_amount} WC {rate_type_ru}
                 Выигрыш: {format_number(winning_amount)}
                 Исход: {game_model.get_result_message(game_result, short=True)}
-                Баланс: {format_number(int(user_coins - amount))}
+                Баланс: {format_number(int(balance - amount))}
                 До конца раунда: {end_round}
-                Номер чата: {int(chat_id - 2E9)} ({game_id})
+                Номер чата: {int(rate_data.chat_id - 2E9)} ({rate_data.game_id})
             """
 
         return f"{user_name}, успешная ставка {format_amount} WC {rate_type_ru}", True, admin_message
 
 
+    @classmethod
+    def _write_bets(
+            cls,
+            rates: list[RatesSchema],
+            existing_rates_type: set[str],
+            user_data: UserSchema,
+            chat_data: ChatSchema,
+            psql_cursor: DictCursor,
+            psql_connection: Connection,
+            number_games: int,
+            from_auto_game: bool
+    ) -> None:
+        """Записывает принятые ставки пользователя, доход владельца чата и списание баланса одной транзакцией"""
+        # existing_rates_type - события, на которые пользователь уже ставил в раунде (их ставки увеличиваются)
+
+        user_id = user_data.user_id
+        chat_id = chat_data.chat_id
+
+        owner_income = sum(rate.owner_income for rate in rates)
+        total_amount = sum(rate.amount for rate in rates) * number_games
+
+        with transaction(psql_connection, psql_cursor, "write_bets"):
+            cls._write_rates(rates, {(user_id, rate_type) for rate_type in existing_rates_type}, psql_cursor)
+
+            if owner_income > 0:
+                give_coins(chat_data.owner_id, owner_income, psql_cursor)
+
+            if not from_auto_game:
+                psql_cursor.execute("""
+                    UPDATE users
+                    SET coins = coins - %(amount)s,
+                        rates_count = rates_count + %(rates_count)s
+                    WHERE user_id = %(user_id)s AND coins >= %(amount)s
+                    RETURNING coins
+                """, {
+                    "amount": total_amount,
+                    "rates_count": number_games * len(rates),
+                    "user_id": user_id
+                })
+
+                # Строки нет если баланса не хватило или пользователь не найден
+                if psql_cursor.fetchone() is None:
+                    raise ValueError(f"Failed to deduct coins: insufficient balance or user not found")
+
+                psql_cursor.execute("""
+                    UPDATE user_in_chat
+                    SET last_rate_amount = %(amount)s
+                    WHERE user_id = %(user_id)s AND
+                        chat_id = %(chat_id)s
+                """, {
+                    "amount": rates[-1].amount,
+                    "user_id": user_id,
+                    "chat_id": chat_id
+                })
+
+                if number_games > 1:
+                    for rate in rates:
+                        AutoGameService.insert_auto_game(
+                            user_id=user_id, chat_id=chat_id, amount=rate.amount, rate_type=rate.rate_type,
+                            game_mode=chat_data.game_mode, number_games=number_games-1, psql_cursor=psql_cursor
+                        )
+
+
+    @staticmethod
+    def _write_rates(
+            rates: list[RatesSchema],
+            existing_rates: set[tuple[int, str]],
+            psql_cursor: DictCursor
+    ) -> None:
+        """Добавляет ставки раунда в таблицу rates (вызывается внутри транзакции)"""
+        # existing_rates - (пользователь, событие) у которых уже есть ставка в раунде, их ставки увеличиваются
+
+        grouped_rates = {}  # (пользователь, событие) -> [ставка, сумма, доход владельца]
+        for rate in rates:
+            grouped_rate = grouped_rates.setdefault((rate.user_id, rate.rate_type), [rate, 0, 0])
+            grouped_rate[1] += rate.amount
+            grouped_rate[2] += rate.owner_income
+
+        new_rates = [
+            (rate.user_id, rate.chat_id, rate.game_id, amount, rate.rate_type, rate.game_mode, owner_income)
+            for key, (rate, amount, owner_income) in grouped_rates.items()
+            if key not in existing_rates
+        ]
+        old_rates = [
+            (rate.user_id, rate.game_id, rate.rate_type, amount, owner_income)
+            for key, (rate, amount, owner_income) in grouped_rates.items()
+            if key in existing_rates
+        ]
+
+        if old_rates:
+            updated_rates = execute_values(psql_cursor, """
+                UPDATE rates
+                SET amount = rates.amount + bet.amount,
+                    owner_income = rates.owner_income + bet.owner_income
+                FROM (VALUES %s) AS bet(user_id, game_id, rate_type, amount, owner_income)
+                WHERE rates.user_id = bet.user_id AND
+                      rates.game_id = bet.game_id AND
+                      rates.rate_type = bet.rate_type AND
+                      rates.ctid = (
+                          SELECT user_rate.ctid FROM rates AS user_rate
+                          WHERE user_rate.user_id = bet.user_id AND
+                                user_rate.game_id = bet.game_id AND
+                                user_rate.rate_type = bet.rate_type
+                          LIMIT 1
+                      )
+                RETURNING rates.user_id, rates.rate_type
+            """, old_rates, fetch=True)
+
+            # Суммы в redis резервируются до записи (RoundState.reserve_rates), поэтому ставка
+            # параллельной транзакции может быть еще не закоммичена - такие ставки добавляются строкой,
+            # а при следующей ставке увеличивается только одна из строк события
+            updated_keys = {(rate["user_id"], rate["rate_type"]) for rate in updated_rates}
+            missing_rates = [
+                (rate.user_id, rate.chat_id, rate.game_id, amount, rate.rate_type, rate.game_mode, owner_income)
+                for key, (rate, amount, owner_income) in grouped_rates.items()
+                if key in existing_rates and key not in updated_keys
+            ]
+            new_rates.extend(missing_rates)
+
+        if new_rates:
+            execute_values(psql_cursor, """
+                INSERT INTO rates (
+                    user_id, chat_id, game_id, amount,
+                    rate_type, game_mode, owner_income
+                ) VALUES %s
+            """, new_rates)
+
+
     @classmethod
     def _save_rate_message(
             cls,
@@ -402,7 +605,7 @@ class RatesService:
             return "⚠ Данные хранятся 10 минут, данные могут изменяться при новой ставке на эти же события в этой игре"
 
         rates_message = "\n".join(rates_message)
-        game_enc_hash = f"Хеш игры: {get_game_data(game_id, psql_cursor).enc_hash}"
+        game_enc_hash = f"Хеш игры: {RoundState.get_game(game_id, psql_cursor).enc_hash}"
 
         return f"{rates_message}\n\n{game_enc_hash}"
 
@@ -418,7 +621,7 @@ class RatesService:
         """Запускает игру если она до этого была не запущена"""
 
         try:
-            game_data = get_game_data(game_id, psql_cursor)
+            game_data = RoundState.get_game(game_id, psql_cursor)
             if game_data is None:
                 print(f"[GAME ERROR] Game {game_id} not found in _run_game", flush=True)
                 return
@@ -458,26 +661,21 @@ class RatesService:
     ) -> str:
         """Возвращает сообщение и клавиатуру о принятых ставках"""
 
-        rates_status = []
-        response_parts = []
-        admin_log_parts = []
-
-        for rate_type in rates_type:
-            response_bet, bet_status, admin_log = await cls._accept_bet(
-                user_id=user_id, chat_id=chat_id, game_id=game_id,
-                amount=amount, rate_type=rate_type, game_model=game_model,
-                psql_cursor=psql_cursor, psql_connection=psql_connection
-            )
-            rates_status.append(bet_status)
-            response_parts.append(response_bet)
-            admin_log_parts.append(admin_log)
+        bets_result = await cls._accept_bets(
+            user_id=user_id, chat_id=chat_id, game_id=game_id,
+            bets=[(amount, rate_type) for rate_type in rates_type], game_model=game_model,
+            psql_cursor=psql_cursor, psql_connection=psql_connection
+        )
+        response_parts = [response_bet for response_bet, _, _ in bets_result]
+        rates_status = [bet_status for _, bet_status, _ in bets_result]
+        admin_log_parts = [admin_log for _, _, admin_log in bets_result]
 
         admin_log = "\n\n".join([x for x in admin_log_parts if x is not None])
         if bool(admin_log):
             await NotificationsService.send_notification(NotifyChats.RATES, admin_log)
 
         if rates_status.count(True) > 0:
-            cls._run_game(game_id, game_model, psql_cursor, redis_cursor)
+            await run_sync(cls._run_game, game_id, game_model, psql_cursor, redis_cursor)
 
         return "\n".join(response_parts)
 
@@ -496,7 +694,7 @@ class RatesService:
     ) -> str:
         """Возвращает сообщение и клавиатуру о принятых авто играх"""
 
-        user_data = get_user_data(user_id, psql_cursor)
+        user_data = await run_sync(get_user_data, user_id, psql_cursor)
         user_name = user_data.vk_name
 
         if not strtobool(redis_cursor.get(RedisKeys.AUTO_GAMES_WORK.value) or "1"):
@@ -505,9 +703,9 @@ class RatesService:
         if number_games <= 0:
             return f"{user_name}, количество авто игр должно быть больше нуля"
 
-        chat_data = get_chat_data(chat_id, psql_cursor)
+        chat_data = await run_sync(get_chat_data, chat_id, psql_cursor)
         game_mode = chat_data.game_mode
-        user_count_auto_game = AutoGameService.get_count_auto_games(user_id, chat_id, game_mode, psql_cursor)
+        user_count_auto_game = await run_sync(AutoGameService.get_count_auto_games, user_id, chat_id, game_mode, psql_cursor)
 
         if user_count_auto_game > 0:
             return f"{user_name}, у вас уже есть активная авто-игра, дождитесь окончания"
@@ -515,7 +713,7 @@ class RatesService:
         if number_games > 1 and user_count_auto_game + number_games > 1000:
             return f"{user_name}, нельзя ставить больше 1000 авто игр"
 
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             SELECT MAX(rates.game_id) as found_game_id
             FROM rates
             WHERE rates.user_id = %(user_id)s AND
@@ -531,7 +729,7 @@ class RatesService:
         if found_game_id is None:
             return f"{user_name}, вы еще не сыграли ни одной игры в этом режиме"
 
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             SELECT * FROM rates
             WHERE game_id = %(found_game_id)s AND
                   user_id = %(user_id)s
@@ -552,7 +750,7 @@ class RatesService:
         if user_data.coins < sum_found_rates:
             return f"{user_name}, на вашем балансе недостаточно средств"
 
-        game_data = get_game_data(chat_data.game_id, psql_cursor)
+        game_data = await run_sync(RoundState.get_game, chat_data.game_id, psql_cursor)
         time_left = game_data.time_left
 
         if game_data.game_id != game_id:
@@ -561,32 +759,209 @@ class RatesService:
         if time_left is not None and time_left <= count_found_rates:
             return f"{user_name}, к сожалению мы не успеем поставить ваши ставки за {time_left} сек"
 
-        rates_status = []
-        response_parts = []
-        admin_log_parts = []
-
-        for rate in found_rates:
-            rate_type = rate.rate_type
-            response_bet, bet_status, admin_log = await cls._accept_bet(
-                user_id=user_id, chat_id=chat_id, game_id=game_id,
-                amount=rate.amount, rate_type=rate_type, game_model=game_model,
-                psql_cursor=psql_cursor, psql_connection=psql_connection,
-                number_games=number_games
-            )
-            rates_status.append(bet_status)
-            response_parts.append(response_bet)
-            admin_log_parts.append(admin_log)
+        bets_result = await cls._accept_bets(
+            user_id=user_id, chat_id=chat_id, game_id=game_id,
+            bets=[(rate.amount, rate.rate_type) for rate in found_rates], game_model=game_model,
+            psql_cursor=psql_cursor, psql_connection=psql_connection,
+            number_games=number_games
+        )
+        response_parts = [response_bet for response_bet, _, _ in bets_result]
+        rates_status = [bet_status for _, bet_status, _ in bets_result]
+        admin_log_parts = [admin_log for _, _, admin_log in bets_result]
 
         admin_log = "\n\n".join([x for x in admin_log_parts if x is not None])
         if bool(admin_log):
             await NotificationsService.send_notification(NotifyChats.RATES, admin_log)
 
         if rates_status.count(True) > 0:
-            cls._run_game(game_id, game_model, psql_cursor, redis_cursor)
+            await run_sync(cls._run_game, game_id, game_model, psql_cursor, redis_cursor)
 
         return "\n".join(response_parts)
 
 
+    @classmethod
+    def _place_auto_bets(
+            cls,
+            chat_data: ChatSchema,
+            game_model: GAME_MODEL,
+            psql_cursor: DictCursor,
+            psql_connection: Connection
+    ) -> list[tuple[str, bool, str | None]]:
+        """Ставит все авто игры чата в текущем раунде, возвращает для каждой сообщение, статус и лог"""
+        # Авто игры загружаются одним запросом, проверяются в памяти и записываются одной транзакцией
+        # Баланс не проверяется, авто игры оплачены при создании
+
+        chat_id = chat_data.chat_id
+        game_id = chat_data.game_id
+
+        auto_games = AutoGameService.get_auto_games_with_users(chat_id, chat_data.game_mode, psql_cursor)
+        if not auto_games:
+            return []
+
+        game_data = RoundState.get_game(game_id, psql_cursor)
+        game_result = game_model.format_game_result(game_data.game_result)
+
+        # Пользователь -> (событие -> сумма ставок в раунде, номер изменения ставок для RoundState.reserve_rates)
+        users_rates = RoundState.get_users_rates(
+            game_id, list({user_data.user_id for _, user_data in auto_games}), psql_cursor
+        )
+
+        existing_rates = {
+            (user_id, rate_type)
+            for user_id, (user_rates, _) in users_rates.items()
+            for rate_type in user_rates
+        }
+
+        users_coins = {}  # Пользователь -> баланс для лога
+        bets_result = []
+        accepted_bets = []  # (индекс в bets_result, авто игра, пользователь, ставка, баланс до ставки, событие на русском)
+
+        for auto_game, user_data in auto_games:
+            user_id = user_data.user_id
+            user_name = user_data.vk_name
+            rate_type = auto_game.rate_type
+            amount = auto_game.amount
+
+            user_rates = users_rates[user_id][0]
+            user_coins = users_coins.setdefault(user_id, user_data.coins)
+
+            if not game_model.is_rate_type(rate_type):
+                bets_result.append((f"{user_name} данные устарели, ставка отклонена", False, None))
+                continue
+
+            error_message = cls._check_bet(
+                user_name=user_name, amount=amount, rate_type=rate_type,
+                rate_limit=cls.get_rate_limit(rate_type, game_model, game_result),
+                user_rates=user_rates, user_coins=None, number_games=1,
+                game_model=game_model, game_data=game_data
+            )
+            if error_message is not None:
+                bets_result.append((error_message, False, None))
+                continue
+
+            owner_income = cls._get_profit_chat_owner(user_data, chat_data, amount)
+            rate_data = RatesSchema(
+                user_id=user_id, chat_id=chat_id, game_id=game_id,
+                amount=amount, rate_type=rate_type, game_mode=chat_data.game_mode,
+                owner_income=owner_income
+            )
+            rate_type_ru = cls._get_rate_type_ru(rate_type, game_model)
+            accepted_bets.append((len(bets_result), auto_game, user_data, rate_data, user_coins, rate_type_ru))
+            bets_result.append(None)
+
+            user_rates[rate_type] = user_rates.get(rate_type, 0) + amount
+            if chat_data.owner_id == user_id:
+                users_coins[user_id] = user_coins + owner_income
+
+        if not accepted_bets:
+            return bets_result
+
+        users_accepted_rates = {}  # Пользователь -> (данные пользователя, [(событие, сумма)])
+        for _, _, user_data, rate_data, _, _ in accepted_bets:
+            user_accepted_rates = users_accepted_rates.setdefault(user_data.user_id, (user_data, []))
+            user_accepted_rates[1].append((rate_data.rate_type, rate_data.amount))
+
+        # Лимиты проверяются еще раз атомарно в redis (см. games/round_state.py), авто игры пользователей,
+        # которые параллельно поставили сами, ставятся по одной с проверкой заново
+        reserved_users = {
+            user_id: RoundState.reserve_rates(game_id, user_id, users_rates[user_id][1], [
+                (rate_type, amount, cls.get_rate_limit(rate_type, game_model, game_result))
+                for rate_type, amount in user_accepted_rates
+            ])
+            for user_id, (_, user_accepted_rates) in users_accepted_rates.items()
+        }
+
+        conflicted_bets = [bet for bet in accepted_bets if reserved_users[bet[2].user_id] is False]
+        accepted_bets = [bet for bet in accepted_bets if reserved_users[bet[2].user_id] is not False]
+        cls._place_auto_bets_separately(conflicted_bets, bets_result, chat_id, game_id, game_model, psql_cursor, psql_connection)
+
+        if not accepted_bets:
+            return bets_result
+
+        try:
+            cls._write_auto_bets(
+                [rate_data for _, _, _, rate_data, _, _ in accepted_bets],
+                existing_rates, [auto_game for _, auto_game, _, _, _, _ in accepted_bets],
+                chat_data, psql_cursor, psql_connection
+            )
+
+        except Exception as error:
+            # Все авто игры отменены, по отдельности часть из них может пройти
+            print(f"[AUTO GAMES WARNING] чат {chat_id}: авто игры ставятся по одной, {error!r}", flush=True)
+
+            for user_id, reserved in reserved_users.items():
+                if reserved:
+                    RoundState.release_rates(game_id, user_id, users_accepted_rates[user_id][1])
+
+            cls._place_auto_bets_separately(accepted_bets, bets_result, chat_id, game_id, game_model, psql_cursor, psql_connection)
+
+            return bets_result
+
+        for user_id, reserved in reserved_users.items():
+            if reserved is not False:
+                user_data, user_accepted_rates = users_accepted_rates[user_id]
+                RoundState.add_rates(game_id, user_data, user_accepted_rates, reserved=reserved is True)
+
+        end_round = cls._get_end_round(game_data, chat_data)
+
+        for index, auto_game, user_data, rate_data, balance, rate_type_ru in accepted_bets:
+            bets_result[index] = cls._get_accepted_bet_result(
+                user_name=user_data.vk_name, rate_data=rate_data, balance=balance, rate_type_ru=rate_type_ru,
+                game_model=game_model, game_result=game_result, end_round=end_round,
+                number_auto_games=auto_game.number_games-1
+            )
+
+        return bets_result
+
+
+    @classmethod
+    def _place_auto_bets_separately(
+            cls,
+            accepted_bets: list[tuple],
+            bets_result: list,
+            chat_id: int,
+            game_id: int,
+            game_model: GAME_MODEL,
+            psql_cursor: DictCursor,
+            psql_connection: Connection
+    ) -> None:
+        """Ставит авто игры по одной (как ставки пользователей) и записывает результаты в bets_result"""
+
+        for index, auto_game, user_data, _, _, _ in accepted_bets:
+            bets_result[index] = cls._place_bets(
+                user_id=user_data.user_id, chat_id=chat_id, game_id=game_id,
+                bets=[(auto_game.amount, auto_game.rate_type)], game_model=game_model,
+                psql_cursor=psql_cursor, psql_connection=psql_connection,
+                from_auto_game=True, number_auto_games=auto_game.number_games-1
+            )[0]
+
+            if bets_result[index][1] is True:
+                AutoGameService.decrement_auto_games(auto_game, psql_cursor)
+
+
+    @classmethod
+    def _write_auto_bets(
+            cls,
+            rates: list[RatesSchema],
+            existing_rates: set[tuple[int, str]],
+            auto_games: list[AutoGameSchema],
+            chat_data: ChatSchema,
+            psql_cursor: DictCursor,
+            psql_connection: Connection
+    ) -> None:
+        """Записывает ставки авто игр, доход владельца чата и оставшиеся игры одной транзакцией"""
+
+        owner_income = sum(rate.owner_income for rate in rates)
+
+        with transaction(psql_connection, psql_cursor, "write_auto_bets"):
+            cls._write_rates(rates, existing_rates, psql_cursor)
+
+            if owner_income > 0:
+                give_coins(chat_data.owner_id, owner_income, psql_cursor)
+
+            AutoGameService.decrement_many_auto_games(auto_games, psql_cursor)
+
+
     @classmethod
     async def accept_auto_games(
             cls,
@@ -610,32 +985,18 @@ class RatesService:
         game_id = chat_data.game_id
         game_model = games_models[chat_data.game_mode]
 
-        auto_games = AutoGameService.get_auto_games(chat_id, chat_data.game_mode, psql_cursor)
-        rates_status = []
-        response_parts = []
-        admin_log_parts = []
-
-        for auto_game in auto_games:
-            rate_type = auto_game.rate_type
-            response_bet, bet_status, admin_log = await cls._accept_bet(
-                user_id=auto_game.user_id, chat_id=chat_id, game_id=game_id,
-                amount=auto_game.amount, rate_type=rate_type, game_model=game_model,
-                psql_cursor=psql_cursor, psql_connection=psql_connection,
-                from_auto_game=True, number_auto_games=auto_game.number_games-1
-            )
-            rates_status.append(bet_status)
-            response_parts.append(response_bet)
-            admin_log_parts.append(admin_log)
-
-            if bet_status is True:
-                AutoGameService.decrement_auto_games(auto_game, psql_cursor)
+        bets_result = await run_sync(
+            cls._place_auto_bets,
+            chat_data=chat_data, game_model=game_model,
+            psql_cursor=psql_cursor, psql_connection=psql_connection
+        )
 
-        admin_log = "\n\n".join([x for x in admin_log_parts if x is not None])
+        admin_log = "\n\n".join([admin_log for _, _, admin_log in bets_result if admin_log is not None])
         if bool(admin_log):
             await NotificationsService.send_notification(NotifyChats.RATES, admin_log)
 
-        if rates_status.count(True) > 0:
+        if any(bet_status for _, bet_status, _ in bets_result):
             cls._run_game(game_id, game_model, psql_cursor, redis_cursor)
 
-        if bool(response_parts):
-            await send_message(chat_id, "\n".join(response_parts))
+        if bool(bets_result):
+            await send_message(chat_id, "\n".join([response_bet for response_bet, _, _ in bets_result]))
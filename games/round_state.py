@@ -0,0 +1,581 @@
+import json
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from redis.exceptions import RedisError
+from psycopg2.extras import DictCursor
+
+from settings import RoundStateSettings
+from databases.redis import get_shared_redis_cursor
+from schemas.users import UserSchema, UserStatus
+from schemas.games import GameSchema
+from schemas.redis import RedisKeys
+from modules.databases.chats import get_game_data
+
+
+"""
+    Состояние раунда в redis
+
+    Пока идет прием ставок, каждая ставка, "Банк", повтор и авто игра читали из postgresql
+    одну и ту же игру (game_result JSON, enc_hash, end_datetime) и ставки раунда.
+    Теперь игра и суммы ставок активного раунда лежат в redis, в отдельных ключах,
+    чтобы ставка читала только свои данные и не зависела от размера раунда:
+        round_state:game_id:game - игра без time_left (JSON), end_ts / end_datetime - срок окончания раунда
+        round_state:game_id - данные "Банк":
+            rate:user_id:rate_type - сумма ставок пользователя на событие
+            total:rate_type - сумма всех ставок на событие
+            name:user_id - имя пользователя
+            bank_second / bank_message - текст "Банк" собранный в эту секунду
+        round_state:game_id:user:user_id - ставки пользователя: rate:rate_type - сумма, version - номер изменения
+        round_state:game_id:users - пользователи, у которых есть ключ ставок
+    time_left считается от end_ts. postgresql остается журналом ставок,
+    подсчет раунда читает ставки только из него
+
+    Состояние собирается из postgresql при первом чтении раунда, а дальше меняется lua скриптами:
+    резерв ставок пользователя (reserve_rates), принятые ставки (add_rates), запуск раунда (set_end)
+    и подсчет (finish). Изменения "Банк" и срока увеличивают round_state:game_id:version, и собранное
+    состояние сохраняется только если версия не изменилась пока читался postgresql,
+    поэтому ставка принятая во время сборки не потеряется
+
+    Лимит ставки проверяется в reserve_rates атомарно: суммы пользователя увеличиваются до записи
+    в postgresql, только если ни одна сумма не превысит лимит и ставки пользователя не менялись
+    с момента чтения (version). Иначе ставки проверяются заново, поэтому параллельные ставки
+    одного пользователя не проходят по устаревшим суммам. Если запись в postgresql не удалась,
+    резерв снимается (release_rates)
+
+    Если redis недоступен, данные читаются из postgresql как раньше
+
+    Пример:
+        game_data = RoundState.get_game(game_id, psql_cursor)
+        user_rates, version = RoundState.get_user_rates(game_id, user_id, psql_cursor)
+        RoundState.reserve_rates(game_id, user_id, version, [("red", 100, 5000)])
+        RoundState.add_rates(game_id, user_data, [("red", 100)])
+        totals, rates = RoundState.get_bank(game_id, psql_cursor)
+"""
+
+
+# KEYS: игра, "Банк", версия, пользователи. ARGV: версия при чтении postgresql, ttl, префикс ключа ставок пользователя, состояние (JSON)
+_SAVE_STATE_SCRIPT = """
+    local version = redis.call('GET', KEYS[3]) or '0'
+    if version ~= ARGV[1] or redis.call('EXISTS', KEYS[1]) == 1 then
+        return 0
+    end
+    local state = cjson.decode(ARGV[4])
+    local function save(key, fields)
+        redis.call('DEL', key)
+        for field, value in pairs(fields) do
+            redis.call('HSET', key, field, value)
+        end
+        redis.call('EXPIRE', key, ARGV[2])
+    end
+    save(KEYS[1], state['game'])
+    save(KEYS[2], state['bank'])
+    redis.call('DEL', KEYS[4])
+    for user_id, fields in pairs(state['users']) do
+        save(ARGV[3] .. user_id, fields)
+        redis.call('SADD', KEYS[4], user_id)
+    end
+    redis.call('EXPIRE', KEYS[4], ARGV[2])
+    return 1
+"""
+
+# KEYS: игра, "Банк", версия. ARGV: ttl, end_ts, end_datetime
+_SET_END_SCRIPT = """
+    redis.call('INCR', KEYS[3])
+    redis.call('EXPIRE', KEYS[3], ARGV[1])
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return 0
+    end
+    redis.call('HSET', KEYS[1], 'end_ts', ARGV[2], 'end_datetime', ARGV[3])
+    redis.call('HDEL', KEYS[2], 'bank_second', 'bank_message')
+    return 1
+"""
+
+# KEYS: игра, ставки пользователя, пользователи, "Банк". ARGV: ttl, версия при чтении, user_id, событие, сумма, лимит, ...
+# Возвращает 1 - суммы увеличены, 0 - ставки пользователя изменились или лимит превышен, -1 - состояния нет
+_RESERVE_RATES_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return -1
+    end
+    if (redis.call('HGET', KEYS[2], 'version') or '0') ~= ARGV[2] then
+        return 0
+    end
+    for i = 4, #ARGV, 3 do
+        local amount = tonumber(redis.call('HGET', KEYS[2], 'rate:' .. ARGV[i]) or '0')
+        if amount + tonumber(ARGV[i + 1]) > tonumber(ARGV[i + 2]) then
+            return 0
+        end
+    end
+    for i = 4, #ARGV, 3 do
+        redis.call('HINCRBY', KEYS[2], 'rate:' .. ARGV[i], ARGV[i + 1])
+    end
+    redis.call('HINCRBY', KEYS[2], 'version', 1)
+    redis.call('SADD', KEYS[3], ARGV[3])
+    for i = 1, 4 do
+        redis.call('EXPIRE', KEYS[i], ARGV[1])
+    end
+    return 1
+"""
+
+# KEYS: ставки пользователя. ARGV: событие, сумма, ...
+_RELEASE_RATES_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return 0
+    end
+    for i = 1, #ARGV, 2 do
+        local field = 'rate:' .. ARGV[i]
+        if redis.call('HINCRBY', KEYS[1], field, -tonumber(ARGV[i + 1])) <= 0 then
+            redis.call('HDEL', KEYS[1], field)
+        end
+    end
+    redis.call('HINCRBY', KEYS[1], 'version', 1)
+    return 1
+"""
+
+# KEYS: игра, "Банк", версия, ставки пользователя, пользователи
+# ARGV: ttl, user_id, имя, 1 если суммы пользователя уже зарезервированы, событие, сумма, ...
+_ADD_RATES_SCRIPT = """
+    redis.call('INCR', KEYS[3])
+    redis.call('EXPIRE', KEYS[3], ARGV[1])
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return 0
+    end
+    redis.call('HDEL', KEYS[2], 'bank_second', 'bank_message')
+    redis.call('HSET', KEYS[2], 'name:' .. ARGV[2], ARGV[3])
+    for i = 5, #ARGV, 2 do
+        redis.call('HINCRBY', KEYS[2], 'rate:' .. ARGV[2] .. ':' .. ARGV[i], ARGV[i + 1])
+        redis.call('HINCRBY', KEYS[2], 'total:' .. ARGV[i], ARGV[i + 1])
+        if ARGV[4] == '0' then
+            redis.call('HINCRBY', KEYS[4], 'rate:' .. ARGV[i], ARGV[i + 1])
+        end
+    end
+    if ARGV[4] == '0' then
+        redis.call('HINCRBY', KEYS[4], 'version', 1)
+        redis.call('SADD', KEYS[5], ARGV[2])
+    end
+    for _, key in ipairs({KEYS[1], KEYS[2], KEYS[4], KEYS[5]}) do
+        redis.call('EXPIRE', key, ARGV[1])
+    end
+    return 1
+"""
+
+# KEYS: игра, "Банк". ARGV: секунда, текст
+_SAVE_BANK_MESSAGE_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return 0
+    end
+    redis.call('HSET', KEYS[2], 'bank_second', ARGV[1], 'bank_message', ARGV[2])
+    return 1
+"""
+
+# KEYS: игра, "Банк", версия, пользователи. ARGV: ttl, префикс ключа ставок пользователя
+_FINISH_SCRIPT = """
+    for _, user_id in ipairs(redis.call('SMEMBERS', KEYS[4])) do
+        redis.call('DEL', ARGV[2] .. user_id)
+    end
+    redis.call('DEL', KEYS[1], KEYS[2], KEYS[4])
+    redis.call('INCR', KEYS[3])
+    redis.call('EXPIRE', KEYS[3], ARGV[1])
+    return 1
+"""
+
+
+class RoundRate(NamedTuple):
+    """Сумма ставок пользователя на событие в раунде"""
+
+    user_id: int
+    rate_type: str
+    amount: int
+    user_full_name: str  # Имя с префиксом статуса
+
+
+class RoundState:
+    """Состояние активного раунда в redis (см. описание модуля)"""
+
+    @staticmethod
+    def _get_key(game_id: int) -> str:
+        return f"{RedisKeys.ROUND_STATE.value}:{game_id}"
+
+
+    @classmethod
+    def _get_game_key(cls, game_id: int) -> str:
+        return f"{cls._get_key(game_id)}:game"
+
+
+    @classmethod
+    def _get_version_key(cls, game_id: int) -> str:
+        return f"{cls._get_key(game_id)}:version"
+
+
+    @classmethod
+    def _get_users_key(cls, game_id: int) -> str:
+        return f"{cls._get_key(game_id)}:users"
+
+
+    @classmethod
+    def _get_user_key_prefix(cls, game_id: int) -> str:
+        return f"{cls._get_key(game_id)}:user:"
+
+
+    @classmethod
+    def _get_user_key(cls, game_id: int, user_id: int) -> str:
+        return f"{cls._get_user_key_prefix(game_id)}{user_id}"
+
+
+    @staticmethod
+    def get_user_name(full_name: str, status: UserStatus | None, clan_tag: str | None) -> str:
+        """Возвращает имя пользователя как в get_user_data (префикс статуса и тег клана)"""
+
+        prefix = UserSchema.get_user_prefix(status)
+        full_name = f"{prefix}{full_name}{prefix}"
+
+        return f"({clan_tag}) {full_name}" if clan_tag is not None else full_name
+
+
+    @classmethod
+    def _build_state(cls, game_data: GameSchema, psql_cursor: DictCursor) -> dict[str, dict]:
+        """Собирает состояние раунда из postgresql: {"game": поля игры, "bank": поля "Банк", "users": user_id -> поля}"""
+
+        game = game_data.dict(exclude={"time_left", "end_datetime"})
+        game["game_mode"] = game_data.game_mode.value
+
+        game_fields = {"game": json.dumps(game)}
+
+        if game_data.end_datetime is not None:
+            game_fields["end_ts"] = str(time.time() + game_data.time_left)
+            game_fields["end_datetime"] = game_data.end_datetime.isoformat()
+
+        psql_cursor.execute("""
+            SELECT rates.user_id, rates.rate_type,
+                   SUM(rates.amount) as amount,
+                   users.full_name as user_full_name,
+                   users.status as user_status,
+                   clans.tag as clan_tag
+            FROM rates
+                JOIN users ON rates.user_id = users.user_id
+                LEFT JOIN clans ON users.show_clan_tag AND clans.clan_id = users.clan_id
+            WHERE rates.game_id = %(game_id)s
+            GROUP BY rates.user_id, rates.rate_type, users.full_name, users.status, clans.tag
+        """, {
+            "game_id": game_data.game_id
+        })
+
+        bank_fields = {}
+        users_fields = {}
+
+        for rate in psql_cursor.fetchall():
+            status = UserStatus(rate["user_status"]) if rate["user_status"] else None
+            total_field = f"total:{rate['rate_type']}"
+            bank_fields[f"rate:{rate['user_id']}:{rate['rate_type']}"] = str(rate["amount"])
+            bank_fields[total_field] = str(int(bank_fields.get(total_field, 0)) + rate["amount"])
+            bank_fields[f"name:{rate['user_id']}"] = cls.get_user_name(rate["user_full_name"], status, rate["clan_tag"])
+            users_fields.setdefault(rate["user_id"], {})[f"rate:{rate['rate_type']}"] = str(rate["amount"])
+
+        return {"game": game_fields, "bank": bank_fields, "users": users_fields}
+
+
+    @classmethod
+    def _load(
+            cls,
+            game_id: int,
+            psql_cursor: DictCursor,
+            bank: bool = False,
+            user_ids: list[int] = ()
+    ) -> tuple[dict[str, dict] | None, GameSchema | None]:
+        """Возвращает (состояние раунда, игра из postgresql если состояние не найдено)"""
+        # Читаются только нужные ключи: игра, "Банк" (bank=True) и ставки пользователей (user_ids)
+
+        redis_cursor = get_shared_redis_cursor()
+
+        try:
+            pipeline = redis_cursor.pipeline(transaction=True)
+            pipeline.hgetall(cls._get_game_key(game_id))
+            if bank:
+                pipeline.hgetall(cls._get_key(game_id))
+            for user_id in user_ids:
+                pipeline.hgetall(cls._get_user_key(game_id, user_id))
+            pipeline.get(cls._get_version_key(game_id))
+            response = pipeline.execute()
+
+            game_fields = response[0]
+            if "game" in game_fields:
+                return {
+                    "game": game_fields,
+                    "bank": response[1] if bank else {},
+                    "users": dict(zip(user_ids, response[1 + bank:-1]))
+                }, None
+
+            version = response[-1] or "0"
+
+        except RedisError as error:
+            print(f"[ROUND STATE WARNING] состояние недоступно: {error}", flush=True)
+            return None, get_game_data(game_id, psql_cursor)
+
+        game_data = get_game_data(game_id, psql_cursor)
+
+        # Подсчитанные раунды не кэшируются, их читают редко
+        if game_data is None or not game_data.is_active:
+            return None, game_data
+
+        state = cls._build_state(game_data, psql_cursor)
+
+        try:
+            redis_cursor.register_script(_SAVE_STATE_SCRIPT)(
+                keys=[
+                    cls._get_game_key(game_id), cls._get_key(game_id),
+                    cls._get_version_key(game_id), cls._get_users_key(game_id)
+                ],
+                args=[version, RoundStateSettings.TTL, cls._get_user_key_prefix(game_id), json.dumps(state)]
+            )
+        except RedisError as error:
+            print(f"[ROUND STATE WARNING] не удалось сохранить состояние: {error}", flush=True)
+
+        return state, None
+
+
+    @classmethod
+    def _get_state(
+            cls,
+            game_id: int,
+            psql_cursor: DictCursor,
+            bank: bool = False,
+            user_ids: list[int] = ()
+    ) -> dict[str, dict]:
+        """Возвращает состояние раунда, без redis собирает его из postgresql"""
+
+        state, game_data = cls._load(game_id, psql_cursor, bank=bank, user_ids=user_ids)
+        if state is None:
+            state = cls._build_state(game_data, psql_cursor) if game_data else {"game": {}, "bank": {}, "users": {}}
+
+        return state
+
+
+    @classmethod
+    def _run_script(cls, script: str, keys: list[str], args: list) -> int | None:
+        """Выполняет lua скрипт состояния, при ошибке redis возвращает None"""
+
+        try:
+            return get_shared_redis_cursor().register_script(script)(keys=keys, args=args)
+        except RedisError as error:
+            print(f"[ROUND STATE WARNING] не удалось изменить состояние: {error}", flush=True)
+            return None
+
+
+    @classmethod
+    def get_game(cls, game_id: int, psql_cursor: DictCursor) -> GameSchema | None:
+        """Возвращает данные игры (get_game_data) из состояния раунда"""
+
+        state, game_data = cls._load(game_id, psql_cursor)
+        if state is None:
+            return game_data
+
+        game_fields = state["game"]
+        game = json.loads(game_fields["game"])
+
+        if game_fields.get("end_ts"):
+            game["time_left"] = int(float(game_fields["end_ts"]) - time.time())
+            game["end_datetime"] = datetime.fromisoformat(game_fields["end_datetime"])
+
+        return GameSchema(**game)
+
+
+    @classmethod
+    def _get_rates(cls, bank_fields: dict[str, str]) -> list[RoundRate]:
+        """Возвращает суммы ставок из полей "Банк" """
+
+        rates = []
+        for field, amount in bank_fields.items():
+            if not field.startswith("rate:"):
+                continue
+
+            _, user_id, rate_type = field.split(":", 2)
+            user_name = bank_fields.get(f"name:{user_id}") or f"User {user_id}"
+            rates.append(RoundRate(int(user_id), rate_type, int(amount), user_name))
+
+        return rates
+
+
+    @classmethod
+    def get_rates(cls, game_id: int, psql_cursor: DictCursor) -> list[RoundRate]:
+        """Возвращает суммы ставок раунда по пользователям и событиям"""
+
+        return cls._get_rates(cls._get_state(game_id, psql_cursor, bank=True)["bank"])
+
+
+    @classmethod
+    def get_bank(
+            cls,
+            game_id: int,
+            psql_cursor: DictCursor
+    ) -> tuple[dict[str, int], dict[str, list[RoundRate]]]:
+        """Возвращает суммы ставок по событиям и ставки каждого события (по убыванию суммы)"""
+
+        bank_fields = cls._get_state(game_id, psql_cursor, bank=True)["bank"]
+
+        totals = {
+            field.split(":", 1)[1]: int(amount)
+            for field, amount in bank_fields.items() if field.startswith("total:")
+        }
+
+        rates = {rate_type: [] for rate_type in totals}
+        for rate in cls._get_rates(bank_fields):
+            rates.setdefault(rate.rate_type, []).append(rate)
+
+        for rate_type_rates in rates.values():
+            rate_type_rates.sort(key=lambda rate: rate.amount, reverse=True)
+
+        return totals, rates
+
+
+    @classmethod
+    def get_bank_message(cls, game_id: int) -> str | None:
+        """Возвращает текст "Банк", если он уже собирался в эту секунду"""
+
+        try:
+            second, message = get_shared_redis_cursor().hmget(cls._get_key(game_id), "bank_second", "bank_message")
+        except RedisError as error:
+            print(f"[ROUND STATE WARNING] состояние недоступно: {error}", flush=True)
+            return None
+
+        return message if second == str(int(time.time())) else None
+
+
+    @classmethod
+    def save_bank_message(cls, game_id: int, message: str) -> None:
+        """Сохраняет текст "Банк" на текущую секунду (время до конца раунда в нем указано в секундах)"""
+
+        try:
+            get_shared_redis_cursor().register_script(_SAVE_BANK_MESSAGE_SCRIPT)(
+                keys=[cls._get_game_key(game_id), cls._get_key(game_id)],
+                args=[int(time.time()), message]
+            )
+        except RedisError as error:
+            print(f"[ROUND STATE WARNING] не удалось сохранить текст банка: {error}", flush=True)
+
+
+    @classmethod
+    def get_users_rates(
+            cls,
+            game_id: int,
+            user_ids: list[int],
+            psql_cursor: DictCursor
+    ) -> dict[int, tuple[dict[str, int], str]]:
+        """Возвращает для пользователей суммы их ставок в раунде по событиям и номер их изменения (для reserve_rates)"""
+
+        users_fields = cls._get_state(game_id, psql_cursor, user_ids=user_ids)["users"]
+        users_rates = {}
+
+        for user_id in user_ids:
+            user_fields = users_fields.get(user_id, {})
+            users_rates[user_id] = {
+                field.split(":", 1)[1]: int(amount)
+                for field, amount in user_fields.items()
+                if field.startswith("rate:") and int(amount) > 0
+            }, user_fields.get("version", "0")
+
+        return users_rates
+
+
+    @classmethod
+    def get_user_rates(cls, game_id: int, user_id: int, psql_cursor: DictCursor) -> tuple[dict[str, int], str]:
+        """Возвращает суммы ставок пользователя в раунде по событиям и номер их изменения (для reserve_rates)"""
+
+        return cls.get_users_rates(game_id, [user_id], psql_cursor)[user_id]
+
+
+    @classmethod
+    def reserve_rates(cls, game_id: int, user_id: int, version: str, rates: list[tuple[str, int, int]]) -> bool | None:
+        """Атомарно увеличивает суммы ставок пользователя (rate_type, amount, лимит) до записи в postgresql"""
+        # True - суммы увеличены, False - ставки пользователя изменились или лимит превышен (нужно проверить заново),
+        # None - состояния нет или redis недоступен (ставки проверены только по postgresql)
+
+        amounts = {}  # Событие -> [сумма, лимит]
+        for rate_type, amount, rate_limit in rates:
+            amounts.setdefault(rate_type, [0, rate_limit])[0] += amount
+
+        args = [RoundStateSettings.TTL, version, user_id]
+        for rate_type, (amount, rate_limit) in amounts.items():
+            args.extend([rate_type, amount, rate_limit])
+
+        reserved = cls._run_script(
+            _RESERVE_RATES_SCRIPT,
+            keys=[
+                cls._get_game_key(game_id), cls._get_user_key(game_id, user_id),
+                cls._get_users_key(game_id), cls._get_key(game_id)
+            ],
+            args=args
+        )
+
+        return None if reserved in (None, -1) else bool(reserved)
+
+
+    @classmethod
+    def release_rates(cls, game_id: int, user_id: int, rates: list[tuple[str, int]]) -> None:
+        """Снимает резерв ставок пользователя (rate_type, amount), которые не записались в postgresql"""
+
+        args = []
+        for rate_type, amount in rates:
+            args.extend([rate_type, amount])
+
+        released = cls._run_script(_RELEASE_RATES_SCRIPT, keys=[cls._get_user_key(game_id, user_id)], args=args)
+
+        if released is None:
+            # Суммы пользователя остались завышенными, состояние соберется заново
+            cls.finish(game_id)
+
+
+    @classmethod
+    def add_rates(cls, game_id: int, user_data: UserSchema, rates: list[tuple[str, int]], reserved: bool = True) -> None:
+        """Добавляет в состояние раунда принятые ставки пользователя (rate_type, amount)"""
+        # Вызывается после коммита ставок в postgresql, reserved - суммы пользователя уже увеличены reserve_rates
+
+        # full_name из get_user_data уже с префиксом статуса и тегом клана
+        args = [RoundStateSettings.TTL, user_data.user_id, user_data.full_name, "1" if reserved else "0"]
+        for rate_type, amount in rates:
+            args.extend([rate_type, amount])
+
+        changed = cls._run_script(
+            _ADD_RATES_SCRIPT,
+            keys=[
+                cls._get_game_key(game_id), cls._get_key(game_id), cls._get_version_key(game_id),
+                cls._get_user_key(game_id, user_data.user_id), cls._get_users_key(game_id)
+            ],
+            args=args
+        )
+
+        if changed is None:
+            # Состояние могло устареть, удаляем его чтобы оно собралось заново
+            cls.finish(game_id)
+
+
+    @classmethod
+    def set_end(cls, game_id: int, end_timestamp: float, end_datetime: datetime) -> None:
+        """Записывает срок окончания запущенного раунда"""
+
+        changed = cls._run_script(
+            _SET_END_SCRIPT,
+            keys=[cls._get_game_key(game_id), cls._get_key(game_id), cls._get_version_key(game_id)],
+            args=[RoundStateSettings.TTL, str(end_timestamp), end_datetime.isoformat()]
+        )
+
+        if changed is None:
+            cls.finish(game_id)
+
+
+    @classmethod
+    def finish(cls, game_id: int) -> None:
+        """Удаляет состояние подсчитанного или удаленного раунда"""
+
+        try:
+            get_shared_redis_cursor().register_script(_FINISH_SCRIPT)(
+                keys=[
+                    cls._get_game_key(game_id), cls._get_key(game_id),
+                    cls._get_version_key(game_id), cls._get_users_key(game_id)
+                ],
+                args=[RoundStateSettings.TTL, cls._get_user_key_prefix(game_id)]
+            )
+
+        except RedisError as error:
+            # Раунд перестанет читаться из состояния через RoundStateSettings.TTL секунд
+            print(f"[ROUND STATE WARNING] не удалось удалить состояние раунда {game_id}: {error}", flush=True)
@@ -0,0 +1,83 @@
+import random
+import threading
+from typing import Callable, Generic, Sequence, TypeVar
+
+
+T = TypeVar("T")
+
+
+"""
+    Выбор исхода игры с весами
+
+    random.choices(outcomes, weights) на каждый вызов заново суммирует все веса,
+    для авиатора это 100к чисел на раунд. WeightedSampler один раз строит
+    alias-таблицу (метод Vose) при первом выборе, дальше выбор занимает O(1)
+
+    Пример:
+        DOUBLE_SAMPLER = WeightedSampler(lambda: (DOUBLE_COEFFICIENT, DOUBLE_COEFFICIENT_CHANCES))
+        coefficient = DOUBLE_SAMPLER.sample()
+"""
+
+
+class WeightedSampler(Generic[T]):
+    """Выбор исхода с весами через alias-таблицу"""
+
+    def __init__(self, build: Callable[[], tuple[Sequence[T], Sequence[float]]]) -> None:
+        # build возвращает (исходы, веса), вызывается только при первом выборе
+
+        self._build = build
+        self._lock = threading.Lock()
+
+        self._outcomes: Sequence[T] | None = None
+        self._probability: list[float] = []
+        self._alias: list[int] = []
+
+
+    def _build_table(self) -> None:
+        """Строит alias-таблицу"""
+
+        outcomes, weights = self._build()
+        count = len(outcomes)
+
+        if count == 0 or count != len(weights):
+            raise ValueError("outcomes and weights must be non-empty and of the same length")
+
+        total = sum(weights)
+        scaled = [weight * count / total for weight in weights]
+
+        probability = [1.0] * count
+        alias = list(range(count))
+
+        small = [i for i, x in enumerate(scaled) if x < 1]
+        large = [i for i, x in enumerate(scaled) if x >= 1]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+
+            probability[less] = scaled[less]
+            alias[less] = more
+
+            scaled[more] = scaled[more] + scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+
+        # Остатки из-за погрешности float равны 1
+
+        self._probability = probability
+        self._alias = alias
+        self._outcomes = outcomes
+
+
+    def sample(self) -> T:
+        """Возвращает случайный исход с учетом весов"""
+
+        if self._outcomes is None:
+            with self._lock:
+                if self._outcomes is None:
+                    self._build_table()
+
+        index = random.randrange(len(self._outcomes))
+
+        if random.random() < self._probability[index]:
+            return self._outcomes[index]
+
+        return self._outcomes[self._alias[index]]
@@ -0,0 +1,261 @@
+import os
+import time
+import heapq
+import asyncio
+import threading
+import traceback
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from settings import RoundSchedulerSettings
+
+
+"""
+    Планировщик окончания раундов
+
+    Раньше на каждую запущенную игру создавался поток с asyncio.run,
+    который спал до конца таймера. Теперь все сроки окончания лежат в одной куче
+    и обслуживаются одним event loop в отдельном потоке, а подсчет результатов
+    выполняется в фиксированном пуле из MAX_CONCURRENT_SETTLEMENTS потоков
+
+    Пример:
+        get_round_scheduler().schedule(game_id, WheelGameModel, time_left)
+"""
+
+
+class RoundScheduler:
+    """Очередь сроков окончания раундов"""
+
+    def __init__(
+            self,
+            max_concurrent_settlements: int = RoundSchedulerSettings.MAX_CONCURRENT_SETTLEMENTS
+    ) -> None:
+
+        self.max_concurrent_settlements = max_concurrent_settlements
+
+        self._heap: list[tuple[float, int, int]] = []  # (срок, порядковый номер, game_id)
+        self._entries: dict[int, tuple[float, int, Any, float]] = {}
+        # game_id -> (срок, порядковый номер, игровая модель, time_left)
+        self._sequence = 0
+
+        self._lock = threading.Lock()
+        self._started = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_settlements,
+            thread_name_prefix="round"
+        )
+        self._thread_loops = threading.local()  # event loop каждого потока пула
+        self._settlements: set[asyncio.Task] = set()  # event loop хранит задачи только по слабым ссылкам
+
+        self._dispatched = 0  # Раунды, у которых вышло время
+        self._waiting = 0  # Раунды, у которых вышло время, но нет свободного потока
+        self._running = 0  # Раунды, которые сейчас подсчитываются
+        self._settled = 0  # Подсчитано раундов
+        self._failed = 0  # Раунды завершившиеся ошибкой
+        self._lag_total = 0.0  # Суммарное опоздание таймеров
+        self._lag_max = 0.0  # Максимальное опоздание таймера
+        self._last_stats_log = time.monotonic()
+
+
+    def start(self) -> None:
+        """Запускает поток планировщика"""
+
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+
+        threading.Thread(target=self._run_loop, name="round-scheduler", daemon=True).start()
+        self._started.wait()
+
+
+    def _run_loop(self) -> None:
+        """Event loop планировщика"""
+
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        self._started.set()
+        self._loop.run_until_complete(self._dispatch())
+
+
+    def schedule(self, game_id: int, game_model: Any, time_left: float) -> None:
+        """Ставит раунд в очередь на подсчет результатов через time_left секунд"""
+        # Можно вызывать из любого потока, повторный вызов переносит срок
+
+        self.start()
+
+        # Результаты подсчитываются за DELAY_BEFORE_RESULT до конца таймера (см. submit_results)
+        delay = max(time_left - game_model.DELAY_BEFORE_RESULT, 0)
+        deadline = time.monotonic() + delay
+
+        with self._lock:
+            self._sequence += 1
+            self._entries[game_id] = (deadline, self._sequence, game_model, time_left)
+            heapq.heappush(self._heap, (deadline, self._sequence, game_id))
+
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+
+    def cancel(self, game_id: int) -> None:
+        """Убирает раунд из очереди"""
+
+        with self._lock:
+            self._entries.pop(game_id, None)
+
+
+    def _pop_due(self, now: float) -> list[tuple[int, Any, float, float]]:
+        """Достает из кучи раунды, у которых вышло время"""
+
+        due = []
+
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, sequence, game_id = heapq.heappop(self._heap)
+                entry = self._entries.get(game_id)
+
+                # Запись отменена или срок перенесен
+                if entry is None or entry[1] != sequence:
+                    continue
+
+                del self._entries[game_id]
+                due.append((game_id, entry[2], entry[3], deadline))
+
+        return due
+
+
+    def _next_deadline(self) -> float | None:
+        """Возвращает ближайший срок"""
+
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+
+    async def _dispatch(self) -> None:
+        """Ждет ближайший срок и отправляет раунды на подсчет"""
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_settlements)
+
+        while True:
+            next_deadline = self._next_deadline()
+            timeout = None if next_deadline is None else max(next_deadline - time.monotonic(), 0)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            now = time.monotonic()
+            for game_id, game_model, time_left, deadline in self._pop_due(now):
+                lag = now - deadline
+                self._dispatched += 1
+                self._lag_total += lag
+                self._lag_max = max(self._lag_max, lag)
+                self._waiting += 1
+                settlement = asyncio.create_task(self._settle(semaphore, game_id, game_model, time_left))
+                self._settlements.add(settlement)
+                settlement.add_done_callback(self._settlements.discard)
+
+            self._log_stats(now)
+
+
+    async def _settle(
+            self,
+            semaphore: asyncio.Semaphore,
+            game_id: int,
+            game_model: Any,
+            time_left: float
+    ) -> None:
+        """Подсчитывает результаты раунда в пуле потоков"""
+
+        async with semaphore:
+            self._waiting -= 1
+            self._running += 1
+
+            try:
+                await self._loop.run_in_executor(
+                    self._executor,
+                    partial(self._run_submit_results, game_id, game_model, time_left)
+                )
+                self._settled += 1
+            except Exception as e:
+                self._failed += 1
+                print(f"[GAME ERROR] submit_results failed for game {game_id}: {e}", flush=True)
+                traceback.print_exc()
+            finally:
+                self._running -= 1
+
+
+    def _run_submit_results(self, game_id: int, game_model: Any, time_left: float) -> None:
+        """Выполняет submit_results в потоке пула"""
+
+        # У каждого потока пула свой постоянный event loop, поэтому
+        # Bot (modules.telegram.bot.get_bot) и его соединения переиспользуются между раундами
+        loop = getattr(self._thread_loops, "loop", None)
+        if loop is None:
+            loop = self._thread_loops.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+        # До конца таймера осталось DELAY_BEFORE_RESULT, submit_results пересчитает его по базе
+        loop.run_until_complete(game_model.submit_results(game_id, min(time_left, game_model.DELAY_BEFORE_RESULT)))
+
+
+    def _log_stats(self, now: float) -> None:
+        """Раз в STATS_LOG_INTERVAL секунд пишет статистику в лог"""
+
+        if now - self._last_stats_log < RoundSchedulerSettings.STATS_LOG_INTERVAL:
+            return
+
+        self._last_stats_log = now
+        print(f"[ROUND SCHEDULER] stats: {self.get_stats()}", flush=True)
+
+
+    def get_stats(self) -> dict:
+        """Возвращает статистику планировщика"""
+
+        with self._lock:
+            queue_depth = len(self._entries)
+
+        dispatched = self._dispatched
+
+        return {
+            "queue_depth": queue_depth,
+            "waiting": self._waiting,
+            "running": self._running,
+            "settled": self._settled,
+            "failed": self._failed,
+            "max_concurrent_settlements": self.max_concurrent_settlements,
+            "lag_avg_ms": round(self._lag_total / dispatched * 1000, 3) if dispatched else 0,
+            "lag_max_ms": round(self._lag_max * 1000, 3)
+        }
+
+
+_scheduler: RoundScheduler | None = None
+_scheduler_pid: int | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_round_scheduler() -> RoundScheduler:
+    """Возвращает планировщик раундов текущего процесса"""
+
+    global _scheduler, _scheduler_pid
+
+    if _scheduler is not None and _scheduler_pid == os.getpid():
+        return _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None or _scheduler_pid != os.getpid():
+            # Поток планировщика не переживает fork, в новом процессе создаем свой
+            _scheduler = RoundScheduler()
+            _scheduler_pid = os.getpid()
+
+    return _scheduler
+
+
+def get_round_scheduler_stats() -> dict:
+    """Возвращает статистику планировщика раундов"""
+
+    return get_round_scheduler().get_stats()
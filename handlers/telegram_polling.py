@@ -1,7 +1,8 @@
 import asyncio
 import traceback
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters
+from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, ChatMemberHandler, \
+    filters
 
 from settings import TelegramBotSettings
 from telegram_bot.routers.telegram_router import bot_event_router
@@ -23,6 +24,11 @@ async def telegram_polling() -> None:
         if update.callback_query:
             await bot_event_router(update, from_polling=True)
 
+    # Обработчик подписки и отписки от канала бонусов
+    async def chat_member_handler(update: Update, context):
+        if update.chat_member:
+            await bot_event_router(update, from_polling=True)
+
     # Обрабатываем все текстовые сообщения (включая команды)
     # В группах обрабатываем все сообщения, не только текстовые
     application.add_handler(MessageHandler(filters.TEXT | filters.COMMAND, message_handler))
@@ -30,6 +36,8 @@ async def telegram_polling() -> None:
     application.add_handler(MessageHandler(filters.ALL & ~filters.TEXT & ~filters.COMMAND & ~filters.StatusUpdate.ALL, message_handler))
     # Обрабатываем callback queries
     application.add_handler(CallbackQueryHandler(callback_query_handler))
+    # Обрабатываем изменения участников канала (бот должен быть администратором канала)
+    application.add_handler(ChatMemberHandler(chat_member_handler, ChatMemberHandler.CHAT_MEMBER))
 
     # Запуск polling
     print("Initializing application...", flush=True)
@@ -37,7 +45,8 @@ async def telegram_polling() -> None:
     print("Starting application...", flush=True)
     await application.start()
     print("Starting polling...", flush=True)
-    await application.updater.start_polling()
+    # chat_member не приходит без явного запроса в allowed_updates
+    await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
     print("Bot is running and waiting for messages...", flush=True)
     
     # Бесконечный цикл
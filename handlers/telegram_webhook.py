@@ -1,9 +1,9 @@
 import json
 import traceback
 from fastapi import APIRouter, Request, HTTPException
-from telegram import Update, Bot
+from telegram import Update
 
-from settings import TelegramBotSettings
+from modules.telegram.bot import get_bot
 from telegram_bot.routers.telegram_router import bot_event_router
 
 
@@ -16,7 +16,7 @@ async def telegram_webhook_handler(request: Request) -> dict:
 
     try:
         body = await request.json()
-        update = Update.de_json(body, Bot(token=TelegramBotSettings.BOT_TOKEN))
+        update = Update.de_json(body, get_bot())
         
         if update:
             await bot_event_router(update, from_polling=False)
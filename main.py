@@ -2,6 +2,7 @@ from fastapi import FastAPI
 
 from settings import FastApiSettings
 from root_router import root_router
+from modules.telegram.bot import startup_bot, shutdown_bot, set_webhook
 
 prefix = FastApiSettings.ROOT_PREFIX
 app = FastAPI(
@@ -15,3 +16,18 @@ app = FastAPI(
 )
 
 app.include_router(root_router)
+
+
+@app.on_event("startup")
+async def on_startup() -> None:
+    """Открывает соединение с Bot API в воркере и регистрирует webhook"""
+
+    await startup_bot()
+    await set_webhook()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    """Закрывает соединения с Bot API воркера"""
+
+    await shutdown_bot()
@@ -1,6 +1,8 @@
 import json
 from psycopg2.extras import DictCursor
 
+from databases.executor import to_async
+
 from schemas.games import Games, GameSchema
 from schemas.chats import ChatSchema, ChatType
 
@@ -14,12 +16,11 @@ def get_chat_data(
     if chat_id is None:
         return None
 
+    # current_game_id обновляет триггер при создании игры (raise_database.add_chats_current_game)
     psql_cursor.execute("""
-        SELECT chats.*, MAX(games.game_id) as game_id
+        SELECT *, current_game_id as game_id
         FROM chats
-        LEFT JOIN games ON chats.chat_id = games.chat_id
-        WHERE chats.chat_id = %(chat_id)s
-        GROUP BY chats.chat_id
+        WHERE chat_id = %(chat_id)s
     """, {
         "chat_id": chat_id
     })
@@ -52,3 +53,8 @@ def get_game_data(
     game_data = GameSchema(**psql_response)
 
     return game_data
+
+
+# Асинхронные версии для обработчиков (запрос выполняется в пуле потоков)
+async_get_chat_data = to_async(get_chat_data)
+async_get_game_data = to_async(get_game_data)
@@ -1,10 +1,12 @@
 import json
 from pydantic import BaseModel
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
 
 from settings import Config
+from databases.executor import to_async
 
 from schemas.users import UserSchema, UserMenu
+from services.periods import PeriodsService
 
 
 def get_user_data(
@@ -14,9 +16,17 @@ def get_user_data(
     """Возвращает данные пользователя из базы данных"""
 
     if user_id is not None:
-        psql_cursor.execute("SELECT * FROM users WHERE user_id = %(user_id)s", {"user_id": user_id})
+        psql_cursor.execute(f"""
+            SELECT *, {PeriodsService.get_current_periods_sql()} as current_periods
+            FROM users
+            WHERE user_id = %(user_id)s
+        """, {"user_id": user_id})
         psql_response = psql_cursor.fetchone()
 
+        if psql_response is not None:
+            # Счетчики прошлых периодов (день, неделя, топы) равны 0
+            psql_response = PeriodsService.reset_stale_counters(psql_response)
+
         if psql_response is not None and psql_response["extra_data"] is not None:
             psql_response["extra_data"] = json.loads(psql_response["extra_data"])
 
@@ -268,6 +278,26 @@ def reward_users_rubles_top(
     })
 
 
+def reward_users_tops(
+        rewards: list[tuple[int, int, int, int]],
+        psql_cursor: DictCursor
+) -> None:
+    """Награждает пользователей за топы одним UPDATE"""
+    # rewards - [(user_id, coins, rubles, top_profit)], user_id не должны повторяться
+
+    if not rewards:
+        return
+
+    execute_values(psql_cursor, """
+        UPDATE users
+        SET coins = users.coins + reward.coins,
+            rubles = users.rubles + reward.rubles,
+            top_profit = users.top_profit + reward.top_profit
+        FROM (VALUES %s) AS reward (user_id, coins, rubles, top_profit)
+        WHERE users.user_id = reward.user_id
+    """, rewards, page_size=len(rewards))
+
+
 def update_users_last_activity(
         user_id: int,
         psql_cursor: DictCursor
@@ -301,3 +331,11 @@ def update_free_nick_change(
         "change": change,
         "user_id": user_id
     })
+
+
+# Асинхронные версии для обработчиков (запрос выполняется в пуле потоков)
+async_get_user_data = to_async(get_user_data)
+async_give_coins = to_async(give_coins)
+async_take_coins = to_async(take_coins)
+async_update_user_menu = to_async(update_user_menu)
+async_update_users_last_activity = to_async(update_users_last_activity)
@@ -0,0 +1,49 @@
+"""
+    Keyset пагинация
+
+    OFFSET заставляет базу пройти все строки предыдущих страниц, поэтому
+    следующая страница ищется по ключу последней строки прошлой страницы (after),
+    а предыдущая - по ключу первой строки (before). В payload кнопок хранится только ключ
+
+    Запрос выполняется с LIMIT limit + 1, лишняя строка показывает что есть еще страница
+
+    Пример:
+        condition = get_keyset_condition("chat_id", "%(cursor)s", descending=False, backward=before is not None)
+        order = get_keyset_order(["chat_id"], descending=False, backward=before is not None)
+        items, back_page, next_page = split_keyset_page(rows, limit, after=after, before=before)
+"""
+
+
+def get_keyset_condition(columns: str, cursor_sql: str, *, descending: bool, backward: bool) -> str:
+    """Возвращает SQL условие строк после курсора в направлении листания"""
+
+    operator = ">" if descending == backward else "<"
+    return f"({columns}) {operator} ({cursor_sql})"
+
+
+def get_keyset_order(columns: list[str], *, descending: bool, backward: bool) -> str:
+    """Возвращает SQL сортировку в направлении листания"""
+    # При листании назад строки выбираются в обратном порядке и разворачиваются в split_keyset_page
+
+    direction = "ASC" if descending == backward else "DESC"
+    return ", ".join(f"{column} {direction}" for column in columns)
+
+
+def split_keyset_page(
+        items: list,
+        limit: int,
+        *,
+        after: int | None,
+        before: int | None
+) -> tuple[list, bool, bool]:
+    """Возвращает (элементы страницы, есть предыдущая страница, есть следующая страница)"""
+    # items - строки запроса с LIMIT limit + 1 в порядке get_keyset_order
+
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    if before is not None:
+        items.reverse()
+        return items, has_more, True
+
+    return items, after is not None, has_more
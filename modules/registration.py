@@ -2,6 +2,7 @@ from redis.client import Redis
 from psycopg2.extras import DictCursor
 
 from settings import Config, Temp
+from databases.executor import run_sync
 
 from schemas.users import UserSchema
 from services.incomes import IncomesService
@@ -34,11 +35,11 @@ async def first_greeting(
         telegram_username = user_telegram_data.get("username", "") if user_telegram_data else ""
         
         full_name = SecurityService.replace_banned_symbols(full_name)
-        user_data = register_user(user_id, full_name, psql_cursor)
+        user_data = await run_sync(register_user, user_id, full_name, psql_cursor)
 
         # Сохраняем telegram_username
         if telegram_username:
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET telegram_username = %s
                 WHERE user_id = %s
@@ -66,8 +67,8 @@ async def first_greeting(
             )
 
         if is_arabic_language(full_name):
-            update_user_name(user_id, "Empty", psql_cursor)
-            update_free_nick_change(user_id, True, psql_cursor)
+            await run_sync(update_user_name, user_id, "Empty", psql_cursor)
+            await run_sync(update_free_nick_change, user_id, True, psql_cursor)
             await send_message(
                 chat_id=user_id,
                 message="⚠ Ваш никнейм был изменён, т.к содержит запрещённые символы, "
@@ -97,7 +98,7 @@ async def get_start_bonus(
 
     try:
         if user_data.start_bonus is False:
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET coins = coins + %(reward)s,
                     start_bonus = TRUE
@@ -0,0 +1,279 @@
+import os
+import time
+import asyncio
+import threading
+import traceback
+from typing import Awaitable, Callable
+
+from redis.client import Redis
+from redis.lock import Lock
+from redis.exceptions import RedisError, LockError
+
+from settings import BackgroundTasksSettings
+from schemas.redis import RedisKeys
+
+
+"""
+    Планировщик фоновых задач
+
+    Раньше каждая фоновая задача крутила свой while True в отдельном потоке с asyncio.run,
+    открывала соединения на каждую итерацию и теряла их при ошибке. Теперь задача - это одна
+    итерация (async функция без аргументов), а расписание, таймаут, повтор после ошибки
+    и статистика задаются в TaskRunner. Все задачи выполняются в одном event loop,
+    соединения берутся из общего пула postgresql и общего клиента redis
+
+    Задачи выполняет только один процесс (ведущий), который держит блокировку
+    BACKGROUND_TASKS_LEADER в redis. Остальные процессы ждут и становятся ведущим,
+    если блокировка не продлевалась LEADER_TTL секунд. Блокировка продлевается
+    из отдельного потока, чтобы задача занявшая event loop не потеряла ее,
+    а перед каждой итерацией задача проверяет, что процесс все еще ведущий
+
+    Задача может вернуть число секунд до следующего запуска, если ей нужно проснуться раньше
+    Одна задача не запускается повторно, пока не закончилась прошлая итерация
+
+    Пример:
+        TaskRunner([
+            BackgroundTask("check_games", check_games, IntervalTrigger(10), timeout=60),
+            BackgroundTask("every_day", every_day, DailyTrigger(hour=0, second=10, utc_offset=3 * 3600))
+        ]).run()
+"""
+
+
+class IntervalTrigger:
+    """Запуск через seconds секунд после окончания прошлой итерации"""
+
+    def __init__(self, seconds: float, run_at_start: bool = True) -> None:
+        self.seconds = seconds
+        self.run_at_start = run_at_start
+        self.backoff = True  # После ошибки пауза увеличивается (RESTART_BACKOFF_MIN...MAX)
+
+
+    def get_first_delay(self, now: float) -> float:
+        return 0 if self.run_at_start else self.seconds
+
+
+    def get_delay(self, now: float, requested: float | None) -> float:
+        if requested is None:
+            return self.seconds
+
+        return min(max(requested, 0), self.seconds)
+
+
+class DailyTrigger:
+    """Запуск каждый день в hour:minute:second (как cron "minute hour * * *")"""
+
+    def __init__(self, hour: int = 0, minute: int = 0, second: int = 0, utc_offset: int = 0) -> None:
+        # utc_offset - смещение часового пояса расписания в секундах
+
+        self.day_second = hour * 3600 + minute * 60 + second
+        self.utc_offset = utc_offset
+        self.backoff = False  # Ежедневные задачи не повторяются после ошибки, чтобы не выполнить их дважды
+
+
+    def get_first_delay(self, now: float) -> float:
+        return self.get_delay(now, None)
+
+
+    def get_delay(self, now: float, requested: float | None) -> float:
+        delay = (self.day_second - (now + self.utc_offset) % 86400) % 86400
+        return delay if delay > 0 else 86400
+
+
+class BackgroundTask:
+    """Фоновая задача"""
+
+    def __init__(
+            self,
+            name: str,
+            run: Callable[[], Awaitable[float | None]],
+            trigger: IntervalTrigger | DailyTrigger,
+            timeout: float | None = None
+    ) -> None:
+
+        self.name = name
+        self.run = run
+        self.trigger = trigger
+        self.timeout = timeout  # None - без ограничения
+
+        self.runs = 0  # Выполнено итераций
+        self.failures = 0  # Итерации завершившиеся ошибкой
+        self.timeouts = 0  # Итерации прерванные по таймауту
+        self.consecutive_failures = 0  # Ошибки подряд, от них зависит пауза перед повтором
+        self.running = False
+        self.duration_total = 0.0
+        self.duration_max = 0.0
+        self.last_duration = 0.0
+        self.last_error: str | None = None
+        self.next_run_at: float | None = None
+
+
+    def get_stats(self) -> dict:
+        """Возвращает статистику задачи"""
+
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "consecutive_failures": self.consecutive_failures,
+            "running": self.running,
+            "duration_avg_ms": round(self.duration_total / self.runs * 1000, 3) if self.runs else 0,
+            "duration_max_ms": round(self.duration_max * 1000, 3),
+            "last_duration_ms": round(self.last_duration * 1000, 3),
+            "last_error": self.last_error,
+            "next_run_in": round(self.next_run_at - time.time(), 1) if self.next_run_at else None
+        }
+
+
+class TaskRunner:
+    """Выполняет фоновые задачи в одном процессе"""
+
+    def __init__(self, tasks: list[BackgroundTask], redis_cursor: Redis) -> None:
+        self.tasks = tasks
+        self.redis_cursor = redis_cursor
+        self.is_leader = False
+        self._last_stats_log = time.monotonic()
+
+
+    async def run(self) -> None:
+        """Ждет, пока процесс станет ведущим, и выполняет задачи пока он ведущий"""
+
+        # thread_local=False - блокировку продлевает поток _renew_leader_lock
+        leader_lock = self.redis_cursor.lock(
+            RedisKeys.BACKGROUND_TASKS_LEADER.value,
+            timeout=BackgroundTasksSettings.LEADER_TTL,
+            thread_local=False
+        )
+
+        while True:
+            try:
+                self.is_leader = leader_lock.acquire(blocking=False)
+            except RedisError as error:
+                print(f"[TASKS WARNING] не удалось проверить ведущий процесс: {error}", flush=True)
+
+            if not self.is_leader:
+                await asyncio.sleep(BackgroundTasksSettings.LEADER_REFRESH_INTERVAL)
+                continue
+
+            print(f"[TASKS] процесс {os.getpid()} выполняет фоновые задачи", flush=True)
+
+            leader_lost = asyncio.Event()
+            stop_renewal = threading.Event()
+            threading.Thread(
+                target=self._renew_leader_lock,
+                args=(leader_lock, stop_renewal, asyncio.get_running_loop(), leader_lost),
+                name="tasks-leader", daemon=True
+            ).start()
+
+            supervisors = [asyncio.create_task(self._supervise(task)) for task in self.tasks]
+
+            try:
+                while not leader_lost.is_set():
+                    try:
+                        await asyncio.wait_for(leader_lost.wait(), BackgroundTasksSettings.LEADER_REFRESH_INTERVAL)
+                    except asyncio.TimeoutError:
+                        self._log_stats()
+
+            finally:
+                stop_renewal.set()
+                self.is_leader = False
+                for supervisor in supervisors:
+                    supervisor.cancel()
+                await asyncio.gather(*supervisors, return_exceptions=True)
+
+
+    def _renew_leader_lock(
+            self,
+            leader_lock: Lock,
+            stop_renewal: threading.Event,
+            loop: asyncio.AbstractEventLoop,
+            leader_lost: asyncio.Event
+    ) -> None:
+        """Продлевает блокировку ведущего в отдельном потоке, пока ее не потеряет или не остановят"""
+
+        while not stop_renewal.wait(BackgroundTasksSettings.LEADER_REFRESH_INTERVAL):
+            try:
+                leader_lock.reacquire()
+
+            except (LockError, RedisError) as error:
+                # Блокировку перехватил другой процесс или redis недоступен, задачи останавливаются
+                print(f"[TASKS WARNING] процесс {os.getpid()} больше не ведущий: {error}", flush=True)
+                self.is_leader = False
+                loop.call_soon_threadsafe(leader_lost.set)
+                return
+
+
+    async def _supervise(self, task: BackgroundTask) -> None:
+        """Запускает задачу по расписанию"""
+
+        delay = task.trigger.get_first_delay(time.time())
+
+        while True:
+            task.next_run_at = time.time() + delay
+            await asyncio.sleep(delay)
+
+            # Блокировку могли потерять, пока event loop был занят
+            if not self.is_leader:
+                return
+
+            requested = await self._run_once(task)
+            delay = task.trigger.get_delay(time.time(), requested)
+
+            if task.consecutive_failures and task.trigger.backoff:
+                backoff = BackgroundTasksSettings.RESTART_BACKOFF_MIN * 2 ** (task.consecutive_failures - 1)
+                delay = max(delay, min(backoff, BackgroundTasksSettings.RESTART_BACKOFF_MAX))
+
+
+    async def _run_once(self, task: BackgroundTask) -> float | None:
+        """Выполняет одну итерацию задачи, возвращает запрошенную задачей паузу"""
+
+        requested = None
+        started_at = time.monotonic()
+        task.running = True
+
+        try:
+            requested = await asyncio.wait_for(task.run(), task.timeout)
+            task.consecutive_failures = 0
+
+        except asyncio.TimeoutError:
+            task.timeouts += 1
+            task.failures += 1
+            task.consecutive_failures += 1
+            task.last_error = f"timeout {task.timeout}s"
+            print(f"[TASKS ERROR] {task.name}: прервана по таймауту {task.timeout}s", flush=True)
+
+        except Exception as error:
+            task.failures += 1
+            task.consecutive_failures += 1
+            task.last_error = repr(error)
+            print(f"[TASKS ERROR] {task.name}: {error!r}", flush=True)
+            traceback.print_exc()
+
+        finally:
+            duration = time.monotonic() - started_at
+            task.running = False
+            task.runs += 1
+            task.last_duration = duration
+            task.duration_total += duration
+            task.duration_max = max(task.duration_max, duration)
+
+        return requested
+
+
+    def _log_stats(self) -> None:
+        """Раз в STATS_LOG_INTERVAL секунд пишет статистику в лог"""
+
+        now = time.monotonic()
+        if now - self._last_stats_log < BackgroundTasksSettings.STATS_LOG_INTERVAL:
+            return
+
+        self._last_stats_log = now
+        print(f"[TASKS] stats: {self.get_stats()}", flush=True)
+
+
+    def get_stats(self) -> dict:
+        """Возвращает статистику задач"""
+
+        return {
+            "leader": self.is_leader,
+            "tasks": {task.name: task.get_stats() for task in self.tasks}
+        }
@@ -1,14 +1,509 @@
+import os
 import json
+import time
 import random
+import asyncio
+import threading
+from concurrent.futures import Future
+from enum import IntEnum
+from collections import deque
+from weakref import WeakKeyDictionary
 from typing import Optional
-from telegram import Bot, InlineKeyboardMarkup, ReplyKeyboardMarkup
-from telegram.error import TelegramError
+from telegram import Bot, Update, InlineKeyboardMarkup, ReplyKeyboardMarkup
+from telegram.error import TelegramError, RetryAfter, BadRequest
+from telegram.request import HTTPXRequest
 from telegram.constants import ParseMode
 
 from settings import TelegramBotSettings
 
 
+class _MeteredRequest(HTTPXRequest):
+    """HTTPXRequest который считает время ответа по методам Bot API"""
+
+    async def do_request(self, url: str, method: str, *args, **kwargs) -> tuple[int, bytes]:
+
+        api_method = url.rsplit("/", 1)[-1]
+        started_at = time.monotonic()
+        is_error = True
+
+        try:
+            code, payload = await super().do_request(url, method, *args, **kwargs)
+            is_error = code >= 400
+            return code, payload
+        finally:
+            _record_latency(api_method, time.monotonic() - started_at, is_error)
+
+
+_bots: "WeakKeyDictionary[asyncio.AbstractEventLoop, Bot]" = WeakKeyDictionary()
+# Свой Bot на каждый event loop: соединения httpx нельзя использовать из другого loop
+_stats: dict[str, dict] = {}  # Метод Bot API -> статистика
+_stats_lock = threading.Lock()
+
+
+def _record_latency(api_method: str, latency: float, is_error: bool) -> None:
+    """Записывает время ответа метода Bot API"""
+
+    with _stats_lock:
+        stats = _stats.setdefault(api_method, {"calls": 0, "errors": 0, "total": 0.0, "max": 0.0})
+        stats["calls"] += 1
+        stats["errors"] += int(is_error)
+        stats["total"] += latency
+        stats["max"] = max(stats["max"], latency)
+
+
+def get_bot() -> Bot:
+    """Возвращает Bot текущего event loop с общим пулом HTTP соединений"""
+
+    loop = asyncio.get_running_loop()
+    bot = _bots.get(loop)
+
+    if bot is None:
+        bot = Bot(
+            token=TelegramBotSettings.BOT_TOKEN,
+            request=_MeteredRequest(
+                connection_pool_size=TelegramBotSettings.HTTP_POOL_SIZE,
+                connect_timeout=TelegramBotSettings.HTTP_CONNECT_TIMEOUT,
+                read_timeout=TelegramBotSettings.HTTP_READ_TIMEOUT,
+                write_timeout=TelegramBotSettings.HTTP_WRITE_TIMEOUT,
+                pool_timeout=TelegramBotSettings.HTTP_POOL_TIMEOUT
+            )
+        )
+        _bots[loop] = bot
+
+    return bot
+
+
+async def startup_bot() -> None:
+    """Создает Bot текущего event loop и открывает соединение с Bot API"""
+
+    await get_bot().initialize()
+
+
+async def set_webhook() -> None:
+    """Регистрирует webhook с событиями chat_member, если задан WEBHOOK_URL"""
+    # Без allowed_updates Telegram не присылает chat_member (подписки на канал бонусов)
+
+    if not TelegramBotSettings.WEBHOOK_URL:
+        return None
+
+    await get_bot().set_webhook(
+        url=TelegramBotSettings.WEBHOOK_URL,
+        secret_token=TelegramBotSettings.WEBHOOK_SECRET or None,
+        allowed_updates=Update.ALL_TYPES
+    )
+
+
+async def shutdown_bot() -> None:
+    """Закрывает соединения Bot текущего event loop"""
+
+    bot = _bots.pop(asyncio.get_running_loop(), None)
+
+    if bot is not None:
+        await bot.shutdown()
+
+
+def get_bot_stats() -> dict:
+    """Возвращает статистику ответов Bot API по методам"""
+
+    with _stats_lock:
+        return {
+            api_method: {
+                "calls": stats["calls"],
+                "errors": stats["errors"],
+                "avg_ms": round(stats["total"] / stats["calls"] * 1000, 3),
+                "max_ms": round(stats["max"] * 1000, 3)
+            }
+            for api_method, stats in _stats.items()
+        }
+
+
+class MessagePriority(IntEnum):
+    """Приоритет сообщения в очереди отправки (меньше - раньше)"""
+
+    GAME_RESULT = 0  # Результаты раундов
+    USER = 1  # Ответы пользователям
+    NOTIFICATION = 2  # Логи администраторам
+
+
+class _TokenBucket:
+    """Ограничение частоты отправки (token bucket)"""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+
+        self.rate = rate  # Токенов в секунду
+        self.capacity = capacity  # Максимум токенов (допустимая пачка сообщений)
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0  # До этого времени отправка запрещена (retry_after)
+
+
+    def _refill(self, now: float) -> None:
+        """Добавляет токены за прошедшее время"""
+
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+    def wait_time(self, now: float) -> float:
+        """Возвращает сколько секунд ждать до следующей отправки"""
+
+        self._refill(now)
+
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+    def take(self) -> None:
+        """Забирает токен"""
+
+        self.tokens -= 1
+
+
+    def is_idle(self, now: float) -> bool:
+        """Показывает что ведро полное и его можно удалить"""
+
+        self._refill(now)
+        return self.tokens >= self.capacity and now >= self.blocked_until
+
+
+# Ограничения общие для всех event loop процесса
+_global_bucket = _TokenBucket(TelegramBotSettings.SEND_GLOBAL_RATE, TelegramBotSettings.SEND_GLOBAL_RATE)
+_chat_buckets: dict[int, _TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _get_chat_bucket(chat_id: int) -> _TokenBucket:
+    """Возвращает ограничение частоты для чата"""
+
+    bucket = _chat_buckets.get(chat_id)
+
+    if bucket is None:
+        # Отрицательный chat_id у групп и каналов
+        rate = TelegramBotSettings.SEND_GROUP_RATE if chat_id < 0 else TelegramBotSettings.SEND_PRIVATE_RATE
+        bucket = _chat_buckets[chat_id] = _TokenBucket(rate, TelegramBotSettings.SEND_CHAT_BURST)
+
+    return bucket
+
+
+async def wait_api_slot() -> None:
+    """Ждет разрешения на запрос к Bot API в общем ограничении процесса"""
+    # Для фоновых запросов (getChatMember и т.п.), чтобы они не отнимали квоту у отправки сообщений
+
+    while True:
+        with _buckets_lock:
+            wait = _global_bucket.wait_time(time.monotonic())
+            if wait <= 0:
+                _global_bucket.take()
+                return
+
+        await asyncio.sleep(wait)
+
+
+class _Outgoing:
+    """Сообщение в очереди отправки"""
+
+    def __init__(self, sequence: int, priority: MessagePriority, kwargs: dict) -> None:
+
+        self.sequence = sequence
+        self.priority = priority
+        self.kwargs = kwargs  # Аргументы _send_now
+        self.futures: list[Future] = []  # Ожидающие отправки (после склейки их несколько)
+        self.attempts = 0
+
+
+    def is_text(self) -> bool:
+        """Показывает что это только текст (такие сообщения можно склеивать)"""
+
+        kwargs = self.kwargs
+        return (
+            kwargs["message"] is not None and
+            kwargs["keyboard"] is None and
+            kwargs["photo"] is None and
+            kwargs["attachment"] is None and
+            kwargs["reply_to_message_id"] is None
+        )
+
+
+    def merge(self, other: "_Outgoing") -> bool:
+        """Дописывает текст другого сообщения в этот чат, если это возможно"""
+
+        if not (
+            self.is_text() and other.is_text() and
+            self.kwargs["parse_mode"] == other.kwargs["parse_mode"]
+        ):
+            return False
+
+        message = f"{self.kwargs['message']}\n\n{other.kwargs['message']}"
+        if len(message) > 4096:
+            return False
+
+        self.kwargs["message"] = message
+        self.priority = min(self.priority, other.priority)
+        self.futures.extend(other.futures)
+
+        return True
+
+
+class _SendQueue:
+    """Очередь отправки сообщений процесса"""
+    # Работает в своем потоке с отдельным event loop, поэтому сообщения из короткоживущих
+    # asyncio.run и из потоков подсчета раундов отправляются сразу и не теряются при закрытии их loop
+
+    def __init__(self) -> None:
+
+        self.pid = os.getpid()
+        self._pending: dict[int, deque[_Outgoing]] = {}  # chat_id -> сообщения по порядку
+        self._sequence = 0
+        self._sending: set[asyncio.Task] = set()  # event loop хранит задачи только по слабым ссылкам
+
+        self._loop = asyncio.new_event_loop()
+        self._wakeup: asyncio.Event | None = None
+        self._started = threading.Event()
+
+        threading.Thread(target=self._run_loop, name="telegram-send", daemon=True).start()
+        self._started.wait()
+
+
+    def _run_loop(self) -> None:
+        """Выполняет event loop очереди в отдельном потоке"""
+
+        asyncio.set_event_loop(self._loop)
+        self._wakeup = asyncio.Event()
+        self._loop.create_task(self._dispatch())
+        self._started.set()
+        self._loop.run_forever()
+
+
+    def put(self, chat_id: int, priority: MessagePriority, kwargs: dict) -> Future:
+        """Добавляет сообщение в очередь из любого потока и возвращает future с message_id"""
+
+        future = Future()
+        self._loop.call_soon_threadsafe(self._put, chat_id, priority, kwargs, future)
+
+        return future
+
+
+    def _put(self, chat_id: int, priority: MessagePriority, kwargs: dict, future: Future) -> None:
+        """Добавляет сообщение в очередь (в потоке очереди)"""
+
+        self._sequence += 1
+        item = _Outgoing(self._sequence, priority, kwargs)
+        item.futures.append(future)
+
+        # Внутри чата сообщение встает перед сообщениями с более низким приоритетом
+        chat_items = self._pending.setdefault(chat_id, deque())
+        index = len(chat_items)
+        while index > 0 and chat_items[index - 1].priority > priority:
+            index -= 1
+
+        if not (index > 0 and chat_items[index - 1].merge(item)):
+            chat_items.insert(index, item)
+
+        self._wakeup.set()
+
+
+    def _take_next(self, now: float) -> tuple[int | None, float, list[int]]:
+        """Возвращает чат, сообщение которого можно отправить, сколько ждать и чаты с ошибкой"""
+
+        broken_chat_ids = []
+
+        with _buckets_lock:
+            wait = _global_bucket.wait_time(now)
+            if wait > 0:
+                return None, wait, broken_chat_ids
+
+            best_chat_id, best_key, wait = None, None, float("inf")
+
+            for chat_id, chat_items in self._pending.items():
+                try:
+                    chat_wait = _get_chat_bucket(chat_id).wait_time(now)
+                except Exception as e:
+                    print(f"[SEND ERROR] chat_id={chat_id!r}: сообщения отброшены, {e!r}", flush=True)
+                    broken_chat_ids.append(chat_id)
+                    continue
+
+                if chat_wait > 0:
+                    wait = min(wait, chat_wait)
+                    continue
+
+                key = (chat_items[0].priority, chat_items[0].sequence)
+                if best_key is None or key < best_key:
+                    best_chat_id, best_key = chat_id, key
+
+            if best_chat_id is not None:
+                _global_bucket.take()
+                _get_chat_bucket(best_chat_id).take()
+
+            return best_chat_id, wait, broken_chat_ids
+
+
+    async def _dispatch(self) -> None:
+        """Отправляет сообщения с учетом ограничений и приоритетов"""
+
+        while True:
+            self._wakeup.clear()
+
+            if not self._pending:
+                await self._wakeup.wait()
+                continue
+
+            try:
+                wait = self._dispatch_next()
+            except Exception as e:
+                # Очередь не останавливается, ожидающие получают None
+                print(f"[SEND ERROR] Ошибка очереди отправки, сообщения отброшены: {e!r}", flush=True)
+                for chat_id in list(self._pending):
+                    self._reject(chat_id)
+                continue
+
+            if wait is None:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+
+    def _dispatch_next(self) -> float | None:
+        """Запускает отправку следующего сообщения, возвращает сколько ждать (None - не ждать)"""
+
+        chat_id, wait, broken_chat_ids = self._take_next(time.monotonic())
+
+        for broken_chat_id in broken_chat_ids:
+            self._reject(broken_chat_id)
+
+        if chat_id is None:
+            return None if broken_chat_ids else wait
+
+        chat_items = self._pending[chat_id]
+        item = chat_items.popleft()
+        if not chat_items:
+            del self._pending[chat_id]
+
+        task = asyncio.create_task(self._send(chat_id, item))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+        return None
+
+
+    def _reject(self, chat_id: int) -> None:
+        """Удаляет сообщения чата из очереди, ожидающие отправки получают None"""
+
+        for item in self._pending.pop(chat_id, ()):
+            self._resolve(item, None)
+
+
+    @staticmethod
+    def _resolve(item: _Outgoing, message_id: int | None) -> None:
+        """Возвращает message_id всем ожидающим сообщения"""
+
+        for future in item.futures:
+            if not future.done():
+                future.set_result(message_id)
+
+
+    async def _send(self, chat_id: int, item: _Outgoing) -> None:
+        """Отправляет сообщение, при 429 возвращает его в начало очереди чата"""
+
+        try:
+            message_id = await _send_now(**item.kwargs)
+
+        except RetryAfter as e:
+            item.attempts += 1
+            retry_after = float(e.retry_after)
+
+            with _buckets_lock:
+                bucket = _get_chat_bucket(chat_id)
+                bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + retry_after)
+
+            if item.attempts <= TelegramBotSettings.SEND_MAX_RETRIES:
+                print(f"[SEND] chat_id={chat_id}: retry_after={retry_after}s, повтор {item.attempts}", flush=True)
+                self._pending.setdefault(chat_id, deque()).appendleft(item)
+                self._wakeup.set()
+                return
+
+            print(f"[SEND ERROR] chat_id={chat_id}: сообщение не отправлено после {item.attempts} попыток", flush=True)
+            message_id = None
+
+        except Exception as e:
+            print(f"[SEND ERROR] Error sending message в chat_id={chat_id}: {e}", flush=True)
+            message_id = None
+
+        self._resolve(item, message_id)
+        self._cleanup_bucket(chat_id)
+
+
+    def _cleanup_bucket(self, chat_id: int) -> None:
+        """Удаляет ограничение чата, если оно больше не нужно"""
+
+        if chat_id in self._pending:
+            return
+
+        with _buckets_lock:
+            bucket = _chat_buckets.get(chat_id)
+            if bucket is not None and bucket.is_idle(time.monotonic()):
+                del _chat_buckets[chat_id]
+
+
+_send_queue: _SendQueue | None = None
+_send_queue_lock = threading.Lock()
+
+
+def _get_send_queue() -> _SendQueue:
+    """Возвращает очередь отправки процесса (после fork создается заново)"""
+
+    global _send_queue
+
+    with _send_queue_lock:
+        if _send_queue is None or _send_queue.pid != os.getpid():
+            _send_queue = _SendQueue()
+
+        return _send_queue
+
+
 async def send_message(
+        chat_id: int,
+        message: str | None = None,
+        keyboard: InlineKeyboardMarkup | ReplyKeyboardMarkup | None = None,
+        photo: str | None = None,
+        attachment: str | None = None,
+        parse_mode: str = ParseMode.HTML,
+        reply_to_message_id: int | None = None,
+        *,
+        priority: MessagePriority = MessagePriority.USER,
+        wait: bool = True
+) -> int | None:
+    """Отправляет сообщения в Telegram через очередь отправки"""
+    # wait=True - дождаться отправки и вернуть message_id, wait=False - не ждать (вернет None)
+    # Подряд идущие текстовые сообщения в один чат склеиваются в одно
+
+    if message is None and photo is None and attachment is None and keyboard is None:
+        print(f"[SEND] Пропуск отправки: нет message, photo, attachment и keyboard", flush=True)
+        return None
+
+    chat_id = int(chat_id)  # NotifyChats передается строкой (chat.value)
+
+    future = _get_send_queue().put(chat_id, priority, {
+        "chat_id": chat_id,
+        "message": message,
+        "keyboard": keyboard,
+        "photo": photo,
+        "attachment": attachment,
+        "parse_mode": parse_mode,
+        "reply_to_message_id": reply_to_message_id
+    })
+
+    if not wait:
+        return None
+
+    return await asyncio.wrap_future(future)
+
+
+async def _send_now(
         chat_id: int,
         message: str | None = None,
         keyboard: InlineKeyboardMarkup | ReplyKeyboardMarkup | None = None,
@@ -17,7 +512,7 @@ async def send_message(
         parse_mode: str = ParseMode.HTML,
         reply_to_message_id: int | None = None
 ) -> int | None:
-    """Отправляет сообщения в Telegram"""
+    """Отправляет сообщение сразу (без очереди)"""
 
     # В оригинале VK если message is None, то он устанавливается в ""
     # В Telegram отправляем только если есть что-то для отправки
@@ -27,7 +522,7 @@ async def send_message(
 
     try:
         print(f"[SEND] Отправка сообщения в chat_id={chat_id}, message='{message[:50] if message else None}', keyboard={keyboard is not None}", flush=True)
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
 
         # Используем attachment как photo если photo не указан
         if attachment and not photo:
@@ -94,6 +589,10 @@ async def send_message(
         print(f"[SEND] Сообщение отправлено успешно: message_id={result.message_id}", flush=True)
         return result.message_id
 
+    except RetryAfter:
+        # Обрабатывается очередью отправки
+        raise
+
     except TelegramError as e:
         error_message = str(e)
         print(f"[SEND ERROR] Telegram error в chat_id={chat_id}: {error_message}", flush=True)
@@ -131,7 +630,7 @@ async def delete_message(chat_id: int, message_id: int) -> bool:
     """Удаляет отправленные сообщения"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         await bot.delete_message(chat_id=chat_id, message_id=message_id)
         return True
     except:
@@ -142,7 +641,7 @@ async def send_keyboard(chat_id: int, keyboard: InlineKeyboardMarkup | ReplyKeyb
     """Отправляет клавиатуру без сообщения"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         await bot.send_message(
             chat_id=chat_id,
             text="\u200B",  # Невидимый символ
@@ -162,7 +661,7 @@ async def edit_message(
     """Редактирует сообщение"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         await bot.edit_message_text(
             chat_id=chat_id,
             message_id=message_id,
@@ -179,7 +678,7 @@ async def get_chat_member(chat_id: int, user_id: int):
     """Получает информацию о участнике чата"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         return await bot.get_chat_member(chat_id=chat_id, user_id=user_id)
     except:
         return None
@@ -189,7 +688,7 @@ async def get_chat(chat_id: int):
     """Получает информацию о чате"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         return await bot.get_chat(chat_id=chat_id)
     except:
         return None
@@ -199,7 +698,7 @@ async def is_user_subscribed(user_id: int, channel_id: int) -> bool:
     """Проверяет, подписан ли пользователь на канал"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         member = await bot.get_chat_member(chat_id=channel_id, user_id=user_id)
         # Для каналов: member, administrator, creator - подписан
         # left, kicked, restricted - не подписан
@@ -207,3 +706,30 @@ async def is_user_subscribed(user_id: int, channel_id: int) -> bool:
     except:
         return False
 
+
+async def get_channel_subscription(user_id: int, channel_id: int) -> bool | None:
+    """Проверяет подписку на канал с учетом ограничения частоты, None - проверить не удалось"""
+
+    await wait_api_slot()
+
+    try:
+        member = await get_bot().get_chat_member(chat_id=channel_id, user_id=user_id)
+        return member.status in ['member', 'administrator', 'creator']
+
+    except RetryAfter as e:
+        with _buckets_lock:
+            _global_bucket.blocked_until = max(_global_bucket.blocked_until, time.monotonic() + float(e.retry_after))
+        return None
+
+    except BadRequest as e:
+        if "chat not found" in e.message.lower():
+            # Бот не состоит в канале, подписку проверить нельзя
+            print(f"[SUBSCRIPTION WARNING] канал {channel_id} недоступен: {e}", flush=True)
+            return None
+
+        # Пользователь не найден в канале
+        return False
+
+    except TelegramError as e:
+        print(f"[SUBSCRIPTION WARNING] user_id={user_id}: {e}", flush=True)
+        return None
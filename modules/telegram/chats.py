@@ -1,14 +1,13 @@
 from typing import Optional
-from telegram import Bot
 from telegram.constants import ChatMemberStatus
-from settings import TelegramBotSettings
+from modules.telegram.bot import get_bot
 
 
 async def get_chat_owner_id(chat_id: int) -> int | None:
     """Возвращает идентификатор создателя чата"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         chat = await bot.get_chat(chat_id)
         
         # В Telegram создатель чата имеет статус OWNER или ADMINISTRATOR
@@ -33,7 +32,7 @@ async def get_chat_info(chat_id: int) -> dict | None:
     """Возвращает информацию о чате"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         chat = await bot.get_chat(chat_id)
         return {
             "id": chat.id,
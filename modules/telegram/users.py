@@ -1,13 +1,20 @@
 from typing import Optional
-from telegram import Bot
+from redis.client import Redis
+from telegram import User
+from psycopg2.extras import DictCursor
+
 from settings import TelegramBotSettings
+from schemas.redis import RedisKeys
+from schemas.users import UserSchema
+from databases.executor import run_sync
+from modules.telegram.bot import get_bot
 
 
 async def get_user_data(user_id: int) -> dict | None:
     """Возвращает данные пользователя по ID из Telegram"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         user = await bot.get_chat(user_id)
         return {
             "id": user.id,
@@ -55,8 +62,7 @@ async def get_user_id(link: str) -> int | None:
     """Возвращает идентификатор пользователя по ссылке или username"""
 
     try:
-        from telegram import Bot
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         
         # Если это числовой ID
         if link.strip().isdigit():
@@ -73,7 +79,7 @@ async def get_user_id(link: str) -> int | None:
         if username:
             try:
                 # Пытаемся получить пользователя из Telegram API
-            user = await bot.get_chat(f"@{username}")
+                user = await bot.get_chat(f"@{username}")
                 user_id = user.id
                 
                 # Синхронизируем данные пользователя с БД
@@ -86,8 +92,9 @@ async def get_user_id(link: str) -> int | None:
             except Exception as e:
                 print(f"[DEBUG] Failed to get user by username @{username} from Telegram API: {e}", flush=True)
                 # Пробуем найти в БД по username
-                from databases.postgresql import get_postgresql_connection
-                conn, cur = get_postgresql_connection()
+                from databases.postgresql import get_postgresql_pool
+                psql_pool = get_postgresql_pool()
+                conn, cur = psql_pool.acquire()
                 try:
                     # Сначала ищем по telegram_username (самый точный способ)
                     cur.execute("""
@@ -141,8 +148,7 @@ async def get_user_id(link: str) -> int | None:
                     
                     print(f"[DEBUG] User not found in database: {username}", flush=True)
                 finally:
-                    cur.close()
-                    conn.close()
+                    psql_pool.release(conn, cur)
         
         return None
     except Exception as e:
@@ -156,41 +162,106 @@ async def sync_user_data(user_id: int) -> bool:
     """Синхронизирует данные пользователя с Telegram API"""
     
     try:
-        from telegram import Bot
-        from databases.postgresql import get_postgresql_connection
+        from databases.postgresql import get_postgresql_pool
         
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         
         # Получаем актуальные данные из Telegram
         user = await bot.get_chat(user_id)
         
         # Обновляем в БД
-        conn, cur = get_postgresql_connection()
+        psql_pool = get_postgresql_pool()
+        conn, cur = psql_pool.acquire()
         try:
-            full_name = f"{user.first_name or ''} {user.last_name or ''}".strip()
-            if not full_name:
-                full_name = user.username or f"User {user_id}"
-            
-            telegram_username = user.username or None
-            
-            cur.execute("""
-                UPDATE users
-                SET full_name = %s,
-                    telegram_username = %s
-                WHERE user_id = %s
-            """, (full_name, telegram_username, user_id))
-            conn.commit()
+            full_name, telegram_username = _get_profile(user, user_id)
+            _update_profile(user_id, full_name, telegram_username, cur)
             
             print(f"[SYNC] Updated user {user_id} data: full_name={full_name}", flush=True)
             return True
         finally:
-            cur.close()
-            conn.close()
+            psql_pool.release(conn, cur)
     except Exception as e:
         print(f"[SYNC ERROR] Failed to sync user {user_id}: {e}", flush=True)
         return False
 
 
+def _get_profile(user: User | None, user_id: int) -> tuple[str, str | None]:
+    """Возвращает (полное имя, username) пользователя Telegram"""
+
+    full_name = f"{user.first_name or ''} {user.last_name or ''}".strip()
+    if not full_name:
+        full_name = user.username or f"User {user_id}"
+
+    return full_name, user.username or None
+
+
+def _update_profile(
+        user_id: int,
+        full_name: str,
+        telegram_username: str | None,
+        psql_cursor: DictCursor
+) -> None:
+    """Записывает имя и username пользователя если они изменились"""
+
+    psql_cursor.execute("""
+        UPDATE users
+        SET full_name = %(full_name)s,
+            telegram_username = %(telegram_username)s
+        WHERE user_id = %(user_id)s AND (
+            full_name IS DISTINCT FROM %(full_name)s OR
+            telegram_username IS DISTINCT FROM %(telegram_username)s
+        )
+    """, {
+        "full_name": full_name,
+        "telegram_username": telegram_username,
+        "user_id": user_id
+    })
+
+
+async def sync_user_profile(
+        user_data: UserSchema,
+        user: User | None,
+        psql_cursor: DictCursor,
+        redis_cursor: Redis
+) -> UserSchema:
+    """Обновляет имя и username пользователя не чаще раза в PROFILE_SYNC_TTL секунд"""
+    # user - update.effective_user, если его нет данные запрашиваются через get_chat
+
+    user_id = user_data.user_id
+    synced_key = f"{RedisKeys.PROFILE_SYNCED.value}:{user_id}"
+
+    is_stale = redis_cursor.set(
+        name=synced_key, value=1,
+        ex=TelegramBotSettings.PROFILE_SYNC_TTL, nx=True
+    )
+    if not is_stale:
+        return user_data
+
+    try:
+        if user is None:
+            bot = get_bot()
+            user = await bot.get_chat(user_id)
+
+        full_name, telegram_username = _get_profile(user, user_id)
+
+        if (
+            full_name == user_data.full_name and
+            telegram_username == user_data.telegram_username
+        ):
+            return user_data
+
+        await run_sync(_update_profile, user_id, full_name, telegram_username, psql_cursor)
+
+    except Exception:
+        # Профиль не обновился, следующий запрос пользователя попробует снова
+        redis_cursor.delete(synced_key)
+        raise
+
+    print(f"[SYNC] Updated user {user_id} data: full_name={full_name}", flush=True)
+
+    return user_data.copy(update={"full_name": full_name, "telegram_username": telegram_username})
+
+
 async def get_user_friends(user_id: int) -> list[int]:
     """Возвращает список друзей (в Telegram это не поддерживается напрямую)"""
     # В Telegram нет прямого API для получения друзей
@@ -221,7 +292,7 @@ async def kick_user_from_chat(
     """Исключает пользователя из чата"""
 
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         await bot.ban_chat_member(chat_id=chat_id, user_id=user_id)
         await bot.unban_chat_member(chat_id=chat_id, user_id=user_id)
         return True
@@ -233,7 +304,7 @@ async def is_user_subscribed_to_channel(user_id: int, channel_id: int) -> bool:
     """Проверяет, подписан ли пользователь на канал"""
     
     try:
-        bot = Bot(token=TelegramBotSettings.BOT_TOKEN)
+        bot = get_bot()
         member = await bot.get_chat_member(chat_id=channel_id, user_id=user_id)
         # member.status может быть: 'member', 'administrator', 'creator', 'left', 'kicked', 'restricted'
         return member.status in ['member', 'administrator', 'creator']
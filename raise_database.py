@@ -8,17 +8,20 @@ from schemas.users import UserSchema, UserMenu, UserStatus
 from schemas.clans import ClanSchema, ClanRole, ClanJoinType
 from schemas.chats import ChatSchema, ChatHelperSchema
 from schemas.games import GameSchema
-from schemas.rates import RatesSchema
+from schemas.rates import RatesSchema, ChatRatesVolumeSchema
 from schemas.payments import PaymentSchema
 from schemas.auto_game import AutoGameSchema
 from schemas.promocodes import PromoCodeSchema, ActivatedPromoCode
 from schemas.bonus_repost import BonusPostSchema, BonusRepostLogSchema
-from schemas.bonus_subscription import BonusSubscriptionSchema, BonusSubscriptionLogSchema
+from schemas.bonus_subscription import BonusSubscriptionSchema, BonusSubscriptionLogSchema, ChannelSubscriberSchema
 from schemas.user_in_chat import UserChatSchema
 from schemas.access_tokens import AccessTokensSchema
 from schemas.transfer_coins import TransferCoinsSchema
 from schemas.bot_statistics import BotStatisticsSchema
 from schemas.transfer_white_list import TransferWhiteListSchema
+from schemas.periods import Period, PeriodSchema
+from services.periods import PeriodsService
+from tops.base import BaseTopService
 
 
 
@@ -39,6 +42,7 @@ def delete_tables(psql_cursor: DictCursor) -> None:
         GameSchema.__tablename__,
         AutoGameSchema.__tablename__,
         RatesSchema.__tablename__,
+        ChatRatesVolumeSchema.__tablename__,
 
         PromoCodeSchema.__tablename__,
         ActivatedPromoCode.__tablename__,
@@ -51,8 +55,10 @@ def delete_tables(psql_cursor: DictCursor) -> None:
 
         BonusSubscriptionSchema.__tablename__,
         BonusSubscriptionLogSchema.__tablename__,
+        ChannelSubscriberSchema.__tablename__,
 
-        PaymentSchema.__tablename__
+        PaymentSchema.__tablename__,
+        PeriodSchema.__tablename__
     ]
 
     for table in tables:
@@ -84,6 +90,7 @@ def create_tables(psql_cursor: DictCursor) -> None:
         CREATE TABLE {UserSchema.__tablename__} (
             user_id BIGINT NOT NULL,
             full_name VARCHAR(128) NOT NULL,
+            telegram_username VARCHAR(32) DEFAULT NULL,
 
             menu VARCHAR(32) NOT NULL DEFAULT '{UserMenu.MAIN.value}',
             status VARCHAR(16) NOT NULL DEFAULT '{UserStatus.USER.value}',
@@ -225,6 +232,7 @@ def create_tables(psql_cursor: DictCursor) -> None:
 
             game_mode VARCHAR(64) DEFAULT NULL,
             new_game_mode VARCHAR(64) DEFAULT NULL,
+            current_game_id BIGINT DEFAULT NULL,
 
             game_timer SMALLINT NOT NULL DEFAULT 30,
             rate_limit BIGINT DEFAULT NULL,
@@ -359,16 +367,355 @@ def create_tables(psql_cursor: DictCursor) -> None:
         )
     """)
 
+    add_chats_current_game(psql_cursor)
+    add_counter_periods(psql_cursor)
+    add_chat_rates_volume(psql_cursor)
+    add_clans_points(psql_cursor)
+    add_pagination_indexes(psql_cursor)
+    add_games_deadline_indexes(psql_cursor)
+    add_channel_subscribers(psql_cursor)
+
+
+def add_chats_current_game(psql_cursor: DictCursor) -> None:
+    """Добавляет chats.current_game_id, триггер который его обновляет и заполняет его"""
+    # Последняя игра чата раньше считалась через MAX(games.game_id) при каждом get_chat_data
+
+    psql_cursor.execute(f"""
+        ALTER TABLE {ChatSchema.__tablename__}
+        ADD COLUMN IF NOT EXISTS current_game_id BIGINT DEFAULT NULL
+    """)
+
+    # Обновляется в той же транзакции, что и INSERT игры в create_game
+    psql_cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION set_chat_current_game() RETURNS TRIGGER AS $$
+        BEGIN
+            UPDATE {ChatSchema.__tablename__}
+            SET current_game_id = NEW.game_id
+            WHERE chat_id = NEW.chat_id AND
+                  (current_game_id IS NULL OR current_game_id < NEW.game_id);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    psql_cursor.execute(f"""
+        DROP TRIGGER IF EXISTS games_set_chat_current_game
+        ON {GameSchema.__tablename__}
+    """)
+    psql_cursor.execute(f"""
+        CREATE TRIGGER games_set_chat_current_game
+        AFTER INSERT ON {GameSchema.__tablename__}
+        FOR EACH ROW EXECUTE FUNCTION set_chat_current_game()
+    """)
+
+    psql_cursor.execute(f"""
+        UPDATE {ChatSchema.__tablename__}
+        SET current_game_id = last_games.game_id
+        FROM (
+            SELECT chat_id, MAX(game_id) as game_id
+            FROM {GameSchema.__tablename__}
+            GROUP BY chat_id
+        ) as last_games
+        WHERE {ChatSchema.__tablename__}.chat_id = last_games.chat_id AND
+              {ChatSchema.__tablename__}.current_game_id IS DISTINCT FROM last_games.game_id
+    """)
+    print(f"✅ chats.current_game_id заполнен ({psql_cursor.rowcount} чатов)")
+
+
+def add_counter_periods(psql_cursor: DictCursor) -> None:
+    """Добавляет таблицу периодов и номера периодов счетчиков в users (см. services/periods.py)"""
+    # Сброс статистики и топов раньше переписывал каждую строку users
+
+    psql_cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PeriodSchema.__tablename__} (
+            name VARCHAR(32) NOT NULL,
+            period_id INTEGER NOT NULL DEFAULT 1,
+
+            PRIMARY KEY (name)
+        )
+    """)
+
+    for period in Period:
+        psql_cursor.execute(f"""
+            INSERT INTO {PeriodSchema.__tablename__} (name)
+            VALUES (%(name)s)
+            ON CONFLICT (name) DO NOTHING
+        """, {
+            "name": period.value
+        })
+
+    psql_cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION current_period(period_name VARCHAR) RETURNS INTEGER AS $$
+            SELECT period_id FROM {PeriodSchema.__tablename__} WHERE name = period_name
+        $$ LANGUAGE sql STABLE
+    """)
+
+    # Поле обновляется при подсчете игры, но в DDL его не было
+    psql_cursor.execute(f"""
+        ALTER TABLE {UserSchema.__tablename__}
+        ADD COLUMN IF NOT EXISTS month_top_points BIGINT NOT NULL DEFAULT 0
+    """)
+
+    # DEFAULT 1 - первый период, текущие значения счетчиков остаются актуальными
+    # Добавление поля с константным DEFAULT не переписывает таблицу
+    for period in Period:
+        psql_cursor.execute(f"""
+            ALTER TABLE {UserSchema.__tablename__}
+            ADD COLUMN IF NOT EXISTS {PeriodsService.get_period_column(period)} INTEGER NOT NULL DEFAULT 1
+        """)
+
+    print("✅ периоды счетчиков добавлены")
+
+
+def add_chat_rates_volume(psql_cursor: DictCursor) -> None:
+    """Добавляет суммы ставок по чатам и дням, триггер который их обновляет и заполняет их"""
+    # Топ чатов и статистика чата раньше суммировали все ставки периода из rates
+
+    psql_cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {ChatRatesVolumeSchema.__tablename__} (
+            chat_id BIGINT NOT NULL,
+            user_id BIGINT NOT NULL,
+            day DATE NOT NULL,
+
+            volume BIGINT NOT NULL DEFAULT 0,
+            owner_income BIGINT NOT NULL DEFAULT 0,
+
+            PRIMARY KEY (chat_id, day, user_id)
+        )
+    """)
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS chat_rates_volume_day_idx
+        ON {ChatRatesVolumeSchema.__tablename__} (day)
+    """)
+
+    # Обновляется в той же транзакции, что и INSERT/UPDATE ставки в accept_rate
+    # Ставка дополняется без изменения created_at, поэтому разница попадает в день ставки
+    psql_cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION add_chat_rates_volume() RETURNS TRIGGER AS $$
+        DECLARE
+            volume_delta BIGINT := NEW.amount;
+            owner_income_delta BIGINT := NEW.owner_income;
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                volume_delta := NEW.amount - OLD.amount;
+                owner_income_delta := NEW.owner_income - OLD.owner_income;
+            END IF;
+
+            INSERT INTO {ChatRatesVolumeSchema.__tablename__} (chat_id, user_id, day, volume, owner_income)
+            VALUES (NEW.chat_id, NEW.user_id, DATE(NEW.created_at), volume_delta, owner_income_delta)
+            ON CONFLICT (chat_id, day, user_id) DO UPDATE
+            SET volume = {ChatRatesVolumeSchema.__tablename__}.volume + EXCLUDED.volume,
+                owner_income = {ChatRatesVolumeSchema.__tablename__}.owner_income + EXCLUDED.owner_income;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Триггер и заполнение в транзакции вызывающего кода под блокировкой записи в rates
+    # (блокировка держится до его коммита), чтобы ставки не посчитались дважды или не потерялись
+    psql_cursor.execute(f"LOCK TABLE {RatesSchema.__tablename__} IN SHARE ROW EXCLUSIVE MODE")
+    psql_cursor.execute(f"""
+        DROP TRIGGER IF EXISTS rates_add_chat_rates_volume
+        ON {RatesSchema.__tablename__}
+    """)
+    psql_cursor.execute(f"""
+        CREATE TRIGGER rates_add_chat_rates_volume
+        AFTER INSERT OR UPDATE OF amount, owner_income ON {RatesSchema.__tablename__}
+        FOR EACH ROW EXECUTE FUNCTION add_chat_rates_volume()
+    """)
+    psql_cursor.execute(f"TRUNCATE {ChatRatesVolumeSchema.__tablename__}")
+    psql_cursor.execute(f"""
+        INSERT INTO {ChatRatesVolumeSchema.__tablename__} (chat_id, user_id, day, volume, owner_income)
+        SELECT chat_id, user_id, DATE(created_at), SUM(amount), SUM(owner_income)
+        FROM {RatesSchema.__tablename__}
+        GROUP BY chat_id, user_id, DATE(created_at)
+    """)
+    rows_count = psql_cursor.rowcount
+    print(f"✅ chat_rates_volume заполнен ({rows_count} строк)")
+
+
+def add_clans_points(psql_cursor: DictCursor) -> None:
+    """Добавляет очки кланов в clans, триггер который их обновляет и заполняет их"""
+    # Очки клана раньше считались через SUM(users.clan_points) по всем кланам на каждой странице
+    # clan_points - очки всех участников, top_points - без участников исключенных из топа
+
+    psql_cursor.execute(f"""
+        ALTER TABLE {ClanSchema.__tablename__}
+        ADD COLUMN IF NOT EXISTS clan_points BIGINT NOT NULL DEFAULT 0,
+        ADD COLUMN IF NOT EXISTS top_points BIGINT NOT NULL DEFAULT 0
+    """)
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS clans_clan_points_idx
+        ON {ClanSchema.__tablename__} (clan_points, clan_id)
+    """)
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS clans_top_points_idx
+        ON {ClanSchema.__tablename__} (top_points, clan_id)
+    """)
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS users_clan_id_idx
+        ON {UserSchema.__tablename__} (clan_id)
+        WHERE clan_id IS NOT NULL
+    """)
+
+    ignore_status = ", ".join(f"'{status}'" for status in BaseTopService.IGNORE_STATUS)
+    ignore_user_ids = ", ".join(str(user_id) for user_id in BaseTopService.IGNORE_USER_IDS)
+    clan_points = PeriodsService.counter("clan_points")
+
+    # Вклад игрока в клан - его clan_points текущего периода, при начислении, входе, выходе
+    # и смене статуса разница вклада переносится в clans в той же транзакции
+    psql_cursor.execute(f"""
+        CREATE OR REPLACE FUNCTION update_clans_points() RETURNS TRIGGER AS $$
+        DECLARE
+            period_id INTEGER := current_period('{Period.CLAN_POINTS.value}');
+            old_points BIGINT := 0;
+            new_points BIGINT := 0;
+            old_in_top BOOLEAN := OLD.status NOT IN ({ignore_status}) AND OLD.user_id NOT IN ({ignore_user_ids});
+            new_in_top BOOLEAN := NEW.status NOT IN ({ignore_status}) AND NEW.user_id NOT IN ({ignore_user_ids});
+        BEGIN
+            IF OLD.clan_id IS NOT NULL AND OLD.{PeriodsService.get_period_column(Period.CLAN_POINTS)} = period_id THEN
+                old_points := OLD.clan_points;
+            END IF;
+
+            IF NEW.clan_id IS NOT NULL AND NEW.{PeriodsService.get_period_column(Period.CLAN_POINTS)} = period_id THEN
+                new_points := NEW.clan_points;
+            END IF;
+
+            IF OLD.clan_id IS NOT DISTINCT FROM NEW.clan_id AND old_in_top = new_in_top THEN
+                IF new_points <> old_points THEN
+                    UPDATE {ClanSchema.__tablename__}
+                    SET clan_points = clan_points + new_points - old_points,
+                        top_points = top_points + CASE WHEN new_in_top THEN new_points - old_points ELSE 0 END
+                    WHERE clan_id = NEW.clan_id;
+                END IF;
+                RETURN NEW;
+            END IF;
+
+            IF old_points <> 0 THEN
+                UPDATE {ClanSchema.__tablename__}
+                SET clan_points = clan_points - old_points,
+                    top_points = top_points - CASE WHEN old_in_top THEN old_points ELSE 0 END
+                WHERE clan_id = OLD.clan_id;
+            END IF;
+
+            IF new_points <> 0 THEN
+                UPDATE {ClanSchema.__tablename__}
+                SET clan_points = clan_points + new_points,
+                    top_points = top_points + CASE WHEN new_in_top THEN new_points ELSE 0 END
+                WHERE clan_id = NEW.clan_id;
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Триггер и заполнение в транзакции вызывающего кода под блокировкой записи в users
+    # (блокировка держится до его коммита)
+    psql_cursor.execute(f"LOCK TABLE {UserSchema.__tablename__} IN SHARE ROW EXCLUSIVE MODE")
+    psql_cursor.execute(f"""
+        DROP TRIGGER IF EXISTS users_update_clans_points
+        ON {UserSchema.__tablename__}
+    """)
+    psql_cursor.execute(f"""
+        CREATE TRIGGER users_update_clans_points
+        AFTER UPDATE OF clan_id, clan_points, {PeriodsService.get_period_column(Period.CLAN_POINTS)}, status
+        ON {UserSchema.__tablename__}
+        FOR EACH ROW
+        WHEN (OLD.clan_id IS NOT NULL OR NEW.clan_id IS NOT NULL)
+        EXECUTE FUNCTION update_clans_points()
+    """)
+    psql_cursor.execute(f"""
+        UPDATE {ClanSchema.__tablename__}
+        SET clan_points = COALESCE(members.clan_points, 0),
+            top_points = COALESCE(members.top_points, 0)
+        FROM {ClanSchema.__tablename__} AS clans_all
+        LEFT JOIN (
+            SELECT clan_id,
+                   SUM({clan_points}) as clan_points,
+                   SUM({clan_points}) FILTER (
+                       WHERE status NOT IN ({ignore_status}) AND user_id NOT IN ({ignore_user_ids})
+                   ) as top_points
+            FROM {UserSchema.__tablename__}
+            WHERE clan_id IS NOT NULL
+            GROUP BY clan_id
+        ) AS members ON clans_all.clan_id = members.clan_id
+        WHERE {ClanSchema.__tablename__}.clan_id = clans_all.clan_id
+    """)
+    rows_count = psql_cursor.rowcount
+    print(f"✅ очки кланов заполнены ({rows_count} кланов)")
+
+
+def add_pagination_indexes(psql_cursor: DictCursor) -> None:
+    """Добавляет индексы для keyset пагинации (см. modules/pagination.py)"""
+
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS chats_owner_id_idx
+        ON {ChatSchema.__tablename__} (owner_id, chat_id)
+    """)
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS transfer_coins_sender_id_idx
+        ON {TransferCoinsSchema.__tablename__} (sender_id, id)
+    """)
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS transfer_coins_recipient_id_idx
+        ON {TransferCoinsSchema.__tablename__} (recipient_id, id)
+    """)
+
+    print("✅ индексы пагинации добавлены")
+
+
+def add_games_deadline_indexes(psql_cursor: DictCursor) -> None:
+    """Добавляет индексы для поиска запущенных раундов (см. games/deadlines.py)"""
+
+    # Сроки собираются из postgresql только если redis очистили, при рестарте ищутся ожидающие раунды
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS games_active_end_datetime_idx
+        ON {GameSchema.__tablename__} (end_datetime)
+        WHERE is_active = TRUE
+    """)
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS rates_game_id_idx
+        ON {RatesSchema.__tablename__} (game_id)
+    """)
+
+    print("✅ индексы сроков раундов добавлены")
+
+
+def add_channel_subscribers(psql_cursor: DictCursor) -> None:
+    """Добавляет таблицу подписчиков канала бонусов (см. services/bonus_subscription.py)"""
+
+    psql_cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {ChannelSubscriberSchema.__tablename__} (
+            user_id BIGINT NOT NULL,
+            is_subscribed BOOLEAN NOT NULL,
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (user_id)
+        )
+    """)
+
+    # Повторная проверка неподписанных идет от самых старых проверок
+    psql_cursor.execute(f"""
+        CREATE INDEX IF NOT EXISTS channel_subscribers_unsubscribed_updated_at_idx
+        ON {ChannelSubscriberSchema.__tablename__} (updated_at)
+        WHERE is_subscribed = FALSE
+    """)
+
+    print("✅ таблица подписчиков канала добавлена")
+
 
 def add_coins_constraint(psql_cursor: DictCursor) -> None:
     """Добавляет CHECK constraint для coins >= 0 если его нет"""
+    # Ошибка откатывается до точки сохранения, чтобы не прерывать транзакцию миграции
+    psql_cursor.execute("SAVEPOINT coins_constraint")
     try:
         psql_cursor.execute("""
             ALTER TABLE users
             ADD CONSTRAINT users_coins_non_negative CHECK (coins >= 0)
         """)
+        psql_cursor.execute("RELEASE SAVEPOINT coins_constraint")
         print("✅ CHECK constraint для coins >= 0 добавлен")
     except Exception as e:
+        psql_cursor.execute("ROLLBACK TO SAVEPOINT coins_constraint")
         # Constraint уже существует или другая ошибка
         if "already exists" in str(e) or "duplicate" in str(e).lower():
             print("ℹ️  CHECK constraint для coins >= 0 уже существует")
@@ -381,9 +728,12 @@ if __name__ == "__main__":
     if Config.DEVELOPMENT_MODE:
         try:
             psql_connection, psql_cursor = get_postgresql_connection()
+            # Миграция одной транзакцией, блокировки таблиц держатся до коммита
+            psql_connection.autocommit = False
 
             delete_tables(psql_cursor)
             create_tables(psql_cursor)
+            psql_connection.commit()
 
         except Exception:
             traceback.print_exc()
@@ -395,7 +745,16 @@ if __name__ == "__main__":
         # В production режиме только добавляем constraint если его нет
         try:
             psql_connection, psql_cursor = get_postgresql_connection()
+            # Миграция одной транзакцией, блокировки таблиц держатся до коммита
+            psql_connection.autocommit = False
             add_coins_constraint(psql_cursor)
+            add_chats_current_game(psql_cursor)
+            add_counter_periods(psql_cursor)
+            add_chat_rates_volume(psql_cursor)
+            add_clans_points(psql_cursor)
+            add_pagination_indexes(psql_cursor)
+            add_games_deadline_indexes(psql_cursor)
+            add_channel_subscribers(psql_cursor)
             psql_connection.commit()
         except Exception:
             traceback.print_exc()
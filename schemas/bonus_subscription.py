@@ -25,3 +25,14 @@ class BonusSubscriptionLogSchema(BaseModel):
     received_at: datetime = Field(default_factory=datetime.now, description="YYYY-MM-DD hh:mm:ss")
     # Время получения бонуса
 
+
+
+class ChannelSubscriberSchema(BaseModel):
+    """Схема подписчиков канала бонусов за подписку"""
+
+    __tablename__ = "channel_subscribers"
+
+    user_id: int  # Идентификатор пользователя
+    is_subscribed: bool  # Подписан ли пользователь на канал
+    updated_at: datetime = Field(default_factory=datetime.now, description="YYYY-MM-DD hh:mm:ss")
+    # Время последнего изменения подписки
@@ -48,7 +48,7 @@ class ClanSchema(BaseModel):
     name: str  # Имя клана
 
     points: int = 0  # Очки клана сколько игроки заработали очков
-    # не храниться в дб вычисляется при select
+    # хранится в clans.clan_points, обновляется триггером на users
     count_members: int = 0  # Количество участников в клане
     # не храниться в дб вычисляется при select
 
@@ -0,0 +1,50 @@
+from enum import Enum
+from pydantic import BaseModel
+
+
+class Period(Enum):
+    """Периоды, по которым обнуляются счетчики пользователей"""
+
+    DAY_STATISTICS = "day_statistics"
+    WEEK_STATISTICS = "week_statistics"
+
+    DAY_TOP = "day_top"
+    WEEK_TOP = "week_top"
+    MONTH_TOP = "month_top"
+    ALL_TOP = "all_top"
+    COINS_TOP = "coins_top"
+    RUBLES_TOP = "rubles_top"
+    WEEK_RUBLES_TOP = "week_rubles_top"
+    CLAN_POINTS = "clan_points"
+
+
+class PeriodSchema(BaseModel):
+    """Схема текущего периода"""
+
+    __tablename__ = "periods"
+
+    name: str  # Название периода (Period)
+    period_id: int  # Номер текущего периода, увеличивается при сбросе
+
+
+PERIOD_COUNTERS: dict[Period, tuple[str, ...]] = {
+    Period.DAY_STATISTICS: ("day_win", "day_lost", "day_rates"),
+    Period.WEEK_STATISTICS: ("week_win", "week_lost", "week_rates"),
+
+    Period.DAY_TOP: ("day_top_points",),
+    Period.WEEK_TOP: ("week_top_points",),
+    Period.MONTH_TOP: ("month_top_points",),
+    Period.ALL_TOP: ("all_top_points",),
+    Period.COINS_TOP: ("coins_top_points",),
+    Period.RUBLES_TOP: ("rubles_top_points",),
+    Period.WEEK_RUBLES_TOP: ("week_rubles_top_points",),
+    Period.CLAN_POINTS: ("clan_points",)
+}
+# Счетчики users, которые относятся к периоду
+# Рядом с ними в users лежит номер периода {period}_period, в котором они были записаны
+
+COUNTER_PERIODS: dict[str, Period] = {
+    counter: period
+    for period, counters in PERIOD_COUNTERS.items()
+    for counter in counters
+}
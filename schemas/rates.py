@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel, Field
 
 from schemas.users import UserStatus
@@ -35,3 +35,16 @@ class CalculateRateSchema(GameRateSchema):
 
     is_winning: bool | None = None  # Показывает, выиграл ли пользователь
     winning_amount: int | None = None  # Сумма выигрыша
+
+
+class ChatRatesVolumeSchema(BaseModel):
+    """Схема суммы ставок игрока в чате за день, обновляется триггером на rates"""
+
+    __tablename__ = "chat_rates_volume"
+
+    chat_id: int  # Идентификатор чата
+    user_id: int  # Идентификатор пользователя
+    day: date  # День ставок (DATE(rates.created_at))
+
+    volume: int  # Сумма ставок
+    owner_income: int  # Прибыль владельцев за ставки
@@ -50,6 +50,27 @@ class RedisKeys(Enum):
     CAPTCHA_BAN_BONUSREPOST = "captcha_ban_bonusrepost"  # :user_id
     # Запрещает активировать пользователю бонус за репост на 10 минут
 
+    PROFILE_SYNCED = "profile_synced"  # :user_id
+    # Пока существует ключ имя и username пользователя не синхронизируются с Telegram (ttl)
+
+    TOP_LEADERBOARD = "top_leaderboard"  # :top_name
+    # Рейтинг топа игроков (sorted set), :ready - рейтинг собран (ttl), :lock - идет сборка
+
+    TOP_PAGES = "top_pages"  # :generation или :top_name:generation:offset:limit
+    # Текст страниц топов (ttl), generation увеличивается при подсчете игры
+
+    GAME_DEADLINES = "game_deadlines"  # :ready
+    # Сроки окончания запущенных раундов (sorted set game_id -> unix time), см. games/deadlines.py
+
+    ROUND_STATE = "round_state"  # :game_id, :game_id:game, :game_id:user:user_id, :game_id:users или :game_id:version
+    # Игра и суммы ставок активного раунда (hash, ttl), см. games/round_state.py
+
+    BACKGROUND_TASKS_LEADER = "background_tasks_leader"
+    # Процесс, который выполняет фоновые задачи (ttl), см. modules/task_runner.py
+
+    SUBSCRIPTION_CHECK_CURSOR = "subscription_check_cursor"
+    # Последний user_id, подписку которого проверила фоновая задача (проверка продолжается с него после рестарта)
+
 
     def __getattribute__(self, __name: str) -> Any:
 
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class TopRewardSchema(BaseModel):
+    """Схема награды участника топа"""
+
+    user_id: int  # Идентификатор пользователя
+    coins: int = 0  # Награда в WC
+    rubles: int = 0  # Награда в монетках
+    top_profit: int = 0  # Награда в WC для статистики пользователя и расходов бота
+    message: str | None = None  # Сообщение победителю (None - без сообщения)
+    keyboard: str | None = None  # Клавиатура сообщения
+
+
+class TopRewardsSchema(BaseModel):
+    """Схема наград победителей одного топа"""
+
+    rewards: list[TopRewardSchema]  # Награды победителей
+    admin_message: str | None = None  # Сообщение в чат наград топов
@@ -40,6 +40,7 @@ class UserSchema(BaseModel):
 
     user_id: int  # Идентификатор пользователя
     full_name: str  # Полное имя пользователя
+    telegram_username: str | None = None  # username в Telegram (без @)
 
     menu: UserMenu = UserMenu.MAIN
     status: UserStatus = UserStatus.USER
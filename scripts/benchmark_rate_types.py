@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+    Бенчмарк: проверка события ставки по игровым моделям
+
+    before - rate_type in get_all_rates_type() (поиск по списку)
+    after - BaseGameModel.is_rate_type (frozenset из get_rate_types_index)
+
+    Проверяется последнее событие списка (худший случай для списка) и несуществующее событие
+
+    python scripts/benchmark_rate_types.py --number 1000
+"""
+
+import os
+import sys
+import timeit
+import argparse
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Не трогать, читай BaseGameModel.GAMES_MODEL
+from games.base import BaseGameModel
+from games.cups import CupsGameModel
+from games.dice import DiceGameModel
+from games.wheel import WheelGameModel
+from games.double import DoubleGameModel
+from games.aviator import AviatorGameModel
+from games.mega_dice import MegaDiceGameModel
+from games.black_time import BlackTimeGameModel
+from games.lucky_coins import LuckyCoinsGameModel
+from games.under_7_over import Under7OverGameModel
+from games.dream_catcher import DreamCatcherGameModel
+# Не трогать, читай BaseGameModel.GAMES_MODEL
+
+
+def _per_call_us(statement, number: int) -> float:
+    """Возвращает время одного вызова в микросекундах"""
+
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1_000_000
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'игра':<16}{'событий':>9}{'before, us':>13}{'after, us':>12}{'ускорение':>12}")
+
+    for game, game_model in BaseGameModel.GAMES_MODEL.items():
+        all_rates_type = game_model.get_all_rates_type()
+        game_model.get_rate_types_index()  # Индекс строится один раз, в замер не входит
+
+        checked = [all_rates_type[-1], "not_a_rate_type"]
+
+        before = _per_call_us(lambda: [x in game_model.get_all_rates_type() for x in checked], args.number)
+        after = _per_call_us(lambda: [game_model.is_rate_type(x) for x in checked], args.number)
+
+        print(f"{game.value:<16}{len(all_rates_type):>9}{before:>13.3f}{after:>12.3f}{before / after:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+    Бенчмарк: запись выигрышей в таблицы топов при подсчете игры
+
+    before - add_user_winnings(user_id, amount) на каждого победителя (как было в write_game_result)
+    after - один вызов add_users_winnings(user_ids[], amounts[]) на игру
+
+    Нужна база с примененным databases/apply_top_tables.py
+    Бенчмарк создает временных пользователей с отрицательными user_id
+    и выполняется в транзакции, которая откатывается в конце
+
+    python scripts/benchmark_top_winnings.py --winners 10 100 1000 --repeat 20
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from psycopg2.extras import execute_values
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from databases.postgresql import get_postgresql_connection
+
+
+def _settle_before(psql_cursor, winnings_rows: list[tuple[int, int]]) -> None:
+    """Вызов add_user_winnings на каждого победителя"""
+
+    execute_values(psql_cursor, """
+        SELECT add_user_winnings(winnings.user_id, winnings.amount)
+        FROM (VALUES %s) AS winnings (user_id, amount)
+    """, winnings_rows, page_size=len(winnings_rows))
+
+
+def _settle_after(psql_cursor, winnings_rows: list[tuple[int, int]]) -> None:
+    """Один вызов add_users_winnings на игру"""
+
+    psql_cursor.execute("""
+        SELECT add_users_winnings(%(user_ids)s::BIGINT[], %(amounts)s::BIGINT[])
+    """, {
+        "user_ids": [user_id for user_id, _ in winnings_rows],
+        "amounts": [amount for _, amount in winnings_rows]
+    })
+
+
+def _measure_ms(settle, psql_cursor, winnings_rows: list[tuple[int, int]], repeat: int) -> float:
+    """Возвращает медианное время подсчета одной игры в миллисекундах"""
+
+    timings = []
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        settle(psql_cursor, winnings_rows)
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    return sorted(timings)[len(timings) // 2]
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--winners", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    psql_connection, psql_cursor = get_postgresql_connection()
+    psql_connection.autocommit = False
+
+    try:
+        max_winners = max(args.winners)
+        execute_values(psql_cursor, """
+            INSERT INTO users (user_id, full_name)
+            VALUES %s
+            ON CONFLICT (user_id) DO NOTHING
+        """, [(-user_id, f"benchmark {user_id}") for user_id in range(1, max_winners + 1)])
+
+        print(f"{'победителей':<14}{'before, ms':>12}{'after, ms':>12}{'ускорение':>12}")
+
+        for winners in args.winners:
+            winnings_rows = [(-user_id, 1_000) for user_id in range(1, winners + 1)]
+
+            # Первый вызов создает строки в таблицах топов, дальше замеряются обновления
+            _settle_after(psql_cursor, winnings_rows)
+
+            before = _measure_ms(_settle_before, psql_cursor, winnings_rows, args.repeat)
+            after = _measure_ms(_settle_after, psql_cursor, winnings_rows, args.repeat)
+
+            print(f"{winners:<14}{before:>12.2f}{after:>12.2f}{before / after:>11.1f}x")
+
+    finally:
+        psql_connection.rollback()
+        psql_cursor.close()
+        psql_connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+    Бенчмарк: сколько update-ов в секунду обрабатывает один воркер
+
+    Update-ы проходят настоящий путь telegram_bot.routers.handler_messages
+    (обработчики меню, сервисы, пул соединений) на базе и redis из settings.
+    Ответы не уходят в Telegram: очередь отправки сразу отдает message_id = None,
+    поэтому замеряется только обработка update-а
+
+    before - запросы выполняются прямо в event loop (run_sync вызывает функцию на месте)
+    after - запросы выполняются в пуле потоков databases.executor
+
+    Update-ы отправляют --users пользователей из базы с меню main, у которых
+    не заблокирован аккаунт (имя берется из базы, поэтому профиль не перезаписывается)
+
+    python scripts/benchmark_update_handlers.py --updates 200 --users 50 --text "профиль"
+"""
+
+import io
+import os
+import sys
+import time
+import asyncio
+import argparse
+import contextlib
+from datetime import datetime, timezone
+from concurrent.futures import Executor, Future
+
+# Добавляем корневую директорию в путь
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import Update, Message, Chat, User
+from telegram.constants import ChatType
+
+import databases.executor as psql_executor
+from databases.postgresql import get_postgresql_pool
+from schemas.users import UserMenu
+from modules.telegram.bot import _SendQueue
+from telegram_bot.routers.handler_messages import handler_messages
+
+
+class _InlineExecutor(Executor):
+    """Выполняет функцию сразу в вызывающем потоке, как было до run_sync"""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+        return future
+
+
+def _put_without_sending(self, chat_id: int, priority, kwargs: dict) -> Future:
+    """Заменяет отправку в Telegram, сообщение считается отправленным сразу"""
+
+    future = Future()
+    future.set_result(None)
+
+    return future
+
+
+def _get_users(limit: int) -> list[dict]:
+    """Возвращает пользователей, от имени которых отправляются update-ы"""
+
+    with get_postgresql_pool().connection() as (_, psql_cursor):
+        psql_cursor.execute("""
+            SELECT user_id, full_name, telegram_username
+            FROM users
+            WHERE banned = FALSE AND menu = %(menu)s
+            ORDER BY user_id
+            LIMIT %(limit)s
+        """, {
+            "menu": UserMenu.MAIN.value,
+            "limit": limit
+        })
+        return psql_cursor.fetchall()
+
+
+def _create_update(update_id: int, user: dict, text: str) -> Update:
+    """Собирает update с сообщением пользователя в личном чате с ботом"""
+
+    from_user = User(
+        id=user["user_id"], first_name=user["full_name"],
+        is_bot=False, username=user["telegram_username"]
+    )
+    message = Message(
+        message_id=update_id, date=datetime.now(timezone.utc),
+        chat=Chat(id=user["user_id"], type=ChatType.PRIVATE),
+        from_user=from_user, text=text
+    )
+
+    return Update(update_id=update_id, message=message)
+
+
+async def _handle_update(update: Update, latencies: list[float]) -> None:
+    """Обрабатывает update и запоминает время обработки"""
+
+    started_at = time.perf_counter()
+    await handler_messages(update)
+    latencies.append(time.perf_counter() - started_at)
+
+
+async def _run(updates: list[Update], executor: Executor | None) -> tuple[float, list[float]]:
+    """Возвращает количество обработанных update-ов в секунду и время обработки каждого"""
+
+    psql_executor.shutdown_psql_executor()
+    psql_executor._executor = executor  # None - get_psql_executor создаст пул потоков
+
+    latencies = []
+    started_at = time.perf_counter()
+
+    # handler_messages пишет отладочный лог на каждый update
+    with contextlib.redirect_stdout(io.StringIO()):
+        await asyncio.gather(*[_handle_update(update, latencies) for update in updates])
+
+    elapsed = time.perf_counter() - started_at
+    psql_executor.shutdown_psql_executor()
+
+    return len(updates) / elapsed, sorted(latencies)
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    """Возвращает перцентиль в миллисекундах"""
+
+    index = min(len(values) - 1, len(values) * percent // 100)
+    return values[index] * 1000
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--text", type=str, default="профиль")
+    args = parser.parse_args()
+
+    users = _get_users(args.users)
+    if not users:
+        print("нет пользователей с меню main для бенчмарка")
+        return
+
+    updates = [
+        _create_update(update_id, users[update_id % len(users)], args.text)
+        for update_id in range(args.updates)
+    ]
+
+    _SendQueue.put = _put_without_sending
+
+    # Прогрев: соединения пула, кэш профилей в redis
+    asyncio.run(_run(updates[:len(users)], None))
+
+    before, before_latencies = asyncio.run(_run(updates, _InlineExecutor()))
+    after, after_latencies = asyncio.run(_run(updates, None))
+
+    print(f"update-ов: {args.updates}, пользователей: {len(users)}, сообщение: {args.text!r}")
+    print(
+        f"before (запросы в event loop): {before:.1f} update/s, "
+        f"p50 {_percentile(before_latencies, 50):.1f} ms, p95 {_percentile(before_latencies, 95):.1f} ms"
+    )
+    print(
+        f"after  (run_sync):             {after:.1f} update/s, "
+        f"p50 {_percentile(after_latencies, 50):.1f} ms, p95 {_percentile(after_latencies, 95):.1f} ms"
+    )
+    print(f"ускорение: x{after / before:.1f}")
+    print(f"пул: {get_postgresql_pool().get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
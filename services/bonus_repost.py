@@ -1,11 +1,11 @@
 import os
-import asyncio
 import traceback
 from pathlib import Path
 from psycopg2.extras import DictCursor
 
 from settings import VkBotSettings, NotifyChats, Config
-from databases.postgresql import get_postgresql_connection
+from databases.executor import run_sync
+from databases.postgresql import async_postgresql_connection
 
 from schemas.bonus_repost import BonusPostSchema
 from services.notification import NotificationsService
@@ -212,56 +212,43 @@ class BonusRepostService:
 
     @classmethod
     async def publish_post_end_bonus(cls) -> None:
-        """Публикует пост об окончании бонуса"""
-
-        while True:
-            psql_connect, psql_cursor = get_postgresql_connection()
-
-            try:
-                psql_cursor.execute("""
-                    SELECT post_id FROM bonus_posts
-                    WHERE NOW() >= life_datetime and on_wall = FALSE
-                """)
-                post_ids = [x["post_id"] for x in psql_cursor.fetchall()]
-
-                for post_id in post_ids:
-                    try:
-                        post_link = f"https://vk.com/wall-{VkBotSettings.GROUP_ID}_{post_id}"
-
-                        document_path = cls._create_document(post_id, psql_cursor)
-                        doc_attachment = await upload_document(document_path, "Победители")
-                        os.remove(document_path)
-
-                        await publish_post(
-                            message=f"""
-                                ⌛Время проведения акции - {post_link} подошло к концу
-                                ✅ Все участники получили призы
-                            """,
-                            attachment=doc_attachment
-                        )
-                        psql_cursor.execute("""
-                            UPDATE bonus_posts
-                            SET on_wall = TRUE
-                            WHERE post_id = %s
-                        """, [post_id])
-                        cls.delete_post(post_id, psql_cursor)
-
-                    except:
-                        await NotificationsService.send_notification(
-                            chat=NotifyChats.MAIN,
-                            message=f"""
-                                Пост {post_link} не получилось опубликовать
-                                Через несколько минут попробую еще раз
-                                Ошибка: {traceback.format_exc()}
-                            """
-                        )
-                        await asyncio.sleep(10)
-
-                await asyncio.sleep(60)
-
-            except:
-                await asyncio.sleep(30)
-
-            finally:
-                psql_cursor.close()
-                psql_connect.close()
+        """Публикует пост об окончании бонуса (фоновая задача, см. BackgroundWorkers.get_tasks)"""
+
+        async with async_postgresql_connection() as (_, psql_cursor):
+            await run_sync(psql_cursor.execute, """
+                SELECT post_id FROM bonus_posts
+                WHERE NOW() >= life_datetime and on_wall = FALSE
+            """)
+            post_ids = [x["post_id"] for x in psql_cursor.fetchall()]
+
+            for post_id in post_ids:
+                try:
+                    post_link = f"https://vk.com/wall-{VkBotSettings.GROUP_ID}_{post_id}"
+
+                    document_path = await run_sync(cls._create_document, post_id, psql_cursor)
+                    doc_attachment = await upload_document(document_path, "Победители")
+                    os.remove(document_path)
+
+                    await publish_post(
+                        message=f"""
+                            ⌛Время проведения акции - {post_link} подошло к концу
+                            ✅ Все участники получили призы
+                        """,
+                        attachment=doc_attachment
+                    )
+                    await run_sync(psql_cursor.execute, """
+                        UPDATE bonus_posts
+                        SET on_wall = TRUE
+                        WHERE post_id = %s
+                    """, [post_id])
+                    await run_sync(cls.delete_post, post_id, psql_cursor)
+
+                except:
+                    await NotificationsService.send_notification(
+                        chat=NotifyChats.MAIN,
+                        message=f"""
+                            Пост {post_link} не получилось опубликовать
+                            Через несколько минут попробую еще раз
+                            Ошибка: {traceback.format_exc()}
+                        """
+                    )
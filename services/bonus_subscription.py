@@ -1,8 +1,10 @@
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
 
-from schemas.bonus_subscription import BonusSubscriptionSchema, BonusSubscriptionLogSchema
+from schemas.bonus_subscription import BonusSubscriptionSchema, BonusSubscriptionLogSchema, \
+    ChannelSubscriberSchema
 from modules.additional import format_number
 from modules.databases.users import get_user_data, give_coins
+from modules.telegram.bot import send_message, MessagePriority
 
 
 class BonusSubscriptionService:
@@ -99,6 +101,129 @@ class BonusSubscriptionService:
             "reward": reward
         })
 
+    @staticmethod
+    def set_subscriptions(
+            subscriptions: list[tuple[int, bool]],
+            psql_cursor: DictCursor
+    ) -> None:
+        """Сохраняет подписку пользователей на канал (user_id, is_subscribed)"""
+
+        if not subscriptions:
+            return
+
+        execute_values(psql_cursor, f"""
+            INSERT INTO {ChannelSubscriberSchema.__tablename__} (user_id, is_subscribed)
+            VALUES %s
+            ON CONFLICT (user_id) DO UPDATE
+            SET is_subscribed = EXCLUDED.is_subscribed,
+                updated_at = NOW()
+        """, subscriptions)
+
+    @staticmethod
+    def get_unchecked_users(
+            after_user_id: int,
+            limit: int,
+            psql_cursor: DictCursor
+    ) -> list[int]:
+        """Возвращает пользователей, подписка которых еще не проверялась (по возрастанию user_id)"""
+
+        psql_cursor.execute(f"""
+            SELECT users.user_id
+            FROM users
+            LEFT JOIN {ChannelSubscriberSchema.__tablename__} AS subscribers
+                   ON subscribers.user_id = users.user_id
+            WHERE users.user_id > %(after_user_id)s AND
+                  subscribers.user_id IS NULL
+            ORDER BY users.user_id
+            LIMIT %(limit)s
+        """, {
+            "after_user_id": max(after_user_id, 0),
+            "limit": limit
+        })
+
+        return [row["user_id"] for row in psql_cursor.fetchall()]
+
+    @staticmethod
+    def get_stale_unsubscribed_users(
+            recheck_after: int,
+            limit: int,
+            psql_cursor: DictCursor
+    ) -> list[int]:
+        """Возвращает неподписанных пользователей, проверенных раньше recheck_after секунд назад (самые старые первыми)"""
+
+        psql_cursor.execute(f"""
+            SELECT user_id
+            FROM {ChannelSubscriberSchema.__tablename__}
+            WHERE is_subscribed = FALSE AND
+                  updated_at < NOW() - make_interval(secs => %(recheck_after)s)
+            ORDER BY updated_at
+            LIMIT %(limit)s
+        """, {
+            "recheck_after": recheck_after,
+            "limit": limit
+        })
+
+        return [row["user_id"] for row in psql_cursor.fetchall()]
+
+    @staticmethod
+    def give_bonuses(
+            limit: int,
+            psql_cursor: DictCursor,
+            user_id: int | None = None
+    ) -> list[tuple[int, int]]:
+        """Выдает подписчикам канала активные бонусы, которые они еще не получали"""
+        # Возвращает (user_id, сумма наград) получивших, user_id - выдать бонусы только этому пользователю
+        # limit ограничивает число пар (пользователь, бонус) за один запрос
+
+        # Один запрос: подписчики без записи в логах (anti-join) -> запись в логи -> начисление WC
+        # ON CONFLICT защищает от двойной выдачи, если бонус одновременно выдают событие канала и фоновая задача
+        psql_cursor.execute(f"""
+            WITH eligible AS (
+                SELECT subscribers.user_id, bonuses.id AS bonus_id, bonuses.reward
+                FROM {ChannelSubscriberSchema.__tablename__} AS subscribers
+                JOIN users ON users.user_id = subscribers.user_id
+                CROSS JOIN {BonusSubscriptionSchema.__tablename__} AS bonuses
+                WHERE subscribers.is_subscribed = TRUE AND
+                      bonuses.is_active = TRUE AND
+                      (%(user_id)s::BIGINT IS NULL OR subscribers.user_id = %(user_id)s) AND
+                      NOT EXISTS (
+                          SELECT 1 FROM {BonusSubscriptionLogSchema.__tablename__} AS logs
+                          WHERE logs.user_id = subscribers.user_id AND
+                                logs.bonus_id = bonuses.id
+                      )
+                LIMIT %(limit)s
+            ), received AS (
+                INSERT INTO {BonusSubscriptionLogSchema.__tablename__} (user_id, bonus_id, reward)
+                SELECT user_id, bonus_id, reward FROM eligible
+                ON CONFLICT (user_id, bonus_id) DO NOTHING
+                RETURNING user_id, reward
+            ), rewards AS (
+                SELECT user_id, SUM(reward) AS reward
+                FROM received
+                GROUP BY user_id
+            )
+            UPDATE users
+            SET coins = coins + rewards.reward
+            FROM rewards
+            WHERE users.user_id = rewards.user_id
+            RETURNING users.user_id, rewards.reward
+        """, {
+            "user_id": user_id,
+            "limit": limit
+        })
+
+        return [(row["user_id"], int(row["reward"])) for row in psql_cursor.fetchall()]
+
+    @staticmethod
+    async def send_bonus_messages(
+            rewards: list[tuple[int, int]]
+    ) -> None:
+        """Сообщает пользователям о полученных бонусах за подписку"""
+
+        for user_id, reward in rewards:
+            message = f"Получен бонус за подписку в размере {format_number(reward)} White Coin"
+            await send_message(user_id, message, priority=MessagePriority.NOTIFICATION, wait=False)
+
     @classmethod
     def format_bonus_message(
             cls,
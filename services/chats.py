@@ -5,8 +5,10 @@ from schemas.users import UserSchema, UserStatus
 from schemas.chats import ChatSchema, ChatType, ChatStatsPeriod, ChatStatsSchema, \
     ChatStatsUserSchema, ChatHelperSchema, CHAT_STATS_PAYLOAD
 from schemas.games import Games
+from schemas.rates import ChatRatesVolumeSchema
 
 from modules.additional import format_number
+from modules.pagination import get_keyset_condition, get_keyset_order, split_keyset_page
 from modules.databases.users import get_user_data
 
 
@@ -159,47 +161,43 @@ class ChatsService:
 
 
     @classmethod
-    def get_my_chats(
+    def get_my_chats_page(
         cls,
         user_id: int,
         psql_cursor: DictCursor,
-        offset: int,
-        limit: int
-    ) -> list[ChatSchema | None]:
-        """Возвращает чаты которые принадлежат пользователю"""
+        limit: int,
+        *,
+        after: int | None = None,
+        before: int | None = None
+    ) -> tuple[list[ChatSchema | None], bool, bool]:
+        """
+            Возвращает (чаты пользователя, есть предыдущая, есть следующая)
+            Страница ищется после чата after или до чата before (keyset)
+        """
 
-        psql_cursor.execute("""
+        after = after if isinstance(after, int) else None
+        before = before if isinstance(before, int) and after is None else None
+
+        cursor_id = after if after is not None else before
+        backward = before is not None
+        keyset_condition = "TRUE" if cursor_id is None else get_keyset_condition(
+            "chat_id", "%(cursor_id)s", descending=False, backward=backward
+        )
+
+        psql_cursor.execute(f"""
             SELECT * FROM chats
-            WHERE owner_id = %(user_id)s
-            ORDER BY chat_id ASC, is_activated DESC
-            OFFSET %(offset)s
+            WHERE owner_id = %(user_id)s AND
+                  {keyset_condition}
+            ORDER BY {get_keyset_order(["chat_id"], descending=False, backward=backward)}
             LIMIT %(limit)s
         """, {
             "user_id": user_id,
-            "offset": offset,
-            "limit": limit
+            "cursor_id": cursor_id,
+            "limit": limit + 1
         })
         chats = [ChatSchema(**x) for x in psql_cursor.fetchall()]
 
-        return chats
-
-
-    @classmethod
-    def get_count_my_chats(
-            cls,
-            owner_id: int,
-            psql_cursor: DictCursor
-    ) -> int:
-        """Возвращает количество чатов которые принадлежат пользователю"""
-
-        psql_cursor.execute("""
-            SELECT COUNT(*) as count_chats
-            FROM chats
-            WHERE owner_id = %s
-        """, (owner_id,)),
-        psql_response = psql_cursor.fetchone()["count_chats"]
-
-        return psql_response
+        return split_keyset_page(chats, limit, after=after, before=before)
 
 
     @classmethod
@@ -225,15 +223,15 @@ class ChatsService:
     def _get_stats_sql_condition(period: ChatStatsPeriod) -> str:
         """Возвращает условие по которому выполняется поиск в базе данных"""
 
-        condition = "WHERE rates.chat_id = %(chat_id)s AND "
+        condition = "WHERE volume.chat_id = %(chat_id)s AND "
 
         if period == ChatStatsPeriod.DAY:
-            condition += "DATE(rates.created_at) = current_date"
+            condition += "volume.day = current_date"
 
         elif period == ChatStatsPeriod.WEEK:
             condition += """
-                DATE(rates.created_at) >= date_trunc('week', current_date) AND
-                DATE(rates.created_at) <= current_date
+                volume.day >= date_trunc('week', current_date) AND
+                volume.day <= current_date
             """
 
         elif period == ChatStatsPeriod.ALL_TIME:
@@ -274,10 +272,11 @@ class ChatsService:
         """Возвращает общую статистику за период"""
 
         psql_cursor.execute(f"""
-            SELECT COALESCE(SUM(rates.amount), 0) as rates_amount,
-                   COALESCE(COUNT(DISTINCT rates.user_id), 0) as count_users,
-                   COALESCE(SUM(rates.owner_income), 0) as owner_incomes
-            FROM rates JOIN users ON rates.user_id = users.user_id
+            SELECT COALESCE(SUM(volume.volume), 0) as rates_amount,
+                   COALESCE(COUNT(DISTINCT volume.user_id), 0) as count_users,
+                   COALESCE(SUM(volume.owner_income), 0) as owner_incomes
+            FROM {ChatRatesVolumeSchema.__tablename__} AS volume
+            JOIN users ON volume.user_id = users.user_id
             {cls._get_stats_sql_condition(period)}
         """, {
             "chat_id": chat_id
@@ -297,13 +296,14 @@ class ChatsService:
         """Возвращает 10 лучших пользователей по сумме ставок"""
 
         psql_cursor.execute(f"""
-            SELECT rates.user_id as user_id,
+            SELECT volume.user_id as user_id,
                    users.status as user_status,
                    users.full_name as full_name,
-                   SUM(rates.amount) as rates_amount
-            FROM rates JOIN users ON rates.user_id = users.user_id
+                   SUM(volume.volume) as rates_amount
+            FROM {ChatRatesVolumeSchema.__tablename__} AS volume
+            JOIN users ON volume.user_id = users.user_id
             {cls._get_stats_sql_condition(period)}
-            GROUP BY rates.user_id, users.status, users.full_name
+            GROUP BY volume.user_id, users.status, users.full_name
             ORDER BY rates_amount DESC
             LIMIT 10
         """, {
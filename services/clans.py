@@ -5,13 +5,16 @@ from redis.client import Redis
 from psycopg2.extras import DictCursor
 
 from settings import TelegramBotSettings, ClanSettings
+from databases.executor import run_sync
 
 from schemas.users import UserSchema, UserMenu
 from schemas.clans import ClanSchema, MiniClanSchema, MemberScheme, ClanRole, \
     ClanJoinType, ExtraCreateClan, ExtraOwnerClan, clan_join_type_translation
 from schemas.redis import RedisKeys
+from services.periods import PeriodsService
 
 from modules.additional import format_number
+from modules.pagination import get_keyset_condition, get_keyset_order, split_keyset_page
 from modules.databases.users import get_user_data, update_user_menu, \
     update_user_extra_data
 from modules.telegram.bot import send_message, send_keyboard
@@ -113,13 +116,13 @@ class ClanService:
         """Возвращает очки клана"""
 
         psql_cursor.execute("""
-            SELECT COALESCE(SUM(clan_points), 0) as clan_points
-            FROM users
+            SELECT clan_points FROM clans
             WHERE clan_id = %(clan_id)s
         """, {
             "clan_id": clan_id
         })
-        clan_points = int(psql_cursor.fetchone()["clan_points"])
+        psql_response = psql_cursor.fetchone()
+        clan_points = int(psql_response["clan_points"]) if psql_response is not None else 0
 
         return clan_points
 
@@ -162,7 +165,7 @@ class ClanService:
         if psql_response is not None:
             clan_data = ClanSchema(**psql_response)
 
-            clan_data.points = cls.get_clan_points(clan_id, psql_cursor)
+            clan_data.points = psql_response["clan_points"]
             clan_data.count_members = cls.get_clan_count_members(clan_id, psql_cursor)
 
             return clan_data
@@ -182,15 +185,12 @@ class ClanService:
             с указанным смещением и лимитом
         """
 
+        # Очки клана обновляются триггером на users (см. raise_database.add_clans_points)
         psql_cursor.execute("""
-            SELECT clans.clan_id, clans.owner_id,
-                   clans.tag, clans.name,
-                   COALESCE(SUM(users.clan_points), 0) as points
+            SELECT clan_id, owner_id, tag, name,
+                   clan_points as points
             FROM clans
-            LEFT JOIN users ON clans.clan_id = users.clan_id
-            GROUP BY clans.clan_id, clans.owner_id,
-                     clans.tag, clans.name, clans.tag
-            ORDER BY points DESC, clan_id DESC
+            ORDER BY clan_points DESC, clan_id DESC
             OFFSET %(offset)s
             LIMIT %(limit)s
         """, {
@@ -203,6 +203,56 @@ class ClanService:
         return clans
 
 
+    @classmethod
+    def get_clans_page(
+            cls,
+            psql_cursor: DictCursor,
+            offset: int,
+            limit: int,
+            *,
+            after: int | None = None,
+            before: int | None = None
+    ) -> tuple[list[Optional[MiniClanSchema]], bool, bool]:
+        """
+            Возвращает (кланы страницы, есть предыдущая, есть следующая)
+            Страница ищется после клана after или до клана before (keyset), иначе по offset
+        """
+
+        after = after if isinstance(after, int) else None
+        before = before if isinstance(before, int) and after is None else None
+
+        cursor_id = after if after is not None else before
+        if cursor_id is None:
+            clans = cls.get_clans(psql_cursor, offset, limit + 1)
+            return clans[:limit], offset > 0, len(clans) > limit
+
+        backward = after is None
+        keyset_condition = get_keyset_condition(
+            "clan_points, clan_id",
+            "SELECT clan_points, clan_id FROM clans WHERE clan_id = %(cursor_id)s",
+            descending=True, backward=backward
+        )
+
+        psql_cursor.execute(f"""
+            SELECT clan_id, owner_id, tag, name,
+                   clan_points as points
+            FROM clans
+            WHERE {keyset_condition}
+            ORDER BY {get_keyset_order(["clan_points", "clan_id"], descending=True, backward=backward)}
+            LIMIT %(limit)s
+        """, {
+            "cursor_id": cursor_id,
+            "limit": limit + 1
+        })
+        clans = [MiniClanSchema(**clan) for clan in psql_cursor.fetchall()]
+
+        # Клан курсора удален, показываем страницу по offset
+        if not clans and offset > 0:
+            return cls.get_clans_page(psql_cursor, offset, limit)
+
+        return split_keyset_page(clans, limit, after=after, before=before)
+
+
     @staticmethod
     def get_total_clans_counts(
             psql_cursor: DictCursor
@@ -218,39 +268,45 @@ class ClanService:
         return total_clans_counts
 
 
-    @classmethod
+    @staticmethod
     def get_clan_position(
-            cls,
             clan_id: int,
             psql_cursor: DictCursor
     ) -> int:
         """Возвращает место клана в рейтинге"""
 
-        try:
-            total_clans_counts = cls.get_total_clans_counts(psql_cursor)
-            all_clans = cls.get_clans(psql_cursor, 0, total_clans_counts)
-            all_clans = [clan.clan_id for clan in all_clans]
-            clan_position = all_clans.index(clan_id) + 1
-
-            return clan_position
+        psql_cursor.execute("""
+            SELECT (
+                SELECT COUNT(*) FROM clans
+                WHERE (clans.clan_points, clans.clan_id) > (clan.clan_points, clan.clan_id)
+            ) + 1 as position
+            FROM clans AS clan
+            WHERE clan.clan_id = %(clan_id)s
+        """, {
+            "clan_id": clan_id
+        })
+        psql_response = psql_cursor.fetchone()
 
-        except:
-            return 0
+        return psql_response["position"] if psql_response is not None else 0
 
 
     @classmethod
     def get_clans_message(
             cls,
             psql_cursor: DictCursor,
-            offset: int = 0
+            offset: int = 0,
+            *,
+            after: int | None = None,
+            before: int | None = None
     ) -> tuple[str, str | None]:
         """Возвращает сообщение и клавиатуру о кланах"""
 
         COUNT_ROW = 4  # Количество кнопок в строке
         COUNT_CLANS = 8  # Количество кланов которое нужны найти
 
-        clans = cls.get_clans(psql_cursor, offset, COUNT_CLANS)
-        total_count_clans = cls.get_total_clans_counts(psql_cursor)
+        clans, back_page, next_page = cls.get_clans_page(
+            psql_cursor, offset, COUNT_CLANS, after=after, before=before
+        )
 
         response = "Топ кланов:\n"
         keyboard = VkKeyboard(one_time=False, inline=True) if clans else None
@@ -278,28 +334,27 @@ class ClanService:
             ):
                 keyboard.add_line()
 
-        back_page = offset != 0
-        next_page = total_count_clans - offset - COUNT_CLANS > 0
-
-        if back_page or next_page:
+        if clans and (back_page or next_page):
             keyboard.add_line()  # если есть кнопки вперед и/или назад
 
-        if back_page:
+        if clans and back_page:
             add_back_page(
                 keyboard,
                 full_test=next_page is False,
                 payload={
                     "event": "get_clans_message",
-                    "offset": offset - COUNT_CLANS
+                    "offset": max(offset - COUNT_CLANS, 0),
+                    "before": clans[0].clan_id
             })
 
-        if next_page:
+        if clans and next_page:
             add_next_page(
                 keyboard,
-                full_test=offset == 0,
+                full_test=back_page is False,
                 payload={
                     "event": "get_clans_message",
-                    "offset": offset + COUNT_CLANS
+                    "offset": offset + COUNT_CLANS,
+                    "after": clans[-1].clan_id
             })
 
         if keyboard is not None:
@@ -364,10 +419,10 @@ class ClanService:
         keyboard = get_clan_menu_keyboard(user_data)
 
         if user_data.clan_role == ClanRole.NOT:
-            update_user_extra_data(user_id, ExtraCreateClan(), psql_cursor)
+            await run_sync(update_user_extra_data, user_id, ExtraCreateClan(), psql_cursor)
 
         elif user_data.clan_role == ClanRole.OWNER:
-            update_user_extra_data(user_id, ExtraOwnerClan(), psql_cursor)
+            await run_sync(update_user_extra_data, user_id, ExtraOwnerClan(), psql_cursor)
 
         await send_keyboard(user_id, keyboard)
 
@@ -383,7 +438,7 @@ class ClanService:
         # В Telegram используем прямую ссылку на бота
         link = f"https://t.me/{TelegramBotSettings.BOT_USERNAME}?start=clan_{clan_id}_{salt}"
 
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             UPDATE clans
             SET invitation_link = %(link)s,
                 invitation_salt = %(salt)s
@@ -459,22 +514,23 @@ class ClanService:
     ) -> tuple[str, str | None]:
         """Направляет пользователя в меню кланов"""
 
-        update_user_menu(user_data.user_id, UserMenu.CLANS, psql_cursor)
+        await run_sync(update_user_menu, user_data.user_id, UserMenu.CLANS, psql_cursor)
         
         if user_data.clan_role == ClanRole.NOT:
             # Не отправляем сообщение, только клавиатуру
             response = "Кланы"  # Минимальное сообщение для отправки клавиатуры
             keyboard = get_create_clan_keyboard()
             # Обновляем extra_data для меню создания клана
-            update_user_extra_data(user_data.user_id, ExtraCreateClan(), psql_cursor)
+            await run_sync(update_user_extra_data, user_data.user_id, ExtraCreateClan(), psql_cursor)
         else:
-            response, _ = cls.get_clan_info_message(
+            response, _ = await run_sync(
+                cls.get_clan_info_message,
                 psql_cursor, clan_id=user_data.clan_id, user_data=user_data
             )
             keyboard = get_clan_menu_keyboard(user_data)
             # Обновляем extra_data для владельца клана
             if user_data.clan_role == ClanRole.OWNER:
-                update_user_extra_data(user_data.user_id, ExtraOwnerClan(), psql_cursor)
+                await run_sync(update_user_extra_data, user_data.user_id, ExtraOwnerClan(), psql_cursor)
 
         return response, keyboard
 
@@ -489,7 +545,7 @@ class ClanService:
         """Обрабатывает вход в клан возвращает сообщение, клавиатуру"""
 
         keyboard = None
-        clan_data = cls.get_clan_data(clan_id, psql_cursor)
+        clan_data = await run_sync(cls.get_clan_data, clan_id, psql_cursor)
 
         if clan_data is None:
             response = CLAN_NOT_FOUND
@@ -505,14 +561,14 @@ class ClanService:
 
         else:
             user_id = user_data.user_id
-            cls.join_clan(clan_id, user_id, psql_cursor)
+            await run_sync(cls.join_clan, clan_id, user_id, psql_cursor)
 
             owner_message = f"⚠️ {user_data.vk_name} вступил в клан"
             await cls.send_clan_owner_notification(clan_data, owner_message)
 
             response = CLAN_GREETING
             keyboard = get_clan_member_keyboard()
-            update_user_extra_data(user_id, None, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, None, psql_cursor)
 
         return response, keyboard
 
@@ -532,7 +588,7 @@ class ClanService:
         """
 
         user_id = user_data.user_id
-        clan_data = cls.get_clan_data(clan_id, psql_cursor)
+        clan_data = await run_sync(cls.get_clan_data, clan_id, psql_cursor)
         redis_key = cls.create_redis_key_for_accent_clan(user_id=user_id, clan_id=clan_id)
 
         if clan_data is None:
@@ -580,7 +636,7 @@ class ClanService:
         user_id = user_data.user_id
 
         _, clan_id, clan_salt = reference.split("_")
-        clan_data = cls.get_clan_data(clan_id, psql_cursor)
+        clan_data = await run_sync(cls.get_clan_data, clan_id, psql_cursor)
 
         if user_data.clan_role != ClanRole.NOT:
             response = YOU_HAVE_CLAN
@@ -595,7 +651,7 @@ class ClanService:
             response = MAX_COUNT_MEMBERS_IN_CLAN
 
         else:
-            cls.join_clan(clan_id, user_id, psql_cursor)
+            await run_sync(cls.join_clan, clan_id, user_id, psql_cursor)
             await cls.update_invitation_link(clan_id, psql_cursor)
 
             owner_message = f"⚠️ {user_data.vk_name} вступил в клан"
@@ -618,12 +674,12 @@ class ClanService:
             с указанным смещением и лимитом
         """
 
-        psql_cursor.execute("""
+        psql_cursor.execute(f"""
             SELECT user_id, full_name,
-                   clan_points as points
+                   {PeriodsService.counter("clan_points")} as points
             FROM users
             WHERE clan_id = %(clan_id)s
-            ORDER BY clan_points DESC
+            ORDER BY points DESC
             OFFSET %(offset)s
             LIMIT %(limit)s
         """, {
@@ -11,15 +11,19 @@ from services.clans import ClanService
 
 def get_clans_message_telegram(
         psql_cursor: DictCursor,
-        offset: int = 0
+        offset: int = 0,
+        *,
+        after: int | None = None,
+        before: int | None = None
 ) -> tuple[str, Optional[InlineKeyboardMarkup]]:
     """Возвращает сообщение и клавиатуру о кланах для Telegram"""
 
     COUNT_ROW = 4  # Количество кнопок в строке
     COUNT_CLANS = 8  # Количество кланов которое нужны найти
 
-    clans = ClanService.get_clans(psql_cursor, offset, COUNT_CLANS)
-    total_count_clans = ClanService.get_total_clans_counts(psql_cursor)
+    clans, back_page, next_page = ClanService.get_clans_page(
+        psql_cursor, offset, COUNT_CLANS, after=after, before=before
+    )
 
     response = "Топ кланов:\n"
     keyboard_buttons = []
@@ -46,26 +50,25 @@ def get_clans_message_telegram(
             keyboard_buttons.append(row)
             row = []
 
-    back_page = offset != 0
-    next_page = total_count_clans - offset - COUNT_CLANS > 0
-
-    if back_page or next_page:
+    if clans and (back_page or next_page):
         nav_row = []
         if back_page:
             nav_row.append(InlineKeyboardButton(
                 text="◀️ Назад" if next_page else "◀️",
                 callback_data=json.dumps({
                     "event": "get_clans_message",
-                    "offset": offset - COUNT_CLANS
-                })
+                    "offset": max(offset - COUNT_CLANS, 0),
+                    "before": clans[0].clan_id
+                }, separators=(",", ":"))
             ))
         if next_page:
             nav_row.append(InlineKeyboardButton(
                 text="Вперед ▶️" if back_page else "▶️",
                 callback_data=json.dumps({
                     "event": "get_clans_message",
-                    "offset": offset + COUNT_CLANS
-                })
+                    "offset": offset + COUNT_CLANS,
+                    "after": clans[-1].clan_id
+                }, separators=(",", ":"))
             ))
         if nav_row:
             keyboard_buttons.append(nav_row)
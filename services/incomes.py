@@ -6,6 +6,7 @@ from settings import Config
 from schemas.users import UserStatus
 from schemas.redis import RedisKeys
 from schemas.bot_statistics import StatisticsSchema
+from services.periods import PeriodsService
 
 
 class IncomesService:
@@ -63,17 +64,23 @@ class IncomesService:
     def get_day_statistics(cls, redis_cursor: Redis, psql_cursor: DictCursor) -> StatisticsSchema:
         """Возвращает статистику за день"""
 
-        psql_cursor.execute("SELECT COUNT(user_id) as active FROM users WHERE day_rates > 0")
+        psql_cursor.execute(f"""
+            SELECT COUNT(user_id) as active
+            FROM users
+            WHERE {PeriodsService.is_actual("day_rates")} AND
+                  day_rates > 0
+        """)
         user_activ = psql_cursor.fetchone()["active"]
 
         additional_income = cls.get_additional_income(redis_cursor)
         additional_expenses = cls.get_additional_expenses(redis_cursor)
 
-        psql_cursor.execute("""
+        psql_cursor.execute(f"""
             SELECT COALESCE(SUM(day_win), 0) as day_win,
                    COALESCE(SUM(day_lost), 0) as day_lost
             FROM users
-            WHERE status not in %(ignore_user_status)s
+            WHERE {PeriodsService.is_actual("day_win")} AND
+                  status not in %(ignore_user_status)s
         """, {
             "ignore_user_status": (UserStatus.ADMIN, UserStatus.MARKET)
         })
@@ -1,5 +1,5 @@
 from settings import NotifyChats
-from modules.telegram.bot import send_message
+from modules.telegram.bot import send_message, MessagePriority
 
 
 class NotificationsService:
@@ -11,5 +11,6 @@ class NotificationsService:
             message: str
     ) -> None:
         """Отправить уведомление"""
+        # Не ждет отправки, логи уходят после результатов игр и ответов пользователям
 
-        await send_message(chat.value, message)
+        await send_message(chat.value, message, priority=MessagePriority.NOTIFICATION, wait=False)
@@ -0,0 +1,101 @@
+from psycopg2.extras import DictCursor
+
+from schemas.periods import Period, PeriodSchema, PERIOD_COUNTERS, COUNTER_PERIODS
+
+
+"""
+    Периоды счетчиков пользователей
+
+    Раньше сброс статистики и очков топов выполнялся через UPDATE всей таблицы users.
+    Теперь у каждого периода (Period) есть номер в таблице periods, а рядом со счетчиками
+    в users хранится номер периода {period}_period, в котором они были записаны.
+    Сброс - увеличение номера периода (одна строка), счетчики прошлого периода читаются как 0
+    и перезаписываются при следующем начислении
+
+    Счетчики в SQL нужно читать через PeriodsService.counter, а начислять через PeriodsService.increment
+
+    Пример:
+        psql_cursor.execute(f"SELECT SUM({PeriodsService.counter('day_win')}) as day_win FROM users")
+        PeriodsService.start_new_period(Period.DAY_STATISTICS, psql_cursor)
+"""
+
+
+class PeriodsService:
+    """Сервис по работе с периодами счетчиков"""
+
+    @staticmethod
+    def get_period_column(period: Period) -> str:
+        """Возвращает поле users с номером периода"""
+
+        return f"{period.value}_period"
+
+
+    @classmethod
+    def is_actual(cls, counter: str, table: str = "users") -> str:
+        """Возвращает SQL условие, что счетчик записан в текущем периоде"""
+
+        period = COUNTER_PERIODS[counter]
+        return f"{table}.{cls.get_period_column(period)} = current_period('{period.value}')"
+
+
+    @classmethod
+    def counter(cls, counter: str, table: str = "users") -> str:
+        """Возвращает SQL выражение значения счетчика в текущем периоде"""
+
+        return f"CASE WHEN {cls.is_actual(counter, table)} THEN {table}.{counter} ELSE 0 END"
+
+
+    @classmethod
+    def increment(cls, increments: dict[str, str], table: str = "users") -> str:
+        """Возвращает SET часть UPDATE, которая начисляет счетчики {счетчик: SQL выражение}"""
+        # Счетчик прошлого периода начинается с 0, номер периода обновляется
+
+        assignments = [
+            f"{counter} = {cls.counter(counter, table)} + {value}"
+            for counter, value in increments.items()
+        ]
+
+        periods = dict.fromkeys(COUNTER_PERIODS[counter] for counter in increments)
+        assignments.extend(
+            f"{cls.get_period_column(period)} = current_period('{period.value}')"
+            for period in periods
+        )
+
+        return ",\n".join(assignments)
+
+
+    @staticmethod
+    def start_new_period(period: Period, psql_cursor: DictCursor) -> None:
+        """Начинает новый период, счетчики прошлого периода становятся равны 0"""
+
+        psql_cursor.execute(f"""
+            UPDATE {PeriodSchema.__tablename__}
+            SET period_id = period_id + 1
+            WHERE name = %(name)s
+        """, {
+            "name": period.value
+        })
+
+
+    @staticmethod
+    def get_current_periods_sql() -> str:
+        """Возвращает SQL выражение {период: номер} текущих периодов"""
+
+        return f"(SELECT json_object_agg(name, period_id) FROM {PeriodSchema.__tablename__})"
+
+
+    @classmethod
+    def reset_stale_counters(cls, user: dict) -> dict:
+        """Обнуляет счетчики прошлых периодов в строке users"""
+        # В строке должно быть поле current_periods (см. get_current_periods_sql)
+
+        current_periods = user.pop("current_periods", None) or {}
+
+        for period, counters in PERIOD_COUNTERS.items():
+            if user.get(cls.get_period_column(period)) == current_periods.get(period.value):
+                continue
+
+            for counter in counters:
+                user[counter] = 0
+
+        return user
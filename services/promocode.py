@@ -1,11 +1,10 @@
-import asyncio
-import traceback
 from typing import Optional
 from redis.client import Redis
 from psycopg2.extras import DictCursor
 
 from settings import NotifyChats
-from databases.postgresql import get_postgresql_connection
+from databases.executor import run_sync
+from databases.postgresql import async_postgresql_connection
 
 from schemas.users import UserSchema, EMPTY_USER_DATA
 from schemas.redis import RedisKeys
@@ -125,7 +124,7 @@ class PromoCodeService:
         reward = promocode.reward
         quantity = promocode.quantity
 
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             INSERT INTO promocodes (
                 owner_id, name, reward, quantity, life_datetime
             )
@@ -142,7 +141,7 @@ class PromoCodeService:
             "life_in_minutes": promocode.life_date
         })
         promocode_data = PromoCodeSchema(**psql_cursor.fetchone())
-        take_coins(user_id, int(quantity * reward), psql_cursor)
+        await run_sync(take_coins, user_id, int(quantity * reward), psql_cursor)
 
         admin_message = f"""
             {user_data.vk_name} создал промокод\n
@@ -189,8 +188,8 @@ class PromoCodeService:
         promocode_name = promocode.name
         promocode_reward = promocode.reward
 
-        give_coins(user_id, promocode_reward, psql_cursor)
-        psql_cursor.execute("""
+        await run_sync(give_coins, user_id, promocode_reward, psql_cursor)
+        await run_sync(psql_cursor.execute, """
             UPDATE promocodes
             SET quantity = quantity - 1
             WHERE name = %(name)s
@@ -203,7 +202,7 @@ class PromoCodeService:
         if quantity < 0:
             raise Exception()
 
-        cls.add_promocode_activation(user_id, promocode_name, psql_cursor)
+        await run_sync(cls.add_promocode_activation, user_id, promocode_name, psql_cursor)
 
         admin_message = f"""
             {user_data.vk_name} активировал промо {promocode_name} и получили {promocode_reward} WC
@@ -211,7 +210,7 @@ class PromoCodeService:
         await NotificationsService.send_notification(NotifyChats.PROMOCODE, admin_message)
 
         if quantity == 0:
-            cls.delete_promocode(promocode_name, psql_cursor)
+            await run_sync(cls.delete_promocode, promocode_name, psql_cursor)
 
             admin_message = f"""
                 У промокода {promocode_name} закончились активации
@@ -258,71 +257,59 @@ class PromoCodeService:
 
 
     @classmethod
-    async def run_collector_expired_promocodes(cls):
+    async def collect_expired_promocodes(cls) -> float:
         """
-            Запускает сборщика просроченных промокодов
+            Собирает просроченные промокоды (фоновая задача, см. BackgroundWorkers.get_tasks)
             Возвращает не активированную награду создателю промокода и удаляет промокод
+            Возвращает секунды до истечения следующего промокода
         """
 
-        while True:
-            psql_connection, psql_cursor = get_postgresql_connection()
-
-            try:
-                psql_cursor.execute("""
-                    SELECT EXTRACT(EPOCH FROM
-                        COALESCE(
-                            MIN(life_datetime),
-                            NOW() + INTERVAL '30 SECONDS'
-                        ) - NOW()
-                    ) as seconds
-                    FROM promocodes
-                """)
-                seconds = psql_cursor.fetchone()["seconds"]
-                seconds = seconds if seconds > 0 else 0
-                seconds = min(seconds, 30)
-
-                await asyncio.sleep(seconds)
-
-                psql_cursor.execute("""
-                    SELECT * FROM promocodes
-                    WHERE life_datetime < NOW()
-                """)
-                psql_response = psql_cursor.fetchall()
-                promocodes = [PromoCodeSchema(**x) for x in psql_response]
-
-                for promocode in promocodes:
-                    promocode_name = promocode.name
-                    cls.delete_promocode(promocode_name, psql_cursor)
-
-                    if promocode.quantity == 0:
-                        continue
-
-                    owner_id = promocode.owner_id
-                    refund_amount = int(promocode.quantity * promocode.reward)
-                    give_coins(owner_id, refund_amount, psql_cursor)
-
-                    owner_data = get_user_data(owner_id, psql_cursor) or EMPTY_USER_DATA
-                    refund_amount = format_number(refund_amount)
-
-                    await NotificationsService.send_notification(
-                        chat=NotifyChats.PROMOCODE,
-                        message=f"""
-                            Промокод {promocode_name} истёк
-                            {refund_amount} коинов были возвращены {owner_data.vk_name}
-                        """
-                    )
-                    await send_message(
-                        peer_id=owner_id,
-                        message=f"Промокод {promocode_name} истек, {refund_amount} WC возвращены на баланс"
-                    )
-
-            except:
-                traceback.print_exc()
-                await asyncio.sleep(10)
-
-            finally:
-                psql_cursor.close()
-                psql_connection.close()
+        async with async_postgresql_connection() as (_, psql_cursor):
+            await run_sync(psql_cursor.execute, """
+                SELECT * FROM promocodes
+                WHERE life_datetime < NOW()
+            """)
+            psql_response = psql_cursor.fetchall()
+            promocodes = [PromoCodeSchema(**x) for x in psql_response]
+
+            for promocode in promocodes:
+                promocode_name = promocode.name
+                await run_sync(cls.delete_promocode, promocode_name, psql_cursor)
+
+                if promocode.quantity == 0:
+                    continue
+
+                owner_id = promocode.owner_id
+                refund_amount = int(promocode.quantity * promocode.reward)
+                await run_sync(give_coins, owner_id, refund_amount, psql_cursor)
+
+                owner_data = await run_sync(get_user_data, owner_id, psql_cursor) or EMPTY_USER_DATA
+                refund_amount = format_number(refund_amount)
+
+                await NotificationsService.send_notification(
+                    chat=NotifyChats.PROMOCODE,
+                    message=f"""
+                        Промокод {promocode_name} истёк
+                        {refund_amount} коинов были возвращены {owner_data.vk_name}
+                    """
+                )
+                await send_message(
+                    peer_id=owner_id,
+                    message=f"Промокод {promocode_name} истек, {refund_amount} WC возвращены на баланс"
+                )
+
+            await run_sync(psql_cursor.execute, """
+                SELECT EXTRACT(EPOCH FROM
+                    COALESCE(
+                        MIN(life_datetime),
+                        NOW() + INTERVAL '30 SECONDS'
+                    ) - NOW()
+                ) as seconds
+                FROM promocodes
+            """)
+            seconds = psql_cursor.fetchone()["seconds"]
+
+        return max(float(seconds), 0)
 
 
     @staticmethod
@@ -5,6 +5,7 @@ from vk_api.keyboard import VkKeyboard, VkKeyboardColor
 from psycopg2.extras import DictCursor
 
 from settings import PointsLimit, NotifyChats
+from databases.executor import run_sync
 from databases.redis import get_redis_cursor
 from databases.postgresql import get_postgresql_connection
 
@@ -19,6 +20,7 @@ from services.notification import NotificationsService
 from services.reset_user_data import ResetUserServices
 
 from modules.additional import strtobool, format_number, convert_number
+from modules.pagination import get_keyset_condition
 from modules.databases.users import get_user_data, give_coins, take_coins
 from modules.telegram.bot import send_message
 from modules.telegram.users import get_user_id
@@ -214,7 +216,7 @@ class TransferCoinsService:
     ) -> None:
         """Отправляет callback на сервер получателя"""
 
-        callback_data = CallbackService.get_user_callback(recipient_id, psql_cursor)
+        callback_data = await run_sync(CallbackService.get_user_callback, recipient_id, psql_cursor)
 
         if (
             callback_data is not None and
@@ -247,7 +249,7 @@ class TransferCoinsService:
 
         sender_id = transaction_data.sender_id
 
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             SELECT COALESCE(COUNT(*), 0) as sender_send_count
             FROM transfer_coins
             WHERE sender_id = %(sender_id)s AND
@@ -259,9 +261,9 @@ class TransferCoinsService:
 
         if (
             sender_send_count >= 50 and
-            not TransferWhiteListService.search(sender_id, psql_cursor)
+            not await run_sync(TransferWhiteListService.search, sender_id, psql_cursor)
         ):
-            cls.update_banned_transfer(sender_id, True, psql_cursor)
+            await run_sync(cls.update_banned_transfer, sender_id, True, psql_cursor)
 
             await NotificationsService.send_notification(
                 chat=NotifyChats.TRANSFER_COINS,
@@ -285,11 +287,11 @@ class TransferCoinsService:
             format_amount = format_number(amount)
 
             sender_id = transaction_data.sender_id
-            sender_data = get_user_data(sender_id, psql_cursor)
+            sender_data = await run_sync(get_user_data, sender_id, psql_cursor)
             sender_name = sender_data.vk_name
 
             recipient_id = transaction_data.recipient_id
-            recipient_data = get_user_data(recipient_id, psql_cursor)
+            recipient_data = await run_sync(get_user_data, recipient_id, psql_cursor)
             recipient_name = recipient_data.vk_name
 
             await cls._send_notifi_recipient(
@@ -374,6 +376,7 @@ class TransferCoinsService:
             limit: int,
             psql_cursor: DictCursor,
             *,
+            before_id: int | None = None,  # keyset: переводы старше before_id
             convert_type: bool = True  # Конвертирует в TransferCoinsSchema
     ) -> list[TransferCoinsSchema | dict | None]:
         """Возвращает переводы пользователя"""
@@ -381,14 +384,30 @@ class TransferCoinsService:
         in_flag = type in [TransferCoinsType.IN, TransferCoinsType.ALL]
         out_flag = type in [TransferCoinsType.OUT, TransferCoinsType.ALL]
 
-        psql_cursor.execute("""
+        keyset_condition = "TRUE" if before_id is None else get_keyset_condition(
+            "id", "%(before_id)s", descending=True, backward=False
+        )
+
+        # Входящие и исходящие выбираются отдельно по индексам (recipient_id, id) и (sender_id, id)
+        psql_cursor.execute(f"""
             SELECT *, created_at::text as created_at
-            FROM transfer_coins
-            WHERE (
-                %(in_flag)s AND recipient_id = %(user_id)s
-                OR
-                %(out_flag)s AND sender_id = %(user_id)s
-            ) AND id > %(offset)s
+            FROM (
+                (
+                    SELECT * FROM transfer_coins
+                    WHERE %(in_flag)s AND recipient_id = %(user_id)s AND
+                          id > %(offset)s AND {keyset_condition}
+                    ORDER BY id DESC
+                    LIMIT %(limit)s
+                )
+                UNION
+                (
+                    SELECT * FROM transfer_coins
+                    WHERE %(out_flag)s AND sender_id = %(user_id)s AND
+                          id > %(offset)s AND {keyset_condition}
+                    ORDER BY id DESC
+                    LIMIT %(limit)s
+                )
+            ) AS transfers
             ORDER BY id DESC
             LIMIT %(limit)s
         """, {
@@ -396,6 +415,7 @@ class TransferCoinsService:
             "in_flag": in_flag,
             "out_flag": out_flag,
             "offset": offset,
+            "before_id": before_id,
             "limit": limit
         })
         transfers = psql_cursor.fetchall()
@@ -464,7 +484,8 @@ class TransferCoinsService:
         else:
             return SOMETHING_WENT_WRONG, None
 
-        transfer = cls.check_possibility(
+        transfer = await run_sync(
+            cls.check_possibility,
             sender_id, recipient_id, amount, psql_cursor
         )
 
@@ -496,7 +517,7 @@ class TransferCoinsService:
         )
         keyboard.add_line()
 
-        recipient_data = get_user_data(recipient_id, psql_cursor)
+        recipient_data = await run_sync(get_user_data, recipient_id, psql_cursor)
         extra_text = cls.get_message_warning(recipient_data, keyboard)
         extra_text = f"\n{extra_text}\n\n" if extra_text else ""
 
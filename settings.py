@@ -62,6 +62,11 @@ class TopSettings:
 
     # Указывает какие топы включены, а какие отключены
 
+    LEADERBOARD_TTL: int = 600  # Через сколько секунд рейтинг топа в redis пересобирается из postgresql
+    LEADERBOARD_REBUILD_TIMEOUT: int = 30  # Сколько секунд держится блокировка сборки рейтинга
+    LEADERBOARD_CHUNK_SIZE: int = 10_000  # Сколько игроков добавляется в рейтинг одной командой ZADD
+    PAGE_CACHE_TTL: int = 5  # Сколько секунд хранится текст страницы топа без изменения очков
+
 
 class PointsLimit:
     """
@@ -150,6 +155,45 @@ class DatabasePsqlSettings:
     DB_PORT = os.getenv("PSQL_PORT", "5432")  # Порт базы данных
     DB_NAME = os.getenv("PSQL_DATABASE", "whitecoin")  # Имя базы данных
 
+    POOL_MIN_SIZE = int(os.getenv("PSQL_POOL_MIN_SIZE", "2"))  # Соединений в пуле при старте
+    POOL_MAX_SIZE = int(os.getenv("PSQL_POOL_MAX_SIZE", "20"))  # Максимум соединений в пуле
+    # Пул свой в каждом процессе: 4 воркера gunicorn * POOL_MAX_SIZE + фоновые задачи <= max_connections
+    POOL_TIMEOUT = float(os.getenv("PSQL_POOL_TIMEOUT", "10"))  # Сколько секунд ждать свободное соединение
+    POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("PSQL_POOL_HEALTH_CHECK_INTERVAL", "30"))
+    # Если соединение простаивало дольше (секунд), перед выдачей выполняется SELECT 1
+    EXECUTOR_WORKERS = int(os.getenv("PSQL_EXECUTOR_WORKERS", str(POOL_MAX_SIZE)))
+    # Потоков для выполнения запросов из async обработчиков (databases/executor.py)
+
+
+class RoundSchedulerSettings:
+    """Настройки планировщика окончания раундов"""
+
+    MAX_CONCURRENT_SETTLEMENTS = int(os.getenv("ROUND_MAX_CONCURRENT_SETTLEMENTS", "8"))
+    # Сколько раундов подсчитываются одновременно (каждому нужно до 2 соединений из пула)
+    STATS_LOG_INTERVAL = 60  # Как часто (секунд) писать статистику планировщика в лог
+
+    STUCK_GAME_DELAY = 10  # Через сколько секунд после окончания раунда игра считается зависшей
+    STUCK_GAMES_MAX_SLEEP = 10
+    # Сколько максимум спит воркер зависших игр (раунды из других процессов добавляются без его ведома)
+    STUCK_GAMES_BATCH = 10  # Сколько зависших игр воркер завершает за раз
+
+
+class RoundStateSettings:
+    """Настройки состояния раунда в redis (games/round_state.py)"""
+
+    TTL = 600  # Сколько секунд хранится состояние раунда без изменений (после сборки или ставки)
+    RESERVE_ATTEMPTS = 3  # Сколько раз ставка проверяется заново, если ставки пользователя изменились параллельно
+
+
+class BackgroundTasksSettings:
+    """Настройки фоновых задач (modules/task_runner.py)"""
+
+    LEADER_TTL = 30  # Сколько секунд процесс остается ведущим без продления
+    LEADER_REFRESH_INTERVAL = 10  # Как часто (секунд) ведущий продлевает себя, остальные пробуют им стать
+    RESTART_BACKOFF_MIN = 5  # Пауза (секунд) перед повтором задачи после первой ошибки
+    RESTART_BACKOFF_MAX = 300  # Максимальная пауза, растет в 2 раза после каждой ошибки подряд
+    STATS_LOG_INTERVAL = 600  # Как часто (секунд) писать статистику задач в лог
+
 
 class DatabaseRedisSettings:
     """Настройки базы данных redis"""
@@ -205,6 +249,31 @@ class TelegramBotSettings:
     SUBSCRIPTION_CHANNEL_ID = int(os.getenv("TELEGRAM_SUBSCRIPTION_CHANNEL_ID", "-1003306584831"))  # ID канала за подписку на который можно получать бонусы
     ADMIN_ID = int(os.getenv("TELEGRAM_ADMIN_ID", "6212101501"))  # ID администратора Telegram бота
     
+    HTTP_POOL_SIZE = int(os.getenv("TELEGRAM_HTTP_POOL_SIZE", "64"))
+    # Соединений с Bot API на один event loop (keep-alive, переиспользуются между запросами)
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("TELEGRAM_HTTP_CONNECT_TIMEOUT", "5"))  # Таймаут подключения
+    HTTP_READ_TIMEOUT = float(os.getenv("TELEGRAM_HTTP_READ_TIMEOUT", "10"))  # Таймаут ответа
+    HTTP_WRITE_TIMEOUT = float(os.getenv("TELEGRAM_HTTP_WRITE_TIMEOUT", "10"))  # Таймаут отправки
+    HTTP_POOL_TIMEOUT = float(os.getenv("TELEGRAM_HTTP_POOL_TIMEOUT", "5"))  # Ожидание свободного соединения
+
+    SEND_GLOBAL_RATE = float(os.getenv("TELEGRAM_SEND_GLOBAL_RATE", "30"))  # Сообщений в секунду на процесс
+    SEND_PRIVATE_RATE = float(os.getenv("TELEGRAM_SEND_PRIVATE_RATE", "1"))  # Сообщений в секунду в личный чат
+    SEND_GROUP_RATE = float(os.getenv("TELEGRAM_SEND_GROUP_RATE", str(20 / 60)))  # Сообщений в секунду в группу
+    SEND_CHAT_BURST = float(os.getenv("TELEGRAM_SEND_CHAT_BURST", "3"))  # Сколько сообщений в чат можно отправить подряд
+    SEND_MAX_RETRIES = int(os.getenv("TELEGRAM_SEND_MAX_RETRIES", "3"))  # Повторов после ответа 429 (retry_after)
+
+    SUBSCRIPTION_CHECK_CONCURRENCY = int(os.getenv("TELEGRAM_SUBSCRIPTION_CHECK_CONCURRENCY", "5"))
+    # Сколько подписок на канал проверяется одновременно (запросы идут в общем ограничении SEND_GLOBAL_RATE)
+    SUBSCRIPTION_CHECK_BATCH = int(os.getenv("TELEGRAM_SUBSCRIPTION_CHECK_BATCH", "300"))
+    # Сколько непроверенных пользователей проверяется за одну итерацию фоновой задачи
+    SUBSCRIPTION_BONUS_BATCH = int(os.getenv("TELEGRAM_SUBSCRIPTION_BONUS_BATCH", "1000"))
+    # Сколько бонусов за подписку выдается одним запросом
+    SUBSCRIPTION_RECHECK_AFTER = int(os.getenv("TELEGRAM_SUBSCRIPTION_RECHECK_AFTER", "86400"))
+    # Через сколько секунд повторно проверять неподписанных (события chat_member могли не прийти)
+
+    PROFILE_SYNC_TTL = int(os.getenv("TELEGRAM_PROFILE_SYNC_TTL", "3600"))
+    # Как часто (секунд) обновлять имя и username пользователя из Telegram
+
     WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "")  # URL для webhook (опционально)
     WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")  # Секретный ключ для webhook
 
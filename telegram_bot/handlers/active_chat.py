@@ -2,8 +2,10 @@ from redis.client import Redis
 from psycopg2.extras import DictCursor
 from psycopg2._psycopg import connection as Connection
 
+from databases.executor import run_sync
 from games.base import BaseGameModel
 from games.rates import RatesService
+from games.round_state import RoundState
 
 from schemas.users import UserSchema, UserStatus
 from schemas.chats import ChatSchema, ChatStatsPeriod, ALL_CHAT_STATS_PERIOD
@@ -69,14 +71,14 @@ async def handler_active_chat(
         await send_message(chat_id, response, keyboard)
         return
     
-    game_data = get_game_data(chat_data.game_id, psql_cursor) if chat_data.game_id else None
+    game_data = await run_sync(RoundState.get_game, chat_data.game_id, psql_cursor) if chat_data.game_id else None
     
     if game_data is None:
         # Если игра не найдена, создаем новую
         game_model = BaseGameModel.GAMES_MODEL[chat_data.game_mode]
-        game_result_dict = game_model.create_game(chat_data.chat_id, psql_cursor)
+        game_result_dict = await run_sync(game_model.create_game, chat_data.chat_id, psql_cursor)
         # Получаем последний game_id для этого чата
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             SELECT game_id FROM games
             WHERE chat_id = %(chat_id)s
             ORDER BY game_id DESC
@@ -86,7 +88,7 @@ async def handler_active_chat(
         if result:
             new_game_id = result["game_id"]
             # Обновляем game_id в чате
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE chats
                 SET game_id = %(game_id)s
                 WHERE chat_id = %(chat_id)s
@@ -94,7 +96,7 @@ async def handler_active_chat(
                 "game_id": new_game_id,
                 "chat_id": chat_data.chat_id
             })
-            game_data = get_game_data(new_game_id, psql_cursor)
+            game_data = await run_sync(get_game_data, new_game_id, psql_cursor)
             chat_data.game_id = new_game_id
         else:
             # Если все еще нет game_id, пропускаем обработку
@@ -118,11 +120,11 @@ async def handler_active_chat(
                 if not game_data.is_active:
                     # Игра завершена, создаем новую
                     game_model = BaseGameModel.GAMES_MODEL[chat_data.game_mode]
-                    game_result_dict = game_model.create_game(chat_data.chat_id, psql_cursor)
+                    game_result_dict = await run_sync(game_model.create_game, chat_data.chat_id, psql_cursor)
                     # Коммитим создание игры
-                    psql_connection.commit()
+                    await run_sync(psql_connection.commit)
                     # Получаем последний game_id для этого чата
-                    psql_cursor.execute("""
+                    await run_sync(psql_cursor.execute, """
                         SELECT game_id FROM games
                         WHERE chat_id = %(chat_id)s
                         ORDER BY game_id DESC
@@ -132,7 +134,7 @@ async def handler_active_chat(
                     if result:
                         new_game_id = result["game_id"]
                         # Обновляем game_id в чате
-                        psql_cursor.execute("""
+                        await run_sync(psql_cursor.execute, """
                             UPDATE chats
                             SET game_id = %(game_id)s
                             WHERE chat_id = %(chat_id)s
@@ -140,10 +142,10 @@ async def handler_active_chat(
                             "game_id": new_game_id,
                             "chat_id": chat_data.chat_id
                         })
-                        psql_connection.commit()
+                        await run_sync(psql_connection.commit)
                         # Получаем новую игру
                         from modules.databases.chats import get_game_data
-                        new_game_data = get_game_data(new_game_id, psql_cursor)
+                        new_game_data = await run_sync(get_game_data, new_game_id, psql_cursor)
                         if new_game_data:
                             game_data = new_game_data
                             chat_data.game_id = new_game_id
@@ -170,7 +172,7 @@ async def handler_active_chat(
             print(f"[DEBUG] Обновить button: message='{message}', original_message='{original_message}'", flush=True)
             try:
                 # Обновляем game_data на актуальную версию
-                fresh_game_data = get_game_data(chat_data.game_id, psql_cursor) if chat_data.game_id else None
+                fresh_game_data = await run_sync(RoundState.get_game, chat_data.game_id, psql_cursor) if chat_data.game_id else None
                 if fresh_game_data:
                     game_data = fresh_game_data
                     game_result = game_model.format_game_result(fresh_game_data.game_result)
@@ -185,17 +187,17 @@ async def handler_active_chat(
                 response = f"Ошибка при обновлении клавиатуры: {e}"
         
         elif (is_payload and payload and payload.get("event") == "get_game_bank") or message in ["банк", "Банк"]:
-            response, keyboard = game_model.get_game_bank_message(chat_data, game_data, psql_cursor)
+            response, keyboard = await run_sync(game_model.get_game_bank_message, chat_data, game_data, psql_cursor)
 
         elif is_payload and payload and payload.get("event") == "get_last_games":
-            response = game_model.get_last_game_message(chat_id, psql_cursor)
+            response = await run_sync(game_model.get_last_game_message, chat_id, psql_cursor)
 
         elif (is_payload and payload and payload.get("event") == "repeat_bet") or message in ["повторить", "Повторить"]:
             response = "Выберите метод"
             keyboard = keyboard_repeat_bet
 
         elif (is_payload and payload and payload.get("event") == "get_user_balance") or message in ["баланс", "Баланс"]:
-            response = get_user_balance_message(user_data, psql_cursor)
+            response = await run_sync(get_user_balance_message, user_data, psql_cursor)
 
         elif (
             is_payload and payload and
@@ -220,7 +222,7 @@ async def handler_active_chat(
                 else:
                     period = ChatStatsPeriod.DAY
 
-                response = ChatsService.get_stats_message(chat_id, period, psql_cursor)
+                response = await run_sync(ChatsService.get_stats_message, chat_id, period, psql_cursor)
                 keyboard = ChatsService.get_stats_keyboard()
             except Exception as e:
                 print(f"[ERROR] Error in get_chat_stats: {e}", flush=True)
@@ -246,7 +248,7 @@ async def handler_active_chat(
                 clear_chat_menu = False
                 response = "Укажите новое имя чата"
                 keyboard = keyboard_cancel_event_menu
-                UserChatService.update_menu(user_id, chat_id, UserChatMenu.CHAT_NAME, psql_cursor)
+                await run_sync(UserChatService.update_menu, user_id, chat_id, UserChatMenu.CHAT_NAME, psql_cursor)
             except Exception as e:
                 print(f"[ERROR] Error in change_chat_name: {e}", flush=True)
                 response = "Ошибка при изменении имени чата"
@@ -255,7 +257,7 @@ async def handler_active_chat(
             message in ["/article_notify", "article_notify"] or
             is_payload and payload and payload.get("event") == "article_notify"
         ):
-            response = handler_article_notify(user_data, chat_data, psql_cursor)
+            response = await run_sync(handler_article_notify, user_data, chat_data, psql_cursor)
 
         elif (
             split_original_message[0] in ["/name", "name"] and len_split_message >= 2 or
@@ -265,7 +267,7 @@ async def handler_active_chat(
                 chat_name = original_message.replace("/", "", 1).replace("name", "", 1).strip()
             else:
                 chat_name = original_message
-            response = handler_change_chat_name(user_data, chat_data, chat_name, psql_cursor)
+            response = await run_sync(handler_change_chat_name, user_data, chat_data, chat_name, psql_cursor)
 
         elif (
             is_payload and payload and
@@ -276,7 +278,7 @@ async def handler_active_chat(
                 clear_chat_menu = False
                 response = "Выберите новый игровой режим"
                 keyboard = get_keyboard_change_game_mode()
-                UserChatService.update_menu(user_id, chat_id, UserChatMenu.CHANGE_GAME, psql_cursor)
+                await run_sync(UserChatService.update_menu, user_id, chat_id, UserChatMenu.CHANGE_GAME, psql_cursor)
             except Exception as e:
                 print(f"[ERROR] Error in change_game_mode menu: {e}", flush=True)
                 response = "Ошибка при смене режима игры"
@@ -294,7 +296,7 @@ async def handler_active_chat(
         ):
             try:
                 game_mode = Games(payload.get("game_mode") if is_payload and payload else split_message[1])
-                response, keyboard = handler_change_game_mode(user_data, chat_data, game_mode, psql_cursor)
+                response, keyboard = await run_sync(handler_change_game_mode, user_data, chat_data, game_mode, psql_cursor)
                 # Отправляем новую клавиатуру сразу
                 await send_message(chat_id, response, keyboard)
                 return
@@ -320,20 +322,20 @@ async def handler_active_chat(
             clear_chat_menu = False
             response = "Укажите новое время игрового таймера в секундах"
             keyboard = keyboard_cancel_event_menu
-            UserChatService.update_menu(user_id, chat_id, UserChatMenu.CHANGE_TIMER, psql_cursor)
+            await run_sync(UserChatService.update_menu, user_id, chat_id, UserChatMenu.CHANGE_TIMER, psql_cursor)
 
         elif (
             split_message[0] in ["/timer", "timer"] and len_split_message == 2 or
             user_chat_data.menu == UserChatMenu.CHANGE_TIMER
         ):
             new_timer = message.replace("/", "", 1).replace("timer", "", 1).strip()
-            response = handler_change_game_timer(user_data, chat_data, new_timer, psql_cursor)
+            response = await run_sync(handler_change_game_timer, user_data, chat_data, new_timer, psql_cursor)
 
         elif is_payload and payload and payload.get("event") == "add_chat_helper":
             clear_chat_menu = False
             response = "Укажите какого пользователя добавить в помощники"
             keyboard = keyboard_cancel_event_menu
-            UserChatService.update_menu(user_id, chat_id, UserChatMenu.ADD_HELPER, psql_cursor)
+            await run_sync(UserChatService.update_menu, user_id, chat_id, UserChatMenu.ADD_HELPER, psql_cursor)
 
         elif (
             split_message[0] in ["/add_helper", "add_helper"] and len_split_message == 2 or
@@ -349,7 +351,7 @@ async def handler_active_chat(
             clear_chat_menu = False
             response = "Укажите какого пользователя удалить из помощников"
             keyboard = keyboard_cancel_event_menu
-            UserChatService.update_menu(user_id, chat_id, UserChatMenu.DEL_HELPER, psql_cursor)
+            await run_sync(UserChatService.update_menu, user_id, chat_id, UserChatMenu.DEL_HELPER, psql_cursor)
 
         elif (
             split_message[0] in ["/del_helper", "del_helper"] and len_split_message == 2 or
@@ -368,7 +370,7 @@ async def handler_active_chat(
             is_payload and payload and payload.get("event") == "show_personnel" or
             message in ["helpers", "/helpers"]
         ):
-            response = ChatsService.get_helpers_message(chat_data, psql_cursor)
+            response = await run_sync(ChatsService.get_helpers_message, chat_data, psql_cursor)
 
         elif (
             split_message[0] == "перевод" and
@@ -392,25 +394,26 @@ async def handler_active_chat(
             payload.get("event") == RedisKeys.TRANSFERS_IN_CHAT.value and
             payload.get("sender_id") == user_id
         ):
-            response = TransferCoinsService.handler_transfer_coins_in_message(
+            response = await run_sync(
+                TransferCoinsService.handler_transfer_coins_in_message,
                 sender_id=user_id, payload=payload,
                 psql_cursor=psql_cursor, redis_cursor=redis_cursor
             )
 
         elif message == "топ дня" or message == "топ дня":
-            response, _ = DayTopService.get_message(user_data, psql_cursor)
+            response, _ = await run_sync(DayTopService.get_message, user_data, psql_cursor)
 
         elif message == "топ недели" or message == "топ недели":
-            response, _ = WeekTopService.get_message(user_data, psql_cursor)
+            response, _ = await run_sync(WeekTopService.get_message, user_data, psql_cursor)
 
         elif message in ["топ чатов", "топ бесед", "топ чатов", "топ бесед"]:
-            response, _ = ChatsTopService.get_message(chat_data, psql_cursor)
+            response, _ = await run_sync(ChatsTopService.get_message, chat_data, psql_cursor)
 
         elif message == "топ кланов" or message == "топ кланов":
-            response, _ = ClansTopService.get_message(user_data, psql_cursor)
+            response, _ = await run_sync(ClansTopService.get_message, user_data, psql_cursor)
 
         elif message == "топ монеток" or message == "топ монеток":
-            response, _ = RublesTopService.get_message(user_data, psql_cursor)
+            response, _ = await run_sync(RublesTopService.get_message, user_data, psql_cursor)
 
         elif message == "!чат":
             response = f"Текущий чат: {chat_id}"
@@ -440,9 +443,9 @@ async def handler_active_chat(
                     response = "Ошибка: неверный тип ставки"
                 else:
                     # Устанавливаем тип ставки для пользователя
-                    game_model.update_current_rate(chat_data.chat_id, user_data.user_id, rate_type, psql_cursor)
+                    await run_sync(game_model.update_current_rate, chat_data.chat_id, user_data.user_id, rate_type, psql_cursor)
                     # Получаем клавиатуру для ввода суммы ставки
-                    response, keyboard = game_model.get_keyboard_pay_rates(chat_data, user_chat_data, rate_type, game_result, psql_cursor)
+                    response, keyboard = await run_sync(game_model.get_keyboard_pay_rates, chat_data, user_chat_data, rate_type, game_result, psql_cursor)
                     clear_current_rate = False
             except Exception as e:
                 print(f"[ERROR] Error processing rate button: {e}", flush=True)
@@ -454,9 +457,9 @@ async def handler_active_chat(
         elif message in ["x2", "x3", "x5", "x50", "X2", "X3", "X5", "X50"]:
             rate_type = message.lower().replace("x", "")
             # Устанавливаем тип ставки для пользователя
-            game_model.update_current_rate(chat_data.chat_id, user_data.user_id, rate_type, psql_cursor)
+            await run_sync(game_model.update_current_rate, chat_data.chat_id, user_data.user_id, rate_type, psql_cursor)
             # Получаем клавиатуру для ввода суммы ставки
-            response, keyboard = game_model.get_keyboard_pay_rates(chat_data, user_chat_data, rate_type, game_result, psql_cursor)
+            response, keyboard = await run_sync(game_model.get_keyboard_pay_rates, chat_data, user_chat_data, rate_type, game_result, psql_cursor)
             clear_current_rate = False
         
         # Обработка кнопок с суммами ставок (payload содержит "amount")
@@ -483,7 +486,8 @@ async def handler_active_chat(
                 response = f"❌ Ошибка при принятии ставки: {e}"
         
         # Обработка ставок через текстовые сообщения (для VK совместимости)
-        elif response_current_rate := game_model.handler_current_rate(
+        elif response_current_rate := await run_sync(
+            game_model.handler_current_rate,
             user_data, chat_data, game_result, user_chat_data,
             message, payload, psql_cursor
         ):
@@ -506,7 +510,7 @@ async def handler_active_chat(
         elif is_payload and payload and payload.get("event") == "auto_game":
             try:
                 clear_chat_menu = False
-                UserChatService.update_menu(user_id, chat_id, UserChatMenu.AUTO_GAME, psql_cursor)
+                await run_sync(UserChatService.update_menu, user_id, chat_id, UserChatMenu.AUTO_GAME, psql_cursor)
                 response = "Введите количество игр, которые хотите повторить"
             except Exception as e:
                 print(f"[ERROR] Error in auto_game menu: {e}", flush=True)
@@ -523,7 +527,7 @@ async def handler_active_chat(
     if user_chat_data.current_rate is not None and response is None:
 
         rates = user_chat_data.current_rate.split(" ")
-        game_model.update_current_rate(chat_id, user_id, None, psql_cursor)
+        await run_sync(game_model.update_current_rate, chat_id, user_id, None, psql_cursor)
         clear_current_rate = False
 
         response = await RatesService.accept_bets(
@@ -544,10 +548,10 @@ async def handler_active_chat(
         )
 
     if clear_chat_menu is True and user_chat_data.menu is not None:
-        UserChatService.update_menu(user_id, chat_id, None, psql_cursor)
+        await run_sync(UserChatService.update_menu, user_id, chat_id, None, psql_cursor)
 
     if clear_current_rate is True and user_chat_data.current_rate is not None:
-        game_model.update_current_rate(chat_id, user_id, None, psql_cursor)
+        await run_sync(game_model.update_current_rate, chat_id, user_id, None, psql_cursor)
 
     # В оригинале VK всегда отправляется сообщение, даже если response is None
     # (тогда отправляется пустое сообщение с клавиатурой)
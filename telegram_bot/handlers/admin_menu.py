@@ -5,6 +5,7 @@ from redis.client import Redis
 from psycopg2.extras import DictCursor
 
 from settings import Config
+from databases.executor import run_sync
 from games.base import BaseGameModel
 
 from schemas.users import UserSchema, UserStatus, UserMenu
@@ -13,6 +14,7 @@ from schemas.games import Games, GAME_NAMES
 from schemas.redis import RedisKeys
 
 from services.incomes import IncomesService
+from services.periods import PeriodsService
 from services.promocode import PromoCodeService
 from services.bonus_repost import BonusRepostService
 from services.bonus_subscription import BonusSubscriptionService
@@ -156,20 +158,20 @@ async def handler_admin_menu(
             response = BACK_MAIN_MENU
             reply_keyboard, _ = get_main_menu_keyboard(admin_data)
             keyboard = reply_keyboard
-            update_user_menu(admin_id, UserMenu.MAIN, psql_cursor)
+            await run_sync(update_user_menu, admin_id, UserMenu.MAIN, psql_cursor)
 
         elif message == "help" or (is_payload and payload.get("event") == "help"):
             response = ADMIN_HELP_MESSAGE
 
         elif message == "прибыль" or message == "incomes" or (is_payload and payload.get("event") == "incomes"):
 
-            day_statistics = IncomesService.get_day_statistics(redis_cursor, psql_cursor)
+            day_statistics = await run_sync(IncomesService.get_day_statistics, redis_cursor, psql_cursor)
             day_profit = {
                 "coins": day_statistics.coins_income,
                 "rubles": day_statistics.rubles_income
             }
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(SUM(coins_income), 0) as coins,
                     COALESCE(SUM(rubles_income), 0) as rubles
                 FROM bot_statistics
@@ -177,7 +179,7 @@ async def handler_admin_menu(
             """)
             week_profit = add_up_profit(psql_cursor.fetchone(), day_profit)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(SUM(coins_income), 0) as coins,
                     COALESCE(SUM(rubles_income), 0) as rubles
                 FROM bot_statistics
@@ -186,19 +188,19 @@ async def handler_admin_menu(
             """)
             month_profit = add_up_profit(psql_cursor.fetchone(), day_profit)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(SUM(coins_income), 0) as coins,
                     COALESCE(SUM(rubles_income), 0) as rubles
                 FROM bot_statistics
             """)
             all_profit = add_up_profit(psql_cursor.fetchone(), day_profit)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, f"""
                 SELECT COALESCE(SUM(coins), 0) as user_coins,
                     COALESCE(SUM(all_win), 0) as all_win,
                     COALESCE(SUM(all_lost), 0) as all_lost,
-                    COALESCE(SUM(day_win), 0) as day_win,
-                    COALESCE(SUM(day_lost), 0) as day_lost
+                    COALESCE(SUM({PeriodsService.counter("day_win")}), 0) as day_win,
+                    COALESCE(SUM({PeriodsService.counter("day_lost")}), 0) as day_lost
                 FROM users
                 WHERE status NOT IN %(ignore_user_status)s
             """, {
@@ -206,7 +208,7 @@ async def handler_admin_menu(
             })
             users_stats = psql_cursor.fetchone()
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(
                     SUM(promocodes.reward * promocodes.quantity), 0
                 ) as promocodes_amount
@@ -217,7 +219,7 @@ async def handler_admin_menu(
             })
             promocodes_amount = psql_cursor.fetchone()["promocodes_amount"]
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(
                     SUM(auto_games.amount * auto_games.number_games), 0
                 ) as auto_games_amount
@@ -255,7 +257,7 @@ async def handler_admin_menu(
             # Получаем все режимы игр из enum
             all_game_modes = [game.value for game in Games]
             
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT game_mode, SUM(income) as income
                 FROM games
                 WHERE DATE(end_datetime) = CURRENT_DATE
@@ -274,7 +276,7 @@ async def handler_admin_menu(
                 game_name = GAME_NAMES.get(Games(game_mode), game_mode)
                 response_day_games += f"\n💰 {game_name}: {format_number(income)}"
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT game_mode, SUM(income) as income
                 FROM games
                 GROUP BY game_mode
@@ -292,8 +294,8 @@ async def handler_admin_menu(
                 game_name = GAME_NAMES.get(Games(game_mode), game_mode)
                 response_all_games += f"\n💰 {game_name}: {format_number(income)}"
 
-            psql_cursor.execute("""
-                SELECT COALESCE(SUM(day_rates), 0) as day,
+            await run_sync(psql_cursor.execute, f"""
+                SELECT COALESCE(SUM({PeriodsService.counter("day_rates")}), 0) as day,
                        COALESCE(SUM(all_rates), 0) as all
                 FROM users
                 WHERE status NOT IN %(ignore_user_status)s AND
@@ -303,7 +305,7 @@ async def handler_admin_menu(
             })
             rates = psql_cursor.fetchone()
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(SUM(payments.coins), 0) as coins,
                        COALESCE(SUM(payments.rubles), 0) as rubles
                 FROM payments JOIN users ON payments.user_id = users.user_id
@@ -315,7 +317,7 @@ async def handler_admin_menu(
             })
             day_payments = psql_cursor.fetchone()
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(SUM(payments.coins), 0) as coins,
                        COALESCE(SUM(payments.rubles), 0) as rubles
                 FROM payments JOIN users ON payments.user_id = users.user_id
@@ -329,7 +331,7 @@ async def handler_admin_menu(
             day_other_profit = IncomesService.get_additional_income(redis_cursor)
             day_other_expenses = IncomesService.get_additional_expenses(redis_cursor)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(SUM(additional_income), 0) as other_profit,
                        COALESCE(SUM(additional_income), 0) as other_expenses
                 FROM bot_statistics
@@ -354,34 +356,35 @@ async def handler_admin_menu(
 
         elif message == "актив" or message == "active" or (is_payload and payload.get("event") == "active"):
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(COUNT(user_id), 0) as count
                 FROM users
                 WHERE DATE(created_at) = CURRENT_DATE
             """)
             new_user_day = int(psql_cursor.fetchone()["count"])
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(COUNT(user_id), 0) as count
                 FROM users
             """)
             count_users = int(psql_cursor.fetchone()["count"])
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, f"""
                 SELECT COALESCE(COUNT(user_id), 0) as count
                 FROM users
-                WHERE day_rates > 0
+                WHERE {PeriodsService.is_actual("day_rates")} AND
+                      day_rates > 0
             """)
             day_activ_users = int(psql_cursor.fetchone()["count"])
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(COUNT(user_id), 0) as count
                 FROM users
                 WHERE all_rates > 0
             """)
             all_activ_users = int(psql_cursor.fetchone()["count"])
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT COALESCE(COUNT(chats.chat_id), 0) as count
                 FROM chats JOIN users ON chats.owner_id = users.user_id
                 WHERE chats.is_activated = TRUE AND
@@ -404,7 +407,7 @@ async def handler_admin_menu(
             """
 
         elif message == "топ" or message == "top" or (is_payload and payload.get("event") == "top_users"):
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT user_id, full_name, status, coins
                 FROM users
                 WHERE status NOT IN %(ignore_user_status)s AND
@@ -428,7 +431,7 @@ async def handler_admin_menu(
 
         elif message == "пользователи" or (is_payload and payload.get("event") == "users"):
             # Показываем список пользователей с возможностью управления
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT user_id, full_name, status, coins, banned
                 FROM users
                 WHERE status NOT IN %(ignore_user_status)s
@@ -458,8 +461,8 @@ async def handler_admin_menu(
             response = "Введи ссылку на вложение по типу photo-192514282_457381934 или нажми пропустить"
             keyboard = get_mailing_menu_keyboard()
 
-            update_user_menu(admin_id, UserMenu.MAILING, psql_cursor)
-            update_user_extra_data(admin_id, ExtraMailing(), psql_cursor)
+            await run_sync(update_user_menu, admin_id, UserMenu.MAILING, psql_cursor)
+            await run_sync(update_user_extra_data, admin_id, ExtraMailing(), psql_cursor)
 
         elif (
             (
@@ -490,7 +493,7 @@ async def handler_admin_menu(
             
             sql_field = f"{time_stamp}_win - {time_stamp}_lost {'+ top_profit' if time_stamp == 'all' else ''}"
             # Используем whitelist для безопасности - time_stamp проверен выше
-            psql_cursor.execute(f"""
+            await run_sync(psql_cursor.execute, f"""
                 SELECT user_id, full_name, status, {sql_field} as points
                 FROM users
                 WHERE status NOT IN %(ignore_user_status)s
@@ -544,7 +547,7 @@ async def handler_admin_menu(
             
             sql_field = f"-1 * ({time_stamp}_win - {time_stamp}_lost {'+ top_profit' if time_stamp == 'all' else ''})"
             # Используем whitelist для безопасности - time_stamp проверен выше
-            psql_cursor.execute(f"""
+            await run_sync(psql_cursor.execute, f"""
                 SELECT user_id, full_name, status, {sql_field} as points
                 FROM users
                 WHERE status NOT IN %(ignore_user_status)s
@@ -573,7 +576,7 @@ async def handler_admin_menu(
 
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
             number = AdminPanel.get_number(split_message[2])
-            set_coins(user_data.user_id, number, psql_cursor)
+            await run_sync(set_coins, user_data.user_id, number, psql_cursor)
 
             response = f"Баланс {user_data.telegram_name} изменен на {format_number(number)} WC"
             await NotificationsService.send_notification(
@@ -589,7 +592,7 @@ async def handler_admin_menu(
 
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
             number = AdminPanel.get_number(split_message[2])
-            give_coins(user_data.user_id, number, psql_cursor)
+            await run_sync(give_coins, user_data.user_id, number, psql_cursor)
 
             response = f"{user_data.telegram_name} получил {format_number(number)} WC"
             await NotificationsService.send_notification(
@@ -605,7 +608,7 @@ async def handler_admin_menu(
 
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
             number = AdminPanel.get_number(split_message[2])
-            take_coins(user_data.user_id, number, psql_cursor)
+            await run_sync(take_coins, user_data.user_id, number, psql_cursor)
 
             response = f"У {user_data.telegram_name} изъято {format_number(number)} WC"
             await NotificationsService.send_notification(
@@ -620,7 +623,7 @@ async def handler_admin_menu(
         elif split_message[0] == "zero" and len_split_message == 2:
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 DELETE FROM users
                 WHERE user_id = %(user_id)s
             """, {
@@ -631,7 +634,7 @@ async def handler_admin_menu(
 
         elif split_message[0] == "user" and len_split_message == 2:
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
-            AdminPanel.update_user_status(user_data.user_id, UserStatus.USER, psql_cursor)
+            await run_sync(AdminPanel.update_user_status, user_data.user_id, UserStatus.USER, psql_cursor)
 
             response = f"{user_data.telegram_name} теперь пользователь"
             await NotificationsService.send_notification(
@@ -641,7 +644,7 @@ async def handler_admin_menu(
 
         elif split_message[0] == "admin" and len_split_message == 2:
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
-            AdminPanel.update_user_status(user_data.user_id, UserStatus.ADMIN, psql_cursor)
+            await run_sync(AdminPanel.update_user_status, user_data.user_id, UserStatus.ADMIN, psql_cursor)
 
             response = f"{user_data.telegram_name} теперь админ"
             await NotificationsService.send_notification(
@@ -651,14 +654,14 @@ async def handler_admin_menu(
 
         elif split_message[0] == "honest" and len_split_message == 2:
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
-            AdminPanel.update_user_status(user_data.user_id, UserStatus.HONEST, psql_cursor)
-            user_data = get_user_data(user_data.user_id, psql_cursor)
+            await run_sync(AdminPanel.update_user_status, user_data.user_id, UserStatus.HONEST, psql_cursor)
+            user_data = await run_sync(get_user_data, user_data.user_id, psql_cursor)
             response = f"{user_data.telegram_name} выдан статус честного игрока"
 
         elif split_message[0] == "scammer" and len_split_message == 2:
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
-            AdminPanel.update_user_status(user_data.user_id, UserStatus.SCAMMER, psql_cursor)
-            user_data = get_user_data(user_data.user_id, psql_cursor)
+            await run_sync(AdminPanel.update_user_status, user_data.user_id, UserStatus.SCAMMER, psql_cursor)
+            user_data = await run_sync(get_user_data, user_data.user_id, psql_cursor)
             response = f"{user_data.telegram_name} выдан статус мошенника"
 
         elif split_message[0] in ["uinfo", "user_info"] and len_split_message == 2:
@@ -678,7 +681,7 @@ async def handler_admin_menu(
                 💳 Прибыль за все время: {format_number(user_data.all_win - user_data.all_lost + user_data.top_profit)}
             """
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 SELECT chat_id
                 FROM chats
                 WHERE owner_id = %(owner_id)s
@@ -690,7 +693,7 @@ async def handler_admin_menu(
             if len(chat_ids) > 0:
                 response += f"\n\n 🔐 Приватные чаты: {', '.join(chat_ids)}"
 
-            promocodes = PromoCodeService.get_user_pormocodes(user_data.user_id, psql_cursor)
+            promocodes = await run_sync(PromoCodeService.get_user_pormocodes, user_data.user_id, psql_cursor)
             if len(promocodes) > 0:
                 response += f"\n\n💬 Активные промокоды: {', '.join([x.name for x in promocodes])}"
 
@@ -716,7 +719,7 @@ async def handler_admin_menu(
             if user_id_str and user_id_str.isdigit():
                 # Запрашиваем сумму
                 response = f"Введите сумму для выдачи пользователю {user_id_str}:"
-                update_user_extra_data(admin_id, json.dumps({"action": "give_coins", "target_user_id": user_id_str}), psql_cursor)
+                await run_sync(update_user_extra_data, admin_id, json.dumps({"action": "give_coins", "target_user_id": user_id_str}), psql_cursor)
             else:
                 response = "Использование: Выдать монеты user_id"
 
@@ -727,7 +730,7 @@ async def handler_admin_menu(
             if user_id_str and user_id_str.isdigit():
                 # Запрашиваем сумму
                 response = f"Введите сумму для изъятия у пользователя {user_id_str}:"
-                update_user_extra_data(admin_id, json.dumps({"action": "take_coins", "target_user_id": user_id_str}), psql_cursor)
+                await run_sync(update_user_extra_data, admin_id, json.dumps({"action": "take_coins", "target_user_id": user_id_str}), psql_cursor)
             else:
                 response = "Использование: Забрать монеты user_id"
 
@@ -738,7 +741,7 @@ async def handler_admin_menu(
             if user_id_str and user_id_str.isdigit():
                 # Запрашиваем сумму
                 response = f"Введите новый баланс для пользователя {user_id_str}:"
-                update_user_extra_data(admin_id, json.dumps({"action": "set_coins", "target_user_id": user_id_str}), psql_cursor)
+                await run_sync(update_user_extra_data, admin_id, json.dumps({"action": "set_coins", "target_user_id": user_id_str}), psql_cursor)
             else:
                 response = "Использование: Установить баланс user_id"
 
@@ -760,7 +763,7 @@ async def handler_admin_menu(
             parts = message.split()
             user_id_str = parts[-1] if len(parts) >= 2 else split_message[1]
             user_data = await AdminPanel.get_user_data(user_id_str, psql_cursor)
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned = TRUE
                 WHERE user_id = %(user_id)s
@@ -773,7 +776,7 @@ async def handler_admin_menu(
             parts = message.split()
             user_id_str = parts[-1] if len(parts) >= 2 else split_message[1]
             user_data = await AdminPanel.get_user_data(user_id_str, psql_cursor)
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned = FALSE
                 WHERE user_id = %(user_id)s
@@ -795,28 +798,28 @@ async def handler_admin_menu(
                     user_data = await AdminPanel.get_user_data(target_user_id, psql_cursor)
                     
                     if extra_data.get("action") == "give_coins":
-                        give_coins(user_data.user_id, amount, psql_cursor)
+                        await run_sync(give_coins, user_data.user_id, amount, psql_cursor)
                         response = f"{user_data.telegram_name} получил {format_number(amount)} WC"
                         await send_message(user_data.user_id, message=f"🅰 Администратор выдал Вам {format_number(amount)} WC")
                         keyboard = get_user_management_keyboard(user_data.user_id)
                     elif extra_data.get("action") == "take_coins":
-                        take_coins(user_data.user_id, amount, psql_cursor)
+                        await run_sync(take_coins, user_data.user_id, amount, psql_cursor)
                         response = f"У {user_data.telegram_name} изъято {format_number(amount)} WC"
                         await send_message(user_data.user_id, message=f"🅰 Администратор забрал у вас {format_number(amount)} WC")
                         keyboard = get_user_management_keyboard(user_data.user_id)
                     elif extra_data.get("action") == "set_coins":
-                        set_coins(user_data.user_id, amount, psql_cursor)
+                        await run_sync(set_coins, user_data.user_id, amount, psql_cursor)
                         response = f"Баланс {user_data.telegram_name} установлен на {format_number(amount)} WC"
                         await send_message(user_data.user_id, message=f"🅰 Администратор установил ваш баланс на {format_number(amount)} WC")
                         keyboard = get_user_management_keyboard(user_data.user_id)
                     
-                    update_user_extra_data(admin_id, None, psql_cursor)
+                    await run_sync(update_user_extra_data, admin_id, None, psql_cursor)
             except (json.JSONDecodeError, AttributeError, TypeError):
                 pass  # Игнорируем ошибки парсинга extra_data
 
         elif split_message[0] in ["cinfo", "chat_info"] and len_split_message == 2:
-            chat_data = AdminPanel.get_chat_data(split_message[1], psql_cursor)
-            owner_data = get_user_data(chat_data.owner_id, psql_cursor)
+            chat_data = await run_sync(AdminPanel.get_chat_data, split_message[1], psql_cursor)
+            owner_data = await run_sync(get_user_data, chat_data.owner_id, psql_cursor)
             owner_name = UserSchema.format_telegram_name(chat_data.owner_id, owner_data.full_name) if owner_data else "Не выбран"
 
             chat_name = f"({chat_data.name})" if chat_data.name else ""
@@ -838,7 +841,7 @@ async def handler_admin_menu(
 
         elif split_message[0] in ["pinfo", "promo_info"] and len_split_message == 2:
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
-            promocodes = PromoCodeService.get_user_pormocodes(user_data.user_id, psql_cursor)
+            promocodes = await run_sync(PromoCodeService.get_user_pormocodes, user_data.user_id, psql_cursor)
 
             response = f"Активные промокоды {user_data.telegram_name}\n\n"
             response += "".join([PromoCodeService.format_promocode_message(x) for x in promocodes])
@@ -848,7 +851,7 @@ async def handler_admin_menu(
             users_data = await AdminPanel.get_users_data(split_message[1:], psql_cursor)
             users_name = [x.telegram_name for x in users_data]
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned = TRUE
                 WHERE user_id IN %(user_ids)s
@@ -859,7 +862,7 @@ async def handler_admin_menu(
             for user_data in users_data:
 
                 user_id = user_data.user_id
-                reset_data = ResetUserServices.reset_data(user_id, psql_cursor)
+                reset_data = await run_sync(ResetUserServices.reset_data, user_id, psql_cursor)
                 IncomesService.records_additional_incomes(reset_data.total_amount, redis_cursor)
 
                 await NotificationsService.send_notification(
@@ -867,7 +870,7 @@ async def handler_admin_menu(
                     message=f"{user_data.telegram_name} заблокирован {reset_data.reset_message}"
                 )
 
-                psql_cursor.execute("""
+                await run_sync(psql_cursor.execute, """
                     SELECT chat_id FROM user_in_chat
                     WHERE user_id = %(user_id)s
                 """, {
@@ -876,7 +879,7 @@ async def handler_admin_menu(
                 user_in_chats = [x["chat_id"] for x in psql_cursor.fetchall()]
                 [await kick_user_from_chat(user_id, chat_id) for chat_id in user_in_chats]
 
-                psql_cursor.execute("""
+                await run_sync(psql_cursor.execute, """
                     DELETE FROM user_in_chat
                     WHERE user_id = %(user_id)s
                 """, {
@@ -889,7 +892,7 @@ async def handler_admin_menu(
             users_data = await AdminPanel.get_users_data(split_message[1:], psql_cursor)
             users_name = [x.telegram_name for x in users_data]
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned = FALSE
                 WHERE user_id IN %(user_ids)s
@@ -906,7 +909,7 @@ async def handler_admin_menu(
             friends_data = await AdminPanel.get_users_data(friend_ids, psql_cursor)
             users_data = friends_data + [user_data]
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned = TRUE
                 WHERE user_id IN %(user_ids)s
@@ -917,7 +920,7 @@ async def handler_admin_menu(
             for user_data in users_data:
 
                 user_id = user_data.user_id
-                reset_data = ResetUserServices.reset_data(user_id, psql_cursor)
+                reset_data = await run_sync(ResetUserServices.reset_data, user_id, psql_cursor)
                 IncomesService.records_additional_incomes(reset_data.total_amount, redis_cursor)
 
                 await NotificationsService.send_notification(
@@ -925,7 +928,7 @@ async def handler_admin_menu(
                     message=f"{user_data.telegram_name} заблокирован {reset_data.reset_message}"
                 )
 
-                psql_cursor.execute("""
+                await run_sync(psql_cursor.execute, """
                     SELECT chat_id FROM user_in_chat
                     WHERE user_id = %(user_id)s
                 """, {
@@ -934,7 +937,7 @@ async def handler_admin_menu(
                 user_in_chats = [x["chat_id"] for x in psql_cursor.fetchall()]
                 [await kick_user_from_chat(user_id, chat_id) for chat_id in user_in_chats]
 
-                psql_cursor.execute("""
+                await run_sync(psql_cursor.execute, """
                     DELETE FROM user_in_chat
                     WHERE user_id = %(user_id)s
                 """, {
@@ -950,7 +953,7 @@ async def handler_admin_menu(
             friends_data = await AdminPanel.get_users_data(friend_ids, psql_cursor)
             users_data = friends_data + [user_data]
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned = FALSE
                 WHERE user_id IN %(user_ids)s
@@ -963,7 +966,7 @@ async def handler_admin_menu(
         elif split_message[0] in ["pban", "promo_ban"] and len_split_message == 2:
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned_promo = True
                 WHERE user_id = %(user_id)s
@@ -976,7 +979,7 @@ async def handler_admin_menu(
         elif split_message[0] in ["pnban", "promo_unban"] and len_split_message == 2:
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned_promo = FALSE
                 WHERE user_id = %(user_id)s
@@ -989,20 +992,20 @@ async def handler_admin_menu(
         elif split_message[0] in ["tban", "transfer_ban"] and len_split_message == 2:
 
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
-            TransferCoinsService.update_banned_transfer(user_data.user_id, True, psql_cursor)
+            await run_sync(TransferCoinsService.update_banned_transfer, user_data.user_id, True, psql_cursor)
             response = f"{user_data.telegram_name} больше не может переводить коины"
 
         elif split_message[0] in ["tnban", "transfer_unban"] and len_split_message == 2:
 
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
-            TransferCoinsService.update_banned_transfer(user_data.user_id, False, psql_cursor)
+            await run_sync(TransferCoinsService.update_banned_transfer, user_data.user_id, False, psql_cursor)
             response = f"{user_data.telegram_name} может переводить коины"
 
         elif split_message[0] in ["nkban", "nickname_ban"] and len_split_message == 2:
 
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned_nickname = True
                 WHERE user_id = %(user_id)s
@@ -1016,7 +1019,7 @@ async def handler_admin_menu(
 
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET banned_nickname = False
                 WHERE user_id = %(user_id)s
@@ -1031,18 +1034,18 @@ async def handler_admin_menu(
             user_data = await AdminPanel.get_user_data(split_message[2], psql_cursor)
             user_id = user_data.user_id
 
-            user_in_white_list = TransferWhiteListService.search(user_id, psql_cursor)
+            user_in_white_list = await run_sync(TransferWhiteListService.search, user_id, psql_cursor)
 
             if split_message[1] == "add":
                 if user_in_white_list is False:
-                    TransferWhiteListService.insert_user(user_id, psql_cursor)
+                    await run_sync(TransferWhiteListService.insert_user, user_id, psql_cursor)
                     response = f"{user_data.telegram_name} добавлен в белый список"
                 else:
                     response = f"{user_data.telegram_name} уже есть в белом списке"
 
             elif split_message[1] == "del":
                 if user_in_white_list is True:
-                    TransferWhiteListService.delete_user(user_id, psql_cursor)
+                    await run_sync(TransferWhiteListService.delete_user, user_id, psql_cursor)
                     response = f"{user_data.telegram_name} удален из белого списка"
                 else:
                     response = f"{user_data.telegram_name} нет в белом списке"
@@ -1058,7 +1061,7 @@ async def handler_admin_menu(
             if len(new_user_name) <= 0 or len(new_user_name) > 50:
                 raise MaxTextLen("❌ Максимальный размер имени пользователя 50 символов")
 
-            update_user_name(user_id, new_user_name, psql_cursor)
+            await run_sync(update_user_name, user_id, new_user_name, psql_cursor)
             new_user_name = UserSchema.format_telegram_name(user_id, new_user_name)
 
             response = f"Имя {user_data.telegram_name} изменено на {new_user_name}"
@@ -1075,7 +1078,7 @@ async def handler_admin_menu(
             if isinstance(user_description, str) and len(user_description) > 250:
                 raise MaxTextLen("❌ Максимальный размер описания пользователя 250 символов")
 
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE users
                 SET description = %(description)s
                 WHERE user_id = %(user_id)s
@@ -1095,16 +1098,16 @@ async def handler_admin_menu(
             user_data = await AdminPanel.get_user_data(split_message[1], psql_cursor)
             free_change = strtobool(split_message[2])
 
-            update_free_nick_change(user_data.user_id, free_change, psql_cursor)
+            await run_sync(update_free_nick_change, user_data.user_id, free_change, psql_cursor)
             response = f"{user_data.telegram_name} {'может' if free_change else 'не может'} бесплатно поменять ник"
 
         elif split_message[0] == "chat" and len_split_message == 4 and split_message[1] == "type":
 
-            chat_data = AdminPanel.get_chat_data(split_message[2], psql_cursor)
+            chat_data = await run_sync(AdminPanel.get_chat_data, split_message[2], psql_cursor)
             new_chat_type = AdminPanel.get_chat_type(split_message[3]).value
 
             chat_id = chat_data.chat_id
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE chats
                 SET type = %(new_chat_type)s
                 WHERE chat_id = %(chat_id)s
@@ -1117,11 +1120,11 @@ async def handler_admin_menu(
 
         elif split_message[0] == "chat" and len_split_message == 4 and split_message[1] == "owner":
 
-            chat_data = AdminPanel.get_chat_data(split_message[2], psql_cursor)
+            chat_data = await run_sync(AdminPanel.get_chat_data, split_message[2], psql_cursor)
             new_owner_data = await AdminPanel.get_user_data(split_message[3], psql_cursor)
 
             chat_id = chat_data.chat_id
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE chats
                 SET owner_id = %(new_owner_id)s
                 WHERE chat_id = %(chat_id)s
@@ -1134,12 +1137,12 @@ async def handler_admin_menu(
 
         elif split_message[0] == "chat" and len_split_message == 4 and split_message[1] == "timer":
 
-            chat_data = AdminPanel.get_chat_data(split_message[2], psql_cursor)
+            chat_data = await run_sync(AdminPanel.get_chat_data, split_message[2], psql_cursor)
             new_timer = AdminPanel.get_number(split_message[3])
             new_timer = min(max(new_timer, 0), 32_767)
 
             chat_id = chat_data.chat_id
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE chats
                 SET game_timer = %(new_timer)s
                 WHERE chat_id = %(chat_id)s
@@ -1152,22 +1155,22 @@ async def handler_admin_menu(
 
         elif split_message[0] == "chat" and len_split_message == 4 and split_message[1] == "game_mode":
 
-            chat_data = AdminPanel.get_chat_data(split_message[2], psql_cursor)
+            chat_data = await run_sync(AdminPanel.get_chat_data, split_message[2], psql_cursor)
             new_game_mode = AdminPanel.get_game_mode(split_message[3])
 
             chat_id = chat_data.chat_id
-            chat_response, chat_keyboard = handler_change_game_mode(admin_data, chat_data, new_game_mode, psql_cursor)
+            chat_response, chat_keyboard = await run_sync(handler_change_game_mode, admin_data, chat_data, new_game_mode, psql_cursor)
             await send_message(chat_id, chat_response, chat_keyboard)
 
             response = f"Чат {chat_id} получил сообщение: {chat_response}"
 
         elif split_message[0] == "chat" and len_split_message >= 4  and split_message[1] == "life":
 
-            chat_data = AdminPanel.get_chat_data(split_message[2], psql_cursor)
+            chat_data = await run_sync(AdminPanel.get_chat_data, split_message[2], psql_cursor)
             new_life_datetime = AdminPanel.get_life_datetime(" ".join(split_message[3:]))
 
             chat_id = chat_data.chat_id
-            psql_cursor.execute("""
+            await run_sync(psql_cursor.execute, """
                 UPDATE chats
                 SET life_datetime = %(new_life_datetime)s
                 WHERE chat_id = %(chat_id)s
@@ -1179,7 +1182,7 @@ async def handler_admin_menu(
             response = f"В чате {chat_id} изменено время жизни чата на {new_life_datetime}"
 
         elif split_message[0] == "resettop" and len_split_message == 2 and split_message[1] in TOPS_NAME:
-            TOPS[split_message[1]].reset_points(psql_cursor)
+            await run_sync(TOPS[split_message[1]].reset_points, psql_cursor)
             response = f"Сбросил очки топа {split_message[1]}"
 
         elif split_message[0] in ["itop", "incrtop"] and len_split_message == 4 and split_message[1] in TOPS_NAME:
@@ -1193,15 +1196,17 @@ async def handler_admin_menu(
             
             sql_field = "clan_points" if top_name == ClansTop.NAME else f"{top_name}_top_points"
             # Используем whitelist для безопасности - top_name проверен выше
-            psql_cursor.execute(f"""
+            await run_sync(psql_cursor.execute, f"""
                 UPDATE users
-                SET {sql_field} = {sql_field} + %(incr_amount)s
+                SET {PeriodsService.increment({sql_field: "%(incr_amount)s"})}
                 WHERE user_id = %(user_id)s
             """, {
                 "incr_amount": incr_amount,
                 "user_id": user_data.user_id
             })
 
+            TOPS[top_name].invalidate_leaderboard()
+
             response = f"У {user_data.telegram_name} увеличен топ {top_name} на {format_number(incr_amount)}"
 
         elif split_message[0] in ["dtop", "decrtop"] and len_split_message == 4 and split_message[1] in TOPS_NAME:
@@ -1215,19 +1220,21 @@ async def handler_admin_menu(
             
             sql_field = "clan_points" if top_name == ClansTop.NAME else f"{top_name}_top_points"
             # Используем whitelist для безопасности - top_name проверен выше
-            psql_cursor.execute(f"""
+            await run_sync(psql_cursor.execute, f"""
                 UPDATE users
-                SET {sql_field} = {sql_field} - %(dncr_amount)s
+                SET {PeriodsService.increment({sql_field: "-%(dncr_amount)s"})}
                 WHERE user_id = %(user_id)s
             """, {
                 "dncr_amount": dncr_amount,
                 "user_id": user_data.user_id
             })
 
+            TOPS[top_name].invalidate_leaderboard()
+
             response = f"У {user_data.telegram_name} уменьшен топ {top_name} на {format_number(dncr_amount)}"
 
         elif message == "post":
-            response = BonusRepostService.get_active_bonus_response_message(psql_cursor)
+            response = await run_sync(BonusRepostService.get_active_bonus_response_message, psql_cursor)
 
         elif split_message[0] == "npost" and len_split_message == 6:
             post_id = AdminPanel.get_number(split_message[1])
@@ -1236,8 +1243,9 @@ async def handler_admin_menu(
             activations = AdminPanel.get_number(split_message[4])
             life_seconds = AdminPanel.get_number(split_message[5])
 
-            if BonusRepostService.get_bonus_post(post_id, psql_cursor) is None:
-                bonus_post = BonusRepostService.create_bonus_posts(
+            if await run_sync(BonusRepostService.get_bonus_post, post_id, psql_cursor) is None:
+                bonus_post = await run_sync(
+                    BonusRepostService.create_bonus_posts,
                     post_id=post_id, reward=reward, sub_reward=sub_reward,
                     activations=activations,life_seconds=life_seconds, psql_cursor=psql_cursor
                 )
@@ -1247,31 +1255,31 @@ async def handler_admin_menu(
 
         elif split_message[0] == "dpost" and len_split_message == 2:
             post_id = AdminPanel.get_number(split_message[1])
-            BonusRepostService.delete_post(post_id, psql_cursor)
+            await run_sync(BonusRepostService.delete_post, post_id, psql_cursor)
             response = f"Удален бонус за репост {post_id}"
 
         elif message == "subbonus":
-            response = BonusSubscriptionService.get_active_bonuses_response_message(psql_cursor)
+            response = await run_sync(BonusSubscriptionService.get_active_bonuses_response_message, psql_cursor)
 
         elif split_message[0] == "nsubbonus" and len_split_message == 2:
             reward = AdminPanel.get_number(split_message[1])
-            bonus = BonusSubscriptionService.create_bonus(reward=reward, psql_cursor=psql_cursor)
+            bonus = await run_sync(BonusSubscriptionService.create_bonus, reward=reward, psql_cursor=psql_cursor)
             response = f"✅ Создан бонус за подписку:\n{BonusSubscriptionService.format_bonus_message(bonus)}"
 
         elif split_message[0] == "dsubbonus" and len_split_message == 2:
             bonus_id = AdminPanel.get_number(split_message[1])
-            if BonusSubscriptionService.get_bonus(bonus_id, psql_cursor) is not None:
-                BonusSubscriptionService.delete_bonus(bonus_id, psql_cursor)
+            if await run_sync(BonusSubscriptionService.get_bonus, bonus_id, psql_cursor) is not None:
+                await run_sync(BonusSubscriptionService.delete_bonus, bonus_id, psql_cursor)
                 response = f"✅ Удален бонус за подписку {bonus_id}"
             else:
                 response = f"❌ Бонус {bonus_id} не найден"
 
         elif message == "dev":
-            response = get_develore_income(psql_cursor, redis_cursor)
+            response = await run_sync(get_develore_income, psql_cursor, redis_cursor)
 
         elif message == "dev_clear":
-            develore_income = get_develore_income(psql_cursor, redis_cursor)
-            clear_developer_income(psql_cursor)
+            develore_income = await run_sync(get_develore_income, psql_cursor, redis_cursor)
+            await run_sync(clear_developer_income, psql_cursor)
 
             response = f"Данные обнулены\n\n{develore_income}"
             await send_message(Config.DEVELOPER_ID, develore_income)
@@ -1293,9 +1301,9 @@ async def handler_admin_menu(
             response = f"Тихий режим {'включен' if work_status else 'выключен'}"
 
         elif split_message[0] == "start_game" and len_split_message == 2 and split_message[1].isdecimal():
-            game_data = get_game_data(split_message[1], psql_cursor)
+            game_data = await run_sync(get_game_data, split_message[1], psql_cursor)
             game_model = BaseGameModel.GAMES_MODEL[game_data.game_mode]
-            game_model.init_game(game_data.game_id, psql_cursor, redis_cursor)
+            await run_sync(game_model.init_game, game_data.game_id, psql_cursor, redis_cursor)
             response = f"Запущена игра № {game_data.game_id} в чате № {game_data.chat_id}"
 
         elif message == "restart_bot":
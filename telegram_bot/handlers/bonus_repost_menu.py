@@ -5,6 +5,7 @@ from psycopg2._psycopg import connection as Connection
 from telegram import ReplyKeyboardMarkup
 
 from settings import Temp, TelegramBotSettings
+from databases.executor import run_sync
 
 from schemas.users import UserSchema, UserMenu
 from schemas.redis import RedisKeys
@@ -65,11 +66,11 @@ async def handler_bonus_repost_menu(
         CaptchaService.set_captcha_attempts(
             user_id, RedisKeys.CAPTCHA_BONUSREPOST, attempts_captchas+1, redis_cursor
         )
-        response, keyboard = go_main_menu(user_data, psql_cursor)
+        response, keyboard = await run_sync(go_main_menu, user_data, psql_cursor)
 
     elif is_payload and payload.get("captcha_name") == extra_data.captcha_name:
         post_id = extra_data.post_id
-        bonus_post = BonusRepostService.get_bonus_post(post_id, psql_cursor)
+        bonus_post = await run_sync(BonusRepostService.get_bonus_post, post_id, psql_cursor)
 
         if bonus_post is None or bonus_post.activations <= 0:
             response = DATA_OUTDATED
@@ -78,7 +79,7 @@ async def handler_bonus_repost_menu(
 
         elif (
                 bonus_post.activations > 0 and
-                not BonusRepostService.user_active_post(user_id, post_id, psql_cursor)
+                not await run_sync(BonusRepostService.user_active_post, user_id, post_id, psql_cursor)
         ):
             # TODO: Укажите ID канала в settings.py -> TelegramBotSettings.CHANNEL_ID
             # или в .env файле как TELEGRAM_CHANNEL_ID
@@ -100,11 +101,11 @@ async def handler_bonus_repost_menu(
                     psql_connection.autocommit = False
 
                     try:
-                        give_coins(user_id, reward, psql_cursor)
-                        BonusRepostService.decrement_activation(post_id, psql_cursor)
-                        BonusRepostService.insert_bonus_repost_logs(user_id, post_id, reward, psql_cursor)
+                        await run_sync(give_coins, user_id, reward, psql_cursor)
+                        await run_sync(BonusRepostService.decrement_activation, post_id, psql_cursor)
+                        await run_sync(BonusRepostService.insert_bonus_repost_logs, user_id, post_id, reward, psql_cursor)
 
-                        psql_cursor.execute("""
+                        await run_sync(psql_cursor.execute, """
                             SELECT activations FROM bonus_posts
                             WHERE post_id = %(post_id)s
                         """, {
@@ -114,7 +115,7 @@ async def handler_bonus_repost_menu(
                         if (psql_cursor.fetchone())["activations"] < 0:
                             raise Exception()
 
-                        psql_connection.commit()
+                        await run_sync(psql_connection.commit)
 
                         response = f"✅ Вы получили {format_number(reward)} коинов за подписку на канал."
                         IncomesService.records_additional_expenses(reward, redis_cursor)
@@ -123,7 +124,7 @@ async def handler_bonus_repost_menu(
 
                     except:
                         response = SOMETHING_WENT_WRONG
-                        psql_connection.rollback()
+                        await run_sync(psql_connection.rollback)
                         reply_keyboard, _ = get_main_menu_keyboard(user_data)
                         keyboard = reply_keyboard
 
@@ -139,7 +140,7 @@ async def handler_bonus_repost_menu(
             reply_keyboard, _ = get_main_menu_keyboard(user_data)
             keyboard = reply_keyboard
         
-        response, keyboard = go_main_menu(user_data, psql_cursor)
+        response, keyboard = await run_sync(go_main_menu, user_data, psql_cursor)
 
     else:
         if attempts_captchas < 3:
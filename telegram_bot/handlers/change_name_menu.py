@@ -2,6 +2,7 @@ from redis.client import Redis
 from psycopg2.extras import DictCursor
 
 from settings import ServicesCosts, NotifyChats
+from databases.executor import run_sync
 from schemas.users import UserSchema, UserMenu
 
 from services.incomes import IncomesService
@@ -38,7 +39,7 @@ async def handler_change_name_menu(
         response = BACK_MAIN_MENU
         reply_keyboard, _ = get_main_menu_keyboard(user_data)
         keyboard = reply_keyboard
-        update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
 
     elif user_data.banned_nickname:
         response = "❌ Вам запрещено менять никнейм"
@@ -64,20 +65,20 @@ async def handler_change_name_menu(
         """
 
     else:
-        update_user_name(user_id, new_user_name, psql_cursor)
+        await run_sync(update_user_name, user_id, new_user_name, psql_cursor)
 
         if user_data.free_nick_change is False:
-            take_coins(user_id, ServicesCosts.CHANGE_USER_NAME, psql_cursor)
+            await run_sync(take_coins, user_id, ServicesCosts.CHANGE_USER_NAME, psql_cursor)
             IncomesService.records_additional_incomes(
                 amount=ServicesCosts.CHANGE_USER_NAME,
                 redis_cursor=redis_cursor
             )
         else:
-            update_free_nick_change(user_id, False, psql_cursor)
+            await run_sync(update_free_nick_change, user_id, False, psql_cursor)
 
         old_user_name = UserSchema.format_telegram_name(user_id, user_data.full_name)
         new_user_name_formatted = UserSchema.format_telegram_name(
-            user_id, get_user_data(user_id, psql_cursor).full_name
+            user_id, (await run_sync(get_user_data, user_id, psql_cursor)).full_name
         )
 
         await NotificationsService.send_notification(
@@ -88,7 +89,7 @@ async def handler_change_name_menu(
         response = f"✅ Ваш ник изменен на {new_user_name_formatted}"
         reply_keyboard, _ = get_main_menu_keyboard(user_data)
         keyboard = reply_keyboard
-        update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
 
     await send_message(user_id, response, keyboard)
 
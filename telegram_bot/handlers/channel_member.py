@@ -0,0 +1,49 @@
+from telegram import Update
+from telegram.constants import ChatMemberStatus
+
+from settings import TelegramBotSettings
+from databases.executor import run_sync
+from databases.postgresql import async_postgresql_connection
+
+from services.bonus_subscription import BonusSubscriptionService
+
+
+"""
+    Подписка на канал бонусов
+
+    Telegram присылает update chat_member, когда пользователь подписывается на канал
+    или отписывается от него (бот должен быть администратором канала, а chat_member -
+    в allowed_updates). Подписка сохраняется в channel_subscribers, и подписавшемуся
+    сразу выдаются активные бонусы, поэтому фоновой задаче не нужно опрашивать getChatMember
+"""
+
+
+SUBSCRIBED_STATUSES = (ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER)
+
+
+async def handler_channel_member(update: Update) -> None:
+    """Обрабатывает изменение подписки на канал бонусов"""
+
+    chat_member = update.chat_member
+
+    if chat_member.chat.id != TelegramBotSettings.SUBSCRIPTION_CHANNEL_ID:
+        return
+
+    user = chat_member.new_chat_member.user
+    if user.is_bot:
+        return
+
+    is_subscribed = chat_member.new_chat_member.status in SUBSCRIBED_STATUSES
+
+    async with async_postgresql_connection() as (_, psql_cursor):
+        await run_sync(BonusSubscriptionService.set_subscriptions, [(user.id, is_subscribed)], psql_cursor)
+
+        if not is_subscribed:
+            return
+
+        rewards = await run_sync(
+            BonusSubscriptionService.give_bonuses,
+            TelegramBotSettings.SUBSCRIPTION_BONUS_BATCH, psql_cursor, user.id
+        )
+
+    await BonusSubscriptionService.send_bonus_messages(rewards)
@@ -2,6 +2,7 @@ from redis.client import Redis
 from psycopg2.extras import DictCursor
 
 from settings import ServicesCosts, NotifyChats
+from databases.executor import run_sync
 
 from schemas.users import UserSchema, UserMenu
 from schemas.clans import ExtraCreateClan, CreateClanMenu, ClanTypeApplication, \
@@ -51,8 +52,8 @@ async def handler_menu_create_clan(
             response = BACK_SERVICES_MENU
             reply_keyboard, _ = get_main_menu_keyboard(user_data)
             keyboard = reply_keyboard
-            update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
-            update_user_extra_data(user_id, None, psql_cursor)
+            await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, None, psql_cursor)
 
         elif message == "создать клан" or message == "Создать клан":
             service_cost = format_number(ServicesCosts.CREATE_CLAN)
@@ -63,10 +64,10 @@ async def handler_menu_create_clan(
             keyboard = back_keyboard
 
             extra_data.menu = CreateClanMenu.SET_NAME
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         elif message == "топ кланов" or message == "Топ кланов":
-            response, keyboard = get_clans_message_telegram(psql_cursor)
+            response, keyboard = await run_sync(get_clans_message_telegram, psql_cursor)
 
         elif (
             payload is not None and
@@ -80,7 +81,7 @@ async def handler_menu_create_clan(
             keyboard = back_keyboard
 
             extra_data.menu = CreateClanMenu.SET_NAME
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         elif (
             payload is not None and
@@ -88,8 +89,10 @@ async def handler_menu_create_clan(
             isinstance(payload.get("offset"), int)
         ):
             offset = payload.get("offset")
-            response, keyboard = get_clans_message_telegram(
-                psql_cursor, offset=offset
+            response, keyboard = await run_sync(
+                get_clans_message_telegram,
+                psql_cursor, offset=offset,
+                after=payload.get("after"), before=payload.get("before")
             )
 
         elif (
@@ -98,7 +101,8 @@ async def handler_menu_create_clan(
             isinstance(payload.get("clan_id"), int)
         ):
             clan_id = payload.get("clan_id")
-            response, keyboard = ClanService.get_clan_info_message(
+            response, keyboard = await run_sync(
+                ClanService.get_clan_info_message,
                 psql_cursor, clan_id=clan_id, user_data=user_data,
             )
 
@@ -136,7 +140,7 @@ async def handler_menu_create_clan(
             response = "Создание клана отменено"
             keyboard = get_create_clan_keyboard()
             extra_data.menu = CreateClanMenu.MAIN
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         elif not ClanService.check_length_clan_name(clan_name):
             response = CLAN_NAME_LENGTH
@@ -145,7 +149,7 @@ async def handler_menu_create_clan(
             banned_symbols = ",".join(banned_symbols)
             response = PATTERN_BANNED_SYMBOLS.format(banned_symbols)
 
-        elif not ClanService.is_name_available(clan_name, psql_cursor):
+        elif not await run_sync(ClanService.is_name_available, clan_name, psql_cursor):
             response = CLAN_NAME_OCCUPIED
 
         else:
@@ -160,7 +164,7 @@ async def handler_menu_create_clan(
 
             extra_data.menu = CreateClanMenu.SET_TAG
             extra_data.clan_name = clan_name
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
     elif extra_data.menu == CreateClanMenu.SET_TAG:
 
@@ -177,7 +181,7 @@ async def handler_menu_create_clan(
 
             extra_data.menu = CreateClanMenu.SET_NAME
             extra_data.clan_name = None
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         elif not ClanService.check_length_clan_tag(clan_tag):
             response = CLAN_TAG_LENGTH
@@ -186,7 +190,7 @@ async def handler_menu_create_clan(
             banned_symbols = ", ".join(banned_symbols)
             response = PATTERN_BANNED_SYMBOLS.format(banned_symbols)
 
-        elif not ClanService.is_tag_available(clan_tag, psql_cursor):
+        elif not await run_sync(ClanService.is_tag_available, clan_tag, psql_cursor):
             response = CLAN_TAG_OCCUPIED
 
         elif user_data.coins < ServicesCosts.CREATE_CLAN:
@@ -200,12 +204,12 @@ async def handler_menu_create_clan(
             clan_name = extra_data.clan_name
             clan_service = ClanService
 
-            clan_data = clan_service.create_clan(user_id, clan_tag, clan_name, psql_cursor)
-            update_user_extra_data(user_id, ExtraOwnerClan(), psql_cursor)
+            clan_data = await run_sync(clan_service.create_clan, user_id, clan_tag, clan_name, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, ExtraOwnerClan(), psql_cursor)
             await clan_service.update_invitation_link(clan_data.clan_id, psql_cursor)
 
             service_cost = ServicesCosts.CREATE_CLAN
-            take_coins(user_id, service_cost, psql_cursor)
+            await run_sync(take_coins, user_id, service_cost, psql_cursor)
             IncomesService.records_additional_incomes(service_cost, redis_cursor)
 
             clan_name = UserSchema.format_telegram_name(user_id, clan_name)
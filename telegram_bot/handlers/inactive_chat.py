@@ -2,6 +2,7 @@ from redis.client import Redis
 from psycopg2.extras import DictCursor
 
 from settings import NotifyChats
+from databases.executor import run_sync
 
 from games.base import BaseGameModel
 from schemas.chats import ChatSchema, ChatType, CHAT_TYPES_NAME, CHAT_TYPE_COST
@@ -39,7 +40,7 @@ async def handler_inactive_chat(
     keyboard = None
 
     if chat_data is None:
-        ChatsService.register_chat(chat_id, psql_cursor)
+        await run_sync(ChatsService.register_chat, chat_id, psql_cursor)
         response = """
             Привет!
 
@@ -56,7 +57,7 @@ async def handler_inactive_chat(
             response = "⚠️ Выдайте боту права администратора в беседе, чтобы активировать беседу"
             return await send_message(chat_id, response)
         else:
-            ChatsService.update_owner_id(chat_id, owner_id, psql_cursor)
+            await run_sync(ChatsService.update_owner_id, chat_id, owner_id, psql_cursor)
 
     if (
         message in ["start", "/start", "начать", "help", "выбор"] or
@@ -76,7 +77,7 @@ async def handler_inactive_chat(
         payload.get("game") in ALL_GAMES_VALUES
     ):
         game_mode = Games(payload.get("game"))
-        ChatsService.update_game_mode(chat_id, game_mode, psql_cursor)
+        await run_sync(ChatsService.update_game_mode, chat_id, game_mode, psql_cursor)
 
         response = "Теперь выбери тип беседы:"
         keyboard = get_keyboard_select_chat_type()
@@ -101,12 +102,12 @@ async def handler_inactive_chat(
 
         if user_data.coins >= CHAT_TYPE_COST[chat_type] or user_data.status == UserStatus.ADMIN:
             response = f"✅ Статус беседы повышен до {chat_type.value}"
-            ChatsService.update_type(chat_id, chat_type, psql_cursor)
-            ChatsService.update_life_datetime(chat_id, 1, psql_cursor)
+            await run_sync(ChatsService.update_type, chat_id, chat_type, psql_cursor)
+            await run_sync(ChatsService.update_life_datetime, chat_id, 1, psql_cursor)
 
             if user_data.status != UserStatus.ADMIN:
                 cost = CHAT_TYPE_COST[chat_type]
-                take_coins(user_id, cost, psql_cursor)
+                await run_sync(take_coins, user_id, cost, psql_cursor)
                 IncomesService.records_additional_incomes(cost, redis_cursor)
 
             # Проверяем, что игра существует в GAMES_MODEL
@@ -115,7 +116,7 @@ async def handler_inactive_chat(
                 keyboard = get_keyboard_select_game_mode()
             else:
                 game_model = BaseGameModel.GAMES_MODEL[chat_data.game_mode]
-                game_result = game_model.create_game(chat_id, psql_cursor)
+                game_result = await run_sync(game_model.create_game, chat_id, psql_cursor)
                 keyboard = game_model.get_game_keyboard(game_result)
 
             await NotificationsService.send_notification(
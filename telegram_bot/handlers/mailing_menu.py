@@ -2,6 +2,7 @@ import asyncio
 import threading
 from psycopg2.extras import DictCursor
 
+from databases.executor import run_sync
 from schemas.users import UserSchema, UserMenu
 from modules.telegram.bot import send_message
 from modules.databases.users import update_user_menu, update_user_extra_data
@@ -30,15 +31,15 @@ async def handler_mailing_menu(
             response = "Админ панель"
             keyboard = get_admin_menu_keyboard()
 
-            update_user_menu(admin_id, UserMenu.ADMIN, psql_cursor)
-            update_user_extra_data(admin_id, None, psql_cursor)
+            await run_sync(update_user_menu, admin_id, UserMenu.ADMIN, psql_cursor)
+            await run_sync(update_user_extra_data, admin_id, None, psql_cursor)
 
         elif message == "пропустить":
             response = "Введи текст рассылки\nНе забудь указать ; в конце!"
             keyboard = back_keyboard
 
             extra_data.menu = MailingMenu.MESSAGE
-            update_user_extra_data(admin_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, admin_id, extra_data, psql_cursor)
 
         else:
             response = "Введи текст рассылки\nНе забудь указать ; в конце!"
@@ -46,7 +47,7 @@ async def handler_mailing_menu(
 
             extra_data.menu = MailingMenu.MESSAGE
             extra_data.attachment = original_message
-            update_user_extra_data(admin_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, admin_id, extra_data, psql_cursor)
 
     # Добавить остальную логику из vk_bot/handlers/mailing_menu.py
     else:
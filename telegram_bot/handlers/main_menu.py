@@ -2,6 +2,7 @@ from redis.client import Redis
 from psycopg2.extras import DictCursor
 
 from settings import Config, PointsLimit
+from databases.executor import run_sync
 
 from schemas.users import UserSchema, UserStatus, UserMenu
 from schemas.games import ALL_GAMES_VALUES
@@ -56,7 +57,7 @@ async def handler_main_menu(
     if message == "/start" or message == "start" or message == "меню" or message == "Меню":
         response = "Главное меню"
         reply_keyboard, inline_keyboard = get_main_menu_keyboard(user_data)
-        update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
         await send_message(user_id, response, reply_keyboard)
         if inline_keyboard:
             await send_message(user_id, "🏆 Топы:", inline_keyboard)
@@ -72,7 +73,7 @@ async def handler_main_menu(
     elif "админ" in message and user_data.status == UserStatus.ADMIN:
         response = "Админ панель"
         keyboard = get_admin_menu_keyboard()
-        update_user_menu(user_id, UserMenu.ADMIN, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.ADMIN, psql_cursor)
 
     elif message == "играть":
         response = "Нажмите кнопку \"Играть\" ещё раз чтобы увидеть другие игры"
@@ -106,25 +107,25 @@ async def handler_main_menu(
         response = ENTER_LINK_USER
         keyboard = back_keyboard
 
-        update_user_menu(user_id, UserMenu.TRANSFER_COINS, psql_cursor)
-        update_user_extra_data(user_id, ExtraTransferCoins(), psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.TRANSFER_COINS, psql_cursor)
+        await run_sync(update_user_extra_data, user_id, ExtraTransferCoins(), psql_cursor)
 
     elif message == "настройки":
         response = "Настройки профиля"
         keyboard = get_settings_menu_keyboard(user_data)
-        update_user_menu(user_id, UserMenu.SETTINGS, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.SETTINGS, psql_cursor)
 
     elif message == "сервисы":
         response = BACK_SERVICES_MENU
         keyboard = get_services_menu_keyboard()
-        update_user_menu(user_id, UserMenu.SERVICES, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.SERVICES, psql_cursor)
 
     elif message == "профиль" or message == "Профиль":
         from modules.telegram.users import get_registration_date
         from modules.databases.users import get_user_data
         
         # Перезагружаем данные пользователя из БД для актуальной статистики
-        current_user_data = get_user_data(user_id, psql_cursor)
+        current_user_data = await run_sync(get_user_data, user_id, psql_cursor)
         if current_user_data is None:
             current_user_data = user_data
         
@@ -148,41 +149,47 @@ async def handler_main_menu(
         keyboard = get_tops_menu_keyboard()
 
     elif message == "топ дня" or message == "Топ дня":
-        response, keyboard = DayTopService().get_message(
+        response, keyboard = await run_sync(
+            DayTopService().get_message,
             user_data, psql_cursor, offset=0
         )
 
     elif message == "топ недели" or message == "Топ недели":
-        response, keyboard = WeekTopService().get_message(
+        response, keyboard = await run_sync(
+            WeekTopService().get_message,
             user_data, psql_cursor, offset=0
         )
 
     elif message == "топ месяца" or message == "Топ месяца":
-        response, keyboard = MonthTopService().get_message(user_data, psql_cursor, offset=0)
+        response, keyboard = await run_sync(MonthTopService().get_message, user_data, psql_cursor, offset=0)
 
     elif message == "топ кланов" or message == "Топ кланов":
-        response, keyboard = get_clans_top_message_telegram(
+        response, keyboard = await run_sync(
+            get_clans_top_message_telegram,
             user_data, psql_cursor, offset=0
         )
 
     elif message == "топ игроков":
-        response, _ = AllTimeTopService().get_message(user_data, psql_cursor)
+        response, _ = await run_sync(AllTimeTopService().get_message, user_data, psql_cursor)
         reply_keyboard, inline_keyboard = get_main_menu_keyboard(user_data)
         keyboard = reply_keyboard
 
     elif is_payload and payload.get("event") == "get_top_day_message":
-        response, keyboard = DayTopService().get_message(
+        response, keyboard = await run_sync(
+            DayTopService().get_message,
             user_data, psql_cursor, payload.get("offset", 0),
         )
 
     elif is_payload and payload.get("event") == "get_top_week_message":
         from tops.week_top_telegram import get_week_top_message_telegram
-        response, keyboard = get_week_top_message_telegram(
+        response, keyboard = await run_sync(
+            get_week_top_message_telegram,
             user_data, psql_cursor, payload.get("offset", 0)
         )
 
     elif is_payload and payload.get("event") == "get_top_clans_message":
-        response, keyboard = get_clans_top_message_telegram(
+        response, keyboard = await run_sync(
+            get_clans_top_message_telegram,
             user_data, psql_cursor, payload.get("offset", 0)
         )
 
@@ -190,17 +197,20 @@ async def handler_main_menu(
         response, keyboard = await ClanService.go_clan_menu(user_data, psql_cursor)
 
     elif is_payload and payload.get("event") == "get_top_coins_message":
-        response, keyboard = CoinsTopService().get_message(
+        response, keyboard = await run_sync(
+            CoinsTopService().get_message,
             user_data, psql_cursor, payload.get("offset", 0)
         )
 
     elif is_payload and payload.get("event") == "get_top_rubles_message":
-        response, keyboard = RublesTopService().get_message(
+        response, keyboard = await run_sync(
+            RublesTopService().get_message,
             user_data, psql_cursor, payload.get("offset", 0)
         )
 
     elif is_payload and payload.get("event") == "get_top_week_rubles_message":
-        response, keyboard = WeekRublesTopService().get_message(
+        response, keyboard = await run_sync(
+            WeekRublesTopService().get_message,
             user_data, psql_cursor, payload.get("offset", 0)
         )
 
@@ -226,7 +236,8 @@ async def handler_main_menu(
         payload.get("event") == RedisKeys.TRANSFERS_IN_CHAT.value and
         payload.get("sender_id") == user_id
     ):
-        response = TransferCoinsService.handler_transfer_coins_in_message(
+        response = await run_sync(
+            TransferCoinsService.handler_transfer_coins_in_message,
             sender_id=user_id, payload=payload,
             psql_cursor=psql_cursor, redis_cursor=redis_cursor
         )
@@ -1,5 +1,6 @@
 from psycopg2.extras import DictCursor
 
+from databases.executor import run_sync
 from schemas.users import UserSchema, UserMenu
 from services.clans import ClanService
 
@@ -26,10 +27,10 @@ async def handler_management_clan_members_menu(
         response = BACK_MAIN_MENU
         reply_keyboard, _ = get_main_menu_keyboard(member_data)
         keyboard = reply_keyboard
-        update_user_menu(member_id, UserMenu.MAIN, psql_cursor)
+        await run_sync(update_user_menu, member_id, UserMenu.MAIN, psql_cursor)
 
     elif message == "кланы":
-        response, keyboard = ClanService.get_clans_message(psql_cursor)
+        response, keyboard = await run_sync(ClanService.get_clans_message, psql_cursor)
 
     elif (
         payload is not None and
@@ -37,8 +38,10 @@ async def handler_management_clan_members_menu(
         isinstance(payload.get("offset"), int)
     ):
         offset = payload.get("offset")
-        response, keyboard = ClanService.get_clans_message(
-            psql_cursor, offset=offset
+        response, keyboard = await run_sync(
+            ClanService.get_clans_message,
+            psql_cursor, offset=offset,
+            after=payload.get("after"), before=payload.get("before")
         )
 
     elif (
@@ -47,13 +50,15 @@ async def handler_management_clan_members_menu(
         isinstance(payload.get("clan_id"), int)
     ):
         clan_id = payload.get("clan_id")
-        response, _ = ClanService.get_clan_info_message(
+        response, _ = await run_sync(
+            ClanService.get_clan_info_message,
             psql_cursor, clan_id=clan_id, user_data=member_data
         )
         keyboard = get_clan_member_keyboard()
 
     elif message == "участники":
-        response, keyboard = ClanService.get_clan_members_message(
+        response, keyboard = await run_sync(
+            ClanService.get_clan_members_message,
             psql_cursor, clan_id=clan_id
         )
 
@@ -63,12 +68,14 @@ async def handler_management_clan_members_menu(
         isinstance(payload.get("offset"), int)
     ):
         offset = payload.get("offset")
-        response, keyboard = ClanService.get_clan_members_message(
+        response, keyboard = await run_sync(
+            ClanService.get_clan_members_message,
             psql_cursor, clan_id=clan_id, offset=offset
         )
 
     elif message == "беседа клана":
-        response = ClanService.get_link_clan_chat(
+        response = await run_sync(
+            ClanService.get_link_clan_chat,
             clan_id=clan_id, psql_cursor=psql_cursor
         )
         keyboard = get_clan_member_keyboard()
@@ -78,11 +85,11 @@ async def handler_management_clan_members_menu(
         reply_keyboard, _ = get_main_menu_keyboard(member_data)
         keyboard = reply_keyboard
 
-        update_user_menu(member_id, UserMenu.MAIN, psql_cursor)
+        await run_sync(update_user_menu, member_id, UserMenu.MAIN, psql_cursor)
         clan_service = ClanService
-        clan_service.leave_clan([member_id], psql_cursor)
+        await run_sync(clan_service.leave_clan, [member_id], psql_cursor)
 
-        clan_data = clan_service.get_clan_data(clan_id, psql_cursor)
+        clan_data = await run_sync(clan_service.get_clan_data, clan_id, psql_cursor)
         clan_owner_message = f"⚠️ {member_data.full_name} покинул клан"
         await clan_service.send_clan_owner_notification(clan_data, clan_owner_message)
 
@@ -7,6 +7,7 @@ from psycopg2.extras import DictCursor
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 from settings import ServicesCosts, ClanSettings
+from databases.executor import run_sync
 
 from schemas.users import UserSchema, UserMenu
 from schemas.clans import ExtraOwnerClan, OwnerClanMenu, ClanSchema, \
@@ -116,7 +117,7 @@ async def handler_management_clan_owner_menu(
     """Обрабатывает сообщения владельца клана"""
 
     clan_id = owner_data.clan_id
-    clan_data = ClanService.get_clan_data(clan_id, psql_cursor)
+    clan_data = await run_sync(ClanService.get_clan_data, clan_id, psql_cursor)
     
     # Проверяем что extra_data не None
     if owner_data.extra_data is None:
@@ -133,10 +134,10 @@ async def handler_management_clan_owner_menu(
             response = BACK_MAIN_MENU
             reply_keyboard, _ = get_main_menu_keyboard(owner_data)
             keyboard = reply_keyboard
-            update_user_menu(owner_id, UserMenu.MAIN, psql_cursor)
+            await run_sync(update_user_menu, owner_id, UserMenu.MAIN, psql_cursor)
 
         elif message == "кланы" or message == "Кланы":
-            response, keyboard = get_clans_message_telegram(psql_cursor)
+            response, keyboard = await run_sync(get_clans_message_telegram, psql_cursor)
 
         elif (
             payload is not None and
@@ -144,8 +145,10 @@ async def handler_management_clan_owner_menu(
             isinstance(payload.get("offset"), int)
         ):
             offset = payload.get("offset")
-            response, keyboard = get_clans_message_telegram(
-                psql_cursor, offset=offset
+            response, keyboard = await run_sync(
+                get_clans_message_telegram,
+                psql_cursor, offset=offset,
+                after=payload.get("after"), before=payload.get("before")
             )
 
         elif (
@@ -154,7 +157,8 @@ async def handler_management_clan_owner_menu(
             isinstance(payload.get("clan_id"), int)
         ):
             clan_id_info = payload.get("clan_id")
-            response, _ = ClanService.get_clan_info_message(
+            response, _ = await run_sync(
+                ClanService.get_clan_info_message,
                 psql_cursor, clan_id=clan_id_info, user_data=owner_data
             )
             keyboard = get_clan_owner_keyboard()
@@ -165,7 +169,8 @@ async def handler_management_clan_owner_menu(
             isinstance(payload.get("offset"), int)
         ):
             offset = payload.get("offset")
-            response, keyboard = get_clan_members_message_telegram(
+            response, keyboard = await run_sync(
+                get_clan_members_message_telegram,
                 psql_cursor, clan_id=clan_id, offset=offset
             )
             # Добавляем кнопку "Назад"
@@ -184,26 +189,28 @@ async def handler_management_clan_owner_menu(
                     )
                 ]])
             extra_data.menu = OwnerClanMenu.MANAGING_MEMBERS
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif (
             payload is not None and
             payload.get("event") == "clan_back"
         ):
-            response, keyboard = go_clan_main_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_main_menu, clan_data, owner_data, psql_cursor)
 
         elif message == "участники" or message == "Участники":
-            response, keyboard = get_clan_members_message_telegram(
+            response, keyboard = await run_sync(
+                get_clan_members_message_telegram,
                 psql_cursor, clan_id=clan_id
             )
 
             extra_data.menu = OwnerClanMenu.MANAGING_MEMBERS
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
             # Сразу показываем клавиатуру управления участниками
             keyboard = get_keyboard_managing_members()
 
         elif message == "беседа клана" or message == "Беседа клана":
-            response = ClanService.get_link_clan_chat(
+            response = await run_sync(
+                ClanService.get_link_clan_chat,
                 clan_id=clan_id, psql_cursor=psql_cursor
             )
             keyboard = get_clan_owner_keyboard()
@@ -213,29 +220,29 @@ async def handler_management_clan_owner_menu(
             keyboard = get_keyboard_delete_clan()
 
             extra_data.menu = OwnerClanMenu.DELETE_CLAN
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif message == "настройки" or message == "Настройки":
-            response, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
 
     elif extra_data.menu == OwnerClanMenu.MANAGING_MEMBERS:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_main_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_main_menu, clan_data, owner_data, psql_cursor)
 
         elif message == "пригласить" or message == "Пригласить":
             response = "Введите @username или ID игрока для приглашения в клан"
             keyboard = back_keyboard
 
             extra_data.menu = OwnerClanMenu.INVITE_MEMBER
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif message == "исключить" or message == "Исключить":
             response = "Введите @username или ID игрока для исключения из клана"
             keyboard = back_keyboard
 
             extra_data.menu = OwnerClanMenu.EXPEL_MEMBER
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         else:
             response = COMMAND_NOT_FOUND
@@ -244,7 +251,7 @@ async def handler_management_clan_owner_menu(
     elif extra_data.menu == OwnerClanMenu.SETTINGS:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_main_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_main_menu, clan_data, owner_data, psql_cursor)
 
         elif message == "название" or message == "Название":
             service_cost = format_number(ServicesCosts.CHANGE_CLAN_NAME)
@@ -255,7 +262,7 @@ async def handler_management_clan_owner_menu(
             keyboard = back_keyboard
 
             extra_data.menu = OwnerClanMenu.CHANGE_CLAN_NAME
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif message == "тег" or message == "Тег":
             service_cost = format_number(ServicesCosts.CHANGE_CLAN_TAG)
@@ -266,7 +273,7 @@ async def handler_management_clan_owner_menu(
             keyboard = back_keyboard
 
             extra_data.menu = OwnerClanMenu.CHANGE_CLAN_TAG
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif message == "тип входа" or message == "Тип входа":
             from schemas.clans import clan_join_type_translation
@@ -280,25 +287,25 @@ async def handler_management_clan_owner_menu(
             keyboard = get_keyboard_change_clan_join_type()
 
             extra_data.menu = OwnerClanMenu.CHANGE_JOIN_TYPE
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif message == "порог входа" or message == "Порог входа":
             response = "Укажите, от какого количества выигранных коинов люди смогут вступать в клан/подавать заявку"
             keyboard = back_keyboard
 
             extra_data.menu = OwnerClanMenu.CHANGE_JOIN_BARRIER
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif message == "ссылка на беседу" or message == "Ссылка на беседу":
             response = "Укажи ссылку на беседу клана"
             keyboard = back_keyboard
 
             extra_data.menu = OwnerClanMenu.CHANGE_CHAT_LINK
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif message == "уведомления о входе" or message == "Уведомления о входе":
             old_switch = clan_data.owner_notifications
-            switch = ClanService.switch_owner_notifications(clan_id, old_switch, psql_cursor)
+            switch = await run_sync(ClanService.switch_owner_notifications, clan_id, old_switch, psql_cursor)
 
             if switch:
                 response = "Вы включили уведомления о входе/выходе игроков из клана"
@@ -316,11 +323,11 @@ async def handler_management_clan_owner_menu(
 
         if message == "подтвердить удаление" or message == "Подтвердить удаление":
             # Удаляем клан
-            member_ids = ClanService.get_members_id(clan_id, psql_cursor)
-            ClanService.delete_clan(clan_id, member_ids, psql_cursor)
+            member_ids = await run_sync(ClanService.get_members_id, clan_id, psql_cursor)
+            await run_sync(ClanService.delete_clan, clan_id, member_ids, psql_cursor)
             
             # ВАЖНО: Коммитим изменения
-            psql_connection.commit()
+            await run_sync(psql_connection.commit)
             
             # Отправляем уведомления всем участникам
             await asyncio.gather(*[
@@ -331,10 +338,10 @@ async def handler_management_clan_owner_menu(
             response = "Клан успешно удален"
             reply_keyboard, _ = get_main_menu_keyboard(owner_data)
             keyboard = reply_keyboard
-            update_user_menu(owner_id, UserMenu.MAIN, psql_cursor)
+            await run_sync(update_user_menu, owner_id, UserMenu.MAIN, psql_cursor)
 
         elif message == "отмена" or message == "Отмена":
-            response, keyboard = go_clan_main_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_main_menu, clan_data, owner_data, psql_cursor)
 
         else:
             response = COMMAND_NOT_FOUND
@@ -343,7 +350,7 @@ async def handler_management_clan_owner_menu(
     elif extra_data.menu == OwnerClanMenu.CHANGE_CLAN_NAME:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
 
         else:
             # Проверяем баланс и меняем название
@@ -358,20 +365,20 @@ async def handler_management_clan_owner_menu(
                 elif re.search(PATTERN_BANNED_SYMBOLS, clan_name):
                     response = "Имя клана содержит запрещенные символы"
                     keyboard = back_keyboard
-                elif ClanService.check_clan_name_occupied(clan_name, psql_cursor):
+                elif await run_sync(ClanService.check_clan_name_occupied, clan_name, psql_cursor):
                     response = CLAN_NAME_OCCUPIED
                     keyboard = back_keyboard
                 else:
-                    take_coins(owner_id, ServicesCosts.CHANGE_CLAN_NAME, psql_cursor)
-                    ClanService.update_clan_name(clan_id, clan_name, psql_cursor)
-                    clan_data = ClanService.get_clan_data(clan_id, psql_cursor)
+                    await run_sync(take_coins, owner_id, ServicesCosts.CHANGE_CLAN_NAME, psql_cursor)
+                    await run_sync(ClanService.update_clan_name, clan_id, clan_name, psql_cursor)
+                    clan_data = await run_sync(ClanService.get_clan_data, clan_id, psql_cursor)
                     response = f"Название клана изменено на {clan_name}"
-                    _, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+                    _, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
 
     elif extra_data.menu == OwnerClanMenu.CHANGE_CLAN_TAG:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
 
         else:
             # Проверяем баланс и меняем тег
@@ -386,20 +393,20 @@ async def handler_management_clan_owner_menu(
                 elif re.search(PATTERN_BANNED_SYMBOLS, clan_tag):
                     response = "Тег клана содержит запрещенные символы"
                     keyboard = back_keyboard
-                elif ClanService.check_clan_tag_occupied(clan_tag, psql_cursor):
+                elif await run_sync(ClanService.check_clan_tag_occupied, clan_tag, psql_cursor):
                     response = CLAN_TAG_OCCUPIED
                     keyboard = back_keyboard
                 else:
-                    take_coins(owner_id, ServicesCosts.CHANGE_CLAN_TAG, psql_cursor)
-                    ClanService.update_clan_tag(clan_id, clan_tag, psql_cursor)
-                    clan_data = ClanService.get_clan_data(clan_id, psql_cursor)
+                    await run_sync(take_coins, owner_id, ServicesCosts.CHANGE_CLAN_TAG, psql_cursor)
+                    await run_sync(ClanService.update_clan_tag, clan_id, clan_tag, psql_cursor)
+                    clan_data = await run_sync(ClanService.get_clan_data, clan_id, psql_cursor)
                     response = f"Тег клана изменен на {clan_tag}"
-                    _, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+                    _, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
 
     elif extra_data.menu == OwnerClanMenu.CHANGE_JOIN_TYPE:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
 
         elif (
             payload is not None and
@@ -409,8 +416,8 @@ async def handler_management_clan_owner_menu(
             from schemas.clans import ClanJoinType, clan_join_type_translation
             try:
                 join_type = ClanJoinType(payload.get("join_type"))
-                ClanService.update_clan_join_type(clan_id, join_type, psql_cursor)
-                clan_data = ClanService.get_clan_data(clan_id, psql_cursor)
+                await run_sync(ClanService.update_clan_join_type, clan_id, join_type, psql_cursor)
+                clan_data = await run_sync(ClanService.get_clan_data, clan_id, psql_cursor)
                 
                 if join_type == ClanJoinType.OPEN:
                     response = "Теперь в клан могут вступить все желающие, кто выиграл больше необходимого для вступления значения коинов"
@@ -421,7 +428,7 @@ async def handler_management_clan_owner_menu(
                 else:
                     response = f"Тип входа изменен на {clan_join_type_translation[join_type]}"
                 
-                _, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+                _, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
             except (ValueError, KeyError):
                 response = COMMAND_NOT_FOUND
                 keyboard = get_keyboard_change_clan_join_type()
@@ -432,7 +439,7 @@ async def handler_management_clan_owner_menu(
     elif extra_data.menu == OwnerClanMenu.CHANGE_JOIN_BARRIER:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
 
         else:
             try:
@@ -441,10 +448,10 @@ async def handler_management_clan_owner_menu(
                     response = "Порог входа не может быть отрицательным"
                     keyboard = back_keyboard
                 else:
-                    ClanService.update_clan_join_barrier(clan_id, barrier, psql_cursor)
-                    clan_data = ClanService.get_clan_data(clan_id, psql_cursor)
+                    await run_sync(ClanService.update_clan_join_barrier, clan_id, barrier, psql_cursor)
+                    clan_data = await run_sync(ClanService.get_clan_data, clan_id, psql_cursor)
                     response = f"Порог входа изменен на {format_number(barrier)}"
-                    _, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+                    _, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
             except ValueError:
                 response = "Введите корректное число"
                 keyboard = back_keyboard
@@ -452,7 +459,7 @@ async def handler_management_clan_owner_menu(
     elif extra_data.menu == OwnerClanMenu.INVITE_MEMBER:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_management_menu(owner_id, psql_cursor)
+            response, keyboard = await run_sync(go_clan_management_menu, owner_id, psql_cursor)
 
         else:
             # Обработка приглашения участника
@@ -473,7 +480,7 @@ async def handler_management_clan_owner_menu(
                 keyboard = back_keyboard
             else:
                 # Проверяем существует ли пользователь в БД
-                target_user_data = get_user_data(user_id, psql_cursor)
+                target_user_data = await run_sync(get_user_data, user_id, psql_cursor)
                 if target_user_data is None:
                     response = f"Пользователь с ID {user_id} не найден в базе данных. Попросите пользователя написать боту /start для регистрации."
                     keyboard = back_keyboard
@@ -497,7 +504,7 @@ async def handler_management_clan_owner_menu(
                         response = APPLICATION_ALREADY_SENT
                         keyboard = back_keyboard
                     else:
-                        clan_position = ClanService.get_clan_position(clan_id, psql_cursor)
+                        clan_position = await run_sync(ClanService.get_clan_position, clan_id, psql_cursor)
                         
                         from telegram_bot.keyboards.clans_menu import get_keyboard_answer_user_join_clan
                         invite_message = f"""🏆 Вас приглашают в клан [{clan_data.tag}] {clan_data.name}
@@ -525,12 +532,12 @@ async def handler_management_clan_owner_menu(
                         
                         keyboard = get_keyboard_managing_members()
                         extra_data.menu = OwnerClanMenu.MANAGING_MEMBERS
-                        update_user_extra_data(owner_id, extra_data, psql_cursor)
+                        await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
     elif extra_data.menu == OwnerClanMenu.EXPEL_MEMBER:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_management_menu(owner_id, psql_cursor)
+            response, keyboard = await run_sync(go_clan_management_menu, owner_id, psql_cursor)
 
         else:
             # Обработка исключения участника
@@ -545,22 +552,22 @@ async def handler_management_clan_owner_menu(
                 response = expel_result
                 keyboard = get_keyboard_managing_members()
                 extra_data.menu = OwnerClanMenu.MANAGING_MEMBERS
-                update_user_extra_data(owner_id, extra_data, psql_cursor)
+                await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
     elif extra_data.menu == OwnerClanMenu.CHANGE_CHAT_LINK:
 
         if message == "назад" or message == "Назад":
-            response, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+            response, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
 
         else:
             # Проверяем что это похоже на ссылку (для Telegram можно использовать t.me или другие форматы)
             chat_link = original_message.strip()
             # Простая проверка на ссылку
             if chat_link.startswith("http://") or chat_link.startswith("https://") or chat_link.startswith("t.me/"):
-                ClanService.change_chat_link(clan_id, chat_link, psql_cursor)
-                clan_data = ClanService.get_clan_data(clan_id, psql_cursor)
+                await run_sync(ClanService.change_chat_link, clan_id, chat_link, psql_cursor)
+                clan_data = await run_sync(ClanService.get_clan_data, clan_id, psql_cursor)
                 response = "Ссылка на беседу клана обновлена"
-                _, keyboard = go_clan_settings_menu(clan_data, owner_data, psql_cursor)
+                _, keyboard = await run_sync(go_clan_settings_menu, clan_data, owner_data, psql_cursor)
             else:
                 response = "Это не похоже на ссылку. Введите корректную ссылку (например, t.me/... или https://...)"
                 keyboard = back_keyboard
@@ -2,6 +2,7 @@ from datetime import datetime
 from redis.client import Redis
 from psycopg2.extras import DictCursor
 
+from databases.executor import run_sync
 from schemas.users import UserSchema, UserMenu
 from schemas.chats import ExtraMyChats, MyChatsMenu, CHAT_TYPE_COST, INCOME_CHAT_TYPE, \
     get_margin_prolong_chat
@@ -40,7 +41,7 @@ async def handler_my_chats_menu(
     is_payload = payload is not None
 
     chat_id = extra_data.chat_id
-    chat_data = get_chat_data(chat_id, psql_cursor) if chat_id else None
+    chat_data = await run_sync(get_chat_data, chat_id, psql_cursor) if chat_id else None
 
     if extra_data.menu == MyChatsMenu.CHATS and chat_id is None:
 
@@ -48,16 +49,20 @@ async def handler_my_chats_menu(
             response = BACK_SERVICES_MENU
             keyboard = get_services_menu_keyboard()
 
-            update_user_menu(owner_id, UserMenu.SERVICES, psql_cursor)
-            update_user_extra_data(owner_id, None, psql_cursor)
+            await run_sync(update_user_menu, owner_id, UserMenu.SERVICES, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, None, psql_cursor)
 
         elif (
             is_payload and
-            payload.get("event") == "get_my_chats_message" and
-            isinstance(payload.get("offset"), int)
+            payload.get("event") == "get_my_chats_message"
         ):
+            # Старые кнопки страниц с offset открывают первую страницу
             response = "Выберите чат для управления:"
-            keyboard = get_my_chats_keyboard(owner_id, psql_cursor, payload["offset"])
+            keyboard = await run_sync(
+                get_my_chats_keyboard,
+                owner_id, psql_cursor,
+                after=payload.get("after"), before=payload.get("before")
+            )
 
         elif (
             is_payload and
@@ -66,22 +71,22 @@ async def handler_my_chats_menu(
         ):
 
             chat_id = payload["chat_id"]
-            chat_data = get_chat_data(chat_id, psql_cursor)
+            chat_data = await run_sync(get_chat_data, chat_id, psql_cursor)
 
             if chat_data and chat_data.owner_id == owner_id:
                 response = "Доступные команды управления чатом"
                 keyboard = get_management_chat_keyboard(chat_data)
 
                 extra_data.chat_id = chat_id
-                update_user_extra_data(owner_id, extra_data, psql_cursor)
+                await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
             else:
                 response = "Вы не являетесь владельцем этого чата"
-                keyboard = get_my_chats_keyboard(owner_id, psql_cursor)
+                keyboard = await run_sync(get_my_chats_keyboard, owner_id, psql_cursor)
 
         else:
             response = "Выберите чат для управления:"
-            keyboard = get_my_chats_keyboard(owner_id, psql_cursor)
+            keyboard = await run_sync(get_my_chats_keyboard, owner_id, psql_cursor)
 
     elif (
         extra_data.menu == MyChatsMenu.CHATS and
@@ -91,8 +96,8 @@ async def handler_my_chats_menu(
 
         if message == "назад":
             response = "Выберите чат для управления:"
-            keyboard = get_my_chats_keyboard(owner_id, psql_cursor)
-            update_user_extra_data(owner_id, ExtraMyChats(), psql_cursor)
+            keyboard = await run_sync(get_my_chats_keyboard, owner_id, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, ExtraMyChats(), psql_cursor)
 
         elif message == "инфо" or (is_payload and payload.get("event") == "get_chat_info"):
 
@@ -121,7 +126,7 @@ async def handler_my_chats_menu(
             keyboard = get_prolong_period_keyboard()
 
             extra_data.menu = MyChatsMenu.PROLONG
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif (
             (
@@ -150,14 +155,14 @@ async def handler_my_chats_menu(
         chat_data and chat_data.owner_id == owner_id
     ):
         days_period = payload.get("days") if is_payload else convert_number(message)
-        days_sub_left = ChatsService.get_days_subscription_left(chat_id, psql_cursor)
+        days_sub_left = await run_sync(ChatsService.get_days_subscription_left, chat_id, psql_cursor)
 
         if message == "назад":
             response = "Доступные команды управления чатом"
             keyboard = get_management_chat_keyboard(chat_data)
 
             extra_data.menu = MyChatsMenu.CHATS
-            update_user_extra_data(owner_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, extra_data, psql_cursor)
 
         elif days_period is None or not 1 <= days_period + days_sub_left <= 180:
             response = "Максимальный срок подписки чата может быть 180 дней"
@@ -174,7 +179,7 @@ async def handler_my_chats_menu(
             response = f"Стоимость продления на {days_period} {days_word} составит {format_prolong_cost} WC, продолжаем ?"
             keyboard = get_prolong_confirm_keyboard()
 
-            update_user_extra_data(owner_id, ExtraMyChats(
+            await run_sync(update_user_extra_data, owner_id, ExtraMyChats(
                 menu=MyChatsMenu.PROLONG_CONFIRM, chat_id=chat_id,
                 prolong_cost=prolong_cost, prolong_period=days_period
             ), psql_cursor)
@@ -195,10 +200,10 @@ async def handler_my_chats_menu(
 
             else:
                 prolong_period = extra_data.prolong_period
-                ChatsService.prolong_life_datetime(chat_id, prolong_period, psql_cursor)
+                await run_sync(ChatsService.prolong_life_datetime, chat_id, prolong_period, psql_cursor)
 
                 prolong_cost = extra_data.prolong_cost
-                take_coins(owner_id, prolong_cost, psql_cursor)
+                await run_sync(take_coins, owner_id, prolong_cost, psql_cursor)
                 IncomesService.records_additional_incomes(prolong_cost, redis_cursor)
 
                 chat_name = chat_data.name if chat_data.name else str(chat_data.chat_id)
@@ -212,12 +217,12 @@ async def handler_my_chats_menu(
                 response = f"Вы успешно увеличили срок подписки в чате {chat_name} на {prolong_period} {days_word}"
 
             keyboard = get_management_chat_keyboard(chat_data)
-            update_user_extra_data(owner_id, ExtraMyChats(chat_id=chat_id), psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, ExtraMyChats(chat_id=chat_id), psql_cursor)
 
         elif confirm is False:
             response = "Вы отменили продление подписки"
             keyboard = get_management_chat_keyboard(chat_data)
-            update_user_extra_data(owner_id, ExtraMyChats(chat_id=chat_id), psql_cursor)
+            await run_sync(update_user_extra_data, owner_id, ExtraMyChats(chat_id=chat_id), psql_cursor)
 
         else:
             days_period = extra_data.prolong_period
@@ -229,7 +234,7 @@ async def handler_my_chats_menu(
 
     else:
         response = "Обновление данных до актуальных"
-        keyboard = get_my_chats_keyboard(owner_id, psql_cursor)
-        update_user_extra_data(owner_id, ExtraMyChats(), psql_cursor)
+        keyboard = await run_sync(get_my_chats_keyboard, owner_id, psql_cursor)
+        await run_sync(update_user_extra_data, owner_id, ExtraMyChats(), psql_cursor)
 
     await send_message(owner_id, response, keyboard)
@@ -1,6 +1,7 @@
 from redis.client import Redis
 from psycopg2.extras import DictCursor
 
+from databases.executor import run_sync
 from schemas.users import UserSchema, UserMenu
 from schemas.clans import ClanRole, ClanTypeApplication
 from services.clans import ClanService
@@ -35,10 +36,10 @@ async def processing_in_all_menus(
     ):
 
         clan_id = payload.get("clan_id")
-        clan_data = ClanService.get_clan_data(clan_id, psql_cursor)
+        clan_data = await run_sync(ClanService.get_clan_data, clan_id, psql_cursor)
 
         user_id = payload.get("user_id")
-        user_data = get_user_data(user_id, psql_cursor)
+        user_data = await run_sync(get_user_data, user_id, psql_cursor)
 
         confirm = payload.get("confirm")
         redis_key = ClanService.create_redis_key_for_accent_user(
@@ -61,7 +62,7 @@ async def processing_in_all_menus(
 
         elif confirm is True:
             response = CLAN_GREETING
-            ClanService.join_clan(clan_id, user_id, psql_cursor)
+            await run_sync(ClanService.join_clan, clan_id, user_id, psql_cursor)
 
             await ClanService.send_clan_owner_notification(
                 clan_data=clan_data,
@@ -92,10 +93,10 @@ async def processing_in_all_menus(
     ):
 
         clan_id = payload.get("clan_id")
-        clan_data = ClanService.get_clan_data(clan_id, psql_cursor)
+        clan_data = await run_sync(ClanService.get_clan_data, clan_id, psql_cursor)
 
         user_id = payload.get("user_id")
-        user_data = get_user_data(user_id, psql_cursor)
+        user_data = await run_sync(get_user_data, user_id, psql_cursor)
 
         confirm = payload.get("confirm")
         redis_key = ClanService.create_redis_key_for_accent_clan(
@@ -124,7 +125,7 @@ async def processing_in_all_menus(
 
         elif confirm is True:
             response = "⚠️ Игрок принят в клан"
-            ClanService.join_clan(clan_id, user_id, psql_cursor)
+            await run_sync(ClanService.join_clan, clan_id, user_id, psql_cursor)
 
             clan_name = UserSchema.format_telegram_name(clan_data.owner_id, clan_data.name)
             await send_message(
@@ -160,7 +161,7 @@ async def processing_in_all_menus(
     elif (
         event == "switch_mailing"
     ):
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             UPDATE users SET mailing = not mailing
             WHERE user_id = %s
         """, [puser_data.user_id]
@@ -176,7 +177,7 @@ async def processing_in_all_menus(
     ):
 
         chat_id = payload["chat_id"]
-        chat_data = get_chat_data(chat_id, psql_cursor)
+        chat_data = await run_sync(get_chat_data, chat_id, psql_cursor)
 
         if chat_data is None:
             response = DATA_OUTDATED
@@ -184,7 +185,7 @@ async def processing_in_all_menus(
         elif chat_data.owner_id != puser_data.user_id:
             response = "❌ Вы не являетесь владельцем этого чата"
 
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             UPDATE chats
             SET subscription_notif = FALSE
             WHERE chat_id = %s
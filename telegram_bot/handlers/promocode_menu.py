@@ -4,6 +4,7 @@ from psycopg2.extras import DictCursor
 from psycopg2._psycopg import connection as Connection
 
 from settings import PointsLimit, PromoCodeSettings
+from databases.executor import run_sync
 
 from schemas.users import UserSchema, UserMenu
 from schemas.redis import RedisKeys
@@ -106,8 +107,8 @@ async def handler_promocode_menu(
             response = BACK_SERVICES_MENU
             keyboard = get_services_menu_keyboard()
 
-            update_user_menu(user_id, UserMenu.SERVICES, psql_cursor)
-            update_user_extra_data(user_id, None, psql_cursor)
+            await run_sync(update_user_menu, user_id, UserMenu.SERVICES, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, None, psql_cursor)
 
         elif message == "активировать промокод":
             if PromoCodeService.is_access_activation(user_id, redis_cursor):
@@ -115,7 +116,7 @@ async def handler_promocode_menu(
                 keyboard = back_keyboard
 
                 extra_data.menu = PromoCodeMenu.BEFORE_ACTIVATE
-                update_user_extra_data(user_id, extra_data, psql_cursor)
+                await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
             else:
                 seconds = PromoCodeService.get_ttl_ban_access(user_id, redis_cursor)
                 response = f"Доступ к сервису ограничен на {format_seconds_to_text(seconds)}"
@@ -126,10 +127,10 @@ async def handler_promocode_menu(
             keyboard = back_keyboard
 
             extra_data.menu = PromoCodeMenu.SET_NAME
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         elif message == "информация о промокодах":
-            response = PromoCodeService.get_message_user_promocodes(user_id, psql_cursor)
+            response = await run_sync(PromoCodeService.get_message_user_promocodes, user_id, psql_cursor)
             keyboard = get_promocode_menu_keyboard()
 
         else:
@@ -139,8 +140,9 @@ async def handler_promocode_menu(
     elif extra_data.menu == PromoCodeMenu.BEFORE_ACTIVATE:
 
         promocode_name = SecurityService.replace_banned_symbols(original_message)
-        promocode_data = PromoCodeService.get_promocode(promocode_name, psql_cursor)
-        promocode_response, promocode_access = checking_activation_promocode(
+        promocode_data = await run_sync(PromoCodeService.get_promocode, promocode_name, psql_cursor)
+        promocode_response, promocode_access = await run_sync(
+            checking_activation_promocode,
             user_id, promocode_data, psql_cursor
         )
         attempts = PromoCodeService.get_activation_attempts(user_id, redis_cursor) + 1
@@ -148,12 +150,12 @@ async def handler_promocode_menu(
 
         if attempts >= 10:
             response = LIMIT_ATTEMPTS
-            _, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+            _, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
             PromoCodeService.ban_access(user_id, redis_cursor)
             PromoCodeService.del_activation_attempts(user_id, redis_cursor)
 
         elif message == "назад":
-            response, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+            response, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
 
         elif promocode_access is True:
             response = "Решите капчу чтобы активировать промокод. " \
@@ -166,7 +168,7 @@ async def handler_promocode_menu(
             extra_data.menu = PromoCodeMenu.ACTIVATE
             extra_data.name = promocode_name
             extra_data.captcha_name = captcha_name
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         else:
             response = promocode_response
@@ -183,25 +185,26 @@ async def handler_promocode_menu(
 
         if attempts >= 3:
             response = LIMIT_ATTEMPTS
-            _, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+            _, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
             PromoCodeService.ban_access(user_id, redis_cursor)
             CaptchaService.del_captcha_attempts(user_id, RedisKeys.CAPTCHA_PROMOCODE, redis_cursor)
 
         elif message == "назад":
-            response, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+            response, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
 
         elif is_payload and payload.get("captcha_name") == extra_data.captcha_name:
 
-            promocode_data = PromoCodeService.get_promocode(extra_data.name, psql_cursor)
-            promocode_response, promocode_access = checking_activation_promocode(
+            promocode_data = await run_sync(PromoCodeService.get_promocode, extra_data.name, psql_cursor)
+            promocode_response, promocode_access = await run_sync(
+                checking_activation_promocode,
                 user_id, promocode_data, psql_cursor
             )
             
             # Перезагружаем user_data для активации промокода
-            user_data = get_user_data(user_id, psql_cursor)
+            user_data = await run_sync(get_user_data, user_id, psql_cursor)
             if user_data is None:
                 response = "Ошибка: не удалось загрузить данные пользователя"
-                _, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+                _, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
                 await send_message(user_id, response, keyboard, attachment)
                 return
 
@@ -214,11 +217,11 @@ async def handler_promocode_menu(
                     response = f"✅ Вы успешно активировали промокод {promocode_data.name} " \
                         f"и получили {format_number(promocode_data.reward)} WC"
 
-                    psql_connection.commit()
+                    await run_sync(psql_connection.commit)
 
                 except:
                     response = SOMETHING_WENT_WRONG
-                    psql_connection.rollback()
+                    await run_sync(psql_connection.rollback)
 
                 finally:
                     psql_connection.autocommit = True
@@ -226,7 +229,7 @@ async def handler_promocode_menu(
             else:
                 response = promocode_response
 
-            _, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+            _, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
             CaptchaService.del_captcha_attempts(user_id, RedisKeys.CAPTCHA_PROMOCODE, redis_cursor)
 
         else:
@@ -235,7 +238,7 @@ async def handler_promocode_menu(
             keyboard = CaptchaService.create_captcha_keyboard(captcha_name)
 
             extra_data.captcha_name = captcha_name
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
     elif extra_data.menu == PromoCodeMenu.SET_NAME:
 
@@ -244,7 +247,7 @@ async def handler_promocode_menu(
         banned_symbols = SecurityService.check_banned_symbols(promocode_name)
 
         if message == "назад":
-            response, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+            response, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
 
         elif len(banned_symbols) != 0:
             banned_symbols = ", ".join(banned_symbols)
@@ -257,22 +260,22 @@ async def handler_promocode_menu(
             max_len = format_number(PromoCodeSettings.MAX_LEN_NAME)
             response = f"❌ Максимальная длина названия промокода {max_len}"
 
-        elif PromoCodeService.get_promocode(promocode_name, psql_cursor) is not None:
+        elif await run_sync(PromoCodeService.get_promocode, promocode_name, psql_cursor) is not None:
             response = "Данное название уже занято"
 
         elif (
-            PromoCodeService.get_count_user_promocode(user_id, psql_cursor)
+            await run_sync(PromoCodeService.get_count_user_promocode, user_id, psql_cursor)
             >= PromoCodeSettings.MAX_COUNT_PROMOCODE
         ):
             response = "Вы достигли лимита создания промокодов"
-            _, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+            _, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
 
         else:
             response = "Введите время через которое промокод станет неактивным в минутах"
 
             extra_data.menu = PromoCodeMenu.SET_LIFE_DATE
             extra_data.name = promocode_name
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
     elif extra_data.menu == PromoCodeMenu.SET_LIFE_DATE:
 
@@ -284,7 +287,7 @@ async def handler_promocode_menu(
 
             extra_data.menu = PromoCodeMenu.SET_NAME
             extra_data.name = None
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         elif (
             life_date is None or
@@ -299,7 +302,7 @@ async def handler_promocode_menu(
 
             extra_data.menu = PromoCodeMenu.SET_QUANTITY
             extra_data.life_date = life_date
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
     elif extra_data.menu == PromoCodeMenu.SET_QUANTITY:
 
@@ -311,7 +314,7 @@ async def handler_promocode_menu(
 
             extra_data.menu = PromoCodeMenu.SET_LIFE_DATE
             extra_data.life_date = None
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         elif (
             quantity is None or
@@ -326,7 +329,7 @@ async def handler_promocode_menu(
 
             extra_data.menu = PromoCodeMenu.SET_AMOUNT
             extra_data.quantity = quantity
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
     elif extra_data.menu == PromoCodeMenu.SET_AMOUNT:
 
@@ -338,7 +341,7 @@ async def handler_promocode_menu(
 
             extra_data.menu = PromoCodeMenu.SET_QUANTITY
             extra_data.quantity = None
-            update_user_extra_data(user_id, extra_data, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, extra_data, psql_cursor)
 
         elif (
             reward is None or
@@ -351,7 +354,7 @@ async def handler_promocode_menu(
 
         else:
             # Перезагружаем user_data из БД чтобы получить актуальное значение all_win и coins
-            user_data = get_user_data(user_id, psql_cursor)
+            user_data = await run_sync(get_user_data, user_id, psql_cursor)
             if user_data is None:
                 response = "Ошибка: не удалось загрузить данные пользователя"
                 keyboard = back_keyboard
@@ -378,7 +381,7 @@ async def handler_promocode_menu(
                     👑 Промокод успешно создан\n
                     {PromoCodeService.format_promocode_message(promocode_data)}
                 """
-                _, keyboard = go_promocode_main_menu(user_id, psql_cursor)
+                _, keyboard = await run_sync(go_promocode_main_menu, user_id, psql_cursor)
 
     else:
         response = COMMAND_NOT_FOUND
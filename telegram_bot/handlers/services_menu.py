@@ -1,5 +1,6 @@
 from psycopg2.extras import DictCursor
 
+from databases.executor import run_sync
 from schemas.users import UserSchema, UserMenu
 from schemas.chats import ExtraMyChats
 from schemas.promocodes import ExtraPromoCode
@@ -30,7 +31,7 @@ async def handler_services_menu(
         response = BACK_MAIN_MENU
         reply_keyboard, _ = get_main_menu_keyboard(user_data)
         keyboard = reply_keyboard
-        update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
 
     elif message == "промокоды" and user_data.banned_promo is True:
         response = "Отказано в доступе"
@@ -40,23 +41,23 @@ async def handler_services_menu(
         response = "Сервис управления промокодами"
         keyboard = get_promocode_menu_keyboard()
 
-        update_user_menu(user_id, UserMenu.PROMOCODE, psql_cursor)
-        update_user_extra_data(user_id, ExtraPromoCode(), psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.PROMOCODE, psql_cursor)
+        await run_sync(update_user_extra_data, user_id, ExtraPromoCode(), psql_cursor)
 
     elif message == "кланы":
         response, keyboard = await ClanService.go_clan_menu(user_data, psql_cursor)
 
     elif message == "мои чаты":
         response = "Выберите чат для управления:"
-        keyboard = get_my_chats_keyboard(user_id, psql_cursor)
+        keyboard = await run_sync(get_my_chats_keyboard, user_id, psql_cursor)
 
-        update_user_menu(user_id, UserMenu.MY_CHATS, psql_cursor)
-        update_user_extra_data(user_id, ExtraMyChats(), psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.MY_CHATS, psql_cursor)
+        await run_sync(update_user_extra_data, user_id, ExtraMyChats(), psql_cursor)
 
     elif message == "статистика":
         response = "Здесь вы можете посмотреть статистику проекта White Coin"
         keyboard = get_statistics_menu_keyboard()
-        update_user_menu(user_id, UserMenu.STATISTICS, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.STATISTICS, psql_cursor)
 
     else:
         response = COMMAND_NOT_FOUND
@@ -1,6 +1,7 @@
 from psycopg2.extras import DictCursor
 
 from settings import ServicesCosts
+from databases.executor import run_sync
 from schemas.users import UserSchema, UserMenu
 from services.access_tokens import ApiAccessTokensService
 
@@ -31,7 +32,7 @@ async def handler_settings_menu(
         response = BACK_MAIN_MENU
         reply_keyboard, _ = get_main_menu_keyboard(user_data)
         keyboard = reply_keyboard
-        update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
 
     elif "показывать баланс" in message.lower() or message in ["✅ Показывать баланс", "❌ Показывать баланс"]:
 
@@ -41,7 +42,7 @@ async def handler_settings_menu(
             response = "Ваш баланс могут посмотреть все пользователи"
 
         user_data.show_balance = not user_data.show_balance
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             UPDATE users
             SET show_balance = %(flag)s
             WHERE user_id = %(user_id)s
@@ -58,7 +59,7 @@ async def handler_settings_menu(
             response = "✅ Вы подписались на рассылку"
 
         user_data.mailing = not user_data.mailing
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             UPDATE users
             SET mailing = %(flag)s
             WHERE user_id = %(user_id)s
@@ -68,13 +69,15 @@ async def handler_settings_menu(
         })
 
     elif "получить ключ api" in message.lower() or message == "Получить ключ api":
-        access_token = ApiAccessTokensService.get_or_create_access_token(
+        access_token = await run_sync(
+            ApiAccessTokensService.get_or_create_access_token,
             user_id=user_id, psql_cursor=psql_cursor
         )
         response = ApiAccessTokensService.format_message(access_token)
 
     elif "обновить ключ api" in message.lower() or message == "Обновить ключ api":
-        access_token = ApiAccessTokensService.update_user_access_token(
+        access_token = await run_sync(
+            ApiAccessTokensService.update_user_access_token,
             user_id=user_id, psql_cursor=psql_cursor
         )
         response = ApiAccessTokensService.format_message(access_token)
@@ -90,7 +93,7 @@ async def handler_settings_menu(
                 Стоимость: {format_services_cost} коинов
             """
             keyboard = back_keyboard
-            update_user_menu(user_id, UserMenu.CHANGE_USER_NAME, psql_cursor)
+            await run_sync(update_user_menu, user_id, UserMenu.CHANGE_USER_NAME, psql_cursor)
 
         else:
             response = f"""
@@ -106,7 +109,7 @@ async def handler_settings_menu(
             response = "Отображение тега клана перед ником включено"
 
         user_data.show_clan_tag = not user_data.show_clan_tag
-        psql_cursor.execute("""
+        await run_sync(psql_cursor.execute, """
             UPDATE users
             SET show_clan_tag = %(flag)s
             WHERE user_id = %(user_id)s
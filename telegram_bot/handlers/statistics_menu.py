@@ -1,5 +1,6 @@
 from psycopg2.extras import DictCursor
 
+from databases.executor import run_sync
 from schemas.users import UserMenu
 from services.statistics import StatisticsService
 
@@ -27,20 +28,20 @@ async def handler_statistics_menu(
         response = BACK_SERVICES_MENU
         from telegram_bot.keyboards.services_menu import get_services_menu_keyboard
         keyboard = get_services_menu_keyboard()
-        update_user_menu(user_id, UserMenu.SERVICES, psql_cursor)
+        await run_sync(update_user_menu, user_id, UserMenu.SERVICES, psql_cursor)
 
     elif (
         (is_payload and payload.get("event") == "get_bet_balance_message") or
         message in ["🔝 топ", "топ", "топ баланс"]
     ):
-        response = StatisticsService.get_bet_balance_message(psql_cursor)
+        response = await run_sync(StatisticsService.get_bet_balance_message, psql_cursor)
         keyboard = get_statistics_menu_keyboard()
 
     elif (
         (is_payload and payload.get("event") == "get_transfers_statistics_message") or
         message in ["♻ переводы", "переводы"]
     ):
-        response = StatisticsService.get_transfers_stats_message(psql_cursor)
+        response = await run_sync(StatisticsService.get_transfers_stats_message, psql_cursor)
         keyboard = get_statistics_menu_keyboard()
 
     else:
@@ -2,6 +2,7 @@ import json
 from psycopg2.extras import DictCursor
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
+from databases.executor import run_sync
 from schemas.users import UserSchema, UserMenu
 from schemas.transfer_coins import ExtraTransferCoins, MenuTransferCoins, \
     TransferCoinsError, get_transfer_coins_error_message
@@ -38,8 +39,8 @@ async def handler_transfer_coins_menu(
             reply_keyboard, _ = get_main_menu_keyboard(user_data)
             keyboard = reply_keyboard
 
-            update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
-            update_user_extra_data(user_id, None, psql_cursor)
+            await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, None, psql_cursor)
 
         else:
             # Разделяем сообщение на части (username может быть с суммой)
@@ -47,7 +48,7 @@ async def handler_transfer_coins_menu(
             recipient_link = message_parts[0] if message_parts else message
             
             recipient_id = await get_user_id(recipient_link)
-            recipient_data = get_user_data(recipient_id, psql_cursor)
+            recipient_data = await run_sync(get_user_data, recipient_id, psql_cursor)
 
             if recipient_id is None:
                 response = THIS_NOT_LINK
@@ -90,7 +91,7 @@ async def handler_transfer_coins_menu(
                 response = f"{extra_text}Для подтверждения перевода, введите количество"
                 keyboard = back_keyboard
 
-                update_user_extra_data(user_id, ExtraTransferCoins(
+                await run_sync(update_user_extra_data, user_id, ExtraTransferCoins(
                     menu=MenuTransferCoins.AMOUNT,
                     recipient_id=recipient_id,
                     recipient_name=recipient_data.full_name
@@ -100,14 +101,14 @@ async def handler_transfer_coins_menu(
 
         if message == "назад":
             response = "Введи @username или ID игрока"
-            update_user_extra_data(user_id, ExtraTransferCoins(), psql_cursor)
+            await run_sync(update_user_extra_data, user_id, ExtraTransferCoins(), psql_cursor)
 
         elif message == "меню":
             response = BACK_MAIN_MENU
             reply_keyboard, _ = get_main_menu_keyboard(user_data)
             keyboard = reply_keyboard
-            update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
-            update_user_extra_data(user_id, None, psql_cursor)
+            await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
+            await run_sync(update_user_extra_data, user_id, None, psql_cursor)
 
         else:
             amount = convert_number(message)
@@ -116,21 +117,23 @@ async def handler_transfer_coins_menu(
                 recipient_id = extra_data.recipient_id
                 recipient_name = extra_data.recipient_name
 
-                possibility_translation = TransferCoinsService.check_possibility(
+                possibility_translation = await run_sync(
+                    TransferCoinsService.check_possibility,
                     sender_id=user_id, recipient_id=recipient_id,
                     amount=amount, psql_cursor=psql_cursor
                 )
 
                 if possibility_translation.access is True:
-                    TransferCoinsService.send_coins(
+                    await run_sync(
+                        TransferCoinsService.send_coins,
                         sender_id=user_id, recipient_id=recipient_id,
                         amount=amount, psql_cursor=psql_cursor
                     )
                     response = f"✅ {recipient_name} получил {format_number(amount)} WC"
                     reply_keyboard, _ = get_main_menu_keyboard(user_data)
                     keyboard = reply_keyboard
-                    update_user_menu(user_id, UserMenu.MAIN, psql_cursor)
-                    update_user_extra_data(user_id, None, psql_cursor)
+                    await run_sync(update_user_menu, user_id, UserMenu.MAIN, psql_cursor)
+                    await run_sync(update_user_extra_data, user_id, None, psql_cursor)
 
                 else:
                     response = get_transfer_coins_error_message(
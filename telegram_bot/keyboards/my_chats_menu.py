@@ -12,15 +12,18 @@ from telegram_bot.keyboards.pages import add_back_page, add_next_page
 def get_my_chats_keyboard(
         owner_id: int,
         psql_cursor: DictCursor,
-        offset: int = 0,
-        limit: int = 6
+        limit: int = 6,
+        *,
+        after: int | None = None,
+        before: int | None = None
 ) -> InlineKeyboardMarkup:
     """Возвращает клавиатуру с выбором чата в меню мои чаты"""
 
     MAX_ROW = 3
 
-    my_chats = ChatsService.get_my_chats(owner_id, psql_cursor, offset, limit)
-    count_my_chats = len(my_chats)
+    my_chats, back_page, next_page = ChatsService.get_my_chats_page(
+        owner_id, psql_cursor, limit, after=after, before=before
+    )
 
     buttons = []
 
@@ -40,10 +43,12 @@ def get_my_chats_keyboard(
         ))
 
     # Добавляем навигацию по страницам
-    total_chats = ChatsService.get_count_my_chats(owner_id, psql_cursor)
-    if total_chats > limit:
-        buttons = add_back_page(buttons, offset, limit, total_chats, "my_chats")
-        buttons = add_next_page(buttons, offset, limit, total_chats, "my_chats")
+    if my_chats and back_page:
+        buttons = add_back_page(buttons, event="get_my_chats_message", before=my_chats[0].chat_id)
+    if my_chats and next_page:
+        buttons = add_next_page(
+            buttons, event="get_my_chats_message", after=my_chats[-1].chat_id, same_row=back_page
+        )
 
     buttons.append([InlineKeyboardButton(
         text="Назад",
@@ -2,50 +2,43 @@ import json
 from telegram import InlineKeyboardButton
 
 
+def _get_page_button(text: str, payload: dict) -> InlineKeyboardButton:
+    """Возвращает кнопку страницы, callback_data без пробелов (лимит telegram 64 байта)"""
+
+    return InlineKeyboardButton(
+        text=text,
+        callback_data=json.dumps(payload, separators=(",", ":"))
+    )
+
+
 def add_back_page(
         buttons: list,
-        offset: int,
-        limit: int,
-        count_items: int,
-        event_prefix: str
+        *,
+        event: str,
+        before: int
 ) -> list:
-    """Добавляет кнопку назад для пагинации"""
-
-    if offset > 0:
-        new_offset = max(0, offset - limit)
-        if not buttons or len(buttons[-1]) > 0:
-            buttons.append([])
-        buttons[-1].append(InlineKeyboardButton(
-            text="◀ Назад",
-            callback_data=json.dumps({
-                "event": f"{event_prefix}_page",
-                "offset": new_offset
-            })
-        ))
+    """Добавляет кнопку назад keyset пагинации (см. modules/pagination.py)"""
+
+    if not buttons or len(buttons[-1]) > 0:
+        buttons.append([])
+
+    buttons[-1].append(_get_page_button("◀ Назад", {"event": event, "before": before}))
 
     return buttons
 
 
 def add_next_page(
         buttons: list,
-        offset: int,
-        limit: int,
-        count_items: int,
-        event_prefix: str
+        *,
+        event: str,
+        after: int,
+        same_row: bool = False
 ) -> list:
-    """Добавляет кнопку вперед для пагинации"""
-
-    if count_items >= limit:
-        new_offset = offset + limit
-        if not buttons or len(buttons[-1]) > 0:
-            buttons.append([])
-        buttons[-1].append(InlineKeyboardButton(
-            text="Вперед ▶",
-            callback_data=json.dumps({
-                "event": f"{event_prefix}_page",
-                "offset": new_offset
-            })
-        ))
+    """Добавляет кнопку вперед keyset пагинации, same_row - в строку с кнопкой назад"""
 
-    return buttons
+    if not same_row or not buttons:
+        buttons.append([])
 
+    buttons[-1].append(_get_page_button("Вперед ▶", {"event": event, "after": after}))
+
+    return buttons
@@ -1,5 +1,6 @@
 from psycopg2.extras import DictCursor
 
+from databases.executor import run_sync
 from games.base import BaseGameModel
 from schemas.users import UserSchema
 from schemas.chats import ChatSchema, ChatHelperStatus
@@ -100,7 +101,7 @@ async def handler_add_helper(
     if helper_id is None:
         return "❌ Пользователь не найден"
 
-    ChatsService.add_helper(chat_data.chat_id, helper_id, ChatHelperStatus.BASE, psql_cursor)
+    await run_sync(ChatsService.add_helper, chat_data.chat_id, helper_id, ChatHelperStatus.BASE, psql_cursor)
     return f"✅ Помощник добавлен"
 
 
@@ -116,7 +117,7 @@ async def handler_del_helper(
     if helper_id is None:
         return "❌ Пользователь не найден"
 
-    ChatsService.del_helper(chat_data.chat_id, helper_id, psql_cursor)
+    await run_sync(ChatsService.del_helper, chat_data.chat_id, helper_id, psql_cursor)
     return f"✅ Помощник удален"
 
 
@@ -145,7 +146,7 @@ async def handler_change_chat_owner(
     if new_owner_id is None:
         return "❌ Пользователь не найден"
 
-    ChatsService.update_owner_id(chat_data.chat_id, new_owner_id, psql_cursor)
+    await run_sync(ChatsService.update_owner_id, chat_data.chat_id, new_owner_id, psql_cursor)
     return f"✅ Владелец чата изменен"
 
 
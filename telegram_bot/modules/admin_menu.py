@@ -9,6 +9,7 @@ import json
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
 from settings import Config
+from databases.executor import run_sync
 
 from tops.day_top import DayTopService, DayTop
 from tops.week_top import WeekTopService, WeekTop
@@ -189,7 +190,7 @@ class AdminPanel:
         if user_id is None:
             raise UserIdNotFound(f"❌ Не удалось получить user_id из {user}")
 
-        user_data = get_user_data(user_id, psql_cursor)
+        user_data = await run_sync(get_user_data, user_id, psql_cursor)
         if user_data is None:
             raise UserDataNotFound(f"❌ {UserSchema.format_telegram_name(user_id, 'Пользователь')} не зарегистрирован")
 
@@ -205,7 +206,7 @@ class AdminPanel:
         """Возвращает данные пользователей для админ панели"""
 
         user_ids = [await get_user_id(x) for x in users]
-        users_data = [i for i in [get_user_data(x, psql_cursor) for x in user_ids] if i is not None]
+        users_data = [i for i in [await run_sync(get_user_data, x, psql_cursor) for x in user_ids] if i is not None]
 
         if len(users_data) == 0:
             raise UsersDataNotFound(f"❌ Не удалось найти ни одного зарегистрированного пользователя")
@@ -5,7 +5,8 @@ from telegram import Update
 from telegram.constants import ChatType
 
 from databases.redis import get_redis_cursor
-from databases.postgresql import get_postgresql_connection
+from databases.executor import run_sync
+from databases.postgresql import get_postgresql_pool
 
 from schemas.users import UserStatus, UserMenu
 from schemas.clans import ClanRole
@@ -18,8 +19,9 @@ from services.security import SecurityService
 
 from modules.additional import strtobool
 from modules.registration import first_greeting
-from modules.databases.users import get_user_data, update_users_last_activity
-from modules.databases.chats import get_chat_data
+from modules.databases.users import async_get_user_data, async_update_users_last_activity
+from modules.databases.chats import async_get_chat_data
+from modules.telegram.users import sync_user_profile
 
 from telegram_bot.handlers.main_menu import handler_main_menu
 from telegram_bot.handlers.admin_menu import handler_admin_menu
@@ -119,23 +121,21 @@ async def handler_messages(update: Update):
         return
 
     redis_cursor = get_redis_cursor()
-    psql_connection, psql_cursor = get_postgresql_connection()
+    psql_pool = get_postgresql_pool()
+    psql_connection, psql_cursor = await psql_pool.acquire_async()
     
     # Логирование для отладки
     print(f"[DEBUG] Processing: user_id={user_id}, chat_id={chat_id}, message='{message[:50]}', payload={payload}", flush=True)
 
     try:
-        user_data = get_user_data(user_id, psql_cursor)
+        user_data = await async_get_user_data(user_id, psql_cursor)
         if user_data is None:
             await first_greeting(user_id, psql_cursor, redis_cursor)
             return
         
-        # Обновляем данные пользователя из Telegram (имя и username) перед каждым ответом
+        # Обновляем имя и username из update.effective_user (не чаще раза в PROFILE_SYNC_TTL)
         try:
-            from modules.telegram.users import sync_user_data
-            await sync_user_data(user_id)
-            # Перезагружаем user_data с обновленными данными
-            user_data = get_user_data(user_id, psql_cursor)
+            user_data = await sync_user_profile(user_data, update.effective_user, psql_cursor, redis_cursor)
         except Exception as e:
             # Если не удалось обновить данные, продолжаем работу
             print(f"[DEBUG] Failed to sync user data: {e}", flush=True)
@@ -310,7 +310,7 @@ async def handler_messages(update: Update):
             # или преобразовать в отрицательный формат как в VK (но это не обязательно)
             chat_id_for_db = chat_id  # Используем как есть
             
-            chat_data = get_chat_data(chat_id_for_db, psql_cursor)
+            chat_data = await async_get_chat_data(chat_id_for_db, psql_cursor)
             
             print(f"[DEBUG] Chat: is_activated={chat_data.is_activated if chat_data else None}", flush=True)
 
@@ -331,7 +331,7 @@ async def handler_messages(update: Update):
 
             else:
                 print(f"[DEBUG] Calling handler_active_chat", flush=True)
-                user_chat_data = UserChatService.get_data(user_id, chat_id_for_db, psql_cursor)
+                user_chat_data = await run_sync(UserChatService.get_data, user_id, chat_id_for_db, psql_cursor)
                 try:
                     await handler_active_chat(
                         user_id=user_id, user_data=user_data,
@@ -349,9 +349,8 @@ async def handler_messages(update: Update):
                     traceback.print_exc()
 
     finally:
-        update_users_last_activity(user_id, psql_cursor)
+        await async_update_users_last_activity(user_id, psql_cursor)
 
-        psql_cursor.close()
-        psql_connection.close()
+        psql_pool.release(psql_connection, psql_cursor)
         redis_cursor.close()
 
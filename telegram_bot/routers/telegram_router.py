@@ -1,6 +1,7 @@
 from telegram import Update
 
 from telegram_bot.routers.handler_messages import handler_messages
+from telegram_bot.handlers.channel_member import handler_channel_member
 
 
 async def bot_event_router(update: Update, from_polling: bool = False):
@@ -12,6 +13,8 @@ async def bot_event_router(update: Update, from_polling: bool = False):
             await handler_messages(update)
         elif update.callback_query:
             await handler_messages(update)
+        elif update.chat_member:
+            await handler_channel_member(update)
         print(f"[ROUTER] handler_messages completed", flush=True)
     except Exception as e:
         print(f"[ROUTER ERROR] {e}", flush=True)
@@ -1,9 +1,23 @@
+import asyncio
+import traceback
 from abc import ABC, abstractmethod
 
 from redis.client import Redis
+from redis.exceptions import RedisError
 from psycopg2.extras import DictCursor
 
+from settings import Config, NotifyChats
 from schemas.users import UserSchema, UserStatus
+from schemas.periods import COUNTER_PERIODS
+from schemas.tops import TopRewardsSchema
+from services.periods import PeriodsService
+from services.incomes import IncomesService
+from services.notification import NotificationsService
+from modules.databases.users import reward_users_tops
+from databases.executor import run_sync
+from modules.vkontakte.bot import send_message
+from tops.leaderboard import Leaderboard, get_leaderboard_redis, record_game_points
+from tops.page_cache import get_cached_page, invalidate_pages
 
 
 """
@@ -16,6 +30,11 @@ from schemas.users import UserSchema, UserStatus
     При добавлении нового атрибута нужно описать его в BaseTop
 
     При написания сервиса для топа нужно наследовать его от BaseTopService
+    Топы игроков по полю из users наследуются от BaseUserTopService и указывают LEADERBOARD
+
+    Награды топа считает get_rewards, а выдает reward_tops: награды всех топов дня
+    начисляются одним UPDATE в одной транзакции вместе со сбросом очков,
+    расходы записываются одной командой в redis, сообщения отправляются после транзакции
 """
 
 
@@ -35,6 +54,8 @@ class BaseTopService(ABC):
     IGNORE_CHATS_IDS = (0, )  # Идентификаторы чатов которые не принимают участие в топе
     IGNORE_CLANS_IDS = (0, )  # Идентификаторы кланов которые не принимают участие в топе
 
+    RESET_AFTER_REWARD = True  # Сбрасывать ли очки топа после выдачи наград
+
 
     @classmethod
     @abstractmethod
@@ -69,6 +90,24 @@ class BaseTopService(ABC):
         ...
 
 
+    @classmethod
+    @abstractmethod
+    def format_page(cls, psql_cursor: DictCursor, offset: int, limit: int) -> str:
+        """Возвращает строки участников страницы топа, одинаковые для всех игроков"""
+        ...
+
+
+    @classmethod
+    def get_page(cls, psql_cursor: DictCursor, offset: int, limit: int) -> str:
+        """Возвращает строки участников страницы топа из кэша (см. tops/page_cache.py)"""
+        # Строку с местом игрока get_message добавляет отдельно
+
+        return get_cached_page(
+            cls.__name__, offset, limit,
+            lambda: cls.format_page(psql_cursor, offset, limit)
+        )
+
+
     @classmethod
     @abstractmethod
     def get_message(cls, data, psql_cursor: DictCursor, offset: int, limit: int) -> tuple[str, str | None]:
@@ -85,9 +124,23 @@ class BaseTopService(ABC):
 
     @classmethod
     @abstractmethod
+    def get_rewards(cls, psql_cursor: DictCursor) -> TopRewardsSchema | None:
+        """Возвращает награды победителей топа, None если топ выключен"""
+        ...
+
+
+    @classmethod
     async def reward_winners(cls, redis_cursor: Redis, psql_cursor: DictCursor) -> None:
         """Награждает победителей топа"""
-        ...
+
+        await reward_tops([cls], redis_cursor, psql_cursor)
+
+
+    @classmethod
+    def invalidate_leaderboard(cls) -> None:
+        """Сбрасывает рейтинг топа в redis после ручного изменения очков"""
+
+        invalidate_pages()
 
 
     @classmethod
@@ -99,3 +152,290 @@ class BaseTopService(ABC):
             reward is not None and
             reward.get(position) is not None
         )
+
+
+
+class BaseUserTopService(BaseTopService):
+    """
+        Топ игроков по очкам из таблицы users
+
+        Страницы и места берутся из рейтинга в redis (tops/leaderboard.py),
+        если redis недоступен или рейтинг собирается - из postgresql
+    """
+
+    LEADERBOARD: Leaderboard  # Рейтинг топа, LEADERBOARD.column - поле с очками в users
+
+
+    @classmethod
+    def _is_ignored(cls, data: UserSchema) -> bool:
+        """Проверяет что игрок не участвует в топе"""
+
+        status = getattr(data.status, "value", data.status)
+        return status in cls.IGNORE_STATUS or data.user_id in cls.IGNORE_USER_IDS
+
+
+    @classmethod
+    def _get_ready_leaderboard(cls, psql_cursor: DictCursor) -> Redis | None:
+        """Возвращает подключение к redis если рейтинг собран"""
+
+        redis_cursor = get_leaderboard_redis()
+
+        try:
+            if cls.LEADERBOARD.is_ready(redis_cursor):
+                return redis_cursor
+
+            if cls.LEADERBOARD.rebuild(redis_cursor, psql_cursor, cls.IGNORE_STATUS, cls.IGNORE_USER_IDS):
+                return redis_cursor
+
+        except RedisError as error:
+            print(f"[LEADERBOARD WARNING] {cls.LEADERBOARD.name}: {error}", flush=True)
+
+        return None
+
+
+    @classmethod
+    def _select_winners(cls, psql_cursor: DictCursor, offset: int, limit: int) -> list[dict | None]:
+        """Возвращает победителей из postgresql"""
+
+        points = PeriodsService.counter(cls.LEADERBOARD.column)
+
+        psql_cursor.execute(f"""
+            SELECT user_id, status, full_name,
+                   COALESCE({points}, 0) as points
+            FROM users
+            WHERE status NOT IN %(ignore_status)s AND
+                  user_id NOT IN %(ignore_user_ids)s
+            ORDER BY points DESC, user_id DESC
+            OFFSET %(offset)s
+            LIMIT %(limit)s
+        """, {
+            "ignore_status": cls.IGNORE_STATUS,
+            "ignore_user_ids": cls.IGNORE_USER_IDS,
+            "offset": offset,
+            "limit": limit
+        })
+
+        return psql_cursor.fetchall()
+
+
+    @classmethod
+    def _get_leaderboard_winners(
+            cls,
+            redis_cursor: Redis,
+            psql_cursor: DictCursor,
+            offset: int,
+            limit: int
+    ) -> list[dict | None]:
+        """Возвращает победителей из рейтинга, имена и статусы берутся из postgresql"""
+
+        page = cls.LEADERBOARD.get_page(redis_cursor, offset, limit)
+        if not page:
+            return []
+
+        psql_cursor.execute("""
+            SELECT user_id, status, full_name
+            FROM users
+            WHERE user_id = ANY(%(user_ids)s)
+        """, {
+            "user_ids": [user_id for user_id, _ in page]
+        })
+        users = {user["user_id"]: user for user in psql_cursor.fetchall()}
+
+        return [
+            {**users[user_id], "points": points}
+            for user_id, points in page
+            if user_id in users
+        ]
+
+
+    @classmethod
+    def get_winners(
+            cls,
+            psql_cursor: DictCursor,
+            offset: int,
+            limit: int,
+            leaderboard: bool = True
+    ) -> list[dict | None]:
+        # leaderboard=False читает postgresql напрямую (выдача наград)
+
+        redis_cursor = cls._get_ready_leaderboard(psql_cursor) if leaderboard else None
+
+        if redis_cursor is not None:
+            try:
+                return cls._get_user_prefix(cls._get_leaderboard_winners(redis_cursor, psql_cursor, offset, limit))
+            except RedisError as error:
+                print(f"[LEADERBOARD WARNING] {cls.LEADERBOARD.name}: {error}", flush=True)
+
+        return cls._get_user_prefix(cls._select_winners(psql_cursor, offset, limit))
+
+
+    @classmethod
+    def get_position(cls, data: UserSchema, psql_cursor: DictCursor) -> int:
+
+        if cls._is_ignored(data):
+            return 0
+
+        redis_cursor = cls._get_ready_leaderboard(psql_cursor)
+
+        if redis_cursor is not None:
+            try:
+                return cls.LEADERBOARD.get_position(redis_cursor, data.user_id)
+            except RedisError as error:
+                print(f"[LEADERBOARD WARNING] {cls.LEADERBOARD.name}: {error}", flush=True)
+
+        column = cls.LEADERBOARD.column
+
+        psql_cursor.execute(f"""
+            SELECT COUNT(user_id) + 1 as position
+            FROM users
+            WHERE {PeriodsService.is_actual(column)} AND
+                  {column} > %(points)s AND
+                  status NOT IN %(ignore_status)s AND
+                  user_id NOT IN %(ignore_user_ids)s
+        """, {
+            "points": getattr(data, column) or 0,
+            "ignore_status": cls.IGNORE_STATUS,
+            "ignore_user_ids": cls.IGNORE_USER_IDS
+        })
+        position = psql_cursor.fetchone()["position"]
+
+        return position
+
+
+    @classmethod
+    def reset_points(cls, psql_cursor: DictCursor) -> None:
+        """Сбрасывает очки топа началом нового периода (см. services/periods.py)"""
+
+        PeriodsService.start_new_period(COUNTER_PERIODS[cls.LEADERBOARD.column], psql_cursor)
+        cls.invalidate_leaderboard()
+
+
+    @classmethod
+    def invalidate_leaderboard(cls) -> None:
+        """Сбрасывает рейтинг в redis после ручного изменения очков"""
+
+        try:
+            cls.LEADERBOARD.invalidate(get_leaderboard_redis())
+        except RedisError as error:
+            print(f"[LEADERBOARD WARNING] {cls.LEADERBOARD.name}: {error}", flush=True)
+
+        invalidate_pages()
+
+
+    @classmethod
+    def record_game_points(cls, rows: list[dict]) -> None:
+        """Добавляет очки рассчитанной игры в рейтинги топов игроков и сбрасывает страницы топов"""
+        # rows - [{"user_id", "status", "top_points", "period_top_points", "coins_top_points"}]
+
+        record_game_points([
+            row for row in rows
+            if getattr(row["status"], "value", row["status"]) not in cls.IGNORE_STATUS and
+            row["user_id"] not in cls.IGNORE_USER_IDS
+        ])
+        invalidate_pages()
+
+
+async def _report_reward_error(name: str, details: str = "") -> None:
+    """Сообщает разработчику об ошибке выдачи наград топов"""
+
+    traceback.print_exc()
+    await send_message(
+        peer_id=Config.DEVELOPER_ID,
+        message=f"⚠️ Упали награды топа {name}:\n\n{traceback.format_exc()}\n\n{details}"
+    )
+
+
+def _reset_tops_points(tops: list[type[BaseTopService]], psql_cursor: DictCursor) -> None:
+    """Сбрасывает очки топов, которые сбрасываются после выдачи наград"""
+
+    for top in tops:
+        if top.RESET_AFTER_REWARD:
+            top.reset_points(psql_cursor)
+
+
+def _write_tops_rewards(
+        tops: list[type[BaseTopService]],
+        users_rewards: dict[int, tuple[int, int, int]],
+        psql_cursor: DictCursor
+) -> None:
+    """Выдает награды топов и сбрасывает их очки одной транзакцией"""
+    # users_rewards - user_id -> (coins, rubles, top_profit)
+
+    psql_connection = psql_cursor.connection
+    psql_connection.autocommit = False
+
+    try:
+        reward_users_tops(
+            [(user_id, *user_rewards) for user_id, user_rewards in users_rewards.items()],
+            psql_cursor
+        )
+        _reset_tops_points(tops, psql_cursor)
+        psql_connection.commit()
+
+    except:
+        psql_connection.rollback()
+        raise
+
+    finally:
+        psql_connection.autocommit = True
+
+
+async def reward_tops(
+        tops: list[type[BaseTopService]],
+        redis_cursor: Redis,
+        psql_cursor: DictCursor
+) -> None:
+    """Награждает победителей нескольких топов одной транзакцией"""
+
+    tops_rewards = []
+
+    for top in tops:
+        try:
+            top_rewards = await run_sync(top.get_rewards, psql_cursor)
+        except:
+            await _report_reward_error(top.__name__)
+            continue
+
+        if top_rewards is not None:
+            tops_rewards.append(top_rewards)
+
+    rewards = [reward for top_rewards in tops_rewards for reward in top_rewards.rewards]
+
+    # Один пользователь может выиграть в нескольких топах, UPDATE ... FROM VALUES обновит строку один раз
+    users_rewards = {}
+    for reward in rewards:
+        coins, rubles, top_profit = users_rewards.get(reward.user_id, (0, 0, 0))
+        users_rewards[reward.user_id] = (
+            coins + reward.coins, rubles + reward.rubles, top_profit + reward.top_profit
+        )
+
+    try:
+        await run_sync(_write_tops_rewards, tops, users_rewards, psql_cursor)
+
+    except:
+        await _report_reward_error(
+            ", ".join(top.__name__ for top in tops),
+            "\n".join(f"{user_id}: {user_rewards}" for user_id, user_rewards in users_rewards.items())
+        )
+
+        # Как и раньше, очки сбрасываются даже если награды не выданы
+        await run_sync(_reset_tops_points, tops, psql_cursor)
+        return
+
+    # Рейтинги сбрасываются после commit, иначе их могут собрать со старыми очками
+    for top in tops:
+        top.invalidate_leaderboard()
+
+    expenses = sum(reward.top_profit for reward in rewards)
+    if expenses:
+        IncomesService.records_additional_expenses(expenses, redis_cursor)
+
+    await asyncio.gather(*[
+        send_message(peer_id=reward.user_id, message=reward.message, keyboard=reward.keyboard)
+        for reward in rewards
+        if reward.message is not None
+    ], return_exceptions=True)
+
+    for top_rewards in tops_rewards:
+        if top_rewards.admin_message is not None:
+            await NotificationsService.send_notification(NotifyChats.TOP_REWARD, top_rewards.admin_message)
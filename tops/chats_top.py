@@ -1,22 +1,17 @@
-import asyncio
-import traceback
 from datetime import datetime
 
-from redis.client import Redis
 from vk_api.keyboard import VkKeyboard
 from psycopg2.extras import DictCursor
 
-from settings import TopSettings, NotifyChats, Config
+from settings import TopSettings
 
 from tops.base import BaseTop, BaseTopService
 from schemas.users import UserSchema
+from schemas.tops import TopRewardSchema, TopRewardsSchema
 from schemas.chats import ChatSchema
-from services.incomes import IncomesService
-from services.notification import NotificationsService
+from schemas.rates import ChatRatesVolumeSchema
 
 from modules.additional import format_number, reduce_number
-from modules.databases.users import reward_user_top
-from modules.vkontakte.bot import send_message
 
 
 class ChatsTop(BaseTop):
@@ -36,11 +31,12 @@ class ChatsTopService(BaseTopService):
     @staticmethod
     def _get_sql_timestamp(form_reward_winners: bool) -> str:
         """возвращает условие временной метки sql"""
+        # Суммы ставок берутся из chat_rates_volume (см. raise_database.add_chat_rates_volume)
 
         if form_reward_winners:
             return """
-                WHERE DATE(rates.created_at) >= DATE(NOW() - INTERVAL '7 days') AND
-                      DATE(rates.created_at) <= DATE(NOW() - INTERVAL '1 days')
+                WHERE volume.day >= DATE(NOW() - INTERVAL '7 days') AND
+                      volume.day <= DATE(NOW() - INTERVAL '1 days')
             """
 
         current_weekday = datetime.today().weekday()
@@ -56,8 +52,8 @@ class ChatsTopService(BaseTopService):
         days_until_friday = max(0, min(days_until_friday, 365))  # Ограничиваем до года
         
         return f"""
-            WHERE DATE(rates.created_at) >= DATE(NOW() - INTERVAL '{days_since_last_saturday} DAY') AND
-                  DATE(rates.created_at) <= DATE(NOW() + INTERVAL '{days_until_friday} DAY')
+            WHERE volume.day >= DATE(NOW() - INTERVAL '{days_since_last_saturday} DAY') AND
+                  volume.day <= DATE(NOW() + INTERVAL '{days_until_friday} DAY')
         """
 
 
@@ -73,11 +69,11 @@ class ChatsTopService(BaseTopService):
 
         psql_cursor.execute(f"""
             SELECT chats.chat_id, chats.owner_id, chats.name,
-                   COALESCE(SUM(rates.amount), 0) as points
+                   COALESCE(SUM(volume.volume), 0) as points
             FROM chats
-            JOIN rates ON chats.chat_id = rates.chat_id
+            JOIN {ChatRatesVolumeSchema.__tablename__} AS volume ON chats.chat_id = volume.chat_id
             JOIN users AS users_c ON chats.owner_id = users_c.user_id
-            JOIN users AS users_r ON rates.user_id = users_r.user_id
+            JOIN users AS users_r ON volume.user_id = users_r.user_id
             {cls._get_sql_timestamp(form_reward_winners)} AND
                   users_c.status NOT IN %(ignore_status)s AND
                   users_r.status NOT IN %(ignore_status)s AND
@@ -111,15 +107,15 @@ class ChatsTopService(BaseTopService):
         """возвращает сумму банка который будет разыгрываться"""
 
         psql_cursor.execute(f"""
-            SELECT COALESCE(SUM(rates.amount) / 100 * 0.3, 0) as top_bank
+            SELECT COALESCE(SUM(volume.volume) / 100 * 0.3, 0) as top_bank
             FROM chats
-            JOIN rates ON chats.chat_id = rates.chat_id
+            JOIN {ChatRatesVolumeSchema.__tablename__} AS volume ON chats.chat_id = volume.chat_id
             JOIN users AS users_c ON chats.owner_id = users_c.user_id
-            JOIN users AS users_r ON rates.user_id = users_r.user_id
+            JOIN users AS users_r ON volume.user_id = users_r.user_id
             {cls._get_sql_timestamp(form_reward_winners)} AND
                   users_c.status NOT IN %(ignore_status)s AND
                   users_r.status NOT IN %(ignore_status)s AND
-                  rates.user_id NOT IN %(ignore_user_ids)s AND
+                  volume.user_id NOT IN %(ignore_user_ids)s AND
                   chats.chat_id NOT IN %(ignore_chats_ids)s
         """, {
             "ignore_status": cls.IGNORE_STATUS,
@@ -165,23 +161,12 @@ class ChatsTopService(BaseTopService):
 
 
     @classmethod
-    def get_message(
-            cls,
-            data: ChatSchema,
-            psql_cursor: DictCursor,
-            offset: int = 0,
-            limit: int = ChatsTop.MAPPING
-    ) -> tuple[str, str | None]:
-
-        if TopSettings.SWITCH_CHATS_TOP is False:
-            return "Топ временно не работает", None
+    def format_page(cls, psql_cursor: DictCursor, offset: int, limit: int) -> str:
 
         reward = ChatsTop.REWARDS
         winners = cls.get_winners(psql_cursor, offset, limit)
         top_bank = cls.get_bank(psql_cursor)
-
-        response = "🎁 Топ чатов\n"
-        keyboard = VkKeyboard(one_time=False, inline=True)
+        response = ""
 
         for position, winner in enumerate(winners, offset + 1):
             chat_id = winner["chat_id"]
@@ -195,76 +180,71 @@ class ChatsTopService(BaseTopService):
             if cls.can_get_reward(winner_points, reward, position):
                 response += f" (приз {reduce_number(int(top_bank * reward[position]))} WC)"
 
-        response += f"\n\nТекущий чат находится на {cls.get_position(data, psql_cursor)} месте"
-
-
-        return response, keyboard.get_keyboard()
-
-
-    @classmethod
-    def reset_points(cls, psql_cursor: DictCursor) -> None:
-        pass
+        return response
 
 
     @classmethod
-    async def reward_winners(
+    def get_message(
             cls,
-            redis_cursor: Redis,
-            psql_cursor: DictCursor
-    ) -> None:
-
-        try:
-            if TopSettings.SWITCH_CHATS_TOP is False:
-                return None
-
-            reward = ChatsTop.REWARDS
-            winners = cls.get_winners(psql_cursor, 0, max(reward.keys()), form_reward_winners=True)
-            top_bank = cls.get_bank(psql_cursor, form_reward_winners=True)
+            data: ChatSchema,
+            psql_cursor: DictCursor,
+            offset: int = 0,
+            limit: int = ChatsTop.MAPPING
+    ) -> tuple[str, str | None]:
 
-            tasks = []
-            admin_message = f"Банк топа {format_number(top_bank)}\n🏆 Победители топа чатов:\n"
+        if TopSettings.SWITCH_CHATS_TOP is False:
+            return "Топ временно не работает", None
 
-            for position, winner in enumerate(winners, 1):
-                chat_id = winner["chat_id"]
-                owner_id = winner["owner_id"]
-                chat_name = winner["name"]
+        response = "🎁 Топ чатов\n"
+        keyboard = VkKeyboard(one_time=False, inline=True)
 
-                winner_name = UserSchema.format_vk_name(owner_id, chat_name if chat_name else int(chat_id - 2E9))
-                winner_points = winner["points"]
+        response += cls.get_page(psql_cursor, offset, limit)
 
-                if cls.can_get_reward(winner_points, reward, position):
-                    owner_reward = int(top_bank * reward[position])
+        response += f"\n\nТекущий чат находится на {cls.get_position(data, psql_cursor)} месте"
 
-                    reward_user_top(owner_id, owner_reward, psql_cursor)
-                    IncomesService.records_additional_expenses(owner_reward, redis_cursor)
 
-                    winner_points = format_number(winner_points)
-                    owner_reward = format_number(owner_reward)
+        return response, keyboard.get_keyboard()
 
-                    tasks.append(send_message(
-                        peer_id=owner_id,
-                        message=f"""
-                            🏆 Твой чат {winner_name} занял {position} место в топе чатов
-                            🚀 {owner_reward} WC уже на твоем балансе
-                        """
-                    ))
-                    admin_message += f"\n{position}) {winner_name} - наиграл {winner_points} выиграл {owner_reward}"
 
-            await asyncio.gather(*tasks)
-            await NotificationsService.send_notification(NotifyChats.TOP_REWARD, admin_message)
+    @classmethod
+    def reset_points(cls, psql_cursor: DictCursor) -> None:
+        pass
 
-        except:
-            await send_message(
-                peer_id=Config.DEVELOPER_ID,
-                message=f"⚠️ Упал топ чатов:\n\n{traceback.format_exc()}\n\n{winners}"
-            )
-            traceback.print_exc()
 
-        finally:
-            cls.reset_points(psql_cursor)
+    @classmethod
+    def get_rewards(cls, psql_cursor: DictCursor) -> TopRewardsSchema | None:
 
+        if TopSettings.SWITCH_CHATS_TOP is False:
+            return None
 
+        reward = ChatsTop.REWARDS
+        winners = cls.get_winners(psql_cursor, 0, max(reward.keys()), form_reward_winners=True)
+        top_bank = cls.get_bank(psql_cursor, form_reward_winners=True)
 
+        rewards = []
+        admin_message = f"Банк топа {format_number(top_bank)}\n🏆 Победители топа чатов:\n"
 
+        for position, winner in enumerate(winners, 1):
+            chat_id = winner["chat_id"]
+            owner_id = winner["owner_id"]
+            chat_name = winner["name"]
 
+            winner_name = UserSchema.format_vk_name(owner_id, chat_name if chat_name else int(chat_id - 2E9))
+            winner_points = winner["points"]
 
+            if cls.can_get_reward(winner_points, reward, position):
+                owner_reward = int(top_bank * reward[position])
+
+                rewards.append(TopRewardSchema(
+                    user_id=owner_id,
+                    coins=owner_reward,
+                    top_profit=owner_reward,
+                    message=f"""
+                        🏆 Твой чат {winner_name} занял {position} место в топе чатов
+                        🚀 {format_number(owner_reward)} WC уже на твоем балансе
+                    """
+                ))
+                admin_message += f"\n{position}) {winner_name} - наиграл {format_number(winner_points)} " \
+                                 f"выиграл {format_number(owner_reward)}"
+
+        return TopRewardsSchema(rewards=rewards, admin_message=admin_message)
@@ -1,20 +1,15 @@
-import asyncio
-import traceback
-
-from redis.client import Redis
 from vk_api.keyboard import VkKeyboard, VkKeyboardColor
 from psycopg2.extras import DictCursor
 
-from settings import TopSettings, NotifyChats, Config
+from settings import TopSettings
 
 from tops.base import BaseTop, BaseTopService
 from schemas.users import UserSchema
-from services.incomes import IncomesService
-from services.notification import NotificationsService
+from schemas.tops import TopRewardSchema, TopRewardsSchema
+from schemas.periods import Period
+from services.periods import PeriodsService
 
 from modules.additional import format_number, reduce_number
-from modules.databases.users import reward_user_top
-from modules.vkontakte.bot import send_message
 
 from vk_bot.keyboards.pages import add_back_page, add_next_page
 
@@ -41,23 +36,16 @@ class ClansTopService(BaseTopService):
             limit: int
     ) -> list[dict | None]:
 
+        # Очки клана без участников исключенных из топа (см. raise_database.add_clans_points)
         psql_cursor.execute("""
-            SELECT clans.clan_id, clans.owner_id,
-                   clans.tag, clans.name,
-                   COALESCE(SUM(users.clan_points), 0) as points
+            SELECT clan_id, owner_id, tag, name,
+                   top_points as points
             FROM clans
-            LEFT JOIN users ON clans.clan_id = users.clan_id
-            WHERE users.status NOT IN %(ignore_status)s AND
-                  users.user_id NOT IN %(ignore_user_ids)s AND
-                  clans.clan_id NOT IN %(ignore_clan_ids)s
-            GROUP BY clans.clan_id, clans.owner_id,
-                     clans.tag, clans.name, clans.tag
-            ORDER BY points DESC, clan_id DESC
+            WHERE clan_id NOT IN %(ignore_clan_ids)s
+            ORDER BY top_points DESC, clan_id DESC
             OFFSET %(offset)s
             LIMIT %(limit)s
         """, {
-            "ignore_status": cls.IGNORE_STATUS,
-            "ignore_user_ids": cls.IGNORE_USER_IDS,
             "ignore_clan_ids": cls.IGNORE_CLANS_IDS,
             "offset": offset,
             "limit": limit
@@ -77,31 +65,34 @@ class ClansTopService(BaseTopService):
             psql_cursor: DictCursor
     ) -> int:
 
-        if data in cls.IGNORE_CHATS_IDS:
+        if data in cls.IGNORE_CLANS_IDS:
             return 0
 
-        try:
-            participants = cls.get_number_participants(psql_cursor)
-            winners_ids = [x["clan_id"] for x in cls.get_winners(psql_cursor, 0, participants)]
-            return winners_ids.index(data) + 1
+        psql_cursor.execute("""
+            SELECT (
+                SELECT COUNT(*) FROM clans
+                WHERE (clans.top_points, clans.clan_id) > (clan.top_points, clan.clan_id) AND
+                      clans.clan_id NOT IN %(ignore_clan_ids)s
+            ) + 1 as position
+            FROM clans AS clan
+            WHERE clan.clan_id = %(clan_id)s
+        """, {
+            "clan_id": data,
+            "ignore_clan_ids": cls.IGNORE_CLANS_IDS
+        })
+        psql_response = psql_cursor.fetchone()
 
-        except:
-            return 0
+        return psql_response["position"] if psql_response is not None else 0
 
 
     @classmethod
     def get_number_participants(cls, psql_cursor: DictCursor) -> int:
 
         psql_cursor.execute("""
-            SELECT COUNT(clans.clan_id) as participants
+            SELECT COUNT(*) as participants
             FROM clans
-            LEFT JOIN users ON clans.clan_id = users.clan_id
-            WHERE users.status NOT IN %(ignore_status)s AND
-                  users.user_id NOT IN %(ignore_user_ids)s AND
-                  clans.clan_id NOT IN %(ignore_clan_ids)s
+            WHERE clan_id NOT IN %(ignore_clan_ids)s
         """, {
-            "ignore_status": cls.IGNORE_STATUS,
-            "ignore_user_ids": cls.IGNORE_USER_IDS,
             "ignore_clan_ids": cls.IGNORE_CLANS_IDS
         })
         participants = psql_cursor.fetchone()["participants"]
@@ -109,6 +100,24 @@ class ClansTopService(BaseTopService):
         return participants
 
 
+    @classmethod
+    def format_page(cls, psql_cursor: DictCursor, offset: int, limit: int) -> str:
+
+        reward = ClansTop.REWARDS
+        winners = cls.get_winners(psql_cursor, offset, limit)
+        response = ""
+
+        for position, winner in enumerate(winners, offset + 1):
+            winner_name = f"[{winner['tag']}] {UserSchema.format_vk_name(winner['owner_id'], winner['name'])}"
+            winner_points = winner["points"]
+
+            response += f"\n{position}) {winner_name} - {format_number(winner_points)} коинов"
+            if cls.can_get_reward(winner_points, reward, position):
+                response += f" (приз {reduce_number(reward[position])} WC)"
+
+        return response
+
+
     @classmethod
     def get_message(
             cls,
@@ -121,20 +130,12 @@ class ClansTopService(BaseTopService):
         if TopSettings.SWITCH_CLANS_TOP is False:
             return "Топ временно не работает", None
 
-        reward = ClansTop.REWARDS
-        winners = cls.get_winners(psql_cursor, offset, limit)
         participants = cls.get_number_participants(psql_cursor)
 
         response = "🎁 Топ кланов\n"
         keyboard = VkKeyboard(one_time=False, inline=True)
 
-        for position, winner in enumerate(winners, offset + 1):
-            winner_name = f"[{winner['tag']}] {UserSchema.format_vk_name(winner['owner_id'], winner['name'])}"
-            winner_points = winner["points"]
-
-            response += f"\n{position}) {winner_name} - {format_number(winner_points)} коинов"
-            if cls.can_get_reward(winner_points, reward, position):
-                response += f" (приз {reduce_number(reward[position])} WC)"
+        response += cls.get_page(psql_cursor, offset, limit)
 
         if data.clan_id != None:
             clan_position = cls.get_position(data.clan_id, psql_cursor)
@@ -174,7 +175,15 @@ class ClansTopService(BaseTopService):
     @classmethod
     def reset_points(cls, psql_cursor: DictCursor) -> None:
 
-        psql_cursor.execute("UPDATE users SET clan_points = 0")
+        PeriodsService.start_new_period(Period.CLAN_POINTS, psql_cursor)
+
+        # Очки участников прошлого периода читаются как 0, очки кланов обнуляются сразу
+        psql_cursor.execute("""
+            UPDATE clans
+            SET clan_points = 0,
+                top_points = 0
+            WHERE clan_points <> 0 OR top_points <> 0
+        """)
 
 
     @classmethod
@@ -185,13 +194,13 @@ class ClansTopService(BaseTopService):
     ) -> list:
         """Возвращает участников клана для награждения"""
 
-        psql_cursor.execute("""
-            SELECT user_id, full_name, clan_points as points
+        psql_cursor.execute(f"""
+            SELECT user_id, full_name, {PeriodsService.counter("clan_points")} as points
             FROM users
             WHERE clan_id = %(clan_id)s AND
                   status NOT IN %(ignore_status)s AND
                   user_id NOT IN %(ignore_user_ids)s
-            ORDER BY clan_points DESC
+            ORDER BY points DESC
         """, {
             "clan_id": clan_id,
             "ignore_status": cls.IGNORE_STATUS,
@@ -203,68 +212,49 @@ class ClansTopService(BaseTopService):
 
 
     @classmethod
-    async def reward_winners(
-            cls,
-            redis_cursor: Redis,
-            psql_cursor: DictCursor
-    ) -> None:
-
-        try:
-            if TopSettings.SWITCH_CLANS_TOP is False:
-                return None
-
-            reward = ClansTop.REWARDS
-            winners = cls.get_winners(psql_cursor, 0, max(reward.keys()))
-
-            tasks = []
-            admin_message = "🏆 Победители топа кланов:\n"
-
-            for clan_position, winner in enumerate(winners, 1):
-                clan_id = winner["clan_id"]
-                owner_id = winner["owner_id"]
-                clan_points = winner["points"]
-
-                if cls.can_get_reward(clan_points, reward, clan_position):
-                    clan_name = UserSchema.format_vk_name(owner_id, winner["name"])
-                    clan_reward = reward[clan_position]
-
-                    admin_message += f"\n\n{clan_position}) клан {clan_name} выиграл {format_number(clan_reward)}"
-                    clan_members = cls.get_clan_members(clan_id, psql_cursor)
-
-                    for member_position, member in enumerate(clan_members, 1):
-                        user_id = member["user_id"]
-                        user_name = UserSchema.format_vk_name(user_id, member["full_name"])
-                        user_points = member["points"]
-
-                        user_reward = user_points / clan_points * clan_reward * 0.9
-                        if user_id == owner_id:
-                            user_reward += clan_reward * 0.1
-                        user_reward = int(user_reward)
-
-                        reward_user_top(user_id, user_reward, psql_cursor)
-                        IncomesService.records_additional_expenses(user_reward, redis_cursor)
-
-                        user_points = format_number(user_points)
-                        user_reward = format_number(user_reward)
-
-                        tasks.append(send_message(
-                            peer_id=user_id,
-                            message=f"""
-                                🏆 Неделя подошла к концу, Ваш клан занял {clan_position} место
-                                🚀 {user_reward} WC уже на твоем балансе
-                            """
-                        ))
-                        admin_message += f"\n{clan_position}.{member_position}) {user_name} - наиграл {user_points} выиграл {user_reward}"
-
-            await asyncio.gather(*tasks)
-            await NotificationsService.send_notification(NotifyChats.TOP_REWARD, admin_message)
-
-        except:
-            await send_message(
-                peer_id=Config.DEVELOPER_ID,
-                message=f"⚠️ Упал топ кланов:\n\n{traceback.format_exc()}\n\n{winners}"
-            )
-            traceback.print_exc()
+    def get_rewards(cls, psql_cursor: DictCursor) -> TopRewardsSchema | None:
 
-        finally:
-            cls.reset_points(psql_cursor)
\ No newline at end of file
+        if TopSettings.SWITCH_CLANS_TOP is False:
+            return None
+
+        reward = ClansTop.REWARDS
+        winners = cls.get_winners(psql_cursor, 0, max(reward.keys()))
+
+        rewards = []
+        admin_message = "🏆 Победители топа кланов:\n"
+
+        for clan_position, winner in enumerate(winners, 1):
+            clan_id = winner["clan_id"]
+            owner_id = winner["owner_id"]
+            clan_points = winner["points"]
+
+            if cls.can_get_reward(clan_points, reward, clan_position):
+                clan_name = UserSchema.format_vk_name(owner_id, winner["name"])
+                clan_reward = reward[clan_position]
+
+                admin_message += f"\n\n{clan_position}) клан {clan_name} выиграл {format_number(clan_reward)}"
+                clan_members = cls.get_clan_members(clan_id, psql_cursor)
+
+                for member_position, member in enumerate(clan_members, 1):
+                    user_id = member["user_id"]
+                    user_name = UserSchema.format_vk_name(user_id, member["full_name"])
+                    user_points = member["points"]
+
+                    user_reward = user_points / clan_points * clan_reward * 0.9
+                    if user_id == owner_id:
+                        user_reward += clan_reward * 0.1
+                    user_reward = int(user_reward)
+
+                    rewards.append(TopRewardSchema(
+                        user_id=user_id,
+                        coins=user_reward,
+                        top_profit=user_reward,
+                        message=f"""
+                            🏆 Неделя подошла к концу, Ваш клан занял {clan_position} место
+                            🚀 {format_number(user_reward)} WC уже на твоем балансе
+                        """
+                    ))
+                    admin_message += f"\n{clan_position}.{member_position}) {user_name} - " \
+                                     f"наиграл {format_number(user_points)} выиграл {format_number(user_reward)}"
+
+        return TopRewardsSchema(rewards=rewards, admin_message=admin_message)
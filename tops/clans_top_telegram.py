@@ -7,9 +7,28 @@ import json
 from schemas.users import UserSchema
 from modules.additional import format_number, reduce_number
 from tops.clans_top import ClansTopService, ClansTop
+from tops.page_cache import get_cached_page
 from settings import TopSettings
 
 
+def _format_clans_top_page(psql_cursor: DictCursor, offset: int, limit: int) -> str:
+    """Возвращает строки участников страницы топа кланов для Telegram"""
+
+    reward = ClansTop.REWARDS
+    winners = ClansTopService.get_winners(psql_cursor, offset, limit)
+    response = ""
+
+    for position, winner in enumerate(winners, offset + 1):
+        winner_name = f"[{winner['tag']}] {UserSchema.format_telegram_name(winner['owner_id'], winner['name'])}"
+        winner_points = winner["points"]
+
+        response += f"\n{position}) {winner_name} - {format_number(winner_points)} коинов"
+        if ClansTopService.can_get_reward(winner_points, reward, position):
+            response += f" (приз {reduce_number(reward[position])} WC)"
+
+    return response
+
+
 def get_clans_top_message_telegram(
         user_data: UserSchema,
         psql_cursor: DictCursor,
@@ -21,20 +40,15 @@ def get_clans_top_message_telegram(
     if TopSettings.SWITCH_CLANS_TOP is False:
         return "Топ временно не работает", None
 
-    reward = ClansTop.REWARDS
-    winners = ClansTopService.get_winners(psql_cursor, offset, limit)
     participants = ClansTopService.get_number_participants(psql_cursor)
 
     response = "🎁 Топ кланов\n"
     keyboard_buttons = []
 
-    for position, winner in enumerate(winners, offset + 1):
-        winner_name = f"[{winner['tag']}] {UserSchema.format_telegram_name(winner['owner_id'], winner['name'])}"
-        winner_points = winner["points"]
-
-        response += f"\n{position}) {winner_name} - {format_number(winner_points)} коинов"
-        if ClansTopService.can_get_reward(winner_points, reward, position):
-            response += f" (приз {reduce_number(reward[position])} WC)"
+    response += get_cached_page(
+        f"{ClansTopService.__name__}:telegram", offset, limit,
+        lambda: _format_clans_top_page(psql_cursor, offset, limit)
+    )
 
     if user_data.clan_id is not None:
         clan_position = ClansTopService.get_position(user_data.clan_id, psql_cursor)
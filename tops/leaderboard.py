@@ -0,0 +1,209 @@
+from redis.client import Redis
+from redis.exceptions import RedisError
+from psycopg2.extras import DictCursor
+
+from settings import TopSettings
+from schemas.redis import RedisKeys
+from databases.redis import get_redis_cursor
+from services.periods import PeriodsService
+
+
+"""
+    Рейтинг топа игроков в redis
+
+    Раньше каждая страница топа сортировала всю таблицу users (ORDER BY ... OFFSET/LIMIT),
+    а место игрока считалось через COUNT по всей таблице. Теперь очки топа лежат
+    в sorted set: страница - ZREVRANGE, место - ZREVRANK, оба за O(log n)
+
+    Источник правды - postgresql. Рейтинг собирается из postgresql при первом обращении
+    и живет LEADERBOARD_TTL секунд, между пересборками очки добавляются при подсчете игры (ZINCRBY)
+    В рейтинге хранятся только игроки с очками больше 0
+
+    Пример:
+        DAY_LEADERBOARD.get_page(redis_cursor, offset, limit)  # [(user_id, points), ...]
+"""
+
+
+USER_ID_LENGTH = 20  # user_id дополняется нулями, чтобы при равных очках порядок был user_id DESC
+
+
+class Leaderboard:
+    """Рейтинг одного топа в sorted set"""
+
+    def __init__(self, name: str, column: str, settlement_field: str) -> None:
+        # column - поле с очками топа в таблице users
+        # settlement_field - очки из расчета игры (см. BaseGameModel.write_game_result)
+
+        self.name = name
+        self.column = column
+        self.settlement_field = settlement_field
+
+
+    @property
+    def key(self) -> str:
+        return f"{RedisKeys.TOP_LEADERBOARD.value}:{self.name}"
+
+
+    @property
+    def ready_key(self) -> str:
+        # Пока ключ существует рейтинг считается актуальным (ttl)
+        return f"{self.key}:ready"
+
+
+    @property
+    def lock_key(self) -> str:
+        return f"{self.key}:lock"
+
+
+    @staticmethod
+    def _to_member(user_id: int) -> str:
+        return str(user_id).zfill(USER_ID_LENGTH)
+
+
+    def is_ready(self, redis_cursor: Redis) -> bool:
+        """Проверяет что рейтинг собран"""
+
+        return bool(redis_cursor.exists(self.ready_key))
+
+
+    def rebuild(
+            self,
+            redis_cursor: Redis,
+            psql_cursor: DictCursor,
+            ignore_status: tuple,
+            ignore_user_ids: tuple
+    ) -> bool:
+        """Собирает рейтинг из postgresql, возвращает False если его уже собирает другой процесс"""
+
+        if not redis_cursor.set(self.lock_key, 1, nx=True, ex=TopSettings.LEADERBOARD_REBUILD_TIMEOUT):
+            return False
+
+        try:
+            psql_cursor.execute(f"""
+                SELECT user_id, {self.column} as points
+                FROM users
+                WHERE {PeriodsService.is_actual(self.column)} AND
+                      {self.column} > 0 AND
+                      status NOT IN %(ignore_status)s AND
+                      user_id NOT IN %(ignore_user_ids)s
+            """, {
+                "ignore_status": ignore_status,
+                "ignore_user_ids": ignore_user_ids
+            })
+            rows = psql_cursor.fetchall()
+
+            # Рейтинг собирается во временном ключе и подменяется одной командой RENAME
+            rebuild_key = f"{self.key}:rebuild"
+            pipeline = redis_cursor.pipeline(transaction=False)
+            pipeline.delete(rebuild_key)
+
+            for index in range(0, len(rows), TopSettings.LEADERBOARD_CHUNK_SIZE):
+                chunk = rows[index:index + TopSettings.LEADERBOARD_CHUNK_SIZE]
+                pipeline.zadd(rebuild_key, {self._to_member(row["user_id"]): row["points"] for row in chunk})
+
+            pipeline.execute()
+
+            pipeline = redis_cursor.pipeline(transaction=True)
+            if rows:
+                pipeline.rename(rebuild_key, self.key)
+            else:
+                pipeline.delete(self.key)
+            pipeline.set(self.ready_key, 1, ex=TopSettings.LEADERBOARD_TTL)
+            pipeline.execute()
+
+            print(f"[LEADERBOARD] {self.name}: собран из postgresql, участников {len(rows)}", flush=True)
+
+            return True
+
+        finally:
+            redis_cursor.delete(self.lock_key)
+
+
+    def invalidate(self, redis_cursor: Redis) -> None:
+        """Помечает рейтинг устаревшим, при следующем обращении он соберется заново"""
+
+        redis_cursor.delete(self.ready_key, self.key)
+
+
+    def get_page(self, redis_cursor: Redis, offset: int, limit: int) -> list[tuple[int, int]]:
+        """Возвращает [(user_id, очки)] страницы рейтинга"""
+
+        if limit <= 0:
+            return []
+
+        page = redis_cursor.zrevrange(self.key, offset, offset + limit - 1, withscores=True)
+
+        return [(int(member), int(points)) for member, points in page]
+
+
+    def get_position(self, redis_cursor: Redis, user_id: int) -> int:
+        """Возвращает место игрока в рейтинге"""
+
+        pipeline = redis_cursor.pipeline(transaction=False)
+        pipeline.zrevrank(self.key, self._to_member(user_id))
+        pipeline.zcard(self.key)
+        rank, participants = pipeline.execute()
+
+        # Игроков без очков в рейтинге нет, они стоят после всех
+        return participants + 1 if rank is None else rank + 1
+
+
+DAY_LEADERBOARD = Leaderboard("day", "day_top_points", "period_top_points")
+WEEK_LEADERBOARD = Leaderboard("week", "week_top_points", "period_top_points")
+MONTH_LEADERBOARD = Leaderboard("month", "month_top_points", "period_top_points")
+ALL_TIME_LEADERBOARD = Leaderboard("all_time", "all_top_points", "top_points")
+COINS_LEADERBOARD = Leaderboard("coins", "coins_top_points", "coins_top_points")
+RUBLES_LEADERBOARD = Leaderboard("rubles", "rubles_top_points", "top_points")
+WEEK_RUBLES_LEADERBOARD = Leaderboard("week_rubles", "week_rubles_top_points", "top_points")
+
+LEADERBOARDS = (
+    DAY_LEADERBOARD, WEEK_LEADERBOARD, MONTH_LEADERBOARD, ALL_TIME_LEADERBOARD,
+    COINS_LEADERBOARD, RUBLES_LEADERBOARD, WEEK_RUBLES_LEADERBOARD
+)
+
+
+_redis_cursor: Redis | None = None
+
+
+def get_leaderboard_redis() -> Redis:
+    """Возвращает подключение к redis для рейтингов (пул соединений redis-py переживает fork)"""
+
+    global _redis_cursor
+
+    if _redis_cursor is None:
+        _redis_cursor = get_redis_cursor()
+
+    return _redis_cursor
+
+
+def record_game_points(rows: list[dict]) -> None:
+    """Добавляет очки рассчитанной игры в собранные рейтинги"""
+    # rows - [{"user_id", "top_points", "period_top_points", "coins_top_points"}]
+    # Не собранные рейтинги пропускаются, они получат очки из postgresql при сборке
+
+    if not rows:
+        return
+
+    redis_cursor = get_leaderboard_redis()
+
+    try:
+        pipeline = redis_cursor.pipeline(transaction=False)
+        for leaderboard in LEADERBOARDS:
+            pipeline.exists(leaderboard.ready_key)
+        ready = pipeline.execute()
+
+        pipeline = redis_cursor.pipeline(transaction=False)
+        for leaderboard, is_ready in zip(LEADERBOARDS, ready):
+            if not is_ready:
+                continue
+
+            for row in rows:
+                points = row[leaderboard.settlement_field]
+                if points > 0:
+                    pipeline.zincrby(leaderboard.key, points, Leaderboard._to_member(row["user_id"]))
+
+        pipeline.execute()
+
+    except RedisError as error:
+        # Рейтинг догонит postgresql после пересборки
+        print(f"[LEADERBOARD WARNING] не удалось добавить очки игры: {error}", flush=True)
@@ -1,8 +1,10 @@
-from redis.client import Redis
 from psycopg2.extras import DictCursor
 
-from tops.base import BaseTop, BaseTopService
+from tops.base import BaseTop, BaseUserTopService
+from tops.leaderboard import MONTH_LEADERBOARD
+from services.periods import PeriodsService
 from schemas.users import UserSchema
+from schemas.tops import TopRewardSchema, TopRewardsSchema
 
 from modules.additional import format_number
 
@@ -13,71 +15,20 @@ class MonthTop(BaseTop):
     REWARDS: dict[int, int] | None = None  # Награды за топ месяца (можно настроить)
 
 
-class MonthTopService(BaseTopService):
+class MonthTopService(BaseUserTopService):
 
-    @classmethod
-    def get_winners(
-            cls,
-            psql_cursor: DictCursor,
-            offset: int,
-            limit: int
-    ) -> list[dict | None]:
-
-        # Топ месяца = топ за текущий месяц (используем month_top_points если есть, иначе считаем по дате)
-        psql_cursor.execute("""
-            SELECT user_id, status, full_name,
-                   COALESCE(month_top_points, 0) as points
-            FROM users
-            WHERE status NOT IN %(ignore_status)s AND
-                  user_id NOT IN %(ignore_user_ids)s
-            ORDER BY points DESC, user_id DESC
-            OFFSET %(offset)s
-            LIMIT %(limit)s
-        """, {
-            "ignore_status": cls.IGNORE_STATUS,
-            "ignore_user_ids": cls.IGNORE_USER_IDS,
-            "offset": offset,
-            "limit": limit
-        })
-        winners = cls._get_user_prefix(psql_cursor.fetchall())
-
-        return winners
-
-    @classmethod
-    def get_position(cls, data: UserSchema, psql_cursor: DictCursor) -> int:
-
-        if (
-            data.status.value in cls.IGNORE_STATUS or
-            data.user_id in cls.IGNORE_USER_IDS
-        ):
-            return 0
-
-        psql_cursor.execute("""
-            SELECT COUNT(*) + 1 as position
-            FROM users
-            WHERE status NOT IN %(ignore_status)s AND
-                  user_id NOT IN %(ignore_user_ids)s AND
-                  (COALESCE(month_top_points, 0) > %(points)s OR
-                   (COALESCE(month_top_points, 0) = %(points)s AND user_id < %(user_id)s))
-        """, {
-            "ignore_status": cls.IGNORE_STATUS,
-            "ignore_user_ids": cls.IGNORE_USER_IDS,
-            "points": getattr(data, 'month_top_points', 0),
-            "user_id": data.user_id
-        })
-        position = psql_cursor.fetchone()["position"]
-
-        return int(position)
+    LEADERBOARD = MONTH_LEADERBOARD
+    RESET_AFTER_REWARD = False  # Очки месячного топа сбрасываются из админ панели
 
     @classmethod
     def get_number_participants(cls, psql_cursor: DictCursor) -> int:
 
-        psql_cursor.execute("""
+        psql_cursor.execute(f"""
             SELECT COUNT(*) as count
             FROM users
             WHERE status NOT IN %(ignore_status)s AND
                   user_id NOT IN %(ignore_user_ids)s AND
-                  COALESCE(month_top_points, 0) > 0
+                  {PeriodsService.counter("month_top_points")} > 0
         """, {
             "ignore_status": cls.IGNORE_STATUS,
             "ignore_user_ids": cls.IGNORE_USER_IDS
@@ -86,21 +37,14 @@ class MonthTopService(BaseTopService):
 
         return int(count)
 
+
     @classmethod
-    def get_message(
-            cls,
-            data: UserSchema,
-            psql_cursor: DictCursor,
-            offset: int = 0,
-            limit: int = MonthTop.MAPPING
-    ) -> tuple[str, str | None]:
+    def format_page(cls, psql_cursor: DictCursor, offset: int, limit: int) -> str:
 
         reward = MonthTop.REWARDS
         winners = cls.get_winners(psql_cursor, offset, limit)
         participants = cls.get_number_participants(psql_cursor)
-
-        response = "🔥 Топ игроков месячного рейтинга\n"
-        response += f"Участников: {format_number(participants)}\n"
+        response = f"Участников: {format_number(participants)}\n"
 
         for position, winner in enumerate(winners, offset + 1):
             winner_name = UserSchema.format_telegram_name(winner["user_id"], winner["full_name"])
@@ -110,6 +54,21 @@ class MonthTopService(BaseTopService):
             if cls.can_get_reward(winner_points, reward, position):
                 response += f" 🎁 {format_number(reward[position])} WC"
 
+        return response
+
+
+    @classmethod
+    def get_message(
+            cls,
+            data: UserSchema,
+            psql_cursor: DictCursor,
+            offset: int = 0,
+            limit: int = MonthTop.MAPPING
+    ) -> tuple[str, str | None]:
+
+        response = "🔥 Топ игроков месячного рейтинга\n"
+        response += cls.get_page(psql_cursor, offset, limit)
+
         user_position = cls.get_position(data, psql_cursor)
         if user_position > 0:
             response += f"\n\nТвоя позиция: {user_position}"
@@ -119,27 +78,20 @@ class MonthTopService(BaseTopService):
         return response, keyboard
 
     @classmethod
-    def reset_points(cls, psql_cursor: DictCursor) -> None:
-        """Сбрасывает очки месячного топа"""
-
-        psql_cursor.execute("""
-            UPDATE users
-            SET month_top_points = 0
-        """)
-
-    @classmethod
-    async def reward_winners(cls, redis_cursor: Redis, psql_cursor: DictCursor) -> None:
-        """Награждает победителей месячного топа"""
+    def get_rewards(cls, psql_cursor: DictCursor) -> TopRewardsSchema | None:
+        """Возвращает награды победителей месячного топа"""
 
         if MonthTop.REWARDS is None:
-            return
+            return None
 
         reward = MonthTop.REWARDS
-        winners = cls.get_winners(psql_cursor, 0, max(reward.keys()))
-
-        for position, winner in enumerate(winners, 1):
-            if position in reward:
-                from modules.databases.users import give_coins
-                give_coins(winner["user_id"], reward[position], psql_cursor)
+        winners = cls.get_winners(psql_cursor, 0, max(reward.keys()), leaderboard=False)
 
+        # Награда месячного топа не учитывается в top_profit и расходах
+        rewards = [
+            TopRewardSchema(user_id=winner["user_id"], coins=reward[position])
+            for position, winner in enumerate(winners, 1)
+            if position in reward
+        ]
 
+        return TopRewardsSchema(rewards=rewards)
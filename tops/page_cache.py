@@ -0,0 +1,61 @@
+from typing import Callable
+
+from redis.exceptions import RedisError
+
+from settings import TopSettings
+from schemas.redis import RedisKeys
+from tops.leaderboard import get_leaderboard_redis
+
+
+"""
+    Кэш текста страниц топов
+
+    Страница топа одинакова для всех игроков, которые открыли ее в одну секунду,
+    поэтому текст страницы (без строки с местом игрока) хранится в redis PAGE_CACHE_TTL секунд.
+    В ключ входит номер поколения, подсчет игры увеличивает его (invalidate_pages),
+    и следующие запросы собирают страницу заново без поиска старых ключей
+
+    Пример:
+        response += get_cached_page("DayTopService", offset, limit, lambda: render(...))
+"""
+
+
+def _get_generation_key() -> str:
+    return f"{RedisKeys.TOP_PAGES.value}:generation"
+
+
+def get_cached_page(name: str, offset: int, limit: int, render: Callable[[], str]) -> str:
+    """Возвращает текст страницы топа из кэша, при промахе собирает его через render"""
+
+    redis_cursor = get_leaderboard_redis()
+
+    try:
+        generation = redis_cursor.get(_get_generation_key()) or 0
+        page_key = f"{RedisKeys.TOP_PAGES.value}:{name}:{generation}:{offset}:{limit}"
+
+        page = redis_cursor.get(page_key)
+        if page is not None:
+            return page
+
+    except RedisError as error:
+        print(f"[TOP PAGES WARNING] кэш недоступен: {error}", flush=True)
+        return render()
+
+    page = render()
+
+    try:
+        redis_cursor.set(page_key, page, ex=TopSettings.PAGE_CACHE_TTL)
+    except RedisError as error:
+        print(f"[TOP PAGES WARNING] не удалось сохранить страницу: {error}", flush=True)
+
+    return page
+
+
+def invalidate_pages() -> None:
+    """Помечает страницы всех топов устаревшими"""
+
+    try:
+        get_leaderboard_redis().incr(_get_generation_key())
+    except RedisError as error:
+        # Страницы устареют через PAGE_CACHE_TTL секунд
+        print(f"[TOP PAGES WARNING] не удалось сбросить кэш: {error}", flush=True)
@@ -1,7 +1,3 @@
-import asyncio
-import traceback
-
-from redis.client import Redis
 # Импорты для совместимости
 try:
     from vk_api.keyboard import VkKeyboard
@@ -17,16 +13,14 @@ except ImportError:
     json = None
 from psycopg2.extras import DictCursor
 
-from settings import TopSettings, NotifyChats, Config
+from settings import TopSettings
 
-from tops.base import BaseTop, BaseTopService
+from tops.base import BaseTop, BaseUserTopService
+from tops.leaderboard import WEEK_LEADERBOARD
 from schemas.users import UserSchema
-from services.incomes import IncomesService
-from services.notification import NotificationsService
+from schemas.tops import TopRewardSchema, TopRewardsSchema
 
 from modules.additional import format_number, reduce_number
-from modules.databases.users import reward_user_top
-from modules.vkontakte.bot import send_message
 
 from vk_bot.keyboards.pages import add_back_page, add_next_page
 
@@ -37,59 +31,9 @@ class WeekTop(BaseTop):
     REWARDS: dict[int | int] | None = None
 
 
-class WeekTopService(BaseTopService):
+class WeekTopService(BaseUserTopService):
 
-    @classmethod
-    def get_winners(
-            cls,
-            psql_cursor: DictCursor,
-            offset: int,
-            limit: int
-    ) -> list[dict | None]:
-
-        psql_cursor.execute("""
-            SELECT user_id, status, full_name,
-                   week_top_points as points
-            FROM users
-            WHERE status NOT IN %(ignore_status)s AND
-                  user_id NOT IN %(ignore_user_ids)s
-            ORDER BY week_top_points DESC, user_id DESC
-            OFFSET %(offset)s
-            LIMIT %(limit)s
-        """, {
-            "ignore_status": cls.IGNORE_STATUS,
-            "ignore_user_ids": cls.IGNORE_USER_IDS,
-            "offset": offset,
-            "limit": limit
-        })
-        winners = cls._get_user_prefix(psql_cursor.fetchall())
-
-        return winners
-
-
-    @classmethod
-    def get_position(cls, data: UserSchema, psql_cursor: DictCursor) -> int:
-
-        if (
-            data.status in cls.IGNORE_STATUS or
-            data.user_id in cls.IGNORE_USER_IDS
-        ):
-            return 0
-
-        psql_cursor.execute("""
-            SELECT COUNT(user_id) + 1 as position
-            FROM users
-            WHERE week_top_points > %(points)s AND
-                  status NOT IN %(ignore_status)s AND
-                  user_id NOT IN %(ignore_user_ids)s
-        """, {
-            "points": data.week_top_points,
-            "ignore_status": cls.IGNORE_STATUS,
-            "ignore_user_ids": cls.IGNORE_USER_IDS
-        })
-        position = psql_cursor.fetchone()["position"]
-
-        return position
+    LEADERBOARD = WEEK_LEADERBOARD
 
 
     @classmethod
@@ -109,6 +53,29 @@ class WeekTopService(BaseTopService):
         return count_members
 
 
+    @classmethod
+    def format_page(cls, psql_cursor: DictCursor, offset: int, limit: int) -> str:
+
+        reward = WeekTop.REWARDS
+        winners = cls.get_winners(psql_cursor, offset, limit)
+        response = ""
+
+        for position, winner in enumerate(winners, offset + 1):
+            # Используем правильный формат имени в зависимости от платформы
+            try:
+                winner_name = UserSchema.format_telegram_name(winner["user_id"], winner["full_name"])
+            except AttributeError:
+                # Fallback на VK формат если метод не найден
+                winner_name = UserSchema.format_vk_name(winner["user_id"], winner["full_name"])
+            winner_points = winner["points"]
+
+            response += f"\n{position}) {winner_name} выиграл {format_number(winner_points)} коинов"
+            if cls.can_get_reward(winner_points, reward, position):
+                response += f" (приз {reduce_number(reward[position])} WC)"
+
+        return response
+
+
     @classmethod
     def get_message(
             cls,
@@ -122,7 +89,6 @@ class WeekTopService(BaseTopService):
             return "Топ временно не работает", None
 
         reward = WeekTop.REWARDS
-        winners = cls.get_winners(psql_cursor, offset, limit)
         # participants = cls.get_number_participants(psql_cursor)
 
         response = "🔥 Топ игроков еженедельного рейтинга\n"
@@ -133,18 +99,7 @@ class WeekTopService(BaseTopService):
         else:
             keyboard = None  # Для Telegram можно добавить inline клавиатуру позже
 
-        for position, winner in enumerate(winners, offset + 1):
-            # Используем правильный формат имени в зависимости от платформы
-            try:
-                winner_name = UserSchema.format_telegram_name(winner["user_id"], winner["full_name"])
-            except AttributeError:
-                # Fallback на VK формат если метод не найден
-                winner_name = UserSchema.format_vk_name(winner["user_id"], winner["full_name"])
-            winner_points = winner["points"]
-
-            response += f"\n{position}) {winner_name} выиграл {format_number(winner_points)} коинов"
-            if cls.can_get_reward(winner_points, reward, position):
-                response += f" (приз {reduce_number(reward[position])} WC)"
+        response += cls.get_page(psql_cursor, offset, limit)
 
         user_position = cls.get_position(data, psql_cursor)
         response += f"\n\nТы находишься на {user_position} месте, выиграв {format_number(data.week_top_points)} коинов"
@@ -176,56 +131,35 @@ class WeekTopService(BaseTopService):
 
 
     @classmethod
-    def reset_points(cls, psql_cursor: DictCursor) -> None:
-
-        psql_cursor.execute("UPDATE users SET week_top_points = 0")
-
-
-    @classmethod
-    async def reward_winners(cls, redis_cursor: Redis, psql_cursor: DictCursor) -> None:
-
-        try:
-            if TopSettings.SWITCH_WEEK_TOP is False:
-                return None
-
-            reward = WeekTop.REWARDS
-            winners = cls.get_winners(psql_cursor, 0, max(reward.keys()))
+    def get_rewards(cls, psql_cursor: DictCursor) -> TopRewardsSchema | None:
 
-            tasks = []
-            admin_message = "🏆 Победители топа недели:\n"
-
-            for position, winner in enumerate(winners, 1):
-                user_id = winner["user_id"]
-                user_name = UserSchema.format_vk_name(user_id, winner["full_name"])
-                user_points = winner["points"]
-
-                if cls.can_get_reward(user_points, reward, position):
-                    user_reward = reward[position]
-
-                    reward_user_top(user_id, user_reward, psql_cursor)
-                    IncomesService.records_additional_expenses(user_reward, redis_cursor)
-
-                    user_points = format_number(user_points)
-                    user_reward = format_number(user_reward)
-
-                    tasks.append(send_message(
-                        peer_id=user_id,
-                        message=f"""
-                            🏆 {user_name}, ты занял {position} место в ежедневном топе
-                            🚀 {user_reward} WC уже на твоем балансе
-                        """
-                    ))
-                    admin_message += f"\n{position}) {user_name} - наиграл {user_points} выиграл {user_reward}"
-
-            await asyncio.gather(*tasks)
-            await NotificationsService.send_notification(NotifyChats.TOP_REWARD, admin_message)
-
-        except:
-            await send_message(
-                peer_id=Config.DEVELOPER_ID,
-                message=f"⚠️ Упал топ недели:\n\n{traceback.format_exc()}\n\n{winners}"
-            )
-            traceback.print_exc()
+        if TopSettings.SWITCH_WEEK_TOP is False:
+            return None
 
-        finally:
-            cls.reset_points(psql_cursor)
+        reward = WeekTop.REWARDS
+        winners = cls.get_winners(psql_cursor, 0, max(reward.keys()), leaderboard=False)
+
+        rewards = []
+        admin_message = "🏆 Победители топа недели:\n"
+
+        for position, winner in enumerate(winners, 1):
+            user_id = winner["user_id"]
+            user_name = UserSchema.format_vk_name(user_id, winner["full_name"])
+            user_points = winner["points"]
+
+            if cls.can_get_reward(user_points, reward, position):
+                user_reward = reward[position]
+
+                rewards.append(TopRewardSchema(
+                    user_id=user_id,
+                    coins=user_reward,
+                    top_profit=user_reward,
+                    message=f"""
+                        🏆 {user_name}, ты занял {position} место в ежедневном топе
+                        🚀 {format_number(user_reward)} WC уже на твоем балансе
+                    """
+                ))
+                admin_message += f"\n{position}) {user_name} - наиграл {format_number(user_points)} " \
+                                 f"выиграл {format_number(user_reward)}"
+
+        return TopRewardsSchema(rewards=rewards, admin_message=admin_message)
@@ -7,9 +7,28 @@ import json
 from schemas.users import UserSchema
 from modules.additional import format_number, reduce_number
 from tops.week_top import WeekTopService, WeekTop
+from tops.page_cache import get_cached_page
 from settings import TopSettings
 
 
+def _format_week_top_page(psql_cursor: DictCursor, offset: int, limit: int) -> str:
+    """Возвращает строки участников страницы топа недели для Telegram"""
+
+    reward = WeekTop.REWARDS
+    winners = WeekTopService.get_winners(psql_cursor, offset, limit)
+    response = ""
+
+    for position, winner in enumerate(winners, offset + 1):
+        winner_name = UserSchema.format_telegram_name(winner["user_id"], winner["full_name"])
+        winner_points = winner["points"]
+
+        response += f"\n{position}) {winner_name} выиграл {format_number(winner_points)} коинов"
+        if WeekTopService.can_get_reward(winner_points, reward, position):
+            response += f" (приз {reduce_number(reward[position])} WC)"
+
+    return response
+
+
 def get_week_top_message_telegram(
         user_data: UserSchema,
         psql_cursor: DictCursor,
@@ -22,19 +41,15 @@ def get_week_top_message_telegram(
         return "Топ временно не работает", None
 
     reward = WeekTop.REWARDS
-    winners = WeekTopService.get_winners(psql_cursor, offset, limit)
     participants = WeekTopService.get_number_participants(psql_cursor)
 
     response = "🔥 Топ игроков еженедельного рейтинга\n"
     keyboard_buttons = []
 
-    for position, winner in enumerate(winners, offset + 1):
-        winner_name = UserSchema.format_telegram_name(winner["user_id"], winner["full_name"])
-        winner_points = winner["points"]
-
-        response += f"\n{position}) {winner_name} выиграл {format_number(winner_points)} коинов"
-        if WeekTopService.can_get_reward(winner_points, reward, position):
-            response += f" (приз {reduce_number(reward[position])} WC)"
+    response += get_cached_page(
+        f"{WeekTopService.__name__}:telegram", offset, limit,
+        lambda: _format_week_top_page(psql_cursor, offset, limit)
+    )
 
     user_position = WeekTopService.get_position(user_data, psql_cursor)
     if user_position > 0:
@@ -4,6 +4,7 @@ from psycopg2._psycopg import connection as Connection
 
 from games.base import BaseGameModel
 from games.rates import RatesService
+from games.round_state import RoundState
 
 from schemas.users import UserSchema, UserStatus
 from schemas.chats import ChatSchema, ChatStatsPeriod, ALL_CHAT_STATS_PERIOD
@@ -22,7 +23,6 @@ from services.user_in_chat import UserChatService
 from services.transfer_coins import TransferCoinsService
 
 from modules.additional import convert_number
-from modules.databases.chats import get_game_data
 from modules.vkontakte.bot import send_message
 
 from vk_bot.modules.active_chat import handler_change_chat_name, handler_change_game_mode, \
@@ -57,7 +57,7 @@ async def handler_active_chat(
     clear_chat_menu = True
     clear_current_rate = True
 
-    game_data = get_game_data(chat_data.game_id, psql_cursor)
+    game_data = RoundState.get_game(chat_data.game_id, psql_cursor)
     game_model = BaseGameModel.GAMES_MODEL[chat_data.game_mode]
     game_result = game_model.format_game_result(game_data.game_result)
 
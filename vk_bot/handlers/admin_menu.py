@@ -12,6 +12,7 @@ from schemas.games import Games
 from schemas.redis import RedisKeys
 
 from services.incomes import IncomesService
+from services.periods import PeriodsService
 from services.promocode import PromoCodeService
 from services.bonus_repost import BonusRepostService
 from services.bonus_subscription import BonusSubscriptionService
@@ -187,12 +188,12 @@ async def handler_admin_menu(
             """)
             all_profit = add_up_profit(psql_cursor.fetchone(), day_profit)
 
-            psql_cursor.execute("""
+            psql_cursor.execute(f"""
                 SELECT COALESCE(SUM(coins), 0) as user_coins,
                     COALESCE(SUM(all_win), 0) as all_win,
                     COALESCE(SUM(all_lost), 0) as all_lost,
-                    COALESCE(SUM(day_win), 0) as day_win,
-                    COALESCE(SUM(day_lost), 0) as day_lost
+                    COALESCE(SUM({PeriodsService.counter("day_win")}), 0) as day_win,
+                    COALESCE(SUM({PeriodsService.counter("day_lost")}), 0) as day_lost
                 FROM users
                 WHERE status NOT IN %(ignore_user_status)s
             """, {
@@ -273,8 +274,8 @@ async def handler_admin_menu(
                 for x in all_games_profit
             ])
 
-            psql_cursor.execute("""
-                SELECT COALESCE(SUM(day_rates), 0) as day,
+            psql_cursor.execute(f"""
+                SELECT COALESCE(SUM({PeriodsService.counter("day_rates")}), 0) as day,
                        COALESCE(SUM(all_rates), 0) as all
                 FROM users
                 WHERE status NOT IN %(ignore_user_status)s
@@ -345,10 +346,11 @@ async def handler_admin_menu(
             """)
             count_users = int(psql_cursor.fetchone()["count"])
 
-            psql_cursor.execute("""
+            psql_cursor.execute(f"""
                 SELECT COALESCE(COUNT(user_id), 0) as count
                 FROM users
-                WHERE day_rates > 0
+                WHERE {PeriodsService.is_actual("day_rates")} AND
+                      day_rates > 0
             """)
             day_activ_users = int(psql_cursor.fetchone()["count"])
 
@@ -1016,13 +1018,15 @@ async def handler_admin_menu(
 
             psql_cursor.execute(f"""
                 UPDATE users
-                SET {sql_field} = {sql_field} + %(incr_amount)s
+                SET {PeriodsService.increment({sql_field: "%(incr_amount)s"})}
                 WHERE user_id = %(user_id)s
             """, {
                 "incr_amount": incr_amount,
                 "user_id": user_data.user_id
             })
 
+            TOPS[top_name].invalidate_leaderboard()
+
             response = f"У {user_data.vk_name} увеличен топ {top_name} на {format_number(incr_amount)}"
 
         elif split_message[0] in ["dtop", "decrtop"] and len_split_message == 4 and split_message[1] in TOPS_NAME:
@@ -1034,13 +1038,15 @@ async def handler_admin_menu(
 
             psql_cursor.execute(f"""
                 UPDATE users
-                SET {sql_field} = {sql_field} - %(dncr_amount)s
+                SET {PeriodsService.increment({sql_field: "-%(dncr_amount)s"})}
                 WHERE user_id = %(user_id)s
             """, {
                 "dncr_amount": dncr_amount,
                 "user_id": user_data.user_id
             })
 
+            TOPS[top_name].invalidate_leaderboard()
+
             response = f"У {user_data.vk_name} уменьшен топ {top_name} на {format_number(dncr_amount)}"
 
         elif message == "post":
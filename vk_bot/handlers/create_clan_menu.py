@@ -69,7 +69,8 @@ async def handler_menu_create_clan(
         ):
             offset = payload.get("offset")
             response, keyboard = ClanService.get_clans_message(
-                psql_cursor, offset=offset
+                psql_cursor, offset=offset,
+                after=payload.get("after"), before=payload.get("before")
             )
 
         elif (
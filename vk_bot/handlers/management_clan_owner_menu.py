@@ -132,7 +132,8 @@ async def handler_management_clan_owner_menu(
         ):
             offset = payload.get("offset")
             response, keyboard = ClanService.get_clans_message(
-                psql_cursor, offset=offset
+                psql_cursor, offset=offset,
+                after=payload.get("after"), before=payload.get("before")
             )
 
         elif (
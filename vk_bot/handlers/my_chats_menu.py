@@ -53,11 +53,14 @@ async def handler_my_chats_menu(
 
         elif (
             is_payload and
-            payload.get("event") == "get_my_chats_message" and
-            isinstance(payload.get("offset"), int)
+            payload.get("event") == "get_my_chats_message"
         ):
+            # Старые кнопки страниц с offset открывают первую страницу
             response = "Выберите чат для управления:"
-            keyboard = get_my_chats_keyboard(owner_id, psql_cursor, payload["offset"])
+            keyboard = get_my_chats_keyboard(
+                owner_id, psql_cursor,
+                after=payload.get("after"), before=payload.get("before")
+            )
 
         elif (
             is_payload and
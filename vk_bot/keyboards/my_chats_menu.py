@@ -11,14 +11,18 @@ from vk_bot.keyboards.pages import add_back_page, add_next_page
 def get_my_chats_keyboard(
         owner_id: int,
         psql_cursor: DictCursor,
-        offset: int = 0,
-        limit: int = 6
+        limit: int = 6,
+        *,
+        after: int | None = None,
+        before: int | None = None
 ) -> str:
     """Возвращает клавиатуру с выбором чата в меню мои чаты"""
 
     MAX_ROW = 3  # Максимальное количество элементов строке
 
-    my_chats = ChatsService.get_my_chats(owner_id, psql_cursor, offset, limit)
+    my_chats, back_page, next_page = ChatsService.get_my_chats_page(
+        owner_id, psql_cursor, limit, after=after, before=before
+    )
     count_my_chats = len(my_chats)
 
     keyboard = VkKeyboard()
@@ -40,10 +44,10 @@ def get_my_chats_keyboard(
             }
         )
 
-    back_page = offset != 0
-    next_page = ChatsService.get_count_my_chats(owner_id, psql_cursor) - offset - limit > 0
+    back_page = back_page and count_my_chats > 0
+    next_page = next_page and count_my_chats > 0
 
-    if count_my_chats > 0 and (back_page or next_page):
+    if back_page or next_page:
         keyboard.add_line()
 
     if back_page:
@@ -52,17 +56,17 @@ def get_my_chats_keyboard(
             full_test=next_page is False,
             payload={
                 "event": "get_my_chats_message",
-                "offset": offset - limit
+                "before": my_chats[0].chat_id
             }
         )
 
     if next_page:
         add_next_page(
             keyboard=keyboard,
-            full_test=offset == 0,
+            full_test=back_page is False,
             payload={
                 "event": "get_my_chats_message",
-                "offset": offset + limit
+                "after": my_chats[-1].chat_id
             }
         )
 
@@ -1,6 +1,7 @@
 from psycopg2.extras import DictCursor
 
 from games.base import BaseGameModel
+from games.round_state import RoundState
 
 from schemas.users import UserSchema, UserStatus
 from schemas.chats import ChatSchema
@@ -112,6 +113,7 @@ def handler_change_game_mode(
             WHERE chat_id = %(chat_id)s
         """, sql_data)
         psql_cursor.execute("DELETE FROM games WHERE game_id = %s", [game_id])
+        RoundState.finish(game_id)
 
         keyboard = BaseGameModel.GAMES_MODEL[game_mode].get_game_keyboard(game_result)
         return f"Режим игры изменен на {game_mode.name}", keyboard